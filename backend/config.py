@@ -40,6 +40,7 @@ class Settings(BaseSettings):
     
     # OpenAI Configuration
     openai_api_key: Optional[str] = None
+    openai_base_url: Optional[str] = None  # OpenAI-compatible endpoint (e.g. a local model server)
     
     # Google Maps Configuration
     react_app_google_maps_api_key: Optional[str] = None
@@ -50,6 +51,66 @@ class Settings(BaseSettings):
     port: int = 8000
     frontend_url: str = "https://juridence.net"
     
+    # Response cache (services/cache_service.py)
+    cache_enabled: bool = True
+    cache_backend: str = "memory"  # memory | redis
+    redis_url: Optional[str] = None
+    cache_default_ttl: int = 300  # seconds
+    cache_max_entries: int = 1024
+    case_context_cache_ttl: int = 3600  # AI chat case-context snapshots (keyed by case version)
+    
+    # LLM response cache (services/llm_cache_service.py)
+    llm_cache_enabled: bool = True
+    llm_cache_ttl: int = 30 * 24 * 3600  # seconds
+    llm_cache_max_entries: int = 50000  # rows kept in llm_response_cache (least recently used evicted)
+    llm_cache_evict_every: int = 200  # stores between eviction passes
+    
+    # Chat prompt token budget (services/prompt_budget.py)
+    ai_prompt_max_tokens: int = 6000  # upper bound on prompt tokens, below the model's context window
+    ai_prompt_history_share: float = 0.35  # share of the flexible budget reserved for chat history
+    ai_chat_history_window: int = 50  # newest messages read from ai_chat_messages per turn
+    
+    # Gazette PDF text extraction (services/pdf_text_extraction_service.py)
+    pdf_extraction_workers: int = 0  # processes per document; 0 uses the CPU count
+    pdf_parallel_min_pages: int = 16  # smaller documents are extracted in-process
+    pdf_cache_enabled: bool = True  # on-disk extraction cache (services/pdf_extraction_cache.py)
+    pdf_cache_dir: str = "cache/pdf_extraction"
+    pdf_cache_max_bytes: int = 2 * 1024 * 1024 * 1024  # least recently used entries removed beyond this
+    
+    # Excel gazette imports (services/gazette_import_service.py)
+    gazette_import_chunk_size: int = 500  # rows inserted and committed together
+    gazette_import_generate_analytics: bool = True  # queue analytics for people an import creates
+    
+    # Batch AI case analysis (services/batch_case_analysis_service.py)
+    ai_batch_size: int = 100  # cases fetched and written per checkpoint
+    ai_batch_concurrency: int = 8  # requests in flight
+    ai_batch_requests_per_minute: int = 300  # 0 disables rate limiting
+    
+    # Entity <-> case links (services/case_entity_linker.py)
+    case_link_batch_size: int = 1000  # cases matched and committed together
+    case_link_min_confidence: float = 0.5  # weakest link analytics count as an entity's case
+    
+    # Statistics rollups (services/stats_rollup_service.py)
+    stats_rollup_refresh_interval: int = 300  # seconds between incremental refreshes; 0 disables
+    
+    # Usage tracking (middleware/usage_tracking_middleware.py, services/usage_ingestion_service.py)
+    usage_tracking_enabled: bool = False
+    usage_queue_max_size: int = 10000  # events buffered before new ones are dropped
+    usage_batch_size: int = 500
+    usage_flush_interval: float = 2.0  # seconds
+    
+    # Request/activity logging (middleware/logging_middleware.py, services/log_sink_service.py)
+    request_logging_enabled: bool = False
+    log_sink: str = "direct"  # direct | batched | jsonl
+    log_batch_size: int = 200
+    log_flush_interval: float = 2.0  # seconds
+    log_buffer_max: int = 20000  # rows held by the batched sink before new ones are dropped
+    log_segment_dir: str = "logs/segments"
+    log_segment_max_bytes: int = 16 * 1024 * 1024
+    log_segment_load_interval: float = 30.0  # seconds
+    log_access_sample_rate: float = 1.0  # share of successful requests written to access_logs
+    log_activity_sample_rate: float = 1.0
+    
     @property
     def database_url(self) -> str:
         if self.database_url_env:
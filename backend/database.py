@@ -34,6 +34,7 @@ def create_tables():
     # Import additional models that might not be in __init__.py
     try:
         from models.ai_chat_session import AIChatSession  # noqa: F401
+        from models.ai_chat_message import AIChatMessage  # noqa: F401
     except ImportError:
         pass
     try:
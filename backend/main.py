@@ -2,8 +2,9 @@ from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
-# from middleware.logging_middleware import LoggingMiddleware
+from middleware.logging_middleware import LoggingMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 
 from database import create_tables, get_db
@@ -65,6 +66,11 @@ from routes import case_summaries
 from routes import watchlist
 from routes import cause_list
 from config import settings
+from services.stats_rollup_service import run_periodic_refresh
+from services.usage_ingestion_service import usage_pipeline
+from services.log_sink_service import close_log_sink
+from services.ai_chat_service import close_openai_clients, drain_chat_interaction_records
+from middleware.usage_tracking_middleware import UsageTrackingMiddleware
 
 # Application lifespan
 @asynccontextmanager
@@ -73,9 +79,21 @@ async def lifespan(app: FastAPI):
     print("Starting juridence Backend...")
     create_tables()
     print("Database tables created successfully")
+    rollup_task = None
+    if settings.stats_rollup_refresh_interval > 0:
+        rollup_task = asyncio.create_task(run_periodic_refresh(settings.stats_rollup_refresh_interval))
+    if settings.usage_tracking_enabled:
+        await usage_pipeline.start()
     yield
     # Shutdown
     print("Shutting down juridence Backend...")
+    if rollup_task:
+        rollup_task.cancel()
+    # Finish scheduled chat usage writes, then flush queued usage records and log rows
+    await drain_chat_interaction_records()
+    await usage_pipeline.stop()
+    await asyncio.to_thread(close_log_sink)
+    await close_openai_clients()
 
 # Create FastAPI app
 app = FastAPI(
@@ -114,8 +132,13 @@ async def add_security_headers(request, call_next):
     
     return response
 
-# Logging middleware
-# app.add_middleware(LoggingMiddleware)
+# Logging middleware (set LOG_SINK=batched or jsonl to keep writes off the request path)
+if settings.request_logging_enabled:
+    app.add_middleware(LoggingMiddleware)
+
+# Usage tracking middleware (rows are written in batches by services/usage_ingestion_service.py)
+if settings.usage_tracking_enabled:
+    app.add_middleware(UsageTrackingMiddleware)
 
 # Temporarily override authentication for testing - using real database user
 # NOTE: This override bypasses normal token authentication. 
@@ -9,7 +9,7 @@ from fastapi import Request, Response
 from fastapi.responses import StreamingResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from sqlalchemy.orm import Session
-from database import get_db
+from database import SessionLocal
 from services.logging_service import LoggingService
 from models.logs import ActivityType, LogLevel
 from config import settings
@@ -57,9 +57,9 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         # Calculate response time
         process_time = int((time.time() - start_time) * 1000)  # Convert to milliseconds
         
-        # Log the request
+        # Log the request (rows go through the configured log sink)
+        db = SessionLocal()
         try:
-            db = next(get_db())
             logging_service = LoggingService(db)
             
             # Log access
@@ -108,11 +108,11 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                     user_agent=request.headers.get("user-agent"),
                     severity=LogLevel.ERROR if response.status_code >= 500 else LogLevel.WARNING
                 )
-            
-            db.close()
         except Exception as e:
             # Don't let logging errors break the request
             print(f"Error in logging middleware: {e}")
+        finally:
+            db.close()
         
         # Add session ID to response headers
         response.headers["x-session-id"] = session_id
@@ -6,9 +6,7 @@ import time
 import json
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
-from sqlalchemy.orm import Session
-from database import get_db
-from services.usage_tracking_service import UsageTrackingService
+from services.usage_ingestion_service import usage_pipeline
 from auth import get_user_from_token
 import logging
 
@@ -71,20 +69,16 @@ class UsageTrackingMiddleware(BaseHTTPMiddleware):
         # Calculate response time
         response_time_ms = int((time.time() - start_time) * 1000)
         
-        # Track usage if response was successful
+        # Track usage if response was successful; the write happens in the background pipeline
         if response.status_code < 400:
             try:
-                db = next(get_db())
-                usage_service = UsageTrackingService(db)
-                
                 # Extract request data
                 request_data = await self._extract_request_data(request)
                 
                 # Determine resource type
                 resource_type = self.tracked_endpoints.get(request.url.path, "api_call")
                 
-                # Track the usage
-                usage_service.track_usage(
+                usage_pipeline.submit(
                     user_id=user_id,
                     session_id=session_id,
                     endpoint=request.url.path,
@@ -0,0 +1,7 @@
+-- Migration: Index case_hearings by case
+-- The AI chat case-context version check (count and latest change of a case's hearings)
+-- and the per-case hearing lists filter on case_id, which had no index.
+
+CREATE INDEX IF NOT EXISTS ix_case_hearings_case_id ON case_hearings(case_id);
+
+ANALYZE case_hearings;
@@ -0,0 +1,117 @@
+-- Migration: Weighted full-text search document for reported cases
+-- case_search_index holds one row per case; search_vector is a weighted tsvector
+--   A title | B parties and related people | C judges and lawyers | D headnotes, summary, keywords
+-- matched by /api/case-search through a GIN index instead of ORed LIKE scans over reported_cases.
+-- Triggers refresh the document whenever a case or its metadata is written.
+
+ALTER TABLE case_search_index ADD COLUMN IF NOT EXISTS search_vector TSVECTOR;
+
+-- Older processing runs could leave several rows per case; keep the newest one
+DELETE FROM case_search_index csi
+USING case_search_index newer
+WHERE csi.case_id = newer.case_id
+  AND csi.id < newer.id;
+
+DROP INDEX IF EXISTS ix_case_search_index_case_id;
+CREATE UNIQUE INDEX IF NOT EXISTS ix_case_search_index_case_id ON case_search_index(case_id);
+
+CREATE INDEX IF NOT EXISTS idx_case_search_index_vector
+ON case_search_index USING GIN (search_vector);
+
+-- ========================================
+-- Refresh function and triggers
+-- ========================================
+
+-- JSON name arrays -> space separated plain text
+CREATE OR REPLACE FUNCTION case_search_json_text(p_value JSON) RETURNS TEXT AS $$
+    SELECT COALESCE(regexp_replace(p_value::text, '[\[\]",]+', ' ', 'g'), '');
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION case_search_index_refresh(p_case_id INTEGER) RETURNS VOID AS $$
+DECLARE
+    v_a TEXT;
+    v_b TEXT;
+    v_c TEXT;
+    v_d TEXT;
+    v_text TEXT;
+BEGIN
+    SELECT
+        COALESCE(rc.title, ''),
+        concat_ws(' ', rc.protagonist, rc.antagonist,
+                  case_search_json_text(m.related_people), case_search_json_text(csi.person_names)),
+        concat_ws(' ', rc.presiding_judge, rc.judgement_by, rc.opinion_by, rc.lawyers,
+                  case_search_json_text(m.judges), case_search_json_text(m.lawyers)),
+        regexp_replace(concat_ws(' ', rc.headnotes, rc.case_summary, rc.keywords_phrases), '<[^>]+>', ' ', 'g')
+    INTO v_a, v_b, v_c, v_d
+    FROM reported_cases rc
+    LEFT JOIN case_metadata m ON m.case_id = rc.id
+    LEFT JOIN case_search_index csi ON csi.case_id = rc.id
+    WHERE rc.id = p_case_id;
+
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    v_text := btrim(regexp_replace(lower(concat_ws(' ', v_a, v_b, v_c, v_d)), '\s+', ' ', 'g'));
+
+    INSERT INTO case_search_index (case_id, searchable_text, search_vector, word_count, last_indexed)
+    VALUES (
+        p_case_id, v_text,
+        setweight(to_tsvector('simple', v_a), 'A') ||
+        setweight(to_tsvector('simple', v_b), 'B') ||
+        setweight(to_tsvector('simple', v_c), 'C') ||
+        setweight(to_tsvector('simple', v_d), 'D'),
+        COALESCE(array_length(regexp_split_to_array(NULLIF(v_text, ''), ' '), 1), 0),
+        NOW()
+    )
+    ON CONFLICT (case_id) DO UPDATE SET
+        searchable_text = EXCLUDED.searchable_text,
+        search_vector = EXCLUDED.search_vector,
+        word_count = EXCLUDED.word_count,
+        last_indexed = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION case_search_index_sync_case() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM case_search_index WHERE case_id = OLD.id;
+        RETURN OLD;
+    END IF;
+    PERFORM case_search_index_refresh(NEW.id);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_case_search_index_case ON reported_cases;
+CREATE TRIGGER trg_case_search_index_case
+AFTER INSERT OR UPDATE OF title, protagonist, antagonist, presiding_judge, judgement_by, opinion_by,
+    lawyers, headnotes, case_summary, keywords_phrases
+ON reported_cases
+FOR EACH ROW EXECUTE FUNCTION case_search_index_sync_case();
+
+DROP TRIGGER IF EXISTS trg_case_search_index_case_delete ON reported_cases;
+CREATE TRIGGER trg_case_search_index_case_delete
+BEFORE DELETE ON reported_cases
+FOR EACH ROW EXECUTE FUNCTION case_search_index_sync_case();
+
+CREATE OR REPLACE FUNCTION case_search_index_sync_metadata() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM case_search_index_refresh(NEW.case_id);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_case_search_index_metadata ON case_metadata;
+CREATE TRIGGER trg_case_search_index_metadata
+AFTER INSERT OR UPDATE OF related_people, judges, lawyers
+ON case_metadata
+FOR EACH ROW EXECUTE FUNCTION case_search_index_sync_metadata();
+
+-- ========================================
+-- Backfill existing cases
+-- ========================================
+
+SELECT case_search_index_refresh(id) FROM reported_cases ORDER BY id;
+
+ANALYZE case_search_index;
@@ -0,0 +1,27 @@
+-- Migration: Composite indexes backing keyset (cursor) pagination
+-- Each index matches a (sort_key, id) order used by services/pagination.py so the
+-- "row after cursor" predicate is an index range scan instead of OFFSET skipping.
+
+-- /api/case-search/search and /api/admin/cases: ORDER BY date DESC NULLS LAST, id DESC
+CREATE INDEX IF NOT EXISTS idx_reported_cases_date_id
+ON reported_cases (date DESC NULLS LAST, id DESC);
+
+-- /api/gazette/ default sort: ORDER BY publication_date DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_gazette_entries_publication_date_id
+ON gazette_entries (publication_date DESC NULLS LAST, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_gazette_entries_created_at_id
+ON gazette_entries (created_at DESC NULLS LAST, id DESC);
+
+-- /api/people/search default sort: ORDER BY full_name ASC, id ASC
+CREATE INDEX IF NOT EXISTS idx_people_full_name_id
+ON people (full_name ASC NULLS LAST, id ASC);
+
+-- /api/admin/case-hearings: ORDER BY hearing_date DESC, id DESC within a case
+CREATE INDEX IF NOT EXISTS idx_case_hearings_date_id
+ON case_hearings (hearing_date DESC NULLS LAST, id DESC);
+
+ANALYZE reported_cases;
+ANALYZE gazette_entries;
+ANALYZE people;
+ANALYZE case_hearings;
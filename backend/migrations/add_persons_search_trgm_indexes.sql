@@ -0,0 +1,31 @@
+-- Migration: Trigram indexes for /api/persons-unified-search
+-- The search filters each name column with lower(col) LIKE '%term%' (plus a
+-- word-boundary regex for single-word queries). These expression indexes let
+-- PostgreSQL answer the LIKE/regex through a GIN bitmap scan instead of
+-- evaluating the regex on every row of every table.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_change_of_name_new_name_trgm
+ON change_of_name USING GIN (lower(new_name) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_change_of_name_old_name_trgm
+ON change_of_name USING GIN (lower(old_name) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_change_of_name_alias_name_trgm
+ON change_of_name USING GIN (lower(alias_name) gin_trgm_ops)
+WHERE alias_name IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_correction_of_place_of_birth_person_name_trgm
+ON correction_of_place_of_birth USING GIN (lower(person_name) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_correction_of_date_of_birth_person_name_trgm
+ON correction_of_date_of_birth USING GIN (lower(person_name) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_marriage_officers_officer_name_trgm
+ON marriage_officers USING GIN (lower(officer_name) gin_trgm_ops);
+
+ANALYZE change_of_name;
+ANALYZE correction_of_place_of_birth;
+ANALYZE correction_of_date_of_birth;
+ANALYZE marriage_officers;
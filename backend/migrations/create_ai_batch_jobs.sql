@@ -0,0 +1,22 @@
+-- Migration: Checkpoints for batch AI case analysis
+-- ai_batch_jobs records how far a backfill run (scripts/backfill_ai_case_analysis.py) got,
+-- so a crashed or interrupted run resumes after last_case_id.
+-- The partial index serves the runner's keyset scan over cases that still lack an analysis.
+
+CREATE TABLE IF NOT EXISTS ai_batch_jobs (
+    job_name VARCHAR(64) PRIMARY KEY,
+    status VARCHAR(20) NOT NULL DEFAULT 'running',
+    last_case_id INTEGER NOT NULL DEFAULT 0,
+    processed INTEGER DEFAULT 0,
+    failed INTEGER DEFAULT 0,
+    prompt_tokens INTEGER DEFAULT 0,
+    completion_tokens INTEGER DEFAULT 0,
+    last_error TEXT,
+    started_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    finished_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_reported_cases_unanalysed
+ON reported_cases (id)
+WHERE ai_case_outcome IS NULL OR ai_case_outcome = '';
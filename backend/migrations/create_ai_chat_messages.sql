@@ -0,0 +1,51 @@
+-- Migration: Normalized AI chat message history
+-- Each message becomes one row of ai_chat_messages instead of an element of the
+-- ai_chat_sessions.messages JSON array, which was read and rewritten in full on every turn.
+-- services/ai_chat_history_service.py allocates seq from ai_chat_sessions.message_seq with a
+-- single UPDATE ... RETURNING, so concurrent sends to one session never collide.
+
+ALTER TABLE ai_chat_sessions ADD COLUMN IF NOT EXISTS message_seq INTEGER NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS ai_chat_messages (
+    id SERIAL PRIMARY KEY,
+    session_id VARCHAR(255) NOT NULL REFERENCES ai_chat_sessions(session_id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    role VARCHAR(20) NOT NULL,
+    content TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_ai_chat_messages_session_seq UNIQUE (session_id, seq)
+);
+
+-- ========================================
+-- Split the existing JSON arrays into rows (idempotent)
+-- ========================================
+
+INSERT INTO ai_chat_messages (session_id, seq, role, content, created_at)
+SELECT
+    s.session_id,
+    m.ordinality,
+    COALESCE(m.value->>'role', 'user'),
+    COALESCE(m.value->>'content', ''),
+    COALESCE((m.value->>'timestamp')::timestamp AT TIME ZONE 'UTC', s.created_at)
+FROM ai_chat_sessions s
+CROSS JOIN LATERAL json_array_elements(s.messages::json) WITH ORDINALITY AS m(value, ordinality)
+WHERE s.messages IS NOT NULL
+  AND json_typeof(s.messages::json) = 'array'
+ON CONFLICT (session_id, seq) DO NOTHING;
+
+UPDATE ai_chat_sessions s
+SET message_seq = counts.max_seq,
+    total_messages = counts.message_count
+FROM (
+    SELECT session_id, MAX(seq) AS max_seq, COUNT(*) AS message_count
+    FROM ai_chat_messages
+    GROUP BY session_id
+) counts
+WHERE counts.session_id = s.session_id
+  AND s.message_seq < counts.max_seq;
+
+-- The application no longer reads or writes ai_chat_sessions.messages. Once the copy
+-- above has been checked, reclaim the space with:
+--   UPDATE ai_chat_sessions SET messages = NULL WHERE messages IS NOT NULL;
+
+ANALYZE ai_chat_messages;
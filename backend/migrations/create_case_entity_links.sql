@@ -0,0 +1,44 @@
+-- Migration: Precomputed entity <-> case links
+-- case_entity_links holds the reported cases whose parties, title or text name a person,
+-- bank, company or insurer, with the field that matched and a confidence. It is built by
+-- services/case_entity_linker.py, which matches all entity names against each case in
+-- one pass over reported_cases; person, bank, company and insurance analytics read an
+-- entity's cases from it by index instead of running ilike scans per entity.
+-- case_entity_link_state records which entities have been linked. Entities created
+-- after the last full run are queued for background linking on first lookup.
+-- case_entity_link_pending lists cases created or updated since their links were
+-- computed; scripts/link_case_entities.py --queued re-links them in one pass.
+
+CREATE TABLE IF NOT EXISTS case_entity_links (
+    id SERIAL PRIMARY KEY,
+    entity_type VARCHAR(20) NOT NULL,  -- person | bank | company | insurance
+    entity_id INTEGER NOT NULL,
+    case_id INTEGER NOT NULL REFERENCES reported_cases(id) ON DELETE CASCADE,
+    match_field VARCHAR(30) NOT NULL,
+    matched_name VARCHAR(500),
+    confidence DOUBLE PRECISION NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_case_entity_links_entity
+ON case_entity_links (entity_type, entity_id, confidence);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_case_entity_links_match
+ON case_entity_links (entity_type, entity_id, case_id, match_field);
+
+CREATE INDEX IF NOT EXISTS ix_case_entity_links_case_id ON case_entity_links (case_id);
+
+CREATE TABLE IF NOT EXISTS case_entity_link_state (
+    entity_type VARCHAR(20) NOT NULL,
+    entity_id INTEGER NOT NULL,
+    linked_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (entity_type, entity_id)
+);
+
+CREATE TABLE IF NOT EXISTS case_entity_link_pending (
+    case_id INTEGER PRIMARY KEY REFERENCES reported_cases(id) ON DELETE CASCADE,
+    queued_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Build the links with: python scripts/link_case_entities.py
+-- Re-link edited cases on a schedule with: python scripts/link_case_entities.py --queued
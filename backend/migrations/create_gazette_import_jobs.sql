@@ -0,0 +1,37 @@
+-- Migration: Bulk spreadsheet gazette imports
+-- gazette_import_jobs tracks each Excel import (POST /api/gazette/import-excel,
+-- GET /api/gazette/import-jobs/{job_id}).
+-- gazette_entries.import_key is a content hash of an imported notice; the partial unique
+-- index lets the importer insert with ON CONFLICT DO NOTHING, so re-importing a
+-- workbook skips the notices it already loaded.
+
+CREATE TABLE IF NOT EXISTS gazette_import_jobs (
+    id VARCHAR(36) PRIMARY KEY,
+    filename VARCHAR(255),
+    gazette_type VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    total_rows INTEGER DEFAULT 0,
+    processed_rows INTEGER DEFAULT 0,
+    imported INTEGER DEFAULT 0,
+    duplicates INTEGER DEFAULT 0,
+    skipped INTEGER DEFAULT 0,
+    people_created INTEGER DEFAULT 0,
+    people_updated INTEGER DEFAULT 0,
+    analytics_queued INTEGER DEFAULT 0,
+    analytics_done INTEGER DEFAULT 0,
+    errors JSON,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    finished_at TIMESTAMPTZ
+);
+
+ALTER TABLE gazette_entries
+ADD COLUMN IF NOT EXISTS import_key VARCHAR(64);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_gazette_entries_import_key
+ON gazette_entries (import_key)
+WHERE import_key IS NOT NULL;
+
+-- Name lookups of the importer's people prefetch
+CREATE INDEX IF NOT EXISTS idx_people_full_name_lower
+ON people (lower(full_name));
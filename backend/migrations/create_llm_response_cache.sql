@@ -0,0 +1,23 @@
+-- Migration: Persistent LLM response cache
+-- llm_response_cache stores the result of AI case summaries, entity/keyword extraction and
+-- on-demand case analyses keyed by sha256(model, template, template version, normalized input),
+-- see services/llm_cache_service.py. Expired rows and rows beyond LLM_CACHE_MAX_ENTRIES
+-- (least recently used first) are evicted by the service.
+
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    cache_key VARCHAR(64) PRIMARY KEY,
+    template VARCHAR(64) NOT NULL,
+    template_version VARCHAR(16) NOT NULL,
+    model VARCHAR(64) NOT NULL,
+    response JSON NOT NULL,
+    prompt_tokens INTEGER DEFAULT 0,
+    completion_tokens INTEGER DEFAULT 0,
+    hit_count INTEGER DEFAULT 0,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    last_hit_at TIMESTAMPTZ,
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_llm_response_cache_template ON llm_response_cache(template);
+CREATE INDEX IF NOT EXISTS ix_llm_response_cache_expires_at ON llm_response_cache(expires_at);
+CREATE INDEX IF NOT EXISTS ix_llm_response_cache_last_hit_at ON llm_response_cache(last_hit_at);
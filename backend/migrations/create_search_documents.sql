@@ -0,0 +1,151 @@
+-- Migration: Trigram-indexed search documents for /api/search/unified
+-- One row per searchable entity (people, banks, insurance, companies), kept current by triggers.
+-- Leading-wildcard LIKE on search_documents.document is served by a pg_trgm GIN index
+-- instead of sequentially scanning every entity table.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE TABLE IF NOT EXISTS search_documents (
+    id SERIAL PRIMARY KEY,
+    entity_type VARCHAR(20) NOT NULL,  -- people | banks | insurance | companies
+    entity_id INTEGER NOT NULL,
+    title VARCHAR(500) NOT NULL,  -- Display name, ranked against the query
+    document TEXT NOT NULL,  -- Lowercased concatenation of all searchable fields
+    is_searchable BOOLEAN DEFAULT TRUE,  -- People.is_verified / *.is_active
+    boost DOUBLE PRECISION DEFAULT 0,  -- Static tie-break boost (people.case_count)
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT uq_search_documents_entity UNIQUE (entity_type, entity_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_search_documents_entity_type ON search_documents(entity_type);
+CREATE INDEX IF NOT EXISTS ix_search_documents_is_searchable ON search_documents(is_searchable);
+CREATE INDEX IF NOT EXISTS idx_search_documents_type_searchable ON search_documents(entity_type, is_searchable);
+
+-- Trigram indexes: serve LIKE '%term%' on the document and similarity() ranking on the title
+CREATE INDEX IF NOT EXISTS idx_search_documents_document_trgm
+ON search_documents USING GIN (document gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_search_documents_title_trgm
+ON search_documents USING GIN (lower(title) gin_trgm_ops);
+
+-- ========================================
+-- Maintenance triggers
+-- ========================================
+
+CREATE OR REPLACE FUNCTION search_documents_upsert(
+    p_entity_type VARCHAR, p_entity_id INTEGER, p_title TEXT, p_document TEXT,
+    p_is_searchable BOOLEAN, p_boost DOUBLE PRECISION
+) RETURNS VOID AS $$
+BEGIN
+    INSERT INTO search_documents (entity_type, entity_id, title, document, is_searchable, boost, updated_at)
+    VALUES (
+        p_entity_type, p_entity_id, LEFT(COALESCE(p_title, ''), 500),
+        regexp_replace(lower(COALESCE(p_document, '')), '\s+', ' ', 'g'),
+        COALESCE(p_is_searchable, FALSE), COALESCE(p_boost, 0), NOW()
+    )
+    ON CONFLICT (entity_type, entity_id) DO UPDATE SET
+        title = EXCLUDED.title,
+        document = EXCLUDED.document,
+        is_searchable = EXCLUDED.is_searchable,
+        boost = EXCLUDED.boost,
+        updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION search_documents_sync_people() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM search_documents WHERE entity_type = 'people' AND entity_id = OLD.id;
+        RETURN OLD;
+    END IF;
+    PERFORM search_documents_upsert('people', NEW.id, NEW.full_name,
+        concat_ws(' ', NEW.full_name, NEW.first_name, NEW.last_name, NEW.id_number, NEW.phone_number,
+                  NEW.email, NEW.address, NEW.city, NEW.region, NEW.previous_names::text),
+        NEW.is_verified, NEW.case_count);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION search_documents_sync_banks() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM search_documents WHERE entity_type = 'banks' AND entity_id = OLD.id;
+        RETURN OLD;
+    END IF;
+    PERFORM search_documents_upsert('banks', NEW.id, NEW.name,
+        concat_ws(' ', NEW.name, NEW.short_name, NEW.bank_code, NEW.city, NEW.region, NEW.description),
+        NEW.is_active, 0);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION search_documents_sync_insurance() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM search_documents WHERE entity_type = 'insurance' AND entity_id = OLD.id;
+        RETURN OLD;
+    END IF;
+    PERFORM search_documents_upsert('insurance', NEW.id, NEW.name,
+        concat_ws(' ', NEW.name, NEW.short_name, NEW.license_number, NEW.city, NEW.region, NEW.description),
+        NEW.is_active, 0);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION search_documents_sync_companies() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM search_documents WHERE entity_type = 'companies' AND entity_id = OLD.id;
+        RETURN OLD;
+    END IF;
+    PERFORM search_documents_upsert('companies', NEW.id, NEW.name,
+        concat_ws(' ', NEW.name, NEW.short_name, NEW.registration_number, NEW.city, NEW.region,
+                  NEW.industry, NEW.description),
+        NEW.is_active, 0);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_search_documents_people ON people;
+CREATE TRIGGER trg_search_documents_people
+AFTER INSERT OR UPDATE OR DELETE ON people
+FOR EACH ROW EXECUTE FUNCTION search_documents_sync_people();
+
+DROP TRIGGER IF EXISTS trg_search_documents_banks ON banks;
+CREATE TRIGGER trg_search_documents_banks
+AFTER INSERT OR UPDATE OR DELETE ON banks
+FOR EACH ROW EXECUTE FUNCTION search_documents_sync_banks();
+
+DROP TRIGGER IF EXISTS trg_search_documents_insurance ON insurance;
+CREATE TRIGGER trg_search_documents_insurance
+AFTER INSERT OR UPDATE OR DELETE ON insurance
+FOR EACH ROW EXECUTE FUNCTION search_documents_sync_insurance();
+
+DROP TRIGGER IF EXISTS trg_search_documents_companies ON companies;
+CREATE TRIGGER trg_search_documents_companies
+AFTER INSERT OR UPDATE OR DELETE ON companies
+FOR EACH ROW EXECUTE FUNCTION search_documents_sync_companies();
+
+-- ========================================
+-- Backfill existing rows
+-- ========================================
+
+SELECT search_documents_upsert('people', id, full_name,
+    concat_ws(' ', full_name, first_name, last_name, id_number, phone_number,
+              email, address, city, region, previous_names::text),
+    is_verified, case_count)
+FROM people;
+
+SELECT search_documents_upsert('banks', id, name,
+    concat_ws(' ', name, short_name, bank_code, city, region, description), is_active, 0)
+FROM banks;
+
+SELECT search_documents_upsert('insurance', id, name,
+    concat_ws(' ', name, short_name, license_number, city, region, description), is_active, 0)
+FROM insurance;
+
+SELECT search_documents_upsert('companies', id, name,
+    concat_ws(' ', name, short_name, registration_number, city, region, industry, description), is_active, 0)
+FROM companies;
+
+ANALYZE search_documents;
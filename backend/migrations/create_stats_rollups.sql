@@ -0,0 +1,47 @@
+-- Migration: Pre-aggregated dashboard statistics
+-- stats_rollups holds row counts per (dimension, bucket), e.g. ('cases.court_type', 'SC'),
+-- read by /api/admin/cases/stats, /api/people/stats/overview and the gazette statistics.
+-- services/stats_rollup_service.py refreshes them incrementally from rows whose
+-- COALESCE(updated_at, created_at) is past the per-source watermark in stats_rollup_state.
+
+CREATE TABLE IF NOT EXISTS stats_rollups (
+    dimension VARCHAR(64) NOT NULL,
+    bucket VARCHAR(255) NOT NULL,
+    row_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (dimension, bucket)
+);
+
+-- Buckets each source row is currently counted in: {"cases.status": "active", ...}
+CREATE TABLE IF NOT EXISTS stats_rollup_members (
+    source VARCHAR(32) NOT NULL,  -- cases | people | gazettes
+    row_id INTEGER NOT NULL,
+    buckets JSON NOT NULL,
+    PRIMARY KEY (source, row_id)
+);
+
+CREATE TABLE IF NOT EXISTS stats_rollup_state (
+    source VARCHAR(32) PRIMARY KEY,
+    watermark TIMESTAMPTZ,
+    last_refreshed_at TIMESTAMPTZ,
+    last_full_refresh_at TIMESTAMPTZ,
+    rows_processed INTEGER DEFAULT 0
+);
+
+-- ========================================
+-- Change-detection indexes for the incremental refresh
+-- ========================================
+
+CREATE INDEX IF NOT EXISTS idx_reported_cases_changed_at
+ON reported_cases ((COALESCE(updated_at, created_at)));
+
+CREATE INDEX IF NOT EXISTS idx_people_changed_at
+ON people ((COALESCE(updated_at, created_at)));
+
+CREATE INDEX IF NOT EXISTS idx_gazette_entries_changed_at
+ON gazette_entries ((COALESCE(updated_at, created_at)));
+
+-- "Recent cases" counts on the dashboards stay live queries
+CREATE INDEX IF NOT EXISTS idx_reported_cases_created_at ON reported_cases(created_at);
+
+-- Build the rollups with: python scripts/refresh_stats_rollups.py --full
@@ -70,4 +70,10 @@ from .change_of_name import ChangeOfName
 from .marriage_officer import MarriageOfficer
 from .marriage_venue import MarriageVenue
 from .bank_rulings_judgements import BankRulingsJudgements
-from .case_summary import CaseSummary
\ No newline at end of file
+from .case_summary import CaseSummary
+from .search_document import SearchDocument
+from .stats_rollup import StatsRollup, StatsRollupMember, StatsRollupState
+from .llm_response_cache import LLMResponseCache
+from .ai_batch_job import AIBatchJob
+from .gazette_import_job import GazetteImportJob
+from .case_entity_link import CaseEntityLink, CaseEntityLinkState, CaseEntityLinkPending
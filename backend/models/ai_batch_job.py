@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy.sql import func
+from database import Base
+
+class AIBatchJob(Base):
+    """
+    Progress checkpoint of a batch AI analysis run (services/batch_case_analysis_service.py).
+    Written in the same transaction as each batch of results, so a restarted run
+    continues after ``last_case_id``.
+    """
+    __tablename__ = "ai_batch_jobs"
+
+    job_name = Column(String(64), primary_key=True)
+    status = Column(String(20), nullable=False, default="running")  # running, completed, failed
+    last_case_id = Column(Integer, nullable=False, default=0)  # keyset position
+
+    processed = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    prompt_tokens = Column(Integer, default=0)
+    completion_tokens = Column(Integer, default=0)
+    last_error = Column(Text, nullable=True)
+
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<AIBatchJob(job_name='{self.job_name}', status='{self.status}', last_case_id={self.last_case_id})>"
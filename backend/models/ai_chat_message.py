@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from database import Base
+
+class AIChatMessage(Base):
+    """
+    One message of an AI chat session. Messages are only ever inserted; ``seq`` is
+    allocated from ``AIChatSession.message_seq`` (see services/ai_chat_history_service.py)
+    so history reads are an index range scan on ``(session_id, seq)``.
+    """
+    __tablename__ = "ai_chat_messages"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(String(255), ForeignKey("ai_chat_sessions.session_id", ondelete="CASCADE"), nullable=False)
+    seq = Column(Integer, nullable=False)  # 1-based position within the session
+    role = Column(String(20), nullable=False)  # user, assistant
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("session_id", "seq", name="uq_ai_chat_messages_session_seq"),
+    )
+
+    def __repr__(self):
+        return f"<AIChatMessage(session_id='{self.session_id}', seq={self.seq}, role='{self.role}')>"
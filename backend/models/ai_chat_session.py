@@ -17,8 +17,9 @@ class AIChatSession(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     
     # Chat data
-    messages = Column(JSON, nullable=True)  # Array of message objects
+    messages = Column(JSON, nullable=True)  # Legacy message array; messages now live in ai_chat_messages
     total_messages = Column(Integer, default=0, nullable=False)
+    message_seq = Column(Integer, default=0, nullable=False)  # Last ai_chat_messages.seq allocated
     
     # AI context
     case_context_snapshot = Column(JSON, nullable=True)  # Snapshot of case context when session started
@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Index
+from sqlalchemy.sql import func
+from database import Base
+
+class CaseEntityLink(Base):
+    """
+    A reported case whose text names a person, bank, company or insurer. Computed by
+    services/case_entity_linker.py; analytics read an entity's cases from here instead
+    of scanning reported_cases with ilike per entity.
+    """
+    __tablename__ = "case_entity_links"
+
+    id = Column(Integer, primary_key=True)
+    entity_type = Column(String(20), nullable=False)  # person | bank | company | insurance
+    entity_id = Column(Integer, nullable=False)
+    case_id = Column(Integer, ForeignKey("reported_cases.id", ondelete="CASCADE"), nullable=False, index=True)
+    match_field = Column(String(30), nullable=False)  # protagonist, antagonist, title, lawyers, ...
+    matched_name = Column(String(500), nullable=True)  # the name or alias that matched
+    confidence = Column(Float, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("idx_case_entity_links_entity", "entity_type", "entity_id", "confidence"),
+        Index("uq_case_entity_links_match", "entity_type", "entity_id", "case_id", "match_field", unique=True),
+    )
+
+    def __repr__(self):
+        return f"<CaseEntityLink({self.entity_type} {self.entity_id} -> case {self.case_id}, {self.match_field})>"
+
+
+class CaseEntityLinkState(Base):
+    """Entities whose links are current, so analytics can tell 'no cases' from 'not linked yet'"""
+    __tablename__ = "case_entity_link_state"
+
+    entity_type = Column(String(20), primary_key=True)
+    entity_id = Column(Integer, primary_key=True)
+    linked_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class CaseEntityLinkPending(Base):
+    """Cases created or updated since their links were computed (scripts/link_case_entities.py --queued)"""
+    __tablename__ = "case_entity_link_pending"
+
+    case_id = Column(Integer, ForeignKey("reported_cases.id", ondelete="CASCADE"), primary_key=True)
+    queued_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
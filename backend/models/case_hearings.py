@@ -16,7 +16,7 @@ class CaseHearing(Base):
     __tablename__ = "case_hearings"
 
     id = Column(Integer, primary_key=True, index=True)
-    case_id = Column(Integer, ForeignKey("reported_cases.id"), nullable=False)
+    case_id = Column(Integer, ForeignKey("reported_cases.id"), nullable=False, index=True)
     
     # Hearing details
     hearing_date = Column(DateTime, nullable=False)
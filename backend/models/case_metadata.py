@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Float, LargeBinary
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -57,10 +58,11 @@ class CaseSearchIndex(Base):
     __tablename__ = "case_search_index"
     
     id = Column(Integer, primary_key=True, index=True)
-    case_id = Column(Integer, ForeignKey("reported_cases.id"), nullable=False, index=True)
+    case_id = Column(Integer, ForeignKey("reported_cases.id"), nullable=False, unique=True, index=True)
     
     # Searchable content
     searchable_text = Column(Text, nullable=False)  # Combined searchable text
+    search_vector = Column(TSVECTOR().with_variant(Text(), "sqlite", "mysql"), nullable=True)  # Weighted title/parties/judges/body document
     person_names = Column(JSON, nullable=True)  # All person names mentioned
     organization_names = Column(JSON, nullable=True)  # All organization names mentioned
     keywords = Column(JSON, nullable=True)  # All keywords
@@ -95,6 +95,7 @@ class Gazette(Base):
     remarks = Column(Text, comment="Correction notices, confirmation details, or other notes")
     source = Column(String(200), comment="Source authority (e.g., 'High Court', 'Registrar General')")
     reference_number = Column(String(100), index=True, comment="Reference number for linking across databases")
+    import_key = Column(String(64), comment="Duplicate key of an imported or PDF-extracted notice (unique when set); re-runs skip existing keys")
     
     # ========================================
     # Gazette Type and Classification
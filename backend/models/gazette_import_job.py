@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy.sql import func
+from database import Base
+
+class GazetteImportJob(Base):
+    """
+    Progress of one spreadsheet gazette import (services/gazette_import_service.py).
+    Counters are advanced in the same transaction as each chunk of rows, and the
+    deferred analytics counters as the background queue works through new people.
+    """
+    __tablename__ = "gazette_import_jobs"
+
+    id = Column(String(36), primary_key=True)  # uuid4
+    filename = Column(String(255), nullable=True)
+    gazette_type = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, completed, failed
+
+    total_rows = Column(Integer, default=0)
+    processed_rows = Column(Integer, default=0)
+    imported = Column(Integer, default=0)
+    duplicates = Column(Integer, default=0)  # rows whose notice was already imported
+    skipped = Column(Integer, default=0)  # rows without a usable name or that failed
+    people_created = Column(Integer, default=0)
+    people_updated = Column(Integer, default=0)
+    analytics_queued = Column(Integer, default=0)
+    analytics_done = Column(Integer, default=0)
+    errors = Column(JSON, nullable=True)  # first few row errors
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<GazetteImportJob(id='{self.id}', status='{self.status}', processed_rows={self.processed_rows})>"
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy.sql import func
+from database import Base
+
+class LLMResponseCache(Base):
+    """
+    Stored result of one LLM call, keyed by a hash of (model, prompt template and
+    version, normalized input text). Read and written by services/llm_cache_service.py
+    so repeated summaries/analyses of unchanged case content skip the model.
+    """
+    __tablename__ = "llm_response_cache"
+
+    cache_key = Column(String(64), primary_key=True)  # sha256 hex
+    template = Column(String(64), nullable=False, index=True)  # e.g. 'ai_service.case_summary'
+    template_version = Column(String(16), nullable=False)
+    model = Column(String(64), nullable=False)
+
+    response = Column(JSON, nullable=False)
+    prompt_tokens = Column(Integer, default=0)
+    completion_tokens = Column(Integer, default=0)
+
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_hit_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<LLMResponseCache(template='{self.template}', model='{self.model}', hits={self.hit_count})>"
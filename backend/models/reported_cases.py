@@ -1,8 +1,13 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred, load_only
 from database import Base
 
+# Deferred column groups. Multi-kilobyte bodies are not loaded with the row; code that
+# reads them for many cases at once adds .options(undefer_group(BODY_COLUMN_GROUP)).
+BODY_COLUMN_GROUP = "body"
+AI_ANALYSIS_COLUMN_GROUP = "ai_analysis"
+
 class ReportedCases(Base):
     __tablename__ = "reported_cases"
 
@@ -11,26 +16,26 @@ class ReportedCases(Base):
     suit_reference_number = Column(String(100), nullable=True)
     date = Column(DateTime, nullable=True, index=True)
     presiding_judge = Column(Text, nullable=True)
-    statutes_cited = Column(Text, nullable=True)
-    cases_cited = Column(Text, nullable=True)
+    statutes_cited = deferred(Column(Text, nullable=True), group=BODY_COLUMN_GROUP)
+    cases_cited = deferred(Column(Text, nullable=True), group=BODY_COLUMN_GROUP)
     lawyers = Column(Text, nullable=True)
-    commentary = Column(Text, nullable=True)
-    headnotes = Column(Text, nullable=True)
+    commentary = deferred(Column(Text, nullable=True), group=BODY_COLUMN_GROUP)
+    headnotes = deferred(Column(Text, nullable=True), group=BODY_COLUMN_GROUP)
     town = Column(String(100), nullable=True, index=True)
     region = Column(String(200), nullable=True, index=True)
     dl_citation_no = Column(String(50), nullable=True, index=True)
     created_by = Column(String(50), nullable=True)
     updated_by = Column(String(50), nullable=True)
     file_url = Column(String(500), nullable=True)
-    judgement = Column(Text, nullable=True)
+    judgement = deferred(Column(Text, nullable=True), group=BODY_COLUMN_GROUP)
     year = Column(String(4), nullable=True, index=True)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     type = Column(String(50), nullable=True, index=True)
     firebase_url = Column(String(500), nullable=True)
-    summernote = Column(Text, nullable=True)
-    detail_content = Column(Text, nullable=True)
-    decision = Column(Text, nullable=True)
+    summernote = deferred(Column(Text, nullable=True), group=BODY_COLUMN_GROUP)
+    detail_content = deferred(Column(Text, nullable=True), group=BODY_COLUMN_GROUP)
+    decision = deferred(Column(Text, nullable=True), group=BODY_COLUMN_GROUP)
     antagonist = Column(String(500), nullable=True, index=True)
     protagonist = Column(String(500), nullable=True, index=True)
     citation = Column(String(100), nullable=True, index=True)
@@ -48,13 +53,13 @@ class ReportedCases(Base):
     dl_type = Column(String(50), nullable=True)
     academic_programme_id = Column(String(50), nullable=True)
     opinion_by = Column(String(200), nullable=True)
-    conclusion = Column(Text, nullable=True)
+    conclusion = deferred(Column(Text, nullable=True), group=BODY_COLUMN_GROUP)
     
     # AI Banking Summary Fields
     ai_case_outcome = Column(Text, nullable=True, comment='AI-generated case outcome')
-    ai_court_orders = Column(Text, nullable=True, comment='AI-generated court orders analysis')
+    ai_court_orders = deferred(Column(Text, nullable=True, comment='AI-generated court orders analysis'), group=AI_ANALYSIS_COLUMN_GROUP)
     ai_financial_impact = Column(Text, nullable=True, comment='AI-generated financial impact level')
-    ai_detailed_outcome = Column(Text, nullable=True, comment='AI-generated detailed outcome analysis')
+    ai_detailed_outcome = deferred(Column(Text, nullable=True, comment='AI-generated detailed outcome analysis'), group=AI_ANALYSIS_COLUMN_GROUP)
     ai_summary_generated_at = Column(DateTime, nullable=True, comment='Timestamp when AI summary was generated')
     ai_summary_version = Column(String(10), nullable=True, default='1.0', comment='Version of AI summary generation algorithm')
     
@@ -62,4 +67,17 @@ class ReportedCases(Base):
     case_metadata = relationship("CaseMetadata", back_populates="case", uselist=False)
     case_search_index = relationship("CaseSearchIndex", back_populates="case", uselist=False)
     hearings = relationship("CaseHearing", back_populates="case", cascade="all, delete-orphan")
-    case_summary_record = relationship("CaseSummary", back_populates="case", uselist=False, cascade="all, delete-orphan")
\ No newline at end of file
+    case_summary_record = relationship("CaseSummary", back_populates="case", uselist=False, cascade="all, delete-orphan")
+
+
+# Display columns for list and autocomplete endpoints (schemas.reported_cases.ReportedCaseListItem)
+LIST_COLUMNS = (
+    "id", "title", "suit_reference_number", "date", "presiding_judge", "town", "region", "year",
+    "type", "antagonist", "protagonist", "citation", "court_type", "court_division", "status",
+    "area_of_law", "published", "created_at", "updated_at",
+)
+
+
+def list_columns_option():
+    """Loader option restricting a ReportedCases query to LIST_COLUMNS"""
+    return load_only(*(getattr(ReportedCases, name) for name in LIST_COLUMNS))
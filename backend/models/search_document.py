@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, UniqueConstraint, Index
+from sqlalchemy.sql import func
+from database import Base
+
+class SearchDocument(Base):
+    """
+    Denormalized search document per searchable entity (people, banks, insurance, companies).
+    On PostgreSQL the table is kept current by triggers and served by pg_trgm GIN indexes
+    (see migrations/create_search_documents.sql).
+    """
+    __tablename__ = "search_documents"
+
+    id = Column(Integer, primary_key=True, index=True)
+    entity_type = Column(String(20), nullable=False, index=True)  # people, banks, insurance, companies
+    entity_id = Column(Integer, nullable=False)
+
+    # Display name (ranked against the query) and lowercased concatenation of all searchable fields
+    title = Column(String(500), nullable=False)
+    document = Column(Text, nullable=False)
+
+    # Mirrors People.is_verified / Banks.is_active / etc. so filtering stays inside the index
+    is_searchable = Column(Boolean, default=True, index=True)
+    boost = Column(Float, default=0.0)  # Static rank boost (e.g. case_count for people)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("entity_type", "entity_id", name="uq_search_documents_entity"),
+        Index("idx_search_documents_type_searchable", "entity_type", "is_searchable"),
+    )
+
+    def __repr__(self):
+        return f"<SearchDocument(entity_type='{self.entity_type}', entity_id={self.entity_id}, title='{self.title}')>"
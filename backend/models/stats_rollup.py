@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy.sql import func
+from database import Base
+
+class StatsRollup(Base):
+    """
+    Pre-aggregated row count for one bucket of a statistics dimension
+    (e.g. dimension 'cases.court_type', bucket 'SC'). Maintained by
+    services/stats_rollup_service.py; dashboards read these instead of
+    grouping the source tables on every request.
+    """
+    __tablename__ = "stats_rollups"
+
+    dimension = Column(String(64), primary_key=True)
+    bucket = Column(String(255), primary_key=True)
+    row_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<StatsRollup(dimension='{self.dimension}', bucket='{self.bucket}', row_count={self.row_count})>"
+
+
+class StatsRollupMember(Base):
+    """
+    Buckets a source row was last counted in, so an incremental refresh can
+    move the row out of its old buckets when it changes or is deleted.
+    """
+    __tablename__ = "stats_rollup_members"
+
+    source = Column(String(32), primary_key=True)  # cases, people, gazettes
+    row_id = Column(Integer, primary_key=True)
+    buckets = Column(JSON, nullable=False)  # {dimension: bucket}
+
+
+class StatsRollupState(Base):
+    """Refresh watermark per source table"""
+    __tablename__ = "stats_rollup_state"
+
+    source = Column(String(32), primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=True)  # updated_at high-water mark of the last refresh
+    last_refreshed_at = Column(DateTime(timezone=True), nullable=True)
+    last_full_refresh_at = Column(DateTime(timezone=True), nullable=True)
+    rows_processed = Column(Integer, default=0)
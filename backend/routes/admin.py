@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_, or_
+from sqlalchemy.orm import Session, undefer_group
+from sqlalchemy import func, desc, and_, or_, inspect
 from typing import List, Optional
 from datetime import datetime, timedelta
 import json
@@ -10,7 +10,7 @@ import uuid
 from database import get_db
 from models.user import User, UserRole, UserStatus
 from auth import get_current_user, get_password_hash
-from models.reported_cases import ReportedCases
+from models.reported_cases import ReportedCases, BODY_COLUMN_GROUP, AI_ANALYSIS_COLUMN_GROUP, list_columns_option
 from models.people import People
 from models.banks import Banks
 from models.insurance import Insurance
@@ -25,6 +25,14 @@ from services.logging_service import LoggingService
 from services.case_metadata_service import CaseMetadataService
 from services.simple_case_processing_service import SimpleCaseProcessingService
 from services.document_processing_service import DocumentProcessingService
+from services.pagination import paginate, InvalidCursorError
+from services.cache_service import cached, invalidates, cache_stats, DASHBOARD_STATS, CASE_STATS
+from services.stats_rollup_service import StatsRollupService
+from services.usage_ingestion_service import usage_pipeline
+from services.log_sink_service import log_sink_stats
+from services.llm_cache_service import llm_cache_stats, evict_llm_responses, clear_llm_cache
+from services.ai_chat_service import invalidate_case_context
+from services.case_entity_linker import queue_case_links
 from schemas.admin import (
     AdminStatsResponse,
     UserListResponse,
@@ -61,17 +69,17 @@ def check_admin_privileges(user_id: int, db: Session):
 
 # Dashboard Statistics
 @router.get("/stats", response_model=AdminStatsResponse)
+@cached(DASHBOARD_STATS, ttl=60)
 async def get_dashboard_stats(db: Session = Depends(get_db)):
     """Get overall dashboard statistics"""
     try:
         # Count total users
         total_users = db.query(User).count()
         
-        # Count total cases
-        total_cases = db.query(ReportedCases).count()
-        
-        # Count total people
-        total_people = db.query(People).count()
+        # Case and people totals come from the stats rollups
+        rollups = StatsRollupService(db)
+        total_cases = rollups.count("cases.total")
+        total_people = rollups.count("people.total")
         
         # Count total banks
         total_banks = db.query(Banks).count()
@@ -111,6 +119,36 @@ async def get_dashboard_stats(db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching dashboard stats: {str(e)}")
 
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Hit/miss counters for the dashboard and statistics response cache"""
+    return cache_stats()
+
+@router.get("/usage-tracking/stats")
+async def get_usage_tracking_stats():
+    """Queue depth and write/drop counters of the background usage-tracking writer"""
+    return usage_pipeline.stats()
+
+@router.get("/logs/sink/stats")
+async def get_log_sink_stats():
+    """Buffered/written/dropped counters and sampling rates of the log sink"""
+    return log_sink_stats()
+
+@router.get("/llm-cache/stats")
+async def get_llm_cache_stats(db: Session = Depends(get_db)):
+    """Hit rate, tokens saved and size of the AI summary/analysis response cache"""
+    return llm_cache_stats(db)
+
+@router.post("/llm-cache/evict")
+async def evict_llm_cache(db: Session = Depends(get_db)):
+    """Delete expired and least recently used AI responses beyond the size limit"""
+    return {"evicted": evict_llm_responses(db)}
+
+@router.delete("/llm-cache")
+async def clear_llm_cache_entries(template: Optional[str] = Query(None), db: Session = Depends(get_db)):
+    """Drop cached AI responses, optionally only those of one prompt template"""
+    return {"deleted": clear_llm_cache(template, db)}
+
 # User Management
 @router.get("/users", response_model=UserListResponse)
 async def get_users(
@@ -303,6 +341,7 @@ async def get_user(user_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error fetching user: {str(e)}")
 
 @router.post("/users", response_model=UserDetailResponse)
+@invalidates(DASHBOARD_STATS)
 async def create_user(user_data: UserCreateRequest, db: Session = Depends(get_db)):
     """Create a new user"""
     try:
@@ -372,6 +411,7 @@ async def create_user(user_data: UserCreateRequest, db: Session = Depends(get_db
         raise HTTPException(status_code=500, detail=f"Error creating user: {str(e)}")
 
 @router.put("/users/{user_id}", response_model=UserDetailResponse)
+@invalidates(DASHBOARD_STATS)
 async def update_user(user_id: int, user_data: UserUpdateRequest, db: Session = Depends(get_db)):
     """Update user information"""
     try:
@@ -444,6 +484,7 @@ async def update_user(user_id: int, user_data: UserUpdateRequest, db: Session =
         raise HTTPException(status_code=500, detail=f"Error updating user: {str(e)}")
 
 @router.delete("/users/{user_id}")
+@invalidates(DASHBOARD_STATS)
 async def delete_user(user_id: int, db: Session = Depends(get_db)):
     """Delete a user"""
     try:
@@ -606,11 +647,14 @@ async def get_cases(
     search: Optional[str] = None,
     court_type: Optional[str] = None,
     status: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page (keyset pagination)"),
+    count_mode: str = Query("exact", regex="^(exact|estimated)$"),
+    known_total: Optional[int] = Query(None, ge=0, description="Total from the first page; echoed on cursor pages instead of counting again"),
     db: Session = Depends(get_db)
 ):
     """Get paginated list of cases with filtering"""
     try:
-        query = db.query(ReportedCases)
+        query = db.query(ReportedCases).options(list_columns_option())
         
         # Apply filters
         if search:
@@ -626,12 +670,18 @@ async def get_cases(
         if status:
             query = query.filter(ReportedCases.status == status)
         
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination
-        offset = (page - 1) * limit
-        cases = query.offset(offset).limit(limit).all()
+        # Keyset pagination over (date, id); page/offset is still honoured without a cursor
+        result_page = paginate(
+            query,
+            [(ReportedCases.date, "desc"), (ReportedCases.id, "desc")],
+            page=page,
+            limit=limit,
+            cursor=cursor,
+            count_mode=count_mode,
+            total=known_total
+        )
+        total = result_page.total
+        cases = result_page.items
         
         # Convert cases to proper format
         formatted_cases = []
@@ -664,72 +714,45 @@ async def get_cases(
             total=total,
             page=page,
             limit=limit,
-            total_pages=(total + limit - 1) // limit
+            total_pages=(total + limit - 1) // limit,
+            next_cursor=result_page.next_cursor
         )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching cases: {str(e)}")
 
 @router.get("/cases/stats", response_model=dict)
+@cached(CASE_STATS)
 async def get_case_stats(db: Session = Depends(get_db)):
     """Get comprehensive case statistics for admin dashboard"""
     try:
-        # Basic counts
-        total_cases = db.query(ReportedCases).count()
-        
-        # Status distribution
-        status_mapping = {
-            'active': 'active',
-            'closed': 'closed',
-            'pending': 'pending',
-            'dismissed': 'dismissed'
-        }
-        
-        active_cases = db.query(ReportedCases).filter(ReportedCases.status == 'active').count()
-        closed_cases = db.query(ReportedCases).filter(ReportedCases.status == 'closed').count()
-        pending_cases = db.query(ReportedCases).filter(ReportedCases.status == 'pending').count()
-        dismissed_cases = db.query(ReportedCases).filter(ReportedCases.status == 'dismissed').count()
+        rollups = StatsRollupService(db)
+        total_cases = rollups.count("cases.total")
+        status_dist = rollups.counts("cases.status")
         
         # Recent cases (last 30 days)
-        from datetime import datetime, timedelta
         thirty_days_ago = datetime.now() - timedelta(days=30)
         recent_cases = db.query(ReportedCases).filter(ReportedCases.created_at >= thirty_days_ago).count()
         
-        # Court type distribution
-        court_type_dist = {}
-        court_types = db.query(ReportedCases.court_type, func.count(ReportedCases.id)).group_by(ReportedCases.court_type).all()
-        for court_type, count in court_types:
-            if court_type:
-                court_type_dist[court_type] = count
-        
-        # Status distribution
-        status_dist = {}
-        status_counts = db.query(ReportedCases.status, func.count(ReportedCases.id)).group_by(ReportedCases.status).all()
-        for status, count in status_counts:
-            if status is not None:
-                status_name = status_mapping.get(status, status or 'unknown')
-                status_dist[status_name] = count
+        # Distributions (pre-aggregated in stats_rollups)
+        court_type_dist = rollups.counts("cases.court_type")
+        region_dist = rollups.counts("cases.region")
         
         # Year distribution (last 10 years)
-        year_dist = {}
         current_year = datetime.now().year
-        for year in range(current_year - 9, current_year + 1):
-            year_count = db.query(ReportedCases).filter(ReportedCases.year == str(year)).count()
-            if year_count > 0:
-                year_dist[str(year)] = year_count
-        
-        # Region distribution
-        region_dist = {}
-        regions = db.query(ReportedCases.region, func.count(ReportedCases.id)).group_by(ReportedCases.region).all()
-        for region, count in regions:
-            if region:
-                region_dist[region] = count
+        recent_years = {str(year) for year in range(current_year - 9, current_year + 1)}
+        year_dist = {
+            year: count for year, count in sorted(rollups.counts("cases.year").items())
+            if year in recent_years
+        }
         
         return {
             "totalCases": total_cases,
-            "activeCases": active_cases,
-            "closedCases": closed_cases,
-            "pendingCases": pending_cases,
-            "dismissedCases": dismissed_cases,
+            "activeCases": status_dist.get('active', 0),
+            "closedCases": status_dist.get('closed', 0),
+            "pendingCases": status_dist.get('pending', 0),
+            "dismissedCases": status_dist.get('dismissed', 0),
             "recentCases": recent_cases,
             "courtTypeDistribution": court_type_dist,
             "statusDistribution": status_dist,
@@ -739,11 +762,17 @@ async def get_case_stats(db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching case stats: {str(e)}")
 
+def _case_dict(case: ReportedCases) -> dict:
+    """Column values of a case; unlike __dict__ this also loads the deferred body columns"""
+    return {attr.key: getattr(case, attr.key) for attr in inspect(ReportedCases).column_attrs}
+
 @router.get("/cases/{case_id}", response_model=CaseDetailResponse)
 async def get_case(case_id: int, db: Session = Depends(get_db)):
     """Get a specific case by ID"""
     try:
-        case = db.query(ReportedCases).filter(ReportedCases.id == case_id).first()
+        case = db.query(ReportedCases).options(
+            undefer_group(BODY_COLUMN_GROUP), undefer_group(AI_ANALYSIS_COLUMN_GROUP)
+        ).filter(ReportedCases.id == case_id).first()
         if not case:
             raise HTTPException(status_code=404, detail="Case not found")
         
@@ -756,7 +785,7 @@ async def get_case(case_id: int, db: Session = Depends(get_db)):
         }
         
         # Create a dict with converted status
-        case_dict = case.__dict__.copy()
+        case_dict = _case_dict(case)
         if case_dict.get('status') is not None:
             case_dict['status'] = status_mapping.get(case_dict['status'])
         
@@ -784,6 +813,7 @@ async def get_case(case_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error fetching case: {str(e)}")
 
 @router.post("/cases", response_model=CaseDetailResponse)
+@invalidates(CASE_STATS, DASHBOARD_STATS)
 async def create_case(case_data: CaseCreateRequest, db: Session = Depends(get_db)):
     """Create a new case"""
     try:
@@ -805,6 +835,8 @@ async def create_case(case_data: CaseCreateRequest, db: Session = Depends(get_db
         
         new_case = ReportedCases(**case_dict)
         db.add(new_case)
+        db.flush()
+        queue_case_links(db, [new_case.id])
         db.commit()
         db.refresh(new_case)
         
@@ -842,7 +874,7 @@ async def create_case(case_data: CaseCreateRequest, db: Session = Depends(get_db
             3: 'dismissed'
         }
         
-        case_dict = new_case.__dict__.copy()
+        case_dict = _case_dict(new_case)
         if case_dict.get('status') is not None:
             case_dict['status'] = status_mapping.get(case_dict['status'])
         
@@ -857,6 +889,7 @@ async def create_case(case_data: CaseCreateRequest, db: Session = Depends(get_db
         raise HTTPException(status_code=500, detail=f"Error creating case: {str(e)}")
 
 @router.put("/cases/{case_id}", response_model=CaseDetailResponse)
+@invalidates(CASE_STATS, DASHBOARD_STATS)
 async def update_case(case_id: int, case_data: CaseUpdateRequest, db: Session = Depends(get_db)):
     """Update a case"""
     try:
@@ -884,8 +917,10 @@ async def update_case(case_id: int, case_data: CaseUpdateRequest, db: Session =
             setattr(case, field, value)
         
         case.updated_at = datetime.now()
+        queue_case_links(db, [case_id])
         db.commit()
         db.refresh(case)
+        invalidate_case_context(case_id)
         
         # Update person-case links if provided
         if person_links is not None:
@@ -910,7 +945,7 @@ async def update_case(case_id: int, case_data: CaseUpdateRequest, db: Session =
             3: 'dismissed'
         }
         
-        case_dict = case.__dict__.copy()
+        case_dict = _case_dict(case)
         if case_dict.get('status') is not None:
             case_dict['status'] = status_mapping.get(case_dict['status'])
         
@@ -922,6 +957,7 @@ async def update_case(case_id: int, case_data: CaseUpdateRequest, db: Session =
         raise HTTPException(status_code=500, detail=f"Error updating case: {str(e)}")
 
 @router.delete("/cases/{case_id}")
+@invalidates(CASE_STATS, DASHBOARD_STATS)
 async def delete_case(case_id: int, db: Session = Depends(get_db)):
     """Delete a case"""
     try:
@@ -931,6 +967,7 @@ async def delete_case(case_id: int, db: Session = Depends(get_db)):
         
         db.delete(case)
         db.commit()
+        invalidate_case_context(case_id)
         return {"message": "Case deleted successfully"}
     except HTTPException:
         raise
@@ -939,6 +976,7 @@ async def delete_case(case_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error deleting case: {str(e)}")
 
 @router.post("/cases/upload")
+@invalidates(CASE_STATS, DASHBOARD_STATS)
 async def upload_case(file: UploadFile = File(...), db: Session = Depends(get_db)):
     """Upload a case document and create a case record with AI analysis"""
     try:
@@ -1040,6 +1078,8 @@ async def upload_case(file: UploadFile = File(...), db: Session = Depends(get_db
         # Create case in database
         case = ReportedCases(**case_data)
         db.add(case)
+        db.flush()
+        queue_case_links(db, [case.id])
         db.commit()
         db.refresh(case)
         
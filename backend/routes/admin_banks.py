@@ -17,6 +17,7 @@ from schemas.admin import BankCreateRequest, BankUpdateRequest
 from typing import List, Optional
 import math
 import json
+from services.pagination import paginate, InvalidCursorError
 
 router = APIRouter()
 
@@ -58,6 +59,9 @@ async def get_banks(
     limit: int = Query(10, ge=1, le=100),
     search: Optional[str] = Query(None),
     bank_type: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page (keyset pagination)"),
+    count_mode: str = Query("exact", regex="^(exact|estimated)$"),
+    known_total: Optional[int] = Query(None, ge=0, description="Total from the first page; echoed on cursor pages instead of counting again"),
     db: Session = Depends(get_db)
 ):
     """Get paginated list of banks with optional filtering"""
@@ -76,20 +80,19 @@ async def get_banks(
         if bank_type:
             query = query.filter(Banks.bank_type == bank_type)
         
-        # Get total count
-        total = query.count()
-        
-        # Apply sorting - ensure Bank of Ghana (BOG) appears first
-        # Sort by bank_code first (BOG has '000'), then by name
-        from sqlalchemy import func
-        query = query.order_by(
-            func.coalesce(Banks.bank_code, 'ZZZ').asc(),  # '000' will sort before other codes
-            Banks.name.asc()
+        # Keyset pagination; Bank of Ghana (BOG, bank_code '000') appears first and banks
+        # without a code last, then by name (id breaks ties so the cursor is stable)
+        result_page = paginate(
+            query,
+            [(Banks.bank_code, "asc"), (Banks.name, "asc"), (Banks.id, "asc")],
+            page=page,
+            limit=limit,
+            cursor=cursor,
+            count_mode=count_mode,
+            total=known_total
         )
-        
-        # Apply pagination
-        offset = (page - 1) * limit
-        banks = query.offset(offset).limit(limit).all()
+        total = result_page.total
+        banks = result_page.items
         
         # Convert JSON arrays to strings for API response
         formatted_banks = []
@@ -128,8 +131,11 @@ async def get_banks(
             "total": total,
             "page": page,
             "limit": limit,
-            "total_pages": total_pages
+            "total_pages": total_pages,
+            "next_cursor": result_page.next_cursor
         }
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching banks: {str(e)}")
 
@@ -10,9 +10,19 @@ from schemas.case_hearings import CaseHearing as CaseHearingSchema, CaseHearingC
 from auth import get_current_user
 from models.user import User
 from datetime import datetime
+from services.pagination import paginate, InvalidCursorError
 
 router = APIRouter(dependencies=[])
 
+# The case pickers only show these; selecting columns keeps judgement/detail_content off the wire
+CASE_OPTION_COLUMNS = (
+    ReportedCases.id,
+    ReportedCases.suit_reference_number,
+    ReportedCases.title,
+    ReportedCases.court_type,
+    ReportedCases.court_division,
+)
+
 @router.get("/admin/case-hearings/test")
 async def test_endpoint():
     """Test endpoint without authentication"""
@@ -33,7 +43,7 @@ async def search_cases_for_hearing(
     
     if q:
         # Search with query
-        cases = db.query(ReportedCases).filter(
+        cases = db.query(*CASE_OPTION_COLUMNS).filter(
             or_(
                 ReportedCases.suit_reference_number.ilike(f"%{q}%"),
                 ReportedCases.title.ilike(f"%{q}%")
@@ -41,7 +51,7 @@ async def search_cases_for_hearing(
         ).limit(limit).all()
     else:
         # Return all cases when no query provided
-        cases = db.query(ReportedCases).filter(
+        cases = db.query(*CASE_OPTION_COLUMNS).filter(
             ReportedCases.title.isnot(None)
         ).limit(limit).all()
     
@@ -113,6 +123,9 @@ async def get_all_case_hearings(
     court_type: Optional[str] = Query(None),
     remark: Optional[str] = Query(None),
     group_by_case: bool = Query(False),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page (keyset pagination)"),
+    count_mode: str = Query("exact", regex="^(exact|estimated)$"),
+    known_total: Optional[int] = Query(None, ge=0, description="Total from the first page; echoed on cursor pages instead of counting again"),
     db: Session = Depends(get_db)
     # Temporarily removed authentication for testing
     # current_user: User = Depends(get_current_user)
@@ -142,12 +155,21 @@ async def get_all_case_hearings(
     if remark:
         query = query.filter(CaseHearing.remark == remark)
     
-    # Get total count before pagination
-    total_count = query.count()
-    
-    # Apply pagination
-    offset = (page - 1) * limit
-    results = query.order_by(ReportedCases.title, CaseHearing.hearing_date.desc()).offset(offset).limit(limit).all()
+    # Keyset pagination over (title, hearing_date, id); page/offset is still honoured without a cursor
+    try:
+        result_page = paginate(
+            query,
+            [(ReportedCases.title, "asc"), (CaseHearing.hearing_date, "desc"), (CaseHearing.id, "desc")],
+            page=page,
+            limit=limit,
+            cursor=cursor,
+            count_mode=count_mode,
+            total=known_total
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total_count = result_page.total
+    results = result_page.items
     
     if group_by_case:
         # Group hearings by case
@@ -185,7 +207,8 @@ async def get_all_case_hearings(
             'grouped': True,
             'cases': cases_list,
             'total_cases': len(cases_list),
-            'total_count': total_count
+            'total_count': total_count,
+            'next_cursor': result_page.next_cursor
         }
     else:
         # Return flat list of hearings (original behavior)
@@ -214,7 +237,8 @@ async def get_all_case_hearings(
             'grouped': False,
             'hearings': hearings_list,
             'total_hearings': len(hearings_list),
-            'total_count': total_count
+            'total_count': total_count,
+            'next_cursor': result_page.next_cursor
         }
 
 @router.get("/admin/case-hearings/{hearing_id}", response_model=CaseHearingSchema)
@@ -375,7 +399,7 @@ async def search_cases_for_hearing(
     
     if q:
         # Search with query
-        cases = db.query(ReportedCases).filter(
+        cases = db.query(*CASE_OPTION_COLUMNS).filter(
             or_(
                 ReportedCases.suit_reference_number.ilike(f"%{q}%"),
                 ReportedCases.title.ilike(f"%{q}%")
@@ -383,7 +407,7 @@ async def search_cases_for_hearing(
         ).limit(limit).all()
     else:
         # Return all cases when no query provided
-        cases = db.query(ReportedCases).filter(
+        cases = db.query(*CASE_OPTION_COLUMNS).filter(
             ReportedCases.title.isnot(None)
         ).limit(limit).all()
     
@@ -405,7 +429,7 @@ async def get_all_cases(
     """Get ALL cases from the database for hearing creation"""
     try:
         # Get all cases with titles (suit reference number can be null)
-        cases = db.query(ReportedCases).filter(
+        cases = db.query(*CASE_OPTION_COLUMNS).filter(
             ReportedCases.title.isnot(None)
         ).order_by(ReportedCases.title).all()
         
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, union_all
 from database import get_db
+from services.cache_service import invalidates, COMPANIES_STATS, DASHBOARD_STATS
 from models.companies import Companies
 from models.banks import Banks
 from models.insurance import Insurance
@@ -547,6 +548,7 @@ async def get_company(company_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error fetching company: {str(e)}")
 
 @router.post("/")
+@invalidates(COMPANIES_STATS, DASHBOARD_STATS)
 async def create_company(company_data: CompanyCreateRequest, db: Session = Depends(get_db)):
     """Create a new company"""
     try:
@@ -664,6 +666,7 @@ async def create_company(company_data: CompanyCreateRequest, db: Session = Depen
         raise HTTPException(status_code=500, detail=f"Error creating company: {str(e)}")
 
 @router.put("/{company_id}")
+@invalidates(COMPANIES_STATS, DASHBOARD_STATS)
 async def update_company(company_id: int, company_data: CompanyUpdateRequest, db: Session = Depends(get_db)):
     """Update an existing company"""
     try:
@@ -1119,6 +1122,7 @@ async def create_company_source(source_data: CompanySourceCreate, db: Session =
         raise HTTPException(status_code=500, detail=f"Error creating source: {str(e)}")
 
 @router.delete("/{company_id}")
+@invalidates(COMPANIES_STATS, DASHBOARD_STATS)
 async def delete_company(company_id: int, db: Session = Depends(get_db)):
     """Delete a company and all associated data"""
     try:
@@ -17,6 +17,7 @@ from schemas.admin import InsuranceCreateRequest, InsuranceUpdateRequest
 from typing import List, Optional
 import math
 import json
+from services.pagination import paginate, InvalidCursorError
 
 router = APIRouter()
 
@@ -77,6 +78,9 @@ async def get_insurance(
     limit: int = Query(10, ge=1, le=100),
     search: Optional[str] = Query(None),
     insurance_type: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page (keyset pagination)"),
+    count_mode: str = Query("exact", regex="^(exact|estimated)$"),
+    known_total: Optional[int] = Query(None, ge=0, description="Total from the first page; echoed on cursor pages instead of counting again"),
     db: Session = Depends(get_db)
 ):
     """Get paginated list of insurance companies with optional filtering"""
@@ -95,12 +99,11 @@ async def get_insurance(
         if insurance_type:
             query = query.filter(Insurance.insurance_type == insurance_type)
         
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination
-        offset = (page - 1) * limit
-        insurance = query.offset(offset).limit(limit).all()
+        # Keyset pagination over id; page/offset is still honoured without a cursor
+        result_page = paginate(query, [(Insurance.id, "asc")], page=page, limit=limit, cursor=cursor,
+                               count_mode=count_mode, total=known_total)
+        total = result_page.total
+        insurance = result_page.items
         
         # Convert JSON arrays to strings for API response
         formatted_insurance = []
@@ -167,8 +170,11 @@ async def get_insurance(
             "total": total,
             "page": page,
             "limit": limit,
-            "total_pages": total_pages
+            "total_pages": total_pages,
+            "next_cursor": result_page.next_cursor
         }
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching insurance: {str(e)}")
 
@@ -7,6 +7,8 @@ from models.person_case_statistics import PersonCaseStatistics
 from schemas.admin import AdminStatsResponse
 from typing import List, Optional
 import math
+from services.pagination import paginate, InvalidCursorError
+from services.cache_service import invalidates, PEOPLE_STATS, DASHBOARD_STATS
 
 router = APIRouter()
 
@@ -48,6 +50,9 @@ async def get_people(
     limit: int = Query(10, ge=1, le=100),
     search: Optional[str] = Query(None),
     risk_level: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page (keyset pagination)"),
+    count_mode: str = Query("exact", regex="^(exact|estimated)$"),
+    known_total: Optional[int] = Query(None, ge=0, description="Total from the first page; echoed on cursor pages instead of counting again"),
     db: Session = Depends(get_db)
 ):
     """Get paginated list of people with optional filtering"""
@@ -67,12 +72,10 @@ async def get_people(
         if risk_level:
             query = query.filter(People.risk_level == risk_level)
         
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination
-        offset = (page - 1) * limit
-        people = query.offset(offset).limit(limit).all()
+        # Keyset pagination over id; page/offset is still honoured without a cursor
+        result_page = paginate(query, [(People.id, "asc")], page=page, limit=limit, cursor=cursor, count_mode=count_mode, total=known_total)
+        total = result_page.total
+        people = result_page.items
         
         # Convert JSON arrays to strings for API response
         formatted_people = []
@@ -116,8 +119,11 @@ async def get_people(
             "total": total,
             "page": page,
             "limit": limit,
-            "total_pages": total_pages
+            "total_pages": total_pages,
+            "next_cursor": result_page.next_cursor
         }
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching people: {str(e)}")
 
@@ -166,6 +172,7 @@ async def get_person(person_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error fetching person: {str(e)}")
 
 @router.post("/")
+@invalidates(PEOPLE_STATS, DASHBOARD_STATS)
 async def create_person(person_data: dict, db: Session = Depends(get_db)):
     """Create a new person record"""
     try:
@@ -194,6 +201,7 @@ async def create_person(person_data: dict, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error creating person: {str(e)}")
 
 @router.put("/{person_id}")
+@invalidates(PEOPLE_STATS, DASHBOARD_STATS)
 async def update_person(person_id: int, person_data: dict, db: Session = Depends(get_db)):
     """Update an existing person record"""
     try:
@@ -217,6 +225,7 @@ async def update_person(person_id: int, person_data: dict, db: Session = Depends
         raise HTTPException(status_code=500, detail=f"Error updating person: {str(e)}")
 
 @router.delete("/{person_id}")
+@invalidates(PEOPLE_STATS, DASHBOARD_STATS)
 async def delete_person(person_id: int, db: Session = Depends(get_db)):
     """Delete a person and all associated data"""
     try:
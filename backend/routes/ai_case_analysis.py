@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import Dict, Any
 from database import get_db
@@ -11,6 +11,7 @@ router = APIRouter(prefix="/ai-case-analysis", tags=["ai-case-analysis"])
 @router.post("/analyze/{case_id}", response_model=Dict[str, Any])
 def analyze_case_on_demand(
     case_id: int,
+    refresh: bool = Query(False, description="Re-analyze an already analyzed case, bypassing the LLM response cache"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -19,7 +20,7 @@ def analyze_case_on_demand(
     This endpoint is called when a case is first opened.
     """
     try:
-        result = analyze_case_if_needed(case_id)
+        result = analyze_case_if_needed(case_id, use_cache=not refresh)
         
         if result["status"] == "error":
             raise HTTPException(
@@ -121,4 +122,21 @@ def get_analysis_stats(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Stats retrieval failed: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/batch/{job_name}", response_model=Dict[str, Any])
+def get_batch_job(
+    job_name: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Progress of a batch analysis run (scripts/backfill_ai_case_analysis.py).
+    """
+    from services.batch_case_analysis_service import get_batch_job_status
+    
+    job = get_batch_job_status(db, job_name)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch job not found")
+    return job
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc
 from typing import List, Optional, Dict, Any
+import json
 import uuid
 from datetime import datetime, timedelta
 
-from database import get_db
+from database import get_db, SessionLocal
 from models.ai_chat_session import AIChatSession
 from models.reported_cases import ReportedCases
 from schemas.ai_chat import (
@@ -14,6 +17,10 @@ from schemas.ai_chat import (
     ChatSessionListResponse, ChatMessage
 )
 from services.ai_chat_service import AIChatService
+from services.ai_chat_history_service import (
+    append_messages, get_messages, get_messages_for_sessions, get_recent_messages
+)
+from config import settings
 from services.usage_tracking_service import UsageTrackingService
 
 router = APIRouter(prefix="/ai-chat", tags=["ai-chat"])
@@ -40,8 +47,8 @@ async def create_chat_session(
             user_id=session_data.user_id,
             title=session_data.title or f"Chat for {case.title[:50]}...",
             is_active=True,
-            messages=[],
             total_messages=0,
+            message_seq=0,
             ai_model_used="gpt-4"
         )
         
@@ -94,17 +101,11 @@ async def get_chat_sessions(
         offset = (page - 1) * limit
         sessions = query.order_by(AIChatSession.last_activity.desc()).offset(offset).limit(limit).all()
         
-        # Convert to response format
+        # Convert to response format (messages of the whole page in one query)
+        page_messages = get_messages_for_sessions(db, [session.session_id for session in sessions])
         session_responses = []
         for session in sessions:
-            messages = []
-            if session.messages:
-                for msg in session.messages:
-                    messages.append(ChatMessage(
-                        role=msg.get("role", "user"),
-                        content=msg.get("content", ""),
-                        timestamp=datetime.fromisoformat(msg.get("timestamp", datetime.utcnow().isoformat()))
-                    ))
+            messages = [_chat_message(msg) for msg in page_messages.get(session.session_id, [])]
             
             session_responses.append(ChatSessionResponse(
                 id=session.id,
@@ -136,6 +137,8 @@ async def get_chat_sessions(
 @router.get("/sessions/{session_id}", response_model=ChatSessionResponse)
 async def get_chat_session(
     session_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Only the newest N messages"),
+    before_seq: Optional[int] = Query(None, ge=1, description="Only messages before this sequence number"),
     db: Session = Depends(get_db)
 ):
     """Get a specific chat session by ID"""
@@ -149,14 +152,10 @@ async def get_chat_session(
             raise HTTPException(status_code=404, detail="Chat session not found")
         
         # Convert messages
-        messages = []
-        if session.messages:
-            for msg in session.messages:
-                messages.append(ChatMessage(
-                    role=msg.get("role", "user"),
-                    content=msg.get("content", ""),
-                    timestamp=datetime.fromisoformat(msg.get("timestamp", datetime.utcnow().isoformat()))
-                ))
+        messages = [
+            _chat_message(msg)
+            for msg in get_messages(db, session_id, limit=limit, before_seq=before_seq)
+        ]
         
         return ChatSessionResponse(
             id=session.id,
@@ -177,6 +176,32 @@ async def get_chat_session(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching chat session: {str(e)}")
 
+def _chat_message(msg: Dict[str, Any]) -> ChatMessage:
+    return ChatMessage(
+        role=msg.get("role", "user"),
+        content=msg.get("content", ""),
+        timestamp=datetime.fromisoformat(msg["timestamp"]) if msg.get("timestamp") else None
+    )
+
+def _get_active_session(db: Session, session_id: str) -> Optional[AIChatSession]:
+    return db.query(AIChatSession).filter(
+        AIChatSession.session_id == session_id,
+        AIChatSession.is_active == True
+    ).first()
+
+def _get_session_with_history(db: Session, session_id: str):
+    """Active session and the newest messages used to build the prompt"""
+    session = _get_active_session(db, session_id)
+    if not session:
+        return None, []
+    return session, get_recent_messages(db, session_id, settings.ai_chat_history_window)
+
+def _save_exchange(db: Session, session_id: str, user_content: str, ai_content: str) -> Dict[str, Any]:
+    """Append a user/assistant message pair to a session and commit; returns the assistant message"""
+    _, ai_message = append_messages(db, session_id, [("user", user_content), ("assistant", ai_content)])
+    db.commit()
+    return ai_message
+
 @router.post("/sessions/{session_id}/messages", response_model=ChatMessageResponse)
 async def send_message(
     session_id: str,
@@ -185,28 +210,23 @@ async def send_message(
 ):
     """Send a message to an AI chat session"""
     try:
-        # Get session
-        session = db.query(AIChatSession).filter(
-            AIChatSession.session_id == session_id,
-            AIChatSession.is_active == True
-        ).first()
+        # Database work runs in the thread pool; the completion is awaited on the event loop
+        session, chat_history = await run_in_threadpool(_get_session_with_history, db, session_id)
         
         if not session:
             raise HTTPException(status_code=404, detail="Chat session not found")
         
         # Initialize AI service
-        ai_service = AIChatService(db)
-        
-        # Get chat history
-        chat_history = session.messages or []
+        ai_service = await run_in_threadpool(AIChatService, db)
         
         # Generate AI response with logging parameters
-        ai_response = ai_service.generate_ai_response(
+        ai_response = await ai_service.agenerate_ai_response(
             case_id=session.case_id,
             user_message=message_data.message,
             chat_history=chat_history,
             session_id=session_id,
-            user_id=session.user_id
+            user_id=session.user_id,
+            chat_session=session
         )
         
         if not ai_response.get("success", False):
@@ -215,25 +235,9 @@ async def send_message(
                 detail=f"AI service error: {ai_response.get('error', 'Unknown error')}"
             )
         
-        # Create message objects
-        user_message = {
-            "role": "user",
-            "content": message_data.message,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        ai_message = {
-            "role": "assistant",
-            "content": ai_response["response"],
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        # Update session with new messages
-        session.messages = chat_history + [user_message, ai_message]
-        session.total_messages = len(session.messages)
-        session.last_activity = datetime.utcnow()
-        
-        db.commit()
+        ai_message = await run_in_threadpool(
+            _save_exchange, db, session_id, message_data.message, ai_response["response"]
+        )
         
         return ChatMessageResponse(
             success=True,
@@ -252,6 +256,56 @@ async def send_message(
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error sending message: {str(e)}")
 
+def _sse(event: Dict[str, Any]) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+@router.post("/sessions/{session_id}/messages/stream")
+async def stream_message(
+    session_id: str,
+    message_data: ChatMessageRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Send a message and stream the answer as Server-Sent Events: ``token`` events carry
+    text deltas as the model produces them, followed by a single ``done`` (the exchange
+    has been saved to the session) or ``error`` event.
+    """
+    session, chat_history = await run_in_threadpool(_get_session_with_history, db, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    case_id = session.case_id
+    user_id = session.user_id
+    
+    async def event_stream():
+        # The request-scoped session is closed once streaming starts; use a dedicated one
+        stream_db = SessionLocal()
+        try:
+            ai_service = await run_in_threadpool(AIChatService, stream_db)
+            async for event in ai_service.astream_ai_response(
+                case_id=case_id,
+                user_message=message_data.message,
+                chat_history=chat_history,
+                session_id=session_id,
+                user_id=user_id
+            ):
+                if event["type"] == "done":
+                    try:
+                        await run_in_threadpool(
+                            _save_exchange, stream_db, session_id, message_data.message, event["response"]
+                        )
+                    except Exception as e:
+                        stream_db.rollback()
+                        event = {"type": "error", "error": f"Error saving message: {str(e)}"}
+                yield _sse(event)
+        finally:
+            stream_db.close()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/sessions/{case_id}/start", response_model=ChatMessageResponse)
 async def start_new_chat(
     case_id: int,
@@ -273,8 +327,8 @@ async def start_new_chat(
             user_id=1,  # Default user for testing
             title=f"Chat for {case.title[:50]}...",
             is_active=True,
-            messages=[],
             total_messages=0,
+            message_seq=0,
             ai_model_used="gpt-4"
         )
         
@@ -283,13 +337,14 @@ async def start_new_chat(
         db.refresh(new_session)
         
         # Initialize AI service
-        ai_service = AIChatService(db)
+        ai_service = await run_in_threadpool(AIChatService, db)
         
         # Generate AI response
-        ai_response = ai_service.generate_ai_response(
+        ai_response = await ai_service.agenerate_ai_response(
             case_id=case_id,
             user_message=message_data.message,
-            chat_history=[]
+            chat_history=[],
+            session_id=session_id
         )
         
         if not ai_response.get("success", False):
@@ -298,25 +353,10 @@ async def start_new_chat(
                 detail=f"AI service error: {ai_response.get('error', 'Unknown error')}"
             )
         
-        # Create message objects
-        user_message = {
-            "role": "user",
-            "content": message_data.message,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        ai_message = {
-            "role": "assistant",
-            "content": ai_response["response"],
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        # Update session with messages
-        new_session.messages = [user_message, ai_message]
-        new_session.total_messages = 2
-        new_session.last_activity = datetime.utcnow()
-        
-        db.commit()
+        # Store the first exchange
+        ai_message = await run_in_threadpool(
+            _save_exchange, db, session_id, message_data.message, ai_response["response"]
+        )
         
         return ChatMessageResponse(
             success=True,
@@ -357,7 +397,8 @@ async def generate_case_summary(
         summary_result = ai_service.generate_case_summary(
             case_id=summary_data.case_id,
             session_id=None,  # No session for direct summary requests
-            user_id=user_id
+            user_id=user_id,
+            use_cache=not summary_data.refresh
         )
         
         if not summary_result.get("success", False):
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 from sqlalchemy import and_, or_, func, desc, asc, text
 from database import get_db
-from models.reported_cases import ReportedCases
+from models.reported_cases import ReportedCases, BODY_COLUMN_GROUP, AI_ANALYSIS_COLUMN_GROUP
 from models.case_metadata import CaseMetadata, CaseSearchIndex
 from models.case_hearings import CaseHearing
 from models.user import User
@@ -12,9 +12,10 @@ from schemas.case_metadata import (
 from auth import get_current_user
 from typing import List, Optional, Dict, Any
 import logging
-import math
 import time
 import re
+from services.pagination import paginate, InvalidCursorError
+from services.case_search_index_service import CaseSearchIndexService
 
 router = APIRouter()
 
@@ -36,6 +37,9 @@ async def search_cases(
     area_of_law: Optional[str] = Query(None, description="Filter by area of law"),
     court_type: Optional[str] = Query(None, description="Filter by court type"),
     status: Optional[str] = Query(None, description="Filter by case status"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page (keyset pagination)"),
+    count_mode: str = Query("exact", regex="^(exact|estimated)$", description="Total count mode"),
+    known_total: Optional[int] = Query(None, ge=0, description="Total from the first page; echoed on cursor pages instead of counting again"),
     db: Session = Depends(get_db),
     # current_user: User = Depends(get_current_user)  # Temporarily disabled for testing
 ):
@@ -43,20 +47,13 @@ async def search_cases(
     
     start_time = time.time()
     
-    # Build search query
-    search_term = f"%{query.lower()}%"
-    
-    # Base query
-    cases_query = db.query(ReportedCases).outerjoin(
-        CaseMetadata, ReportedCases.id == CaseMetadata.case_id
-    ).outerjoin(
+    # Rank in SQL against the precomputed per-case search document; only ids and
+    # scores come back for the window, the page is then hydrated without body columns
+    search_index = CaseSearchIndexService(db)
+    score = search_index.rank_expression(query).label("relevance_score")
+    cases_query = db.query(ReportedCases.id, ReportedCases.date, score).outerjoin(
         CaseSearchIndex, ReportedCases.id == CaseSearchIndex.case_id
-    )
-    
-    # Search conditions - search only in title field
-    search_conditions = func.lower(ReportedCases.title).like(search_term)
-    
-    cases_query = cases_query.filter(search_conditions)
+    ).filter(or_(search_index.match_filter(query), search_index.unindexed_match_filter(query)))
     
     # Apply filters
     if case_type:
@@ -68,12 +65,22 @@ async def search_cases(
     if status:
         cases_query = cases_query.filter(ReportedCases.status == status)
     
-    # Get total count
-    total_cases = cases_query.count()
-    
-    # Apply pagination
-    offset = (page - 1) * limit
-    cases = cases_query.offset(offset).limit(limit).all()
+    # Keyset pagination over (score, date, id) so deep pages don't pay for OFFSET
+    try:
+        result_page = paginate(
+            cases_query,
+            [(score, "desc"), (ReportedCases.date, "desc"), (ReportedCases.id, "desc")],
+            page=page,
+            limit=limit,
+            cursor=cursor,
+            count_mode=count_mode,
+            total=known_total
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total_cases = result_page.total
+    scores = {row.id: float(row.relevance_score or 0) for row in result_page.items}
+    cases = search_index.load_cases([row.id for row in result_page.items])
     
     # Convert to search results
     results = []
@@ -93,9 +100,6 @@ async def search_cases(
         else:
             match_type = "content"
         
-        # Calculate relevance score
-        relevance_score = calculate_relevance_score(case, query)
-        
         # Get metadata if available
         metadata = get_case_metadata_safe(case, db)
         case_result = CaseSearchResult(
@@ -122,19 +126,11 @@ async def search_cases(
             outcome=metadata.outcome if metadata else None,
             decision_type=metadata.decision_type if metadata else None,
             monetary_amount=metadata.monetary_amount if metadata else None,
-            relevance_score=relevance_score,
+            relevance_score=scores.get(case.id, 0.0),
             match_type=match_type
         )
         results.append(case_result)
     
-    # Sort by relevance score
-    results.sort(key=lambda x: x.relevance_score, reverse=True)
-    
-    # Calculate pagination info
-    total_pages = math.ceil(total_cases / limit)
-    has_next = page < total_pages
-    has_prev = page > 1
-    
     search_time = (time.time() - start_time) * 1000  # Convert to milliseconds
     
     return CaseSearchResponse(
@@ -142,11 +138,12 @@ async def search_cases(
         total=total_cases,
         page=page,
         limit=limit,
-        total_pages=total_pages,
-        has_next=has_next,
-        has_prev=has_prev,
+        total_pages=result_page.total_pages,
+        has_next=result_page.has_next,
+        has_prev=result_page.has_prev,
         search_time_ms=search_time,
-        query=query
+        query=query,
+        next_cursor=result_page.next_cursor
     )
 
 @router.get("/person/{person_name}", response_model=PersonCaseProfile)
@@ -170,36 +167,31 @@ async def get_person_cases(
         ).all()
         linked_case_ids = {link.case_id for link in person_links if link.case_id}
     
-    # Search for cases involving this person by name
-    search_term = f"%{person_name.lower()}%"
-    
-    # Build filter conditions
-    name_filters = [
-        func.lower(ReportedCases.title).like(search_term),
-        func.lower(ReportedCases.protagonist).like(search_term),
-        func.lower(ReportedCases.antagonist).like(search_term),
-        func.lower(ReportedCases.presiding_judge).like(search_term),
-        func.lower(ReportedCases.lawyers).like(search_term),
-        func.lower(CaseMetadata.related_people).like(search_term)
-    ]
+    # Search for cases involving this person by name (title, parties, judges,
+    # lawyers and related people all live in the case search document)
+    search_index = CaseSearchIndexService(db)
+    name_filters = [search_index.match_filter(person_name), search_index.unindexed_match_filter(person_name)]
     
     # Add linked case IDs filter if any exist
     if linked_case_ids:
         name_filters.append(ReportedCases.id.in_(linked_case_ids))
     
-    cases_query = db.query(ReportedCases).outerjoin(
-        CaseMetadata, ReportedCases.id == CaseMetadata.case_id
+    score = search_index.rank_expression(person_name).label("relevance_score")
+    cases_query = db.query(ReportedCases.id, score).outerjoin(
+        CaseSearchIndex, ReportedCases.id == CaseSearchIndex.case_id
     ).filter(
         or_(*name_filters)
     )
     
     total_cases = cases_query.count()
-    cases = cases_query.offset((page - 1) * limit).limit(limit).all()
+    ranked = cases_query.order_by(desc("relevance_score"), desc(ReportedCases.id)).offset((page - 1) * limit).limit(limit).all()
+    scores = {row.id: float(row.relevance_score or 0) for row in ranked}
+    cases = search_index.load_cases([row.id for row in ranked])
     
     # Convert to search results
     results = []
     for case in cases:
-        relevance_score = calculate_relevance_score(case, person_name)
+        relevance_score = scores.get(case.id, 0.0)
         metadata = get_case_metadata_safe(case, db)
         
         case_result = CaseSearchResult(
@@ -311,42 +303,6 @@ async def get_case_suggestions(
         "total": len(suggestions)
     }
 
-def calculate_relevance_score(case: ReportedCases, query: str) -> float:
-    """Calculate relevance score for a case based on search query"""
-    score = 0.0
-    query_lower = query.lower()
-    
-    # Title match (highest weight)
-    if case.title and query_lower in case.title.lower():
-        score += 10.0
-        # Exact match bonus
-        if case.title.lower() == query_lower:
-            score += 5.0
-    
-    # Protagonist/Antagonist match (high weight)
-    if case.protagonist and query_lower in case.protagonist.lower():
-        score += 8.0
-    if case.antagonist and query_lower in case.antagonist.lower():
-        score += 8.0
-    
-    # Judge match (medium weight)
-    if case.presiding_judge and query_lower in case.presiding_judge.lower():
-        score += 6.0
-    
-    # Lawyer match (medium weight)
-    if case.lawyers and query_lower in case.lawyers.lower():
-        score += 6.0
-    
-    # Content match (lower weight)
-    if case.case_summary and query_lower in case.case_summary.lower():
-        score += 3.0
-    if case.detail_content and query_lower in case.detail_content.lower():
-        score += 2.0
-    if case.judgement and query_lower in case.judgement.lower():
-        score += 2.0
-    
-    return score
-
 def calculate_person_stats(cases: List[ReportedCases], person_name: str) -> CaseStats:
     """Calculate statistics for a person's cases"""
     total_cases = len(cases)
@@ -418,7 +374,9 @@ async def get_case_details(
     """Get detailed information about a specific case including all metadata"""
     
     # Get the case with metadata
-    case = db.query(ReportedCases).outerjoin(
+    case = db.query(ReportedCases).options(
+        undefer_group(BODY_COLUMN_GROUP), undefer_group(AI_ANALYSIS_COLUMN_GROUP)
+    ).outerjoin(
         CaseMetadata, ReportedCases.id == CaseMetadata.case_id
     ).filter(ReportedCases.id == case_id).first()
     
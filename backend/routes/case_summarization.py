@@ -4,9 +4,9 @@ Uses local LLM to generate case summaries and outcomes
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 from database import get_db
-from models.reported_cases import ReportedCases
+from models.reported_cases import ReportedCases, BODY_COLUMN_GROUP, AI_ANALYSIS_COLUMN_GROUP
 from models.case_metadata import CaseMetadata
 from auth import get_current_user
 from typing import Dict, Any
@@ -27,7 +27,9 @@ async def summarize_case(
     """
     try:
         # Fetch case with metadata
-        case = db.query(ReportedCases).outerjoin(
+        case = db.query(ReportedCases).options(
+            undefer_group(BODY_COLUMN_GROUP), undefer_group(AI_ANALYSIS_COLUMN_GROUP)
+        ).outerjoin(
             CaseMetadata, ReportedCases.id == CaseMetadata.case_id
         ).filter(ReportedCases.id == case_id).first()
         
@@ -160,7 +162,9 @@ async def get_case_summary(
     """
     try:
         # Fetch case with metadata
-        case = db.query(ReportedCases).outerjoin(
+        case = db.query(ReportedCases).options(
+            undefer_group(BODY_COLUMN_GROUP), undefer_group(AI_ANALYSIS_COLUMN_GROUP)
+        ).outerjoin(
             CaseMetadata, ReportedCases.id == CaseMetadata.case_id
         ).filter(ReportedCases.id == case_id).first()
         
@@ -16,6 +16,7 @@ from schemas.companies import (
     CompaniesStats
 )
 from auth import get_current_user
+from services.cache_service import cached, invalidates, COMPANIES_STATS, DASHBOARD_STATS
 from models.user import User
 
 router = APIRouter()
@@ -135,6 +136,7 @@ async def get_company(
     return company
 
 @router.post("/", response_model=CompaniesResponse)
+@invalidates(COMPANIES_STATS, DASHBOARD_STATS)
 async def create_company(
     company: CompaniesCreate,
     db: Session = Depends(get_db),
@@ -148,6 +150,7 @@ async def create_company(
     return db_company
 
 @router.put("/{company_id}", response_model=CompaniesResponse)
+@invalidates(COMPANIES_STATS, DASHBOARD_STATS)
 async def update_company(
     company_id: int,
     company: CompaniesUpdate,
@@ -169,6 +172,7 @@ async def update_company(
     return db_company
 
 @router.delete("/{company_id}")
+@invalidates(COMPANIES_STATS, DASHBOARD_STATS)
 async def delete_company(
     company_id: int,
     db: Session = Depends(get_db),
@@ -185,6 +189,7 @@ async def delete_company(
     return {"message": "Company deleted successfully"}
 
 @router.get("/stats/overview", response_model=CompaniesStats)
+@cached(COMPANIES_STATS)
 async def get_companies_stats(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
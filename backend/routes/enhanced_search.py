@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc, asc, String
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import and_, or_, func, desc, asc, case as sql_case, String
 from database import get_db
 from models.reported_cases import ReportedCases
 from models.people import People
@@ -81,7 +81,13 @@ async def enhanced_search(
 async def search_cases(db: Session, query: str, court_type: Optional[str], region: Optional[str], case_type: Optional[str], limit: int) -> List[Dict]:
     """Search cases"""
     try:
-        query_obj = db.query(ReportedCases)
+        # Only the columns the result dict needs; judgement/detail_content stay in the database
+        query_obj = db.query(ReportedCases).options(load_only(
+            ReportedCases.id, ReportedCases.title, ReportedCases.suit_reference_number,
+            ReportedCases.court_type, ReportedCases.region, ReportedCases.date,
+            ReportedCases.case_summary, ReportedCases.area_of_law,
+            ReportedCases.created_at, ReportedCases.updated_at
+        ))
         
         # Apply search filters
         search_conditions = or_(
@@ -91,6 +97,7 @@ async def search_cases(db: Session, query: str, court_type: Optional[str], regio
             ReportedCases.presiding_judge.ilike(f"%{query}%")
         )
         query_obj = query_obj.filter(search_conditions)
+        relevance = case_relevance_expression(query).label("relevance_score")
         
         # Apply additional filters
         if court_type:
@@ -100,10 +107,10 @@ async def search_cases(db: Session, query: str, court_type: Optional[str], regio
         if case_type:
             query_obj = query_obj.filter(ReportedCases.area_of_law.ilike(f"%{case_type}%"))
         
-        cases = query_obj.limit(limit).all()
+        rows = query_obj.add_columns(relevance).order_by(desc("relevance_score"), ReportedCases.id).limit(limit).all()
         
         results = []
-        for case in cases:
+        for case, relevance_score in rows:
             results.append({
                 "id": case.id,
                 "type": "case",
@@ -114,7 +121,7 @@ async def search_cases(db: Session, query: str, court_type: Optional[str], regio
                 "date": case.date,
                 "case_summary": case.case_summary,
                 "area_of_law": case.area_of_law,
-                "relevance_score": calculate_relevance_score(case, query),
+                "relevance_score": float(relevance_score or 0),
                 "risk_level": "medium",  # Default risk level for cases
                 "created_at": case.created_at,
                 "updated_at": case.updated_at
@@ -254,6 +261,18 @@ async def search_insurance(db: Session, query: str, region: Optional[str], limit
         logging.error(f"Error searching insurance: {e}")
         return []
 
+def case_relevance_expression(query: str):
+    """SQL equivalent of calculate_relevance_score for case rows, so ranking happens in the database"""
+    query_lower = query.lower()
+    title = func.lower(ReportedCases.title)
+    score = (
+        sql_case((title.like(f"%{query_lower}%"), 5.0), else_=0.0)
+        + sql_case((title.like(f"{query_lower}%"), 3.0), else_=0.0)
+    )
+    for column in (ReportedCases.suit_reference_number, ReportedCases.court_type, ReportedCases.presiding_judge):
+        score = score + sql_case((func.lower(column).like(f"%{query_lower}%"), 1.0), else_=0.0)
+    return score
+
 def calculate_relevance_score(item, query: str) -> float:
     """Calculate relevance score for search results"""
     score = 0.0
@@ -17,11 +17,14 @@ from models.companies import Companies
 from models.banks import Banks
 from models.insurance import Insurance
 from services.gazette_people_sync import sync_gazette_to_people, create_person_from_gazette
+from services.pagination import paginate, InvalidCursorError
+from services.cache_service import invalidates, GAZETTE_STATS
 
 router = APIRouter(prefix="/gazette", tags=["gazette"])
 
 # Create Gazette Entry
 @router.post("/", response_model=GazetteResponse)
+@invalidates(GAZETTE_STATS)
 def create_gazette(gazette: GazetteCreate, db: Session = Depends(get_db)):
     """Create a new gazette entry"""
     db_gazette = Gazette(**gazette.dict())
@@ -75,6 +78,7 @@ def get_gazette(gazette_id: int, db: Session = Depends(get_db)):
 
 # Update Gazette Entry
 @router.put("/{gazette_id}", response_model=GazetteResponse)
+@invalidates(GAZETTE_STATS)
 def update_gazette(gazette_id: int, gazette_update: GazetteUpdate, db: Session = Depends(get_db)):
     """Update a gazette entry"""
     gazette = db.query(Gazette).filter(Gazette.id == gazette_id).first()
@@ -110,6 +114,7 @@ def update_gazette(gazette_id: int, gazette_update: GazetteUpdate, db: Session =
 
 # Delete Gazette Entry
 @router.delete("/{gazette_id}")
+@invalidates(GAZETTE_STATS)
 def delete_gazette(gazette_id: int, db: Session = Depends(get_db)):
     """Delete a gazette entry"""
     gazette = db.query(Gazette).filter(Gazette.id == gazette_id).first()
@@ -141,6 +146,9 @@ def list_gazettes(
     is_featured: Optional[bool] = Query(None),
     sort_by: str = Query("publication_date", regex="^(publication_date|created_at|title|priority)$"),
     sort_order: str = Query("desc", regex="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page (keyset pagination)"),
+    count_mode: str = Query("exact", regex="^(exact|estimated)$"),
+    known_total: Optional[int] = Query(None, ge=0, description="Total from the first page; echoed on cursor pages instead of counting again"),
     db: Session = Depends(get_db)
 ):
     """List gazette entries with search and filtering
@@ -269,27 +277,27 @@ def list_gazettes(
     if is_featured is not None:
         query = query.filter(Gazette.is_featured == is_featured)
     
-    # Apply sorting
-    if sort_order == "desc":
-        query = query.order_by(desc(getattr(Gazette, sort_by)))
-    else:
-        query = query.order_by(asc(getattr(Gazette, sort_by)))
-    
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination
-    offset = (page - 1) * limit
-    gazettes = query.offset(offset).limit(limit).all()
-    
-    total_pages = math.ceil(total / limit)
+    # Apply sorting and pagination (id breaks ties so the keyset cursor is stable)
+    try:
+        result_page = paginate(
+            query,
+            [(getattr(Gazette, sort_by), sort_order), (Gazette.id, sort_order)],
+            page=page,
+            limit=limit,
+            cursor=cursor,
+            count_mode=count_mode,
+            total=known_total
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return GazetteListResponse(
-        gazettes=gazettes,
-        total=total,
+        gazettes=result_page.items,
+        total=result_page.total,
         page=page,
         limit=limit,
-        total_pages=total_pages
+        total_pages=result_page.total_pages,
+        next_cursor=result_page.next_cursor
     )
 
 # Synchronization Endpoints
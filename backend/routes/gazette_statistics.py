@@ -36,6 +36,17 @@ async def get_statistics_by_year(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/by-jurisdiction")
+async def get_statistics_by_jurisdiction(db: Session = Depends(get_db)):
+    """Get entry counts grouped by jurisdiction"""
+    try:
+        stats_service = GazetteStatistics(db)
+        return stats_service.get_statistics_by_jurisdiction()
+    except Exception as e:
+        logger.error(f"Error getting statistics by jurisdiction: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/gazettes")
 async def get_gazette_list(
     year: Optional[int] = Query(None, description="Filter by year"),
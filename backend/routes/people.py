@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Body
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
 from sqlalchemy import and_, or_, func, desc, asc, String
 from database import get_db
 from models.people import People
@@ -20,6 +20,9 @@ import math
 import json
 import traceback
 from services.ai_service import get_openai_client, AIService
+from services.pagination import paginate, InvalidCursorError
+from services.cache_service import cached, invalidates, PEOPLE_STATS, DASHBOARD_STATS
+from services.stats_rollup_service import StatsRollupService
 
 router = APIRouter()
 
@@ -49,17 +52,22 @@ async def search_people(
     sort_order: str = Query("asc", regex="^(asc|desc)$", description="Sort order"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page (keyset pagination)"),
+    count_mode: str = Query("exact", regex="^(exact|estimated)$", description="Total count mode"),
+    known_total: Optional[int] = Query(None, ge=0, description="Total from the first page; echoed on cursor pages instead of counting again"),
     # current_user: User = Depends(get_current_user),  # Temporarily disabled for testing
     db: Session = Depends(get_db)
 ):
     """Search for people with various filters"""
     try:
-        # Build query - only join case statistics for small queries to improve performance
+        # Build query - only join case statistics for small queries to improve performance.
+        # contains_eager populates person.case_statistics from the join, so reading it
+        # below does not issue one lazy SELECT per person.
         if limit <= 20:
             query_obj = db.query(People).outerjoin(
                 PersonCaseStatistics, 
                 People.id == PersonCaseStatistics.person_id
-            )
+            ).options(contains_eager(People.case_statistics))
         else:
             query_obj = db.query(People)
         
@@ -132,24 +140,24 @@ async def search_people(
         if filters:
             query_obj = query_obj.filter(and_(*filters))
         
-        # Apply sorting
+        # Apply sorting (id breaks ties so the keyset cursor is stable)
         sort_column = getattr(People, sort_by, People.full_name)
-        if sort_order == "desc":
-            query_obj = query_obj.order_by(desc(sort_column))
-        else:
-            query_obj = query_obj.order_by(asc(sort_column))
-        
-        # Get total count
-        total = query_obj.count()
-        
-        # Apply pagination
-        offset = (page - 1) * limit
-        people = query_obj.offset(offset).limit(limit).all()
+        result_page = paginate(
+            query_obj,
+            [(sort_column, sort_order), (People.id, sort_order)],
+            page=page,
+            limit=limit,
+            cursor=cursor,
+            count_mode=count_mode,
+            total=known_total
+        )
+        people = result_page.items
+        total = result_page.total
         
         # Calculate pagination info
-        total_pages = math.ceil(total / limit)
-        has_next = page < total_pages
-        has_prev = page > 1
+        total_pages = result_page.total_pages
+        has_next = result_page.has_next
+        has_prev = result_page.has_prev
         
         # Add case statistics if available (without updating search counts for performance)
         for person in people:
@@ -202,25 +210,35 @@ async def search_people(
                 person.mixed_cases = 0
                 person.case_outcome = "N/A"
         
-        # Only commit if we're updating search counts (for single searches, not batch loads)
-        if limit <= 20:  # Only update search counts for small queries
-            for person in people:
-                if person.search_count is None:
-                    person.search_count = 0
-                person.search_count += 1
-                person.last_searched = func.now()
-            db.commit()
-        
-        return PeopleSearchResponse(
+        # Serialize before committing: commit expires the loaded rows and reading them
+        # afterwards would refresh each person with its own SELECT
+        response = PeopleSearchResponse(
             people=people,
             total=total,
             page=page,
             limit=limit,
             total_pages=total_pages,
             has_next=has_next,
-            has_prev=has_prev
+            has_prev=has_prev,
+            next_cursor=result_page.next_cursor
         )
         
+        # Only commit if we're updating search counts (for single searches, not batch loads)
+        if limit <= 20 and people:  # Only update search counts for small queries
+            # One UPDATE for the whole page instead of one per person
+            db.query(People).filter(People.id.in_([person.id for person in people])).update(
+                {
+                    People.search_count: func.coalesce(People.search_count, 0) + 1,
+                    People.last_searched: func.now()
+                },
+                synchronize_session=False
+            )
+            db.commit()
+        
+        return response
+        
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logging.error(f"Error searching people: {str(e)}")
         logging.error(f"Error type: {type(e).__name__}")
@@ -481,6 +499,7 @@ async def get_person(
         )
 
 @router.post("/", response_model=PeopleResponse)
+@invalidates(PEOPLE_STATS, DASHBOARD_STATS)
 async def create_person(
     request_data: Dict[str, Any] = Body(...),
     current_user: User = Depends(get_current_user),
@@ -724,6 +743,7 @@ async def create_person(
         )
 
 @router.put("/{people_id}", response_model=PeopleResponse)
+@invalidates(PEOPLE_STATS, DASHBOARD_STATS)
 async def update_person(
     people_id: int,
     person_data: PeopleUpdate,
@@ -796,6 +816,7 @@ async def update_person(
         )
 
 @router.delete("/{people_id}")
+@invalidates(PEOPLE_STATS, DASHBOARD_STATS)
 async def delete_person(
     people_id: int,
     current_user: User = Depends(get_current_user),
@@ -828,51 +849,27 @@ async def delete_person(
         )
 
 @router.get("/stats/overview", response_model=PeopleStats)
+@cached(PEOPLE_STATS)
 async def get_people_stats(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get people statistics overview"""
     try:
-        # Total people
-        total_people = db.query(People).filter(People.status == "active").count()
-        
-        # Verified people
-        verified_people = db.query(People).filter(
-            and_(People.status == "active", People.is_verified == True)
-        ).count()
+        # Counts of active people are pre-aggregated in stats_rollups
+        rollups = StatsRollupService(db)
+        total_people = rollups.count("people.active")
+        verified_people = rollups.count("people.verified")
+        people_with_cases = rollups.count("people.with_cases")
         
         # Risk level breakdown
-        high_risk = db.query(People).filter(
-            and_(People.status == "active", People.risk_level == "High")
-        ).count()
-        
-        medium_risk = db.query(People).filter(
-            and_(People.status == "active", People.risk_level == "Medium")
-        ).count()
-        
-        low_risk = db.query(People).filter(
-            and_(People.status == "active", People.risk_level == "Low")
-        ).count()
-        
-        # People with cases
-        people_with_cases = db.query(People).filter(
-            and_(People.status == "active", People.case_count > 0)
-        ).count()
+        risk_levels = rollups.counts("people.risk_level")
+        high_risk = risk_levels.get("High", 0)
+        medium_risk = risk_levels.get("Medium", 0)
+        low_risk = risk_levels.get("Low", 0)
         
-        # People by region
-        region_stats = db.query(
-            People.region, func.count(People.id)
-        ).filter(People.status == "active").group_by(People.region).all()
-        people_by_region = {region or "Unknown": count for region, count in region_stats}
-        
-        # People by occupation
-        occupation_stats = db.query(
-            People.occupation, func.count(People.id)
-        ).filter(
-            and_(People.status == "active", People.occupation.isnot(None))
-        ).group_by(People.occupation).all()
-        people_by_occupation = {occupation: count for occupation, count in occupation_stats}
+        people_by_region = rollups.counts("people.region")
+        people_by_occupation = rollups.counts("people.occupation")
         
         # Recent searches (last 24 hours)
         recent_searches = db.query(People).filter(
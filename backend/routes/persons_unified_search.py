@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc, asc, String, text
+from sqlalchemy import and_, or_, func, desc, asc, String, Integer, text, case, literal, select, union_all
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import math
@@ -62,11 +62,143 @@ class UnifiedSearchResponse(BaseModel):
     limit: int
     total_pages: int
 
+def _name_match(column, search_lower: str, whole_word: bool):
+    """Case-insensitive phrase or whole-word match on a name column.
+
+    The LIKE prefilter is served by the pg_trgm GIN indexes from
+    migrations/add_persons_search_trgm_indexes.sql; the word-boundary regex only
+    runs on the rows that survive it.
+    """
+    lowered = func.lower(column)
+    contains = lowered.like(f"%{search_lower}%")
+    if not whole_word:
+        return contains
+    return and_(contains, lowered.op('~*')(f'\\y{re.escape(search_lower)}\\y'))
+
+def _split_aliases(alias_name: Optional[str]) -> List[str]:
+    return [alias.strip() for alias in alias_name.split(",") if alias.strip()] if alias_name else []
+
+def _change_of_name_result(entry: ChangeOfName, match_type: str, search_lower: str, whole_word: bool) -> Dict[str, Any]:
+    alias_names = _split_aliases(entry.alias_name)
+    if match_type == "current_name":
+        name = entry.new_name
+    elif match_type == "old_name":
+        name = entry.old_name
+    else:
+        # Display the first alias that matches (exact phrase for multi-word, whole word for single word)
+        word_pattern = re.compile(r'\b' + re.escape(search_lower) + r'\b', re.IGNORECASE)
+        name = next(
+            (alias for alias in alias_names
+             if (word_pattern.search(alias) if whole_word else search_lower in alias.lower())),
+            entry.alias_name
+        )
+    return {
+        "id": entry.id,
+        "source_type": "change_of_name",
+        "data_source": "Change of Name",
+        "name": name or "",
+        "current_name": entry.new_name,  # new_name is the current name
+        "old_name": entry.old_name,
+        "alias_names": alias_names,
+        "profession": entry.profession,
+        "gazette_number": str(entry.gazette_number) if entry.gazette_number is not None else None,
+        "gazette_date": entry.gazette_date,
+        "page_number": entry.page_number,
+        "match_type": match_type
+    }
+
+def _place_of_birth_result(entry: CorrectionOfPlaceOfBirth) -> Dict[str, Any]:
+    return {
+        "id": entry.id,
+        "source_type": "correction_of_place_of_birth",
+        "data_source": "Correction of Place of Birth",
+        "name": entry.person_name or "",
+        "person_name": entry.person_name,
+        "old_place_of_birth": entry.old_place_of_birth,
+        "new_place_of_birth": entry.new_place_of_birth,
+        "effective_date": entry.effective_date,
+        "gazette_number": str(entry.gazette_number) if entry.gazette_number is not None else None,
+        "gazette_date": entry.gazette_date,
+        "page_number": entry.page,  # CorrectionOfPlaceOfBirth uses 'page'
+    }
+
+def _date_of_birth_result(entry: CorrectionOfDateOfBirth) -> Dict[str, Any]:
+    return {
+        "id": entry.id,
+        "source_type": "correction_of_date_of_birth",
+        "data_source": "Correction of Date of Birth",
+        "name": entry.person_name or "",
+        "person_name": entry.person_name,
+        "old_date_of_birth": entry.old_date_of_birth,
+        "new_date_of_birth": entry.new_date_of_birth,
+        "effective_date": entry.effective_date,
+        "gazette_number": str(entry.gazette_number) if entry.gazette_number is not None else None,
+        "gazette_date": entry.gazette_date,
+        "page_number": entry.page,  # CorrectionOfDateOfBirth uses 'page'
+    }
+
+def _marriage_officer_result(entry: MarriageOfficer) -> Dict[str, Any]:
+    return {
+        "id": entry.id,
+        "source_type": "marriage_officer",
+        "data_source": "Marriage Officer",
+        "name": entry.officer_name or "",
+        "officer_name": entry.officer_name,
+        "church": entry.church,
+        "location": entry.location,
+        "region": entry.region,
+        "appointing_authority": entry.appointing_authority,
+        "gazette_number": str(entry.gazette_number) if entry.gazette_number is not None else None,
+        "gazette_date": entry.gazette_date,
+    }
+
+# Match ranks: current_name matches first, then old_name, then alias, then other sources
+MATCH_TYPES_BY_RANK = {0: "current_name", 1: "old_name", 2: "alias"}
+OTHER_SOURCE_RANK = 3
+
+def build_persons_search_union(search_lower: str, whole_word: bool):
+    """One UNION ALL over all person-notice tables yielding (source_type, id, name, match_rank).
+
+    Each change_of_name entry appears once, ranked by its best matching field, so
+    de-duplication happens inside the query rather than in Python.
+    """
+    new_name_match = _name_match(ChangeOfName.new_name, search_lower, whole_word)
+    old_name_match = _name_match(ChangeOfName.old_name, search_lower, whole_word)
+    alias_match = and_(
+        ChangeOfName.alias_name.isnot(None),
+        _name_match(ChangeOfName.alias_name, search_lower, whole_word)
+    )
+    change_of_name_select = select(
+        literal("change_of_name", String).label("source_type"),
+        ChangeOfName.id.label("id"),
+        func.coalesce(case(
+            (new_name_match, ChangeOfName.new_name),
+            (old_name_match, ChangeOfName.old_name),
+            else_=ChangeOfName.alias_name
+        ), "").label("name"),
+        case((new_name_match, 0), (old_name_match, 1), else_=2).label("match_rank")
+    ).where(or_(new_name_match, old_name_match, alias_match))
+
+    other_selects = [
+        select(
+            literal(source_type, String).label("source_type"),
+            model.id.label("id"),
+            func.coalesce(name_column, "").label("name"),
+            literal(OTHER_SOURCE_RANK, Integer).label("match_rank")
+        ).where(_name_match(name_column, search_lower, whole_word))
+        for source_type, model, name_column in (
+            ("correction_of_place_of_birth", CorrectionOfPlaceOfBirth, CorrectionOfPlaceOfBirth.person_name),
+            ("correction_of_date_of_birth", CorrectionOfDateOfBirth, CorrectionOfDateOfBirth.person_name),
+            ("marriage_officer", MarriageOfficer, MarriageOfficer.officer_name),
+        )
+    ]
+    return union_all(change_of_name_select, *other_selects).subquery("persons_search")
+
 @router.get("/", response_model=UnifiedSearchResponse)
 async def unified_persons_search(
     query: str = Query(..., min_length=1, description="Search query (name)"),
     page: int = Query(1, ge=1, description="Page number"),
-    limit: int = Query(100, ge=1, description="Items per page"),
+    limit: int = Query(100, ge=1, le=1000, description="Items per page"),
     db: Session = Depends(get_db)
 ):
     """Unified search across change_of_name, correction_of_place_of_birth, correction_of_date_of_birth, and marriage_officers tables"""
@@ -77,241 +209,49 @@ async def unified_persons_search(
         
         # If multiple words, search for exact phrase only
         # If single word, search for that word with word boundaries (whole word match)
-        if len(words) > 1:
-            # Multiple words: search for exact phrase "Thomas Appiah"
-            search_terms = [f"%{search_lower}%"]
-            use_regex = False
-        else:
-            # Single word: search for whole word only (word boundary match)
-            # Escape special regex characters in the search term
-            escaped_word = re.escape(search_lower)
-            search_terms = [escaped_word]
-            use_regex = True
-        
-        all_results: List[Dict[str, Any]] = []
-        
-        # 1. Search change_of_name table
-        change_of_name_query = db.query(ChangeOfName)
-        
-        # Search in new_name (current name)
-        if use_regex:
-            word = search_terms[0]
-            new_name_match = func.lower(ChangeOfName.new_name).op('~*')(f'\\y{word}\\y')
-        else:
-            new_name_conditions = [func.lower(ChangeOfName.new_name).like(term) for term in search_terms]
-            new_name_match = or_(*new_name_conditions) if new_name_conditions else None
+        whole_word = len(words) <= 1
         
-        # Search in old_name
-        if use_regex:
-            word = search_terms[0]
-            old_name_match = func.lower(ChangeOfName.old_name).op('~*')(f'\\y{word}\\y')
-        else:
-            old_name_conditions = [func.lower(ChangeOfName.old_name).like(term) for term in search_terms]
-            old_name_match = or_(*old_name_conditions) if old_name_conditions else None
+        # Ranking, de-duplication and pagination are all done by the database;
+        # only the requested page is loaded into the worker
+        matches = build_persons_search_union(search_lower, whole_word)
+        total = db.query(func.count()).select_from(matches).scalar() or 0
+        page_rows = db.execute(
+            select(matches.c.source_type, matches.c.id, matches.c.match_rank)
+            .order_by(matches.c.match_rank, func.lower(matches.c.name), matches.c.source_type, matches.c.id)
+            .offset((page - 1) * limit)
+            .limit(limit)
+        ).all()
         
-        # Search in alias_name (comma-separated text, can contain multiple names)
-        # For alias, we always use regex if use_regex is true, otherwise like
-        if use_regex:
-            word = search_terms[0]
-            alias_match = and_(
-                ChangeOfName.alias_name.isnot(None),
-                func.lower(ChangeOfName.alias_name).op('~*')(f'\\y{word}\\y')
-            )
-        else:
-            alias_conditions = [func.lower(ChangeOfName.alias_name).like(term) for term in search_terms]
-            alias_match = and_(
-                ChangeOfName.alias_name.isnot(None),
-                or_(*alias_conditions) if alias_conditions else None
-            )
+        # Hydrate the page with one IN query per source table
+        ids_by_source: Dict[str, List[int]] = {}
+        for row in page_rows:
+            ids_by_source.setdefault(row.source_type, []).append(row.id)
         
-        # Get new name matches (current name)
-        new_name_results = change_of_name_query.filter(new_name_match).all()
-        for entry in new_name_results:
-            all_results.append({
-                "id": entry.id,
-                "source_type": "change_of_name",
-                "data_source": "Change of Name",
-                "name": entry.new_name or "",
-                "current_name": entry.new_name,  # new_name is the current name
-                "old_name": entry.old_name,
-                "alias_names": [alias.strip() for alias in entry.alias_name.split(",") if alias.strip()] if entry.alias_name else [],  # Split comma-separated aliases
-                "profession": entry.profession,
-                "gazette_number": str(entry.gazette_number) if entry.gazette_number is not None else None,
-                "gazette_date": entry.gazette_date,
-                "page_number": entry.page_number,
-                "match_type": "current_name"
-            })
-        
-        # Get old name matches
-        old_name_results = change_of_name_query.filter(old_name_match).all()
-        for entry in old_name_results:
-            # Skip if already added as current_name match
-            if not any(r["id"] == entry.id and r["match_type"] == "current_name" for r in all_results):
-                all_results.append({
-                    "id": entry.id,
-                    "source_type": "change_of_name",
-                    "data_source": "Change of Name",
-                    "name": entry.old_name or "",
-                    "current_name": entry.new_name,
-                    "old_name": entry.old_name,
-                    "alias_names": [alias.strip() for alias in entry.alias_name.split(",") if alias.strip()] if entry.alias_name else [],
-                    "profession": entry.profession,
-                    "gazette_number": entry.gazette_number,
-                    "gazette_date": entry.gazette_date,
-                    "page_number": entry.page_number,
-                    "match_type": "old_name"
-                })
-        
-        # Get alias matches
-        alias_results = change_of_name_query.filter(alias_match).all()
-        for entry in alias_results:
-            # Check if this alias matches the search query
-            alias_names_str = entry.alias_name or ""
-            alias_names = [alias.strip() for alias in alias_names_str.split(",") if alias.strip()]
-            # Match if the search query (exact phrase or single word) appears in any alias
-            matching_aliases = []
-            for alias in alias_names:
-                alias_lower = alias.lower()
-                # Check if search query matches (exact phrase for multi-word, whole word for single word)
-                if use_regex:
-                    # Use word boundary matching for single-word queries
-                    word_pattern = re.compile(r'\b' + re.escape(search_lower) + r'\b', re.IGNORECASE)
-                    if word_pattern.search(alias_lower):
-                        matching_aliases.append(alias)
-                else:
-                    # Use exact phrase matching for multi-word queries
-                    if search_lower in alias_lower:
-                        matching_aliases.append(alias)
-            
-            for alias in matching_aliases:
-                # Skip if already added
-                if not any(r["id"] == entry.id and r["match_type"] in ["current_name", "old_name"] for r in all_results):
-                    all_results.append({
-                        "id": entry.id,
-                        "source_type": "change_of_name",
-                        "data_source": "Change of Name",
-                        "name": alias,
-                        "current_name": entry.new_name,
-                        "old_name": entry.old_name,
-                        "alias_names": alias_names,
-                        "profession": entry.profession,
-                        "gazette_number": entry.gazette_number,
-                        "gazette_date": entry.gazette_date,
-                        "page_number": entry.page_number,
-                        "match_type": "alias"
-                    })
+        source_models = {
+            "change_of_name": ChangeOfName,
+            "correction_of_place_of_birth": CorrectionOfPlaceOfBirth,
+            "correction_of_date_of_birth": CorrectionOfDateOfBirth,
+            "marriage_officer": MarriageOfficer,
+        }
+        entries: Dict[str, Dict[int, Any]] = {}
+        for source_type, ids in ids_by_source.items():
+            model = source_models[source_type]
+            entries[source_type] = {entry.id: entry for entry in db.query(model).filter(model.id.in_(ids)).all()}
         
-        # 2. Search correction_of_place_of_birth
-        if use_regex:
-            word = search_terms[0]
-            place_of_birth_query = db.query(CorrectionOfPlaceOfBirth).filter(
-                func.lower(CorrectionOfPlaceOfBirth.person_name).op('~*')(f'\\y{word}\\y')
-            )
-        else:
-            place_of_birth_conditions = [CorrectionOfPlaceOfBirth.person_name.ilike(term) for term in search_terms]
-            place_of_birth_query = db.query(CorrectionOfPlaceOfBirth).filter(
-                or_(*place_of_birth_conditions) if place_of_birth_conditions else None
-            )
-        place_of_birth_results = place_of_birth_query.all()
-        for entry in place_of_birth_results:
-            all_results.append({
-                "id": entry.id,
-                "source_type": "correction_of_place_of_birth",
-                "data_source": "Correction of Place of Birth",
-                "name": entry.person_name or "",
-                "person_name": entry.person_name,
-                "old_place_of_birth": entry.old_place_of_birth,
-                "new_place_of_birth": entry.new_place_of_birth,
-                "effective_date": entry.effective_date,
-                "gazette_number": str(entry.gazette_number) if entry.gazette_number is not None else None,
-                "gazette_date": entry.gazette_date,
-                "page_number": entry.page,  # CorrectionOfPlaceOfBirth uses 'page'
-            })
-        
-        # 3. Search correction_of_date_of_birth
-        if use_regex:
-            word = search_terms[0]
-            date_of_birth_query = db.query(CorrectionOfDateOfBirth).filter(
-                func.lower(CorrectionOfDateOfBirth.person_name).op('~*')(f'\\y{word}\\y')
-            )
-        else:
-            date_of_birth_conditions = [CorrectionOfDateOfBirth.person_name.ilike(term) for term in search_terms]
-            date_of_birth_query = db.query(CorrectionOfDateOfBirth).filter(
-                or_(*date_of_birth_conditions) if date_of_birth_conditions else None
-            )
-        date_of_birth_results = date_of_birth_query.all()
-        for entry in date_of_birth_results:
-            all_results.append({
-                "id": entry.id,
-                "source_type": "correction_of_date_of_birth",
-                "data_source": "Correction of Date of Birth",
-                "name": entry.person_name or "",
-                "person_name": entry.person_name,
-                "old_date_of_birth": entry.old_date_of_birth,
-                "new_date_of_birth": entry.new_date_of_birth,
-                "effective_date": entry.effective_date,
-                "gazette_number": str(entry.gazette_number) if entry.gazette_number is not None else None,
-                "gazette_date": entry.gazette_date,
-                "page_number": entry.page,  # CorrectionOfDateOfBirth uses 'page'
-            })
-        
-        # 4. Search marriage_officers
-        if use_regex:
-            word = search_terms[0]
-            marriage_officer_query = db.query(MarriageOfficer).filter(
-                func.lower(MarriageOfficer.officer_name).op('~*')(f'\\y{word}\\y')
-            )
-        else:
-            marriage_officer_conditions = [MarriageOfficer.officer_name.ilike(term) for term in search_terms]
-            marriage_officer_query = db.query(MarriageOfficer).filter(
-                or_(*marriage_officer_conditions) if marriage_officer_conditions else None
-            )
-        marriage_officer_results = marriage_officer_query.all()
-        for entry in marriage_officer_results:
-            all_results.append({
-                "id": entry.id,
-                "source_type": "marriage_officer",
-                "data_source": "Marriage Officer",
-                "name": entry.officer_name or "",
-                "officer_name": entry.officer_name,
-                "church": entry.church,
-                "location": entry.location,
-                "region": entry.region,
-                "appointing_authority": entry.appointing_authority,
-                "gazette_number": str(entry.gazette_number) if entry.gazette_number is not None else None,
-                "gazette_date": entry.gazette_date,
-            })
-        
-        # Remove duplicates (keep first occurrence)
-        seen = set()
-        unique_results = []
-        for result in all_results:
-            key = (result["source_type"], result["id"], result.get("match_type"))
-            if key not in seen:
-                seen.add(key)
-                unique_results.append(result)
-        
-        # Sort results (prefer current_name matches, then old_name, then alias, then others)
-        def sort_key(result):
-            if result.get("match_type") == "current_name":
-                return (0, result["name"])
-            elif result.get("match_type") == "old_name":
-                return (1, result["name"])
-            elif result.get("match_type") == "alias":
-                return (2, result["name"])
-            else:
-                return (3, result["name"])
-        
-        unique_results.sort(key=sort_key)
-        
-        # Return ALL results - no pagination limit
-        # The user wants all results from all categories, so we fetch everything
-        # The progress bar on the frontend will handle the wait time
-        total = len(unique_results)
-        
-        # Convert to response models (all results, no pagination)
         response_results = []
-        for result in unique_results:
+        for row in page_rows:
+            entry = entries.get(row.source_type, {}).get(row.id)
+            if entry is None:
+                continue
+            if row.source_type == "change_of_name":
+                result = _change_of_name_result(entry, MATCH_TYPES_BY_RANK[row.match_rank], search_lower, whole_word)
+            elif row.source_type == "correction_of_place_of_birth":
+                result = _place_of_birth_result(entry)
+            elif row.source_type == "correction_of_date_of_birth":
+                result = _date_of_birth_result(entry)
+            else:
+                result = _marriage_officer_result(entry)
+            
             # Normalize empty date strings to None to satisfy Pydantic datetime parsing
             for field in ("gazette_date", "effective_date", "old_date_of_birth", "new_date_of_birth"):
                 if result.get(field) == "":
@@ -321,9 +261,9 @@ async def unified_persons_search(
         return UnifiedSearchResponse(
             results=response_results,
             total=total,
-            page=1,  # Always return page 1 since we're returning all results
-            limit=total,  # Return all results
-            total_pages=1  # Single page with all results
+            page=page,
+            limit=limit,
+            total_pages=math.ceil(total / limit)
         )
         
     except Exception as e:
@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 from sqlalchemy import or_, and_, desc, asc
 from typing import Optional
 import math
 
 from database import get_db
-from models.reported_cases import ReportedCases
+from models.reported_cases import ReportedCases, BODY_COLUMN_GROUP, AI_ANALYSIS_COLUMN_GROUP, list_columns_option
 from schemas.reported_cases import (
     ReportedCaseSearchRequest, 
     ReportedCaseSearchResponse, 
@@ -15,6 +15,8 @@ from schemas.reported_cases import (
     ReportedCaseUpdate
 )
 from auth import get_current_user, get_optional_user
+from services.cache_service import invalidates, CASE_STATS, DASHBOARD_STATS
+from services.case_entity_linker import queue_case_links
 
 router = APIRouter()
 
@@ -35,7 +37,7 @@ async def search_cases(
     """Search reported cases with filters and pagination"""
     
     # Build query
-    db_query = db.query(ReportedCases)
+    db_query = db.query(ReportedCases).options(list_columns_option())
     
     # Apply filters
     if query:
@@ -105,7 +107,9 @@ async def get_case_detail(
 ):
     """Get detailed information about a specific case"""
     
-    case = db.query(ReportedCases).filter(ReportedCases.id == case_id).first()
+    case = db.query(ReportedCases).options(
+        undefer_group(BODY_COLUMN_GROUP), undefer_group(AI_ANALYSIS_COLUMN_GROUP)
+    ).filter(ReportedCases.id == case_id).first()
     
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
@@ -153,7 +157,7 @@ async def get_recent_cases(
     try:
         # Temporarily show all cases (no published filter) for admin panel access
         # TODO: Re-enable authentication and add proper admin check
-        db_query = db.query(ReportedCases)
+        db_query = db.query(ReportedCases).options(list_columns_option())
         
         # Apply search filter
         if query:
@@ -260,6 +264,7 @@ async def get_case_stats(
     }
 
 @router.post("/", response_model=ReportedCaseResponse)
+@invalidates(CASE_STATS, DASHBOARD_STATS)
 async def create_case(
     case_data: ReportedCaseCreate,
     db: Session = Depends(get_db),
@@ -277,12 +282,15 @@ async def create_case(
     )
     
     db.add(db_case)
+    db.flush()
+    queue_case_links(db, [db_case.id])
     db.commit()
     db.refresh(db_case)
     
     return db_case
 
 @router.put("/{case_id}", response_model=ReportedCaseResponse)
+@invalidates(CASE_STATS, DASHBOARD_STATS)
 async def update_case(
     case_id: int,
     case_data: ReportedCaseUpdate,
@@ -303,6 +311,7 @@ async def update_case(
         setattr(case, field, value)
     
     case.updated_by = current_user.email or current_user.username
+    queue_case_links(db, [case_id])
     
     db.commit()
     db.refresh(case)
@@ -310,6 +319,7 @@ async def update_case(
     return case
 
 @router.delete("/{case_id}")
+@invalidates(CASE_STATS, DASHBOARD_STATS)
 async def delete_case(
     case_id: int,
     db: Session = Depends(get_db),
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import and_, or_, func, desc, asc, String
 from database import get_db
 from models.people import People
@@ -24,9 +24,110 @@ import logging
 import math
 import time
 from services.usage_tracking_service import UsageTrackingService
+from services.search_index_service import SearchIndexService
 
 router = APIRouter()
 
+def _person_result(person: People) -> SearchResultItem:
+    # Add case statistics if available (same logic as people search endpoint)
+    if hasattr(person, 'case_statistics') and person.case_statistics:
+        stats = person.case_statistics
+        total_cases = stats.total_cases
+        resolved_cases = stats.resolved_cases
+        unresolved_cases = stats.unresolved_cases
+        case_outcome = stats.case_outcome
+    else:
+        # Default values if no statistics available
+        total_cases = 0
+        resolved_cases = 0
+        unresolved_cases = 0
+        case_outcome = "N/A"
+    
+    return SearchResultItem(
+        id=person.id,
+        name=person.full_name,
+        type="people",
+        description=f"{person.risk_level} Risk • {person.case_count} cases",
+        city=person.city,
+        region=person.region,
+        additional_info={
+            "risk_level": person.risk_level,
+            "case_count": person.case_count,
+            "total_cases": total_cases,
+            "resolved_cases": resolved_cases,
+            "unresolved_cases": unresolved_cases,
+            "case_outcome": case_outcome,
+            "phone": person.phone_number,
+            "email": person.email
+        }
+    )
+
+def _bank_result(bank: Banks) -> SearchResultItem:
+    return SearchResultItem(
+        id=bank.id,
+        name=bank.name,
+        type="banks",
+        description=f"{bank.bank_type} • {bank.city}, {bank.region}",
+        city=bank.city,
+        region=bank.region,
+        logo_url=bank.logo_url,
+        additional_info={
+            "bank_type": bank.bank_type,
+            "rating": bank.rating,
+            "phone": bank.phone,
+            "website": bank.website,
+            "has_mobile_app": bank.has_mobile_app,
+            "has_online_banking": bank.has_online_banking
+        }
+    )
+
+def _insurance_result(insurance: Insurance) -> SearchResultItem:
+    return SearchResultItem(
+        id=insurance.id,
+        name=insurance.name,
+        type="insurance",
+        description=f"{insurance.insurance_type} • {insurance.city}, {insurance.region}",
+        city=insurance.city,
+        region=insurance.region,
+        logo_url=insurance.logo_url,
+        additional_info={
+            "insurance_type": insurance.insurance_type,
+            "rating": insurance.rating,
+            "phone": insurance.phone,
+            "website": insurance.website,
+            "has_mobile_app": insurance.has_mobile_app,
+            "has_online_portal": insurance.has_online_portal
+        }
+    )
+
+def _company_result(company: Companies) -> SearchResultItem:
+    return SearchResultItem(
+        id=company.id,
+        name=company.name,
+        type="companies",
+        description=f"{company.company_type} • {company.industry} • {company.city}, {company.region}",
+        city=company.city,
+        region=company.region,
+        logo_url=company.logo_url,
+        additional_info={
+            "company_type": company.company_type,
+            "industry": company.industry,
+            "registration_number": company.registration_number,
+            "phone": company.phone,
+            "website": company.website,
+            "employee_count": company.employee_count,
+            "annual_revenue": company.annual_revenue
+        }
+    )
+
+# entity_type -> (model, result builder)
+UNIFIED_SEARCH_TYPES = {
+    "people": (People, _person_result),
+    "banks": (Banks, _bank_result),
+    "insurance": (Insurance, _insurance_result),
+    "companies": (Companies, _company_result),
+}
+
 @router.get("/unified", response_model=UnifiedSearchResponse)
 async def unified_search(
     query: Optional[str] = Query(None, description="General search query"),
@@ -39,192 +140,38 @@ async def unified_search(
     """Unified search across people, banks, and insurance"""
     
     start_time = time.time()
-    results = []
-    people_results = []
-    banks_results = []
-    insurance_results = []
-    
-    # Search people
-    if search_type in ["all", "people"]:
-        people_query = db.query(People).filter(People.is_verified == True)
-        if query:
-            search_term = f"%{query.lower()}%"
-            people_query = people_query.filter(
-                or_(
-                    func.lower(People.full_name).like(search_term),
-                    func.lower(People.first_name).like(search_term),
-                    func.lower(People.last_name).like(search_term),
-                    func.lower(People.id_number).like(search_term),
-                    func.lower(People.phone_number).like(search_term),
-                    func.lower(People.email).like(search_term),
-                    func.lower(People.address).like(search_term),
-                    func.lower(People.city).like(search_term),
-                    func.lower(People.region).like(search_term),
-                    # Search in previous_names (alias names) JSON array
-                    func.cast(People.previous_names, String).ilike(search_term)
-                )
-            )
-        
-        people_results = people_query.all()
-        
-        # Add to unified results with case statistics
-        for person in people_results:
-            # Add case statistics if available (same logic as people search endpoint)
-            if hasattr(person, 'case_statistics') and person.case_statistics:
-                stats = person.case_statistics
-                total_cases = stats.total_cases
-                resolved_cases = stats.resolved_cases
-                unresolved_cases = stats.unresolved_cases
-                case_outcome = stats.case_outcome
-            else:
-                # Default values if no statistics available
-                total_cases = 0
-                resolved_cases = 0
-                unresolved_cases = 0
-                case_outcome = "N/A"
-            
-            results.append(SearchResultItem(
-                id=person.id,
-                name=person.full_name,
-                type="people",
-                description=f"{person.risk_level} Risk • {person.case_count} cases",
-                city=person.city,
-                region=person.region,
-                additional_info={
-                    "risk_level": person.risk_level,
-                    "case_count": person.case_count,
-                    "total_cases": total_cases,
-                    "resolved_cases": resolved_cases,
-                    "unresolved_cases": unresolved_cases,
-                    "case_outcome": case_outcome,
-                    "phone": person.phone_number,
-                    "email": person.email
-                }
-            ))
-    
-    # Search banks
-    if search_type in ["all", "banks"]:
-        banks_query = db.query(Banks).filter(Banks.is_active == True)
-        if query:
-            search_term = f"%{query.lower()}%"
-            banks_query = banks_query.filter(
-                or_(
-                    func.lower(Banks.name).like(search_term),
-                    func.lower(Banks.short_name).like(search_term),
-                    func.lower(Banks.bank_code).like(search_term),
-                    func.lower(Banks.city).like(search_term),
-                    func.lower(Banks.region).like(search_term),
-                    func.lower(Banks.description).like(search_term)
-                )
-            )
-        
-        banks_results = banks_query.all()
-        
-        # Add to unified results
-        for bank in banks_results:
-            results.append(SearchResultItem(
-                id=bank.id,
-                name=bank.name,
-                type="banks",
-                description=f"{bank.bank_type} • {bank.city}, {bank.region}",
-                city=bank.city,
-                region=bank.region,
-                logo_url=bank.logo_url,
-                additional_info={
-                    "bank_type": bank.bank_type,
-                    "rating": bank.rating,
-                    "phone": bank.phone,
-                    "website": bank.website,
-                    "has_mobile_app": bank.has_mobile_app,
-                    "has_online_banking": bank.has_online_banking
-                }
-            ))
-    
-    # Search insurance
-    if search_type in ["all", "insurance"]:
-        insurance_query = db.query(Insurance).filter(Insurance.is_active == True)
-        if query:
-            search_term = f"%{query.lower()}%"
-            insurance_query = insurance_query.filter(
-                or_(
-                    func.lower(Insurance.name).like(search_term),
-                    func.lower(Insurance.short_name).like(search_term),
-                    func.lower(Insurance.license_number).like(search_term),
-                    func.lower(Insurance.city).like(search_term),
-                    func.lower(Insurance.region).like(search_term),
-                    func.lower(Insurance.description).like(search_term)
-                )
-            )
-        
-        insurance_results = insurance_query.all()
-        
-        # Add to unified results
-        for insurance in insurance_results:
-            results.append(SearchResultItem(
-                id=insurance.id,
-                name=insurance.name,
-                type="insurance",
-                description=f"{insurance.insurance_type} • {insurance.city}, {insurance.region}",
-                city=insurance.city,
-                region=insurance.region,
-                logo_url=insurance.logo_url,
-                additional_info={
-                    "insurance_type": insurance.insurance_type,
-                    "rating": insurance.rating,
-                    "phone": insurance.phone,
-                    "website": insurance.website,
-                    "has_mobile_app": insurance.has_mobile_app,
-                    "has_online_portal": insurance.has_online_portal
-                }
-            ))
-    
-    # Search companies
-    if search_type in ["all", "companies"]:
-        companies_query = db.query(Companies).filter(Companies.is_active == True)
-        if query:
-            search_term = f"%{query.lower()}%"
-            companies_query = companies_query.filter(
-                or_(
-                    func.lower(Companies.name).like(search_term),
-                    func.lower(Companies.short_name).like(search_term),
-                    func.lower(Companies.registration_number).like(search_term),
-                    func.lower(Companies.city).like(search_term),
-                    func.lower(Companies.region).like(search_term),
-                    func.lower(Companies.industry).like(search_term),
-                    func.lower(Companies.description).like(search_term)
-                )
-            )
-        
-        companies_results = companies_query.all()
-        
-        # Add to unified results
-        for company in companies_results:
-            results.append(SearchResultItem(
-                id=company.id,
-                name=company.name,
-                type="companies",
-                description=f"{company.company_type} • {company.industry} • {company.city}, {company.region}",
-                city=company.city,
-                region=company.region,
-                logo_url=company.logo_url,
-                additional_info={
-                    "company_type": company.company_type,
-                    "industry": company.industry,
-                    "registration_number": company.registration_number,
-                    "phone": company.phone,
-                    "website": company.website,
-                    "employee_count": company.employee_count,
-                    "annual_revenue": company.annual_revenue
-                }
-            ))
-    
-    # Calculate total results
-    total_results = len(results)
-    
-    # Apply pagination to unified results
-    start_idx = (page - 1) * limit
-    end_idx = start_idx + limit
-    paginated_results = results[start_idx:end_idx]
+    entity_types = list(UNIFIED_SEARCH_TYPES.keys()) if search_type == "all" else [search_type]
+    entity_types = [t for t in entity_types if t in UNIFIED_SEARCH_TYPES]
+    
+    # Relevance ranking, cross-type merging and the page window are all evaluated
+    # in one query over search_documents; per-type totals come from one GROUP BY.
+    search_index = SearchIndexService(db)
+    type_counts = search_index.count_by_type(query, entity_types) if entity_types else {}
+    total_results = sum(type_counts.values())
+    ranked = search_index.search(query, entity_types, limit=limit, offset=(page - 1) * limit) if entity_types else []
+    
+    # Hydrate only the rows on this page: one IN query per entity type present
+    ids_by_type: Dict[str, List[int]] = {}
+    for entity_type, entity_id, _ in ranked:
+        ids_by_type.setdefault(entity_type, []).append(entity_id)
+    
+    entities: Dict[str, Dict[int, Any]] = {}
+    for entity_type, ids in ids_by_type.items():
+        model = UNIFIED_SEARCH_TYPES[entity_type][0]
+        entity_query = db.query(model).filter(model.id.in_(ids))
+        if model is People:
+            # Case statistics for the whole page in one extra SELECT instead of one per person
+            entity_query = entity_query.options(selectinload(People.case_statistics))
+        entities[entity_type] = {row.id: row for row in entity_query.all()}
+    
+    paginated_results = []
+    page_entities: Dict[str, List[Any]] = {entity_type: [] for entity_type in UNIFIED_SEARCH_TYPES}
+    for entity_type, entity_id, _ in ranked:
+        entity = entities.get(entity_type, {}).get(entity_id)
+        if entity is None:
+            continue  # Document refers to a row deleted since indexing
+        page_entities[entity_type].append(entity)
+        paginated_results.append(UNIFIED_SEARCH_TYPES[entity_type][1](entity))
     
     # Calculate pagination info
     total_pages = math.ceil(total_results / limit)
@@ -250,9 +197,10 @@ async def unified_search(
     
     return UnifiedSearchResponse(
         results=paginated_results,
-        people=people_results if search_type in ["all", "people"] else None,
-        banks=banks_results if search_type in ["all", "banks"] else None,
-        insurance=insurance_results if search_type in ["all", "insurance"] else None,
+        people=page_entities["people"] if search_type in ["all", "people"] else None,
+        banks=page_entities["banks"] if search_type in ["all", "banks"] else None,
+        insurance=page_entities["insurance"] if search_type in ["all", "insurance"] else None,
+        type_counts=type_counts,
         total=total_results,
         page=page,
         limit=limit,
@@ -330,6 +330,7 @@ class CaseListResponse(BaseModel):
     page: int
     limit: int
     total_pages: int
+    next_cursor: Optional[str] = None
 
 # Settings Management CRUD Schemas
 class SettingsResponse(BaseModel):
@@ -38,6 +38,7 @@ class ChatMessageResponse(BaseModel):
 
 class CaseSummaryRequest(BaseModel):
     case_id: int = Field(..., description="Case ID to generate summary for")
+    refresh: bool = Field(False, description="Bypass the cached summary and generate a new one")
 
 class CaseSummaryResponse(BaseModel):
     success: bool
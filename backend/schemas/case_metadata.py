@@ -107,6 +107,7 @@ class CaseSearchResponse(BaseModel):
     has_prev: bool
     search_time_ms: float
     query: str
+    next_cursor: Optional[str] = None
 
 class CaseStats(BaseModel):
     total_cases: int
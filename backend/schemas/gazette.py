@@ -152,6 +152,7 @@ class GazetteListResponse(BaseModel):
     page: int
     limit: int
     total_pages: int
+    next_cursor: Optional[str] = None
 
 # Gazette Search Schema
 class GazetteSearch(BaseModel):
@@ -185,6 +185,7 @@ class PeopleSearchResponse(BaseModel):
     total_pages: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
 
 class PeopleStats(BaseModel):
     total_people: int
@@ -89,8 +89,40 @@ class ReportedCaseSearchRequest(BaseModel):
     sort_by: str = Field("date", description="Sort by field")
     sort_order: str = Field("desc", pattern="^(asc|desc)$", description="Sort order")
 
+class ReportedCaseListItem(BaseModel):
+    """Display columns only (models.reported_cases.LIST_COLUMNS); bodies come from the detail endpoint"""
+    id: int
+    title: Optional[str] = None
+    suit_reference_number: Optional[str] = None
+    date: Optional[datetime] = None
+    presiding_judge: Optional[str] = None
+    town: Optional[str] = None
+    region: Optional[str] = None
+    year: Optional[str] = None
+    type: Optional[str] = None
+    antagonist: Optional[str] = None
+    protagonist: Optional[str] = None
+    citation: Optional[str] = None
+    court_type: Optional[str] = None
+    court_division: Optional[str] = None
+    status: Optional[Union[str, int]] = None
+    area_of_law: Optional[str] = None
+    published: Optional[bool] = True
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @field_validator('status', mode='before')
+    @classmethod
+    def parse_status(cls, v):
+        if isinstance(v, int):
+            return str(v)
+        return v
+
+    class Config:
+        from_attributes = True
+
 class ReportedCaseSearchResponse(BaseModel):
-    cases: List[ReportedCaseResponse] = Field(default_factory=list)
+    cases: List[ReportedCaseListItem] = Field(default_factory=list)
     total: int
     page: int
     limit: int
@@ -65,6 +65,7 @@ class UnifiedSearchResponse(BaseModel):
     people: Optional[List[PeopleResponse]] = None
     banks: Optional[List[BanksResponse]] = None
     insurance: Optional[List[InsuranceResponse]] = None
+    type_counts: Optional[Dict[str, int]] = None  # Matches per entity type across all pages
     
     # Pagination
     total: int
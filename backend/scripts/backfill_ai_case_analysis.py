@@ -0,0 +1,49 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_ROOT = os.path.dirname(CURRENT_DIR)
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+from services.batch_case_analysis_service import BatchCaseAnalysisRunner, StubLLMClient, DEFAULT_JOB_NAME
+
+
+def backfill_ai_case_analysis(job_name=DEFAULT_JOB_NAME, limit=None, restart=False, batch_size=None,
+                              concurrency=None, requests_per_minute=None, model="gpt-3.5-turbo", stub=False):
+    runner = BatchCaseAnalysisRunner(
+        client=StubLLMClient() if stub else None,
+        model=model,
+        job_name=job_name,
+        batch_size=batch_size,
+        concurrency=concurrency,
+        requests_per_minute=requests_per_minute,
+        # Stub answers must never be served from or stored in the LLM response cache
+        use_cache=not stub,
+    )
+    stats = asyncio.run(runner.run(limit=limit, restart=restart))
+    print(
+        f"{stats['processed']} cases analysed, {stats['failed']} failed in {stats['elapsed_seconds']}s "
+        f"({stats['cases_per_minute']} cases/min, {stats['tokens_per_minute']} tokens/min)"
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Generate AI analyses for reported cases that have none")
+    parser.add_argument("--job-name", default=DEFAULT_JOB_NAME,
+                        help="Checkpoint name; a rerun with the same name resumes where it stopped")
+    parser.add_argument("--limit", type=int, help="Stop after this many cases")
+    parser.add_argument("--restart", action="store_true",
+                        help="Rescan from the first case (retries cases that failed earlier)")
+    parser.add_argument("--batch-size", type=int)
+    parser.add_argument("--concurrency", type=int)
+    parser.add_argument("--rpm", type=int, dest="requests_per_minute", help="Maximum requests started per minute")
+    parser.add_argument("--model", default="gpt-3.5-turbo")
+    parser.add_argument("--stub", action="store_true",
+                        help="Use a local stub model instead of OpenAI (dry run; still writes results)")
+    args = parser.parse_args()
+    backfill_ai_case_analysis(**vars(args))
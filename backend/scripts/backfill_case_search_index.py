@@ -0,0 +1,30 @@
+import argparse
+import os
+import sys
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_ROOT = os.path.dirname(CURRENT_DIR)
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+from database import SessionLocal
+from services.case_search_index_service import CaseSearchIndexService
+
+
+def backfill_case_search_index(batch_size=500, only_missing=False):
+    db = SessionLocal()
+    try:
+        total = CaseSearchIndexService(db).backfill(batch_size=batch_size, only_missing=only_missing)
+    finally:
+        db.close()
+
+    print(f"Indexed {total} cases.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild case_search_index documents from reported_cases")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--only-missing", action="store_true",
+                        help="Only index cases that have no search document yet")
+    args = parser.parse_args()
+    backfill_case_search_index(batch_size=args.batch_size, only_missing=args.only_missing)
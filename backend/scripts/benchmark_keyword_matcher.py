@@ -0,0 +1,83 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_ROOT = os.path.dirname(CURRENT_DIR)
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+from services.bank_analytics_service import BankAnalyticsService
+from services.insurance_analytics_service import InsuranceAnalyticsService
+from services.person_analytics_service import PersonAnalyticsService
+
+FILLER = ("the court held that appellant respondent evidence judgment trial counsel submitted "
+          "learned judge findings record witness ground matter law order accordingly").split()
+
+
+def synthetic_cases(matcher, count, words, seed):
+    """Judgment-sized texts of filler words with a sprinkling of the service's keywords"""
+    rng = random.Random(seed)
+    keywords = list(matcher.keywords)
+    cases = []
+    for _ in range(count):
+        parts = [rng.choice(FILLER) for _ in range(words)]
+        for _ in range(rng.randint(0, 12)):
+            parts.insert(rng.randrange(len(parts)), rng.choice(keywords).title())
+        cases.append(" ".join(parts))
+    return cases
+
+
+def per_keyword_scan(service, text):
+    """The scoring loops as they were: every keyword re-lowercases the whole text"""
+    risk = {}
+    for category, data in service.risk_keywords.items():
+        for keyword in data['keywords']:
+            if keyword.lower() in text.lower():
+                risk[category] = [keyword]
+                break
+    subject = {}
+    for category, keywords in service.subject_categories.items():
+        count = sum(1 for keyword in keywords if keyword.lower() in text.lower())
+        if count > 0:
+            subject[category] = count
+    legal = [keyword for keyword in service.legal_issue_keywords if keyword.lower() in text.lower()]
+    financial = [keyword for keyword in service.financial_term_keywords if keyword.lower() in text.lower()]
+    return risk, subject, legal, financial
+
+
+def matcher_scan(service, text):
+    hits = service.keyword_matcher.scan(text)
+    risk = {category: keywords[:1] for category, keywords in hits.categories('risk').items()}
+    return risk, hits.counts('subject'), hits.terms('legal_issues'), hits.terms('financial_terms')
+
+
+def benchmark_keyword_matcher(count=3000, words=1500, seed=0):
+    for service_class in (PersonAnalyticsService, BankAnalyticsService, InsuranceAnalyticsService):
+        # Only the keyword dictionaries are used; no database session is needed
+        service = service_class(None)
+        cases = synthetic_cases(service.keyword_matcher, count, words, seed)
+
+        started = time.perf_counter()
+        expected = [per_keyword_scan(service, text) for text in cases]
+        old_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        actual = [matcher_scan(service, text) for text in cases]
+        new_seconds = time.perf_counter() - started
+
+        mismatches = sum(1 for old, new in zip(expected, actual) if old != new)
+        print(f"{service_class.__name__}: {len(service.keyword_matcher.keywords)} keywords, {count} cases, "
+              f"per-keyword {old_seconds:.2f}s, matcher {new_seconds:.2f}s "
+              f"({old_seconds / new_seconds if new_seconds else 0:.1f}x), {mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare per-keyword case scoring with the compiled KeywordMatcher on synthetic cases")
+    parser.add_argument("--cases", type=int, default=3000)
+    parser.add_argument("--words", type=int, default=1500, help="Words per synthetic case text")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    benchmark_keyword_matcher(count=args.cases, words=args.words, seed=args.seed)
@@ -0,0 +1,89 @@
+"""
+Guard against N+1 queries on the people search paths.
+
+Runs /api/people/search and /api/search/unified against the configured database
+with increasing page sizes, counts the SQL statements each request issues, and
+exits non-zero if any request exceeds MAX_STATEMENTS or if the count grows with
+the number of rows returned.
+
+Usage (from backend/):
+    python scripts/check_search_query_counts.py --query mensah
+"""
+
+import argparse
+import os
+import sys
+from contextlib import contextmanager
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_ROOT = os.path.dirname(CURRENT_DIR)
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+os.chdir(BACKEND_ROOT)
+
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+
+from database import engine
+from auth import get_current_user
+from main import app
+
+# Count, search window, relationship loads and usage tracking - independent of page size
+MAX_STATEMENTS = 12
+
+CHECKS = [
+    ("/api/people/search", "limit", [5, 20]),
+    ("/api/people/search", "limit", [50, 100]),
+    ("/api/search/unified", "limit", [5, 50, 500]),
+]
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def run_checks(query: str, verbose: bool = False) -> bool:
+    app.dependency_overrides[get_current_user] = lambda: None
+    client = TestClient(app)
+    ok = True
+
+    for path, size_param, sizes in CHECKS:
+        counts = []
+        for size in sizes:
+            with count_statements() as statements:
+                response = client.get(path, params={"query": query, size_param: size})
+            rows = response.json().get("people") or response.json().get("results") or []
+            counts.append(len(statements))
+            print(f"{path} {size_param}={size}: {len(statements)} statements, {len(rows)} rows, HTTP {response.status_code}")
+            if verbose:
+                for statement in statements:
+                    print(f"    {' '.join(statement.split())[:160]}")
+            if response.status_code != 200:
+                ok = False
+
+        if max(counts) > MAX_STATEMENTS:
+            print(f"FAIL {path}: {max(counts)} statements exceeds limit of {MAX_STATEMENTS}")
+            ok = False
+        if len(set(counts)) > 1:
+            print(f"FAIL {path}: statement count varies with page size {dict(zip(sizes, counts))}")
+            ok = False
+
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail if people search issues a per-row number of queries")
+    parser.add_argument("--query", default="a", help="Search term broad enough to fill the largest page")
+    parser.add_argument("--verbose", action="store_true", help="Print every statement")
+    args = parser.parse_args()
+    sys.exit(0 if run_checks(args.query, args.verbose) else 1)
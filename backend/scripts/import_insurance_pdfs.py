@@ -16,9 +16,10 @@ from models.insurance_auditors import InsuranceAuditor
 from models.insurance_shareholders import InsuranceShareholder
 from models.insurance_capital_details import InsuranceCapitalDetail
 from models.insurance_share_details import InsuranceShareDetail
+from services.pdf_text_extraction_service import get_pdf_text
 
 try:
-    import pdfplumber
+    import pdfplumber  # noqa: F401  (used by the shared extraction service)
 except Exception as exc:
     raise SystemExit("pdfplumber is required to run this script. Install it in backend/venv.") from exc
 
@@ -51,12 +52,8 @@ def parse_decimal(value: str):
 
 
 def extract_text(file_path: str) -> str:
-    text = ""
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text() or ""
-            text += page_text + "\n"
-    return text
+    # Cached by PDF content, so re-imports only redo the parsing below
+    return get_pdf_text(file_path, ocr=False).text
 
 
 def extract_key_value(text: str, key: str):
@@ -14,6 +14,7 @@ from pytesseract import Output
 from sqlalchemy import text
 
 from database import engine
+from services.pdf_extraction_cache import cached_extraction
 
 
 MONTHS = {
@@ -195,9 +196,35 @@ def is_section_heading(line: str) -> bool:
     return cleaned in SECTION_HEADINGS
 
 
-def extract_lines(page) -> list[tuple[int, str, int, list[dict]]]:
+# OCR output is cached by PDF content (services/pdf_extraction_cache.py); bump the
+# version when the OCR settings below change.
+OCR_CACHE_KIND = "cause_list_ocr"
+OCR_CACHE_VERSION = "1"
+OCR_DATA_KEYS = ("text", "left", "top", "block_num", "par_num", "line_num")
+
+
+def ocr_page(page) -> dict:
+    page_text = pytesseract.image_to_string(page.to_image(resolution=300).original)
     img = page.to_image(resolution=400).original
     data = pytesseract.image_to_data(img, output_type=Output.DICT, config="--psm 6")
+
+    w, h = img.size
+    crop = img.crop((int(w * 0.7), 0, w, h))
+    crop_config = "--psm 11 -c tessedit_char_whitelist=FJH/ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    crop_data = pytesseract.image_to_data(crop, output_type=Output.DICT, config=crop_config)
+    return {
+        "text": page_text,
+        "data": {key: list(data[key]) for key in OCR_DATA_KEYS},
+        "crop": {key: list(crop_data[key]) for key in ("text", "top")},
+    }
+
+
+def ocr_pages(pdf_path: Path) -> list[dict]:
+    with pdfplumber.open(str(pdf_path)) as pdf:
+        return [ocr_page(page) for page in pdf.pages]
+
+
+def extract_lines(data: dict) -> list[tuple[int, str, int, list[dict]]]:
     grouped = {}
     for i in range(len(data["text"])):
         text = data["text"][i].strip()
@@ -223,7 +250,7 @@ def extract_lines(page) -> list[tuple[int, str, int, list[dict]]]:
     return sorted(lines, key=lambda item: item[0])
 
 
-def extract_cases(page, header: dict, page_text: str, inherited_case_type: str | None) -> tuple[list[dict], str | None]:
+def extract_cases(ocr: dict, header: dict, page_text: str, inherited_case_type: str | None) -> tuple[list[dict], str | None]:
     header = header.copy()
 
     current_date = header.get("hearing_date")
@@ -235,8 +262,7 @@ def extract_cases(page, header: dict, page_text: str, inherited_case_type: str |
     vrs_positions = []
     section_heads = []
 
-    img = page.to_image(resolution=400).original
-    data = pytesseract.image_to_data(img, output_type=Output.DICT, config="--psm 6")
+    data = ocr["data"]
     for i in range(len(data["text"])):
         text = data["text"][i].strip()
         if not text:
@@ -253,10 +279,7 @@ def extract_cases(page, header: dict, page_text: str, inherited_case_type: str |
         mid = len(vrs_positions) // 2
         vrs_column = vrs_positions[mid]
 
-    w, h = img.size
-    crop = img.crop((int(w * 0.7), 0, w, h))
-    crop_config = "--psm 11 -c tessedit_char_whitelist=FJH/ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    crop_data = pytesseract.image_to_data(crop, output_type=Output.DICT, config=crop_config)
+    crop_data = ocr["crop"]
     for i in range(len(crop_data["text"])):
         text = crop_data["text"][i].strip()
         if not text:
@@ -265,7 +288,7 @@ def extract_cases(page, header: dict, page_text: str, inherited_case_type: str |
         if REMARKS_REGEX.fullmatch(token):
             remarks_tokens.append({"token": token, "top": crop_data["top"][i]})
 
-    for line_top, raw_line, line_left, line_words in extract_lines(page):
+    for line_top, raw_line, line_left, line_words in extract_lines(data):
         line = normalize_line(raw_line)
         if not line:
             continue
@@ -509,7 +532,7 @@ def upsert_cases(conn, cases: list[dict], court_type: str) -> tuple[int, int]:
     return created, updated
 
 
-def main(pdf_path: Path):
+def main(pdf_path: Path, refresh_cache: bool = False):
     if not pdf_path.exists():
         raise FileNotFoundError(f"PDF not found: {pdf_path}")
 
@@ -517,24 +540,26 @@ def main(pdf_path: Path):
     all_cases = []
 
     current_case_type = None
-    with pdfplumber.open(str(pdf_path)) as pdf:
-        for page in pdf.pages:
-            page_text = pytesseract.image_to_string(page.to_image(resolution=300).original)
-            page_header = parse_header(page_text)
-            for key in base_header:
-                if page_header.get(key):
-                    base_header[key] = page_header[key]
-            merged_header = base_header.copy()
-            for key in merged_header:
-                if page_header.get(key):
-                    merged_header[key] = page_header[key]
-            page_cases, current_case_type = extract_cases(
-                page,
-                merged_header,
-                page_text,
-                current_case_type,
-            )
-            all_cases.extend(page_cases)
+    pages = cached_extraction(
+        str(pdf_path), OCR_CACHE_KIND, OCR_CACHE_VERSION, lambda: ocr_pages(pdf_path), refresh=refresh_cache
+    )
+    for ocr in pages:
+        page_text = ocr["text"]
+        page_header = parse_header(page_text)
+        for key in base_header:
+            if page_header.get(key):
+                base_header[key] = page_header[key]
+        merged_header = base_header.copy()
+        for key in merged_header:
+            if page_header.get(key):
+                merged_header[key] = page_header[key]
+        page_cases, current_case_type = extract_cases(
+            ocr,
+            merged_header,
+            page_text,
+            current_case_type,
+        )
+        all_cases.extend(page_cases)
 
     with engine.begin() as conn:
         ensure_columns(conn)
@@ -547,5 +572,6 @@ def main(pdf_path: Path):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Import Supreme Court cause list PDF")
     parser.add_argument("pdf_path", type=Path, help="Path to cause list PDF")
+    parser.add_argument("--refresh-cache", action="store_true", help="Re-run OCR even if the PDF is cached")
     args = parser.parse_args()
-    main(args.pdf_path)
+    main(args.pdf_path, refresh_cache=args.refresh_cache)
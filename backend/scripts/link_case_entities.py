@@ -0,0 +1,53 @@
+import argparse
+import os
+import sys
+import time
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_ROOT = os.path.dirname(CURRENT_DIR)
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+from database import SessionLocal
+from services.case_entity_linker import (
+    ENTITY_TYPES, CaseEntityLinker, link_entity_batches, link_queued_cases, unlinked_ids
+)
+
+
+def link_case_entities(entity_types, case_ids=None, batch_size=None, unlinked=False, queued=False):
+    db = SessionLocal()
+    try:
+        started = time.monotonic()
+        if queued:
+            counts = link_queued_cases(db, batch_size=batch_size)
+            print(f"{counts['cases']} queued cases, {counts['links']} links in {time.monotonic() - started:.1f}s")
+            return
+        if unlinked:
+            for entity_type in entity_types:
+                counts = link_entity_batches(db, entity_type, unlinked_ids(db, entity_type), batch_size=batch_size)
+                print(f"{entity_type}: {counts['entities']} unlinked entities, {counts['links']} links "
+                      f"in {time.monotonic() - started:.1f}s")
+            return
+        linker = CaseEntityLinker(db, entity_types, batch_size=batch_size)
+        patterns = linker.load()
+        counts = linker.link_cases(case_ids)
+        print(f"{patterns} name patterns, {counts['cases']} cases, {counts['links']} links "
+              f"in {time.monotonic() - started:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild case_entity_links by matching entity names against reported cases")
+    parser.add_argument("--type", choices=ENTITY_TYPES, action="append",
+                        help="Entity type to link (repeatable; default: all)")
+    parser.add_argument("--case-id", type=int, action="append",
+                        help="Only re-link this case (repeatable), e.g. after importing new cases")
+    parser.add_argument("--queued", action="store_true",
+                        help="Re-link the cases created or updated since the last --queued run (schedule this)")
+    parser.add_argument("--unlinked", action="store_true",
+                        help="Only link entities created since the last run, one case scan per batch of them")
+    parser.add_argument("--batch-size", type=int, help="Default: CASE_LINK_BATCH_SIZE")
+    args = parser.parse_args()
+    link_case_entities(args.type or list(ENTITY_TYPES), case_ids=args.case_id, batch_size=args.batch_size,
+                       unlinked=args.unlinked, queued=args.queued)
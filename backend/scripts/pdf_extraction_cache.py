@@ -0,0 +1,86 @@
+import argparse
+import os
+import sys
+import time
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_ROOT = os.path.dirname(CURRENT_DIR)
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+from services.pdf_extraction_cache import (
+    cache_stats, clear_entries, entry_path, evict_entries, file_sha256, list_entries
+)
+from services.pdf_text_extraction_service import CACHE_KIND, EXTRACTOR_VERSION, get_pdf_text
+
+
+def _pdf_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(names):
+                    if name.lower().endswith(".pdf"):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def warm(paths, ocr=True, refresh=False):
+    for file_path in _pdf_files(paths):
+        started = time.monotonic()
+        document = get_pdf_text(file_path, ocr=ocr, refresh=refresh)
+        print(f"{file_path}: {document.total_pages} pages in {time.monotonic() - started:.2f}s")
+
+
+def inspect(paths):
+    for file_path in _pdf_files(paths):
+        sha256 = file_sha256(file_path)
+        entries = [entry for entry in list_entries() if entry["sha256"] == sha256]
+        print(f"{file_path}: sha256 {sha256}")
+        if not entries:
+            print(f"  not cached (text entry would be {entry_path(sha256, CACHE_KIND, EXTRACTOR_VERSION)})")
+        for entry in entries:
+            current = " (current)" if entry["kind"] == CACHE_KIND and entry["version"] == EXTRACTOR_VERSION else ""
+            print(f"  {entry['kind']} v{entry['version']}{current}: {entry['bytes']} bytes, "
+                  f"last used {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry['last_used']))}")
+
+
+def show_stats():
+    stats = cache_stats()
+    print(f"{stats['directory']} ({stats['format']}, {'enabled' if stats['enabled'] else 'disabled'})")
+    print(f"{stats['entries']} entries, {stats['bytes']} of {stats['max_bytes']} bytes")
+    for kind, counters in sorted(stats["kinds"].items()):
+        print(f"  {kind}: {counters['entries']} entries, {counters['bytes']} bytes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm, inspect and trim the on-disk PDF extraction cache")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    warm_parser = commands.add_parser("warm", help="Extract PDFs (files or directories) into the cache")
+    warm_parser.add_argument("paths", nargs="+")
+    warm_parser.add_argument("--no-ocr", action="store_true", help="Warm the entries used by callers without OCR")
+    warm_parser.add_argument("--refresh", action="store_true", help="Re-extract even if cached")
+
+    inspect_parser = commands.add_parser("inspect", help="Show the cache entries of PDFs")
+    inspect_parser.add_argument("paths", nargs="+")
+
+    commands.add_parser("stats", help="Show cache size per extraction kind")
+
+    evict_parser = commands.add_parser("evict", help="Remove least recently used entries beyond a size")
+    evict_parser.add_argument("--max-bytes", type=int, help="Default: PDF_CACHE_MAX_BYTES")
+
+    clear_parser = commands.add_parser("clear", help="Remove all entries")
+    clear_parser.add_argument("--kind", help="Only entries of this extraction kind")
+
+    args = parser.parse_args()
+    if args.command == "warm":
+        warm(args.paths, ocr=not args.no_ocr, refresh=args.refresh)
+    elif args.command == "inspect":
+        inspect(args.paths)
+    elif args.command == "stats":
+        show_stats()
+    elif args.command == "evict":
+        print(f"Removed {evict_entries(args.max_bytes)} entries")
+    elif args.command == "clear":
+        print(f"Removed {clear_entries(args.kind)} entries")
@@ -0,0 +1,31 @@
+import argparse
+import os
+import sys
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_ROOT = os.path.dirname(CURRENT_DIR)
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+from database import SessionLocal
+from services.search_index_service import SearchIndexService, SEARCH_ENTITIES
+
+
+def rebuild_search_index(entity_types=None, batch_size=1000):
+    db = SessionLocal()
+    try:
+        indexed = SearchIndexService(db).rebuild(entity_types, batch_size=batch_size)
+    finally:
+        db.close()
+
+    for entity_type, count in indexed.items():
+        print(f"Indexed {count} {entity_type} documents.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild search_documents from the entity tables")
+    parser.add_argument("--type", action="append", choices=sorted(SEARCH_ENTITIES.keys()),
+                        help="Entity type to rebuild (repeatable, default: all)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    rebuild_search_index(args.type, batch_size=args.batch_size)
@@ -0,0 +1,33 @@
+import argparse
+import os
+import sys
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_ROOT = os.path.dirname(CURRENT_DIR)
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+from database import SessionLocal
+from services.stats_rollup_service import SOURCES, StatsRollupService
+
+
+def refresh_stats_rollups(sources, full=False, batch_size=1000):
+    db = SessionLocal()
+    try:
+        service = StatsRollupService(db)
+        for source in sources:
+            processed = service.refresh(source, full=full, batch_size=batch_size)
+            print(f"{source}: {processed} rows re-read{' (full rebuild)' if full else ''}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh the stats_rollups dashboard aggregates")
+    parser.add_argument("--source", choices=sorted(SOURCES), action="append",
+                        help="Source to refresh (repeatable; default: all)")
+    parser.add_argument("--full", action="store_true",
+                        help="Rebuild from scratch instead of reading rows changed since the last refresh")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    refresh_stats_rollups(args.source or list(SOURCES), full=args.full, batch_size=args.batch_size)
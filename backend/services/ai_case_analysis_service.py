@@ -1,9 +1,9 @@
 import os
 import logging
 from typing import Dict, Any, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 from sqlalchemy import text
-from models.reported_cases import ReportedCases
+from models.reported_cases import ReportedCases, BODY_COLUMN_GROUP
 from models.settings import Settings
 from database import get_db
 import openai
@@ -244,7 +244,7 @@ Respond only with valid JSON, no additional text.
             # Process cases in batches
             offset = 0
             while offset < total_cases:
-                cases = self.db.query(ReportedCases).offset(offset).limit(batch_size).all()
+                cases = self.db.query(ReportedCases).options(undefer_group(BODY_COLUMN_GROUP)).offset(offset).limit(batch_size).all()
                 
                 for case in cases:
                     try:
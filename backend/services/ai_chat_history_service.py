@@ -0,0 +1,99 @@
+"""
+Append-only message history of AI chat sessions (``ai_chat_messages``).
+
+Appending a turn costs the same however long the session is. One
+``UPDATE ai_chat_sessions ... RETURNING message_seq`` reserves the sequence
+numbers, and the new messages are inserted as rows. The UPDATE takes the session
+row lock, so concurrent sends get distinct, gap-free ranges.
+
+Prompt building reads only the newest ``window`` messages, which is an index
+range scan on ``(session_id, seq)``.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from models.ai_chat_message import AIChatMessage
+from models.ai_chat_session import AIChatSession
+
+
+def message_to_dict(message: AIChatMessage) -> Dict:
+    return {
+        "seq": message.seq,
+        "role": message.role,
+        "content": message.content,
+        "timestamp": message.created_at.isoformat() if message.created_at else None,
+    }
+
+
+def append_messages(db: Session, session_id: str, messages: Sequence[Tuple[str, str]]) -> List[Dict]:
+    """
+    Append ``(role, content)`` pairs to a session and bump its counters; the caller
+    commits. Returns the stored messages.
+    """
+    count = len(messages)
+    last_seq = db.execute(
+        update(AIChatSession)
+        .where(AIChatSession.session_id == session_id)
+        .values(
+            message_seq=AIChatSession.message_seq + count,
+            total_messages=AIChatSession.total_messages + count,
+            last_activity=datetime.utcnow()
+        )
+        .returning(AIChatSession.message_seq)
+    ).scalar()
+    if last_seq is None:
+        raise ValueError(f"Chat session {session_id} not found")
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        {"session_id": session_id, "seq": last_seq - count + position + 1, "role": role,
+         "content": content, "created_at": now}
+        for position, (role, content) in enumerate(messages)
+    ]
+    db.execute(insert(AIChatMessage), rows)
+    return [
+        {"seq": row["seq"], "role": row["role"], "content": row["content"], "timestamp": now.isoformat()}
+        for row in rows
+    ]
+
+
+def get_recent_messages(db: Session, session_id: str, window: int) -> List[Dict]:
+    """The newest ``window`` messages of a session, oldest first"""
+    messages = db.query(AIChatMessage).filter(
+        AIChatMessage.session_id == session_id
+    ).order_by(AIChatMessage.seq.desc()).limit(window).all()
+    return [message_to_dict(message) for message in reversed(messages)]
+
+
+def get_messages(db: Session, session_id: str, limit: Optional[int] = None,
+                 before_seq: Optional[int] = None) -> List[Dict]:
+    """
+    Messages of a session in order. With ``limit`` only the newest ``limit`` messages
+    (before ``before_seq`` when given) are returned, for paging back through long sessions.
+    """
+    query = db.query(AIChatMessage).filter(AIChatMessage.session_id == session_id)
+    if before_seq is not None:
+        query = query.filter(AIChatMessage.seq < before_seq)
+    if limit is None:
+        return [message_to_dict(message) for message in query.order_by(AIChatMessage.seq).all()]
+    messages = query.order_by(AIChatMessage.seq.desc()).limit(limit).all()
+    return [message_to_dict(message) for message in reversed(messages)]
+
+
+def get_messages_for_sessions(db: Session, session_ids: Iterable[str]) -> Dict[str, List[Dict]]:
+    """All messages of several sessions in one query, grouped by session"""
+    session_ids = list(session_ids)
+    grouped: Dict[str, List[Dict]] = defaultdict(list)
+    if not session_ids:
+        return grouped
+    messages = db.query(AIChatMessage).filter(
+        AIChatMessage.session_id.in_(session_ids)
+    ).order_by(AIChatMessage.session_id, AIChatMessage.seq).all()
+    for message in messages:
+        grouped[message.session_id].append(message_to_dict(message))
+    return grouped
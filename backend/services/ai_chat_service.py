@@ -1,34 +1,91 @@
 import os
+import time
+import asyncio
+import threading
 import openai
 import logging
-from typing import Dict, List, Any, Optional
-from sqlalchemy.orm import Session
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import func
+from sqlalchemy.orm import Session, undefer_group
 from models.settings import Settings
-from models.reported_cases import ReportedCases
+from models.reported_cases import ReportedCases, BODY_COLUMN_GROUP, AI_ANALYSIS_COLUMN_GROUP
 from models.case_metadata import CaseMetadata
 from models.case_hearings import CaseHearing
 from datetime import datetime
 import json
 import re
 from services.usage_tracking_service import UsageTrackingService
+from services.cache_service import get_cached, set_cached, delete_cached_prefix, CASE_CONTEXT
+from services.llm_cache_service import cached_llm_call
+from services.prompt_budget import PromptBuilder, PromptBuild, truncate_items_to_tokens, truncate_to_tokens
+from database import SessionLocal
+from config import settings
 
 # Configure logging for AI chat
 logging.basicConfig(level=logging.INFO)
 ai_chat_logger = logging.getLogger("ai_chat")
 
+# Bump when the context/prompt format changes so cached snapshots are rebuilt
+CASE_CONTEXT_FORMAT = "v2"
+# Bump when the case-summary prompt changes so cached summaries are not reused
+CASE_SUMMARY_PROMPT_VERSION = "v1"
+
+CHAT_COMPLETION_TOKENS = 800
+# Case context fields whose share of the prompt is set by the token budget
+CASE_PROMPT_FIELDS = ("case_summary", "decision", "judgement", "commentary", "headnotes")
+
+
+# One client (and connection pool) per (api key, base url), shared by every request;
+# closed from the application lifespan
+_openai_clients: Dict[Tuple[str, Optional[str], bool], Any] = {}
+_openai_clients_lock = threading.Lock()
+
+
+def get_shared_openai_client(api_key: str, use_async: bool = False):
+    key = (api_key, settings.openai_base_url, use_async)
+    with _openai_clients_lock:
+        client = _openai_clients.get(key)
+        if client is None:
+            client_class = openai.AsyncOpenAI if use_async else openai.OpenAI
+            client = _openai_clients[key] = client_class(api_key=api_key, base_url=settings.openai_base_url)
+        return client
+
+
+async def close_openai_clients() -> None:
+    with _openai_clients_lock:
+        clients = list(_openai_clients.items())
+        _openai_clients.clear()
+    for (_, _, use_async), client in clients:
+        try:
+            if use_async:
+                await client.close()
+            else:
+                client.close()
+        except Exception as e:
+            ai_chat_logger.warning(f"Error closing OpenAI client: {e}")
+
+
+def invalidate_case_context(case_id: int) -> None:
+    """Drop every cached context snapshot of a case (the versioned key already keeps reads correct)"""
+    delete_cached_prefix(CASE_CONTEXT, f"{case_id}:")
+
 class AIChatService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, async_client=None):
         self.db = db
-        self.openai_client = self._get_openai_client()
+        self._openai_client = None
+        # Any object exposing an async ``chat.completions.create`` works here
+        # (an OpenAI-compatible local endpoint, or a stub in tests)
+        self._async_client = async_client
         self.model = self._get_ai_model()
         self.usage_service = UsageTrackingService(db)
-        
-    def _get_openai_client(self):
-        """Get OpenAI client with API key from database or environment"""
+    
+    def _get_api_key(self) -> str:
+        """Get OpenAI API key from database or environment"""
         try:
             setting = self.db.query(Settings).filter(Settings.key == "openai_api_key").first()
             if setting and setting.value:
-                return openai.OpenAI(api_key=setting.value)
+                return setting.value
         except Exception as e:
             print(f"Error fetching API key from database: {e}")
         
@@ -36,7 +93,20 @@ class AIChatService:
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OpenAI API key not found in database or environment variables")
-        return openai.OpenAI(api_key=api_key)
+        return api_key
+    
+    @property
+    def openai_client(self):
+        if self._openai_client is None:
+            self._openai_client = get_shared_openai_client(self._get_api_key())
+        return self._openai_client
+    
+    async def get_async_client(self):
+        """Shared AsyncOpenAI client; the API key lookup runs in the thread pool"""
+        if self._async_client is None:
+            api_key = await run_in_threadpool(self._get_api_key)
+            self._async_client = get_shared_openai_client(api_key, use_async=True)
+        return self._async_client
     
     def _get_ai_model(self) -> str:
         """Get AI model from settings"""
@@ -47,11 +117,16 @@ class AIChatService:
             print(f"Error fetching AI model from database: {e}")
             return "gpt-3.5-turbo"
     
-    def _truncate_content(self, content: str, max_length: int = 2000) -> str:
-        """Truncate content to prevent token limit issues"""
-        if not content or len(content) <= max_length:
-            return content
-        return content[:max_length] + "... [Content truncated]"
+    def _truncate_content(self, content: Any, max_tokens: int = 500) -> Any:
+        """
+        Cap a context field at ``max_tokens``; the prompt budget decides how much is sent.
+        JSON list columns (CaseMetadata names, citations) keep their leading items.
+        """
+        if isinstance(content, (list, tuple)):
+            return truncate_items_to_tokens(content, max_tokens, self.model)
+        if content is not None and not isinstance(content, str):
+            content = str(content)
+        return truncate_to_tokens(content, max_tokens, self.model)
     
     def _log_chat_interaction(self, case_id: int, user_message: str, ai_response: str, 
                             session_id: str = None, user_id: str = None, 
@@ -59,20 +134,8 @@ class AIChatService:
                             error: str = None):
         """Log chat interaction for reporting and analytics"""
         try:
-            log_data = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "case_id": case_id,
-                "session_id": session_id,
-                "user_id": user_id,
-                "user_message": user_message[:500],  # Truncate for storage
-                "ai_response": ai_response[:500] if ai_response else None,  # Truncate for storage
-                "response_time_ms": response_time_ms,
-                "tokens_used": tokens_used,
-                "ai_model": self.model,
-                "error": error,
-                "message_length": len(user_message),
-                "response_length": len(ai_response) if ai_response else 0
-            }
+            log_data = self._interaction_log(case_id, user_message, ai_response, session_id, user_id,
+                                             response_time_ms, tokens_used, error)
             
             # Log to console/file
             ai_chat_logger.info(f"AI_CHAT_INTERACTION: {json.dumps(log_data)}")
@@ -115,8 +178,7 @@ class AIChatService:
             ).first()
             
             if session:
-                # Update session with interaction count and last activity
-                session.total_messages = (session.total_messages or 0) + 1
+                # total_messages is maintained by ai_chat_history_service when messages are stored
                 session.last_activity = datetime.utcnow()
                 
                 # Store interaction metadata
@@ -174,11 +236,71 @@ class AIChatService:
         else:
             return tokens * 0.00001  # Default estimate
     
+    def get_case_context_version(self, case_id: int) -> Optional[str]:
+        """
+        Cheap fingerprint of everything the case context is built from: the case and
+        metadata ``updated_at`` plus the number and latest change of its hearings.
+        None when the case does not exist.
+        """
+        row = self.db.query(ReportedCases.updated_at, CaseMetadata.updated_at).outerjoin(
+            CaseMetadata, CaseMetadata.case_id == ReportedCases.id
+        ).filter(ReportedCases.id == case_id).first()
+        if row is None:
+            return None
+        hearing_count, hearings_changed = self.db.query(
+            func.count(CaseHearing.id),
+            func.max(func.coalesce(CaseHearing.updated_at, CaseHearing.created_at))
+        ).filter(CaseHearing.case_id == case_id).one()
+        parts = [CASE_CONTEXT_FORMAT, row[0], row[1], hearing_count, hearings_changed]
+        return "|".join("" if part is None else str(part) for part in parts)
+    
+    def get_case_context_snapshot(self, case_id: int, chat_session=None) -> Dict[str, Any]:
+        """
+        Built and truncated case context plus its system prompt, keyed by
+        ``(case_id, get_case_context_version)`` in the shared cache and reused across
+        messages and sessions. When ``chat_session`` is given its ``case_context_snapshot``
+        is consulted first and refreshed if stale (the caller commits).
+        """
+        try:
+            version = self.get_case_context_version(case_id)
+        except Exception as e:
+            print(f"Error getting case context: {e}")
+            return {"context": {"error": f"Failed to get case context: {str(e)}"}}
+        if version is None:
+            return {"context": {"error": "Case not found"}}
+        
+        saved = chat_session.case_context_snapshot if chat_session is not None else None
+        if saved and saved.get("version") == version and saved.get("system_prompt"):
+            return saved
+        
+        cache_key = f"{case_id}:{version}"
+        snapshot = get_cached(CASE_CONTEXT, cache_key)
+        if snapshot is None:
+            context = self._build_case_context(case_id)
+            if "error" in context:
+                return {"context": context}
+            snapshot = {
+                "version": version,
+                "context": context,
+                "system_prompt": self._build_system_prompt(context)
+            }
+            set_cached(CASE_CONTEXT, cache_key, snapshot, ttl=settings.case_context_cache_ttl)
+        
+        if chat_session is not None:
+            chat_session.case_context_snapshot = snapshot
+        return snapshot
+    
     def get_case_context(self, case_id: int) -> Dict[str, Any]:
         """Get comprehensive case context for AI chat"""
+        return self.get_case_context_snapshot(case_id)["context"]
+    
+    def _build_case_context(self, case_id: int) -> Dict[str, Any]:
+        """Load the case, its metadata and hearings and build the truncated context"""
         try:
             # Get case with metadata
-            case = self.db.query(ReportedCases).outerjoin(
+            case = self.db.query(ReportedCases).options(
+                undefer_group(BODY_COLUMN_GROUP), undefer_group(AI_ANALYSIS_COLUMN_GROUP)
+            ).outerjoin(
                 CaseMetadata, ReportedCases.id == CaseMetadata.case_id
             ).filter(ReportedCases.id == case_id).first()
             
@@ -212,14 +334,14 @@ class AIChatService:
                 "judgement_by": case.judgement_by,
                 "opinion_by": case.opinion_by,
                 
-                # Case content (truncated to prevent token limit issues)
+                # Case content (capped per field; build_chat_prompt fits them to the budget)
                 "case_summary": self._truncate_content(case.case_summary, 1000),
-                "detail_content": self._truncate_content(case.detail_content, 2000),
-                "decision": self._truncate_content(case.decision, 1500),
-                "judgement": self._truncate_content(case.judgement, 1500),
+                "detail_content": self._truncate_content(case.detail_content, 1000),
+                "decision": self._truncate_content(case.decision, 2000),
+                "judgement": self._truncate_content(case.judgement, 2000),
                 "commentary": self._truncate_content(case.commentary, 1000),
                 "headnotes": self._truncate_content(case.headnotes, 1000),
-                "keywords_phrases": self._truncate_content(case.keywords_phrases, 500),
+                "keywords_phrases": self._truncate_content(case.keywords_phrases, 150),
                 
                 # Hearings
                 "hearings": [
@@ -233,22 +355,22 @@ class AIChatService:
                     for hearing in hearings
                 ],
                 
-                # Metadata (truncated to prevent token limit issues)
+                # Metadata (capped per field)
                 "metadata": {
                     "case_type": metadata.case_type if metadata else None,
-                    "keywords": self._truncate_content(metadata.keywords, 500) if metadata else None,
-                    "judges": self._truncate_content(metadata.judges, 500) if metadata else None,
-                    "lawyers": self._truncate_content(metadata.lawyers, 500) if metadata else None,
-                    "related_people": self._truncate_content(metadata.related_people, 500) if metadata else None,
-                    "organizations": self._truncate_content(metadata.organizations, 500) if metadata else None,
-                    "banks_involved": self._truncate_content(metadata.banks_involved, 500) if metadata else None,
-                    "insurance_involved": self._truncate_content(metadata.insurance_involved, 500) if metadata else None,
+                    "keywords": self._truncate_content(metadata.keywords, 150) if metadata else None,
+                    "judges": self._truncate_content(metadata.judges, 150) if metadata else None,
+                    "lawyers": self._truncate_content(metadata.lawyers, 150) if metadata else None,
+                    "related_people": self._truncate_content(metadata.related_people, 150) if metadata else None,
+                    "organizations": self._truncate_content(metadata.organizations, 150) if metadata else None,
+                    "banks_involved": self._truncate_content(metadata.banks_involved, 150) if metadata else None,
+                    "insurance_involved": self._truncate_content(metadata.insurance_involved, 150) if metadata else None,
                     "resolution_status": metadata.resolution_status if metadata else None,
                     "outcome": metadata.outcome if metadata else None,
                     "decision_type": metadata.decision_type if metadata else None,
                     "monetary_amount": metadata.monetary_amount if metadata else None,
-                    "statutes_cited": self._truncate_content(metadata.statutes_cited, 500) if metadata else None,
-                    "cases_cited": self._truncate_content(metadata.cases_cited, 500) if metadata else None,
+                    "statutes_cited": self._truncate_content(metadata.statutes_cited, 150) if metadata else None,
+                    "cases_cited": self._truncate_content(metadata.cases_cited, 150) if metadata else None,
                     "relevance_score": metadata.relevance_score if metadata else None
                 } if metadata else {}
             }
@@ -259,130 +381,185 @@ class AIChatService:
             print(f"Error getting case context: {e}")
             return {"error": f"Failed to get case context: {str(e)}"}
     
-    def generate_ai_response(self, case_id: int, user_message: str, chat_history: List[Dict] = None, 
-                           session_id: str = None, user_id: str = None) -> Dict[str, Any]:
-        """Generate AI response based on case context and user message"""
-        start_time = datetime.utcnow()
-        response_time_ms = None
-        tokens_used = None
-        ai_response = None
-        error = None
+    def build_chat_prompt(self, case_context: Dict[str, Any], user_message: str,
+                          chat_history: List[Dict] = None,
+                          system_prompt: Optional[str] = None) -> PromptBuild:
+        """
+        System prompt, history and the new user message fitted to the token budget.
+        ``system_prompt`` (the snapshot's full-context prompt) is reused when no case
+        field has to be cut.
+        """
+        fields = {name: case_context.get(name) for name in CASE_PROMPT_FIELDS}
         
+        def render(fitted: Dict[str, Optional[str]], message: str):
+            if fitted is fields and system_prompt:
+                return system_prompt, message
+            return self._build_system_prompt({**case_context, **fitted}), message
+        
+        builder = PromptBuilder(self.model, completion_tokens=CHAT_COMPLETION_TOKENS)
+        return builder.build(render, fields, user_message, chat_history)
+    
+    def _interaction_log(self, case_id: int, user_message: str, ai_response: Optional[str],
+                         session_id: str = None, user_id: str = None, response_time_ms: int = None,
+                         tokens_used: int = None, error: str = None) -> Dict[str, Any]:
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "case_id": case_id,
+            "session_id": session_id,
+            "user_id": user_id,
+            "user_message": user_message[:500],
+            "ai_response": ai_response[:500] if ai_response else None,
+            "response_time_ms": response_time_ms,
+            "tokens_used": tokens_used,
+            "ai_model": self.model,
+            "error": error,
+            "message_length": len(user_message),
+            "response_length": len(ai_response) if ai_response else 0
+        }
+    
+    def _usage_record(self, user_id, session_id: str, endpoint: str, user_message: str,
+                      prompt_tokens: Optional[int], completion_tokens: Optional[int],
+                      response_time_ms: int) -> Optional[Dict[str, Any]]:
+        """track_ai_usage arguments, or None when the provider reported no token usage"""
+        if not prompt_tokens and not completion_tokens:
+            return None
+        return {
+            "user_id": user_id,
+            "session_id": session_id,
+            "endpoint": endpoint,
+            "ai_model": self.model,
+            "prompt_tokens": prompt_tokens or 0,
+            "completion_tokens": completion_tokens or 0,
+            "response_time_ms": response_time_ms,
+            "query": user_message
+        }
+    
+    async def agenerate_ai_response(self, case_id: int, user_message: str, chat_history: List[Dict] = None,
+                                    session_id: str = None, user_id: str = None,
+                                    chat_session=None) -> Dict[str, Any]:
+        """
+        Generate an AI response from the case context and the user message. Case context
+        is read in the thread pool, the completion is awaited on AsyncOpenAI, and
+        logging/usage writes are scheduled after the response instead of being committed inline.
+        """
+        started = time.monotonic()
+        snapshot = await run_in_threadpool(self.get_case_context_snapshot, case_id, chat_session)
+        case_context = snapshot["context"]
+        if "error" in case_context:
+            schedule_chat_interaction_record(self._interaction_log(
+                case_id, user_message, None, session_id, user_id, error=case_context["error"]
+            ))
+            return case_context
+        
+        prompt = self.build_chat_prompt(case_context, user_message, chat_history, snapshot.get("system_prompt"))
         try:
-            # Log session analytics
-            self._log_session_analytics(session_id, case_id, "message_sent", {
-                "user_message_length": len(user_message),
-                "chat_history_length": len(chat_history) if chat_history else 0
-            })
-            
-            # Get case context
-            case_context = self.get_case_context(case_id)
-            if "error" in case_context:
-                error = case_context["error"]
-                self._log_chat_interaction(
-                    case_id=case_id,
-                    user_message=user_message,
-                    ai_response=None,
-                    session_id=session_id,
-                    user_id=user_id,
-                    error=error
-                )
-                return case_context
-            
-            # Build system prompt
-            system_prompt = self._build_system_prompt(case_context)
-            
-            # Build messages for OpenAI
-            messages = [
-                {"role": "system", "content": system_prompt}
-            ]
-            
-            # Add chat history if provided
-            if chat_history:
-                for msg in chat_history[-10:]:  # Limit to last 10 messages
-                    messages.append({
-                        "role": "user" if msg["role"] == "user" else "assistant",
-                        "content": msg["content"]
-                    })
-            
-            # Add current user message
-            messages.append({"role": "user", "content": user_message})
-            
-            # Generate response
-            response = self.openai_client.chat.completions.create(
+            client = await self.get_async_client()
+            response = await client.chat.completions.create(
                 model=self.model,
-                messages=messages,
-                max_tokens=800,
+                messages=prompt.messages,
+                max_tokens=CHAT_COMPLETION_TOKENS,
                 temperature=0.7,
                 stream=False
             )
-            
-            # Calculate response time and token usage
-            end_time = datetime.utcnow()
-            response_time_ms = int((end_time - start_time).total_seconds() * 1000)
-            tokens_used = response.usage.total_tokens if response.usage else None
-            
-            ai_response = response.choices[0].message.content
-            
-            # Log successful interaction
-            self._log_chat_interaction(
-                case_id=case_id,
-                user_message=user_message,
-                ai_response=ai_response,
-                session_id=session_id,
-                user_id=user_id,
-                response_time_ms=response_time_ms,
-                tokens_used=tokens_used
-            )
-            
-            # Log usage statistics
-            if tokens_used:
-                self._log_usage_statistics(case_id, session_id, tokens_used, response_time_ms)
-                
-                # Track usage for billing
-                self.usage_service.track_ai_usage(
-                    user_id=user_id,
-                    session_id=session_id,
-                    endpoint="/api/ai-chat/message",
-                    ai_model=self.model,
-                    prompt_tokens=response.usage.prompt_tokens if response.usage else 0,
-                    completion_tokens=response.usage.completion_tokens if response.usage else 0,
-                    response_time_ms=response_time_ms,
-                    query=user_message
-                )
-            
-            return {
-                "success": True,
-                "response": ai_response,
-                "case_context": case_context,
-                "timestamp": datetime.utcnow().isoformat(),
-                "response_time_ms": response_time_ms,
-                "tokens_used": tokens_used
-            }
-            
         except Exception as e:
             error = f"Failed to generate AI response: {str(e)}"
-            end_time = datetime.utcnow()
-            response_time_ms = int((end_time - start_time).total_seconds() * 1000)
-            
-            # Log error interaction
-            self._log_chat_interaction(
-                case_id=case_id,
-                user_message=user_message,
-                ai_response=None,
-                session_id=session_id,
-                user_id=user_id,
-                response_time_ms=response_time_ms,
-                error=error
-            )
-            
+            response_time_ms = int((time.monotonic() - started) * 1000)
             ai_chat_logger.error(f"Error generating AI response: {e}")
+            schedule_chat_interaction_record(self._interaction_log(
+                case_id, user_message, None, session_id, user_id, response_time_ms, error=error
+            ))
             return {
                 "success": False,
                 "error": error,
                 "timestamp": datetime.utcnow().isoformat(),
                 "response_time_ms": response_time_ms
             }
+        
+        response_time_ms = int((time.monotonic() - started) * 1000)
+        ai_response = response.choices[0].message.content
+        usage = response.usage
+        tokens_used = usage.total_tokens if usage else None
+        schedule_chat_interaction_record(
+            self._interaction_log(case_id, user_message, ai_response, session_id, user_id,
+                                  response_time_ms, tokens_used),
+            self._usage_record(user_id, session_id, "/api/ai-chat/message", user_message,
+                               usage.prompt_tokens if usage else None,
+                               usage.completion_tokens if usage else None, response_time_ms)
+        )
+        return {
+            "success": True,
+            "response": ai_response,
+            "case_context": case_context,
+            "timestamp": datetime.utcnow().isoformat(),
+            "response_time_ms": response_time_ms,
+            "tokens_used": tokens_used,
+            "prompt_tokens": prompt.token_counts
+        }
+    
+    async def astream_ai_response(self, case_id: int, user_message: str, chat_history: List[Dict] = None,
+                                  session_id: str = None, user_id: str = None,
+                                  chat_session=None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a response as events: ``{"type": "token", "content": ...}`` per delta, then one
+        ``{"type": "done", "response": <full text>, ...}`` or ``{"type": "error", "error": ...}``.
+        """
+        started = time.monotonic()
+        snapshot = await run_in_threadpool(self.get_case_context_snapshot, case_id, chat_session)
+        case_context = snapshot["context"]
+        if "error" in case_context:
+            yield {"type": "error", "error": case_context["error"]}
+            return
+        
+        prompt = self.build_chat_prompt(case_context, user_message, chat_history, snapshot.get("system_prompt"))
+        parts: List[str] = []
+        usage = None
+        try:
+            client = await self.get_async_client()
+            stream = await client.chat.completions.create(
+                model=self.model,
+                messages=prompt.messages,
+                max_tokens=CHAT_COMPLETION_TOKENS,
+                temperature=0.7,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield {"type": "token", "content": delta}
+        except Exception as e:
+            error = f"Failed to generate AI response: {str(e)}"
+            response_time_ms = int((time.monotonic() - started) * 1000)
+            ai_chat_logger.error(f"Error streaming AI response: {e}")
+            schedule_chat_interaction_record(self._interaction_log(
+                case_id, user_message, "".join(parts) or None, session_id, user_id, response_time_ms, error=error
+            ))
+            yield {"type": "error", "error": error}
+            return
+        
+        ai_response = "".join(parts)
+        response_time_ms = int((time.monotonic() - started) * 1000)
+        tokens_used = usage.total_tokens if usage else None
+        schedule_chat_interaction_record(
+            self._interaction_log(case_id, user_message, ai_response, session_id, user_id,
+                                  response_time_ms, tokens_used),
+            self._usage_record(user_id, session_id, "/api/ai-chat/message/stream", user_message,
+                               usage.prompt_tokens if usage else None,
+                               usage.completion_tokens if usage else None, response_time_ms)
+        )
+        yield {
+            "type": "done",
+            "response": ai_response,
+            "timestamp": datetime.utcnow().isoformat(),
+            "response_time_ms": response_time_ms,
+            "tokens_used": tokens_used,
+            "prompt_tokens": prompt.token_counts
+        }
     
     def _get_region_name(self, region_code: str) -> str:
         """Convert region code to full region name"""
@@ -470,8 +647,12 @@ Always base your responses on the specific case details provided and Ghanaian la
         
         return "\n".join(formatted)
     
-    def generate_case_summary(self, case_id: int, session_id: str = None, user_id: str = None) -> Dict[str, Any]:
-        """Generate a comprehensive case summary for quick reference"""
+    def generate_case_summary(self, case_id: int, session_id: str = None, user_id: str = None,
+                              use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Generate a comprehensive case summary for quick reference. Summaries are cached
+        by model and prompt content; ``use_cache=False`` forces a fresh completion.
+        """
         start_time = datetime.utcnow()
         response_time_ms = None
         tokens_used = None
@@ -508,22 +689,35 @@ Parties: {case_context.get('protagonist', 'N/A')} vs {case_context.get('antagoni
 Area of Law: {case_context.get('area_of_law', 'N/A')}
 Court: {case_context.get('court_type', 'N/A')}"""
             
-            response = self.openai_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Please provide a comprehensive summary of this case: {case_context.get('case_summary', 'N/A')}"}
-                ],
-                max_tokens=600,
-                temperature=0.7
+            user_prompt = f"Please provide a comprehensive summary of this case: {case_context.get('case_summary', 'N/A')}"
+            
+            usage = {}
+            
+            def complete():
+                response = self.openai_client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    max_tokens=600,
+                    temperature=0.7
+                )
+                if response.usage:
+                    usage.update(prompt_tokens=response.usage.prompt_tokens,
+                                 completion_tokens=response.usage.completion_tokens,
+                                 total_tokens=response.usage.total_tokens)
+                return response.choices[0].message.content, response.usage
+            
+            summary, cache_hit = cached_llm_call(
+                "ai_chat.case_summary", CASE_SUMMARY_PROMPT_VERSION, self.model,
+                f"{system_prompt}\n{user_prompt}", complete, bypass=not use_cache
             )
             
-            # Calculate response time and token usage
+            # Calculate response time and token usage (a cached summary costs no tokens)
             end_time = datetime.utcnow()
             response_time_ms = int((end_time - start_time).total_seconds() * 1000)
-            tokens_used = response.usage.total_tokens if response.usage else None
-            
-            summary = response.choices[0].message.content
+            tokens_used = usage.get("total_tokens")
             
             # Log successful summary generation
             self._log_chat_interaction(
@@ -546,8 +740,8 @@ Court: {case_context.get('court_type', 'N/A')}"""
                     session_id=session_id,
                     endpoint="/api/ai-chat/case-summary",
                     ai_model=self.model,
-                    prompt_tokens=response.usage.prompt_tokens if response.usage else 0,
-                    completion_tokens=response.usage.completion_tokens if response.usage else 0,
+                    prompt_tokens=usage.get("prompt_tokens", 0),
+                    completion_tokens=usage.get("completion_tokens", 0),
                     response_time_ms=response_time_ms,
                     query="Generate case summary"
                 )
@@ -557,7 +751,8 @@ Court: {case_context.get('court_type', 'N/A')}"""
                 "summary": summary,
                 "timestamp": datetime.utcnow().isoformat(),
                 "response_time_ms": response_time_ms,
-                "tokens_used": tokens_used
+                "tokens_used": tokens_used,
+                "cached": cache_hit
             }
             
         except Exception as e:
@@ -584,3 +779,41 @@ Court: {case_context.get('court_type', 'N/A')}"""
                 "response_time_ms": response_time_ms
             }
 
+
+def record_chat_interaction(log_data: Dict, usage: Optional[Dict] = None) -> None:
+    """
+    Write the interaction log line and billing usage with a dedicated session.
+    Runs in a worker thread once the response has been produced.
+    """
+    ai_chat_logger.info(f"AI_CHAT_INTERACTION: {json.dumps(log_data)}")
+    if not usage:
+        return
+    db = SessionLocal()
+    try:
+        UsageTrackingService(db).track_ai_usage(**usage)
+    except Exception as e:
+        ai_chat_logger.error(f"Error recording chat usage: {e}")
+    finally:
+        db.close()
+
+
+# Strong references to fire-and-forget recording tasks until they finish
+_pending_records = set()
+
+
+def schedule_chat_interaction_record(log_data: Dict, usage: Optional[Dict] = None) -> None:
+    """Run record_chat_interaction in the thread pool without awaiting it"""
+    task = asyncio.get_running_loop().create_task(
+        run_in_threadpool(record_chat_interaction, log_data, usage)
+    )
+    _pending_records.add(task)
+    task.add_done_callback(_pending_records.discard)
+
+
+async def drain_chat_interaction_records(timeout: float = 10.0) -> None:
+    """Wait (at most ``timeout`` seconds) for scheduled records to be written; called at shutdown"""
+    if not _pending_records:
+        return
+    done, pending = await asyncio.wait(set(_pending_records), timeout=timeout)
+    if pending:
+        ai_chat_logger.warning(f"{len(pending)} chat usage records were still being written at shutdown")
@@ -5,6 +5,11 @@ import json
 import re
 from sqlalchemy.orm import Session
 from models.settings import Settings
+from services.llm_cache_service import cached_llm_call
+
+AI_MODEL = "gpt-3.5-turbo"
+# Bump when a prompt or its output parsing changes so cached responses are not reused
+PROMPT_VERSION = "v1"
 
 # Initialize OpenAI client with error handling
 def get_openai_client(db: Session = None):
@@ -25,9 +30,10 @@ def get_openai_client(db: Session = None):
 
 class AIService:
     @staticmethod
-    def generate_case_summary(case_data: Dict[str, Any], db: Session = None) -> Dict[str, Any]:
+    def generate_case_summary(case_data: Dict[str, Any], db: Session = None, use_cache: bool = True) -> Dict[str, Any]:
         """
-        Generate AI-powered case summary and analysis
+        Generate AI-powered case summary and analysis.
+        Responses are cached by prompt content; ``use_cache=False`` forces a fresh call.
         """
         try:
             # Extract key information from case data
@@ -81,19 +87,22 @@ class AIService:
             Make the analysis professional, detailed, and legally relevant.
             """
             
-            client = get_openai_client(db)
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a legal AI assistant specializing in case analysis and legal document summarization."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2000,
-                temperature=0.3
-            )
+            def complete():
+                client = get_openai_client(db)
+                response = client.chat.completions.create(
+                    model=AI_MODEL,
+                    messages=[
+                        {"role": "system", "content": "You are a legal AI assistant specializing in case analysis and legal document summarization."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=2000,
+                    temperature=0.3
+                )
+                return response.choices[0].message.content.strip(), response.usage
             
             # Parse the AI response
-            ai_content = response.choices[0].message.content.strip()
+            ai_content, _ = cached_llm_call("ai_service.case_summary", PROMPT_VERSION, AI_MODEL, prompt,
+                                            complete, bypass=not use_cache)
             
             # Try to extract JSON from the response
             try:
@@ -130,7 +139,7 @@ class AIService:
             }
     
     @staticmethod
-    def extract_entities_from_case(case_data: Dict[str, Any], db: Session = None) -> Dict[str, Any]:
+    def extract_entities_from_case(case_data: Dict[str, Any], db: Session = None, use_cache: bool = True) -> Dict[str, Any]:
         """
         Extract entities (people, companies, banks, insurance) from case data
         """
@@ -171,18 +180,21 @@ class AIService:
             Only include clearly identifiable entities. If none found, use empty arrays.
             """
             
-            client = get_openai_client(db)
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an AI assistant specialized in extracting legal entities from case documents."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1000,
-                temperature=0.2
-            )
+            def complete():
+                client = get_openai_client(db)
+                response = client.chat.completions.create(
+                    model=AI_MODEL,
+                    messages=[
+                        {"role": "system", "content": "You are an AI assistant specialized in extracting legal entities from case documents."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=1000,
+                    temperature=0.2
+                )
+                return response.choices[0].message.content.strip(), response.usage
             
-            ai_content = response.choices[0].message.content.strip()
+            ai_content, _ = cached_llm_call("ai_service.entities", PROMPT_VERSION, AI_MODEL, prompt,
+                                            complete, bypass=not use_cache)
             
             try:
                 json_match = re.search(r'\{.*\}', ai_content, re.DOTALL)
@@ -223,7 +235,7 @@ class AIService:
             client = get_openai_client(db)
             
             response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
+                model=AI_MODEL,
                 messages=[
                     {"role": "system", "content": "You are a legal AI assistant specialized in analyzing legal documents and extracting structured information."},
                     {"role": "user", "content": prompt}
@@ -239,7 +251,7 @@ class AIService:
             return ""
 
     @staticmethod
-    def generate_legal_keywords(case_data: Dict[str, Any], db: Session = None) -> str:
+    def generate_legal_keywords(case_data: Dict[str, Any], db: Session = None, use_cache: bool = True) -> str:
         """
         Generate relevant legal keywords and phrases for the case
         """
@@ -268,18 +280,21 @@ class AIService:
             Focus on terms that would be useful for legal research and case categorization.
             """
             
-            client = get_openai_client(db)
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a legal research assistant specializing in keyword generation for case law."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=500,
-                temperature=0.3
-            )
+            def complete():
+                client = get_openai_client(db)
+                response = client.chat.completions.create(
+                    model=AI_MODEL,
+                    messages=[
+                        {"role": "system", "content": "You are a legal research assistant specializing in keyword generation for case law."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=500,
+                    temperature=0.3
+                )
+                return response.choices[0].message.content.strip(), response.usage
             
-            keywords = response.choices[0].message.content.strip()
+            keywords, _ = cached_llm_call("ai_service.legal_keywords", PROMPT_VERSION, AI_MODEL, prompt,
+                                          complete, bypass=not use_cache)
             return keywords
             
         except Exception as e:
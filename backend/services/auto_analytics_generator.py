@@ -5,12 +5,14 @@ from typing import Dict, List, Any, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc, asc
+from sqlalchemy import and_, func, desc, asc
 from models.people import People
 from models.reported_cases import ReportedCases
 from models.person_analytics import PersonAnalytics
 from models.person_case_statistics import PersonCaseStatistics
 from models.gazette import Gazette
+from services.case_entity_linker import PERSON, get_linked_cases
+from services.keyword_matcher import KeywordHits, KeywordMatcher
 import json
 import logging
 
@@ -45,6 +47,18 @@ class AutoAnalyticsGenerator:
             'Constitutional': ['constitution', 'human rights', 'fundamental rights', 'election', 'constitutional'],
             'Administrative': ['administrative', 'public body', 'government', 'permit', 'license', 'administrative']
         }
+        
+        self.financial_keywords = ['damages', 'compensation', 'fine', 'penalty', 'costs', 'fees', 'restitution', 'recovery']
+        
+        # All dictionaries compiled once; each case is scanned once (services/keyword_matcher.py)
+        self.keyword_matcher = KeywordMatcher({
+            'risk': {category: data['keywords'] for category, data in self.risk_keywords.items()},
+            'subject': self.subject_categories,
+            'financial_terms': self.financial_keywords,
+            'criminal_issues': ['murder', 'theft', 'assault'],
+            'fraud_issues': ['fraud', 'deception'],
+        })
+        self._case_hits_cache: Dict[int, KeywordHits] = {}
 
     def generate_analytics_for_person(self, person_id: int) -> Dict[str, Any]:
         """Generate comprehensive analytics for a person based on their cases"""
@@ -78,34 +92,12 @@ class AutoAnalyticsGenerator:
             raise
 
     def get_person_cases(self, person_id: int) -> List[ReportedCases]:
-        """Get all cases related to a person"""
-        # Search for cases by person name in various fields
+        """Get all cases related to a person (precomputed case_entity_links)"""
         person = self.db.query(People).filter(People.id == person_id).first()
         if not person:
             return []
         
-        # Search in case titles, parties, and other relevant fields
-        search_terms = [person.full_name]
-        if person.first_name and person.last_name:
-            search_terms.extend([person.first_name, person.last_name])
-        
-        cases = []
-        for term in search_terms:
-            if term:
-                case_results = self.db.query(ReportedCases).filter(
-                    or_(
-                        ReportedCases.title.ilike(f"%{term}%"),
-                        ReportedCases.antagonist.ilike(f"%{term}%"),
-                        ReportedCases.protagonist.ilike(f"%{term}%"),
-                        ReportedCases.presiding_judge.ilike(f"%{term}%"),
-                        ReportedCases.decision.ilike(f"%{term}%")
-                    )
-                ).all()
-                cases.extend(case_results)
-        
-        # Remove duplicates
-        unique_cases = list({case.id: case for case in cases}.values())
-        return unique_cases
+        return get_linked_cases(self.db, PERSON, person_id)
 
     def calculate_comprehensive_analytics(self, person: People, cases: List[ReportedCases]) -> Dict[str, Any]:
         """Calculate comprehensive analytics for a person"""
@@ -163,14 +155,10 @@ class AutoAnalyticsGenerator:
         risk_factors = []
         
         for case in cases:
-            case_text = f"{case.title or ''} {case.antagonist or ''} {case.protagonist or ''} {case.decision or ''}".lower()
-            
-            for category, data in self.risk_keywords.items():
-                for keyword in data['keywords']:
-                    if keyword in case_text:
-                        total_score += data['weight']
-                        if category not in risk_factors:
-                            risk_factors.append(category)
+            for category, keywords in self._case_hits(case).categories('risk').items():
+                total_score += self.risk_keywords[category]['weight'] * len(keywords)
+                if category not in risk_factors:
+                    risk_factors.append(category)
         
         # Normalize score to 0-100
         max_possible_score = len(cases) * 10  # Assuming max weight is 10
@@ -217,11 +205,9 @@ class AutoAnalyticsGenerator:
                         continue
             
             # Extract financial terms
-            financial_keywords = ['damages', 'compensation', 'fine', 'penalty', 'costs', 'fees', 'restitution', 'recovery']
-            for keyword in financial_keywords:
-                if keyword.lower() in case_text.lower():
-                    if keyword not in financial_terms:
-                        financial_terms.append(keyword)
+            for keyword in self._case_hits(case).terms('financial_terms'):
+                if keyword not in financial_terms:
+                    financial_terms.append(keyword)
         
         average_value = total_amount / len(cases) if cases else Decimal('0.00')
         return total_amount, average_value, financial_terms
@@ -232,24 +218,18 @@ class AutoAnalyticsGenerator:
         legal_issues = []
         
         for case in cases:
-            case_text = f"{case.title or ''} {case.antagonist or ''} {case.protagonist or ''} {case.decision or ''}".lower()
+            hits = self._case_hits(case)
             
-            for category, keywords in self.subject_categories.items():
-                score = 0
-                for keyword in keywords:
-                    if keyword in case_text:
-                        score += 1
+            for category, score in hits.counts('subject').items():
+                category_scores[category] = category_scores.get(category, 0) + score
                 
-                if score > 0:
-                    category_scores[category] = category_scores.get(category, 0) + score
-                    
-                    # Extract specific legal issues
-                    if category == 'Criminal' and any(k in case_text for k in ['murder', 'theft', 'assault']):
-                        legal_issues.extend(['Criminal Offense', 'Legal Violation'])
-                    elif category == 'Fraud' and any(k in case_text for k in ['fraud', 'deception']):
-                        legal_issues.extend(['Fraud', 'Deception'])
-                    elif category == 'Contract Dispute':
-                        legal_issues.extend(['Contract Breach', 'Commercial Dispute'])
+                # Extract specific legal issues
+                if category == 'Criminal' and hits.any('criminal_issues'):
+                    legal_issues.extend(['Criminal Offense', 'Legal Violation'])
+                elif category == 'Fraud' and hits.any('fraud_issues'):
+                    legal_issues.extend(['Fraud', 'Deception'])
+                elif category == 'Contract Dispute':
+                    legal_issues.extend(['Contract Breach', 'Commercial Dispute'])
         
         # Determine primary subject matter
         primary_subject = max(category_scores.items(), key=lambda x: x[1])[0] if category_scores else "General"
@@ -260,6 +240,14 @@ class AutoAnalyticsGenerator:
         
         return primary_subject, subject_categories, list(set(legal_issues))
 
+    def _case_hits(self, case: ReportedCases) -> KeywordHits:
+        """Keyword hits of a case's title, parties and decision, scanned once per generator"""
+        hits = self._case_hits_cache.get(case.id)
+        if hits is None:
+            case_text = f"{case.title or ''} {case.antagonist or ''} {case.protagonist or ''} {case.decision or ''}"
+            hits = self._case_hits_cache[case.id] = self.keyword_matcher.scan(case_text)
+        return hits
+
     def calculate_case_complexity(self, cases: List[ReportedCases]) -> int:
         """Calculate case complexity score"""
         if not cases:
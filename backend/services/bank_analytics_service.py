@@ -1,14 +1,15 @@
 import os
 import openai
 import re
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 from decimal import Decimal
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 from models.banks import Banks
 from models.reported_cases import ReportedCases
 from models.bank_analytics import BankAnalytics
 from models.bank_case_statistics import BankCaseStatistics
+from services.keyword_matcher import KeywordHits, KeywordMatcher
+from services.case_entity_linker import BANK, get_linked_cases
 import json
 
 class BankAnalyticsService:
@@ -41,6 +42,43 @@ class BankAnalyticsService:
             'Employment': ['employment dispute', 'labor law', 'workplace harassment', 'discrimination'],
             'Property & Assets': ['real estate', 'property management', 'asset recovery', 'foreclosure']
         }
+        
+        self.financial_term_keywords = [
+            'loan', 'credit', 'mortgage', 'deposit', 'withdrawal', 'interest',
+            'principal', 'collateral', 'default', 'foreclosure', 'bankruptcy',
+            'insolvency', 'debt', 'payment', 'installment', 'refinance'
+        ]
+        
+        self.legal_issue_keywords = [
+            'breach of contract', 'negligence', 'fraud', 'misrepresentation',
+            'violation', 'non-compliance', 'default', 'breach', 'liability',
+            'damages', 'injunction', 'specific performance', 'restitution'
+        ]
+        
+        self.favorable_indicators = [
+            'granted', 'allowed', 'successful', 'won', 'victory', 'favor',
+            'upheld', 'dismissed', 'withdrawn', 'settled favorably'
+        ]
+        
+        self.unfavorable_indicators = [
+            'denied', 'rejected', 'failed', 'lost', 'defeat', 'against',
+            'overruled', 'quashed', 'reversed', 'appeal dismissed'
+        ]
+        
+        # All dictionaries compiled once; each case text is scanned once (services/keyword_matcher.py)
+        self.keyword_matcher = KeywordMatcher({
+            'risk': {category: data['keywords'] for category, data in self.risk_keywords.items()},
+            'subject': self.subject_categories,
+            'financial_terms': self.financial_term_keywords,
+            'legal_issues': self.legal_issue_keywords,
+            'favorable': self.favorable_indicators,
+            'unfavorable': self.unfavorable_indicators,
+            'complexity': ['appeal', 'supreme court'],
+            'regulatory_metric': ['regulatory', 'compliance', 'license', 'penalty', 'violation'],
+            'customer_metric': ['customer', 'complaint', 'service', 'account', 'unauthorized'],
+            'operational_metric': ['system', 'failure', 'breach', 'error', 'operational'],
+        })
+        self._case_hits_cache: Dict[int, KeywordHits] = {}
 
     def calculate_risk_score(self, cases: List[ReportedCases]) -> Tuple[int, str, List[str]]:
         """Calculate risk score based on case analysis for banks"""
@@ -51,20 +89,13 @@ class BankAnalyticsService:
         risk_factors = []
         
         for case in cases:
-            case_text = self._get_case_text(case)
             case_score = 0
             case_risk_factors = []
             
-            # Analyze case content for risk factors
-            for category, data in self.risk_keywords.items():
-                weight = data['weight']
-                keywords = data['keywords']
-                
-                for keyword in keywords:
-                    if keyword.lower() in case_text.lower():
-                        case_score += weight
-                        case_risk_factors.append(f"{category}: {keyword}")
-                        break
+            # Analyze case content for risk factors (first keyword found per category)
+            for category, keywords in self._case_hits(case).categories('risk').items():
+                case_score += self.risk_keywords[category]['weight']
+                case_risk_factors.append(f"{category}: {keywords[0]}")
             
             total_score += case_score
             risk_factors.extend(case_risk_factors)
@@ -102,7 +133,7 @@ class BankAnalyticsService:
                 total_amount += sum(amounts)
             
             # Extract financial terms
-            financial_terms.extend(self._extract_financial_terms(case_text))
+            financial_terms.extend(self._extract_financial_terms(self._case_hits(case)))
         
         average_amount = total_amount / len(cases) if cases else Decimal('0.00')
         
@@ -127,16 +158,14 @@ class BankAnalyticsService:
         legal_issues = []
         
         for case in cases:
-            case_text = self._get_case_text(case)
+            hits = self._case_hits(case)
             
             # Count subject matter categories
-            for category, keywords in self.subject_categories.items():
-                count = sum(1 for keyword in keywords if keyword.lower() in case_text.lower())
-                if count > 0:
-                    category_counts[category] = category_counts.get(category, 0) + count
+            for category, count in hits.counts('subject').items():
+                category_counts[category] = category_counts.get(category, 0) + count
             
             # Extract legal issues
-            legal_issues.extend(self._extract_legal_issues(case_text))
+            legal_issues.extend(self._extract_legal_issues(hits))
         
         # Determine primary subject matter
         primary_subject = max(category_counts.items(), key=lambda x: x[1])[0] if category_counts else "N/A"
@@ -167,7 +196,8 @@ class BankAnalyticsService:
             case_text = self._get_case_text(case)
             if len(case_text) > 5000:  # Long cases are more complex
                 complexity += 5
-            if 'appeal' in case_text.lower() or 'supreme court' in case_text.lower():
+            hits = self._case_hits(case)
+            if 'appeal' in hits or 'supreme court' in hits:
                 complexity += 8
             
             total_complexity += complexity
@@ -190,8 +220,7 @@ class BankAnalyticsService:
                 total_resolved += 1
             else:
                 # Analyze case content for outcome indicators
-                case_text = self._get_case_text(case)
-                if self._is_favorable_outcome(case_text):
+                if self._is_favorable_outcome(self._case_hits(case)):
                     favorable_cases += 1
                 total_resolved += 1
         
@@ -217,20 +246,18 @@ class BankAnalyticsService:
         
         for case in cases:
             case_text = self._get_case_text(case)
+            hits = self._case_hits(case)
             
             # Regulatory compliance
-            regulatory_keywords = ['regulatory', 'compliance', 'license', 'penalty', 'violation']
-            if any(keyword in case_text.lower() for keyword in regulatory_keywords):
+            if hits.any('regulatory_metric'):
                 regulatory_issues += 1
             
             # Customer disputes
-            customer_keywords = ['customer', 'complaint', 'service', 'account', 'unauthorized']
-            if any(keyword in case_text.lower() for keyword in customer_keywords):
+            if hits.any('customer_metric'):
                 customer_disputes += 1
             
             # Operational risk
-            operational_keywords = ['system', 'failure', 'breach', 'error', 'operational']
-            if any(keyword in case_text.lower() for keyword in operational_keywords):
+            if hits.any('operational_metric'):
                 operational_issues += 1
             
             # Credit risk exposure
@@ -372,41 +399,12 @@ class BankAnalyticsService:
             return None
 
     def _get_bank_cases(self, bank_id: int) -> List[ReportedCases]:
-        """Get cases related to a bank"""
-        # This is a simplified implementation
-        # In reality, you'd need to match bank names with case parties
+        """Get cases naming a bank or one of its previous names (precomputed case_entity_links)"""
         bank = self.db.query(Banks).filter(Banks.id == bank_id).first()
         if not bank:
             return []
         
-        # Create search terms including bank name and previous names
-        search_terms = [bank.name]
-        if bank.previous_names:
-            if isinstance(bank.previous_names, list):
-                search_terms.extend(bank.previous_names)
-            elif isinstance(bank.previous_names, str):
-                # Handle comma-separated string format
-                search_terms.extend([name.strip() for name in bank.previous_names.split(',')])
-        
-        # Build search conditions for all variations
-        conditions = []
-        for term in search_terms:
-            if term:  # Skip empty terms
-                conditions.extend([
-                    ReportedCases.title.ilike(f"%{term}%"),
-                    ReportedCases.protagonist.ilike(f"%{term}%"),
-                    ReportedCases.antagonist.ilike(f"%{term}%")
-                ])
-        
-        # Search for cases where any bank name variation appears
-        if conditions:
-            cases = self.db.query(ReportedCases).filter(
-                or_(*conditions)
-            ).all()
-        else:
-            cases = []
-        
-        return cases
+        return get_linked_cases(self.db, BANK, bank_id)
 
     def _get_case_text(self, case: ReportedCases) -> str:
         """Extract text content from a case"""
@@ -429,6 +427,16 @@ class BankAnalyticsService:
         
         return " ".join(text_parts)
 
+    def _case_hits(self, case: ReportedCases) -> KeywordHits:
+        """Keyword hits of a case, scanned once per service instance"""
+        hits = self._case_hits_cache.get(case.id)
+        if hits is None:
+            hits = self._case_hits_cache[case.id] = self.keyword_matcher.scan(self._get_case_text(case))
+        return hits
+
+    def _hits(self, text: Union[str, KeywordHits]) -> KeywordHits:
+        return text if isinstance(text, KeywordHits) else self.keyword_matcher.scan(text)
+
     def _extract_monetary_amounts(self, text: str) -> List[Decimal]:
         """Extract monetary amounts from text"""
         # Simple regex to find monetary amounts
@@ -453,50 +461,19 @@ class BankAnalyticsService:
         
         return amounts
 
-    def _extract_financial_terms(self, text: str) -> List[str]:
-        """Extract financial terms from text"""
-        financial_keywords = [
-            'loan', 'credit', 'mortgage', 'deposit', 'withdrawal', 'interest',
-            'principal', 'collateral', 'default', 'foreclosure', 'bankruptcy',
-            'insolvency', 'debt', 'payment', 'installment', 'refinance'
-        ]
-        
-        terms = []
-        for keyword in financial_keywords:
-            if keyword.lower() in text.lower():
-                terms.append(keyword)
-        
-        return terms
+    def _extract_financial_terms(self, text: Union[str, KeywordHits]) -> List[str]:
+        """Extract financial terms from text (or from keyword hits already scanned)"""
+        return self._hits(text).terms('financial_terms')
 
-    def _extract_legal_issues(self, text: str) -> List[str]:
-        """Extract legal issues from text"""
-        legal_keywords = [
-            'breach of contract', 'negligence', 'fraud', 'misrepresentation',
-            'violation', 'non-compliance', 'default', 'breach', 'liability',
-            'damages', 'injunction', 'specific performance', 'restitution'
-        ]
-        
-        issues = []
-        for keyword in legal_keywords:
-            if keyword.lower() in text.lower():
-                issues.append(keyword)
-        
-        return issues
+    def _extract_legal_issues(self, text: Union[str, KeywordHits]) -> List[str]:
+        """Extract legal issues from text (or from keyword hits already scanned)"""
+        return self._hits(text).terms('legal_issues')
 
-    def _is_favorable_outcome(self, text: str) -> bool:
+    def _is_favorable_outcome(self, text: Union[str, KeywordHits]) -> bool:
         """Determine if case outcome is favorable"""
-        favorable_indicators = [
-            'granted', 'allowed', 'successful', 'won', 'victory', 'favor',
-            'upheld', 'dismissed', 'withdrawn', 'settled favorably'
-        ]
-        
-        return any(indicator in text.lower() for indicator in favorable_indicators)
+        return self._hits(text).any('favorable')
 
-    def _is_unfavorable_outcome(self, text: str) -> bool:
+    def _is_unfavorable_outcome(self, text: Union[str, KeywordHits]) -> bool:
         """Determine if case outcome is unfavorable"""
-        unfavorable_indicators = [
-            'denied', 'rejected', 'failed', 'lost', 'defeat', 'against',
-            'overruled', 'quashed', 'reversed', 'appeal dismissed'
-        ]
-        
-        return any(indicator in text.lower() for indicator in unfavorable_indicators)
+        return self._hits(text).any('unfavorable')
+
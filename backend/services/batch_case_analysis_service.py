@@ -0,0 +1,339 @@
+"""
+Batch AI analysis of reported cases that have no ``ai_case_outcome`` yet.
+
+The runner walks reported_cases by keyset (``id > last_case_id``), sends each batch
+to the model with at most ``concurrency`` requests in flight and at most
+``requests_per_minute`` started per minute, and writes the batch back with one
+executemany UPDATE. The ``ai_batch_jobs`` checkpoint is committed in the same
+transaction, so after a crash the next run with the same ``job_name`` resumes
+after the last written batch.
+
+The prompt, response parsing, stored columns and LLM response cache entries are the
+ones of ``OnDemandAIAnalysis`` (services/on_demand_ai_analysis.py), so a backfill reuses
+analyses already cached by on-demand requests and fills the cache for them. The client
+is any object exposing an async ``chat.completions.create``: ``AsyncOpenAI`` (optionally
+pointed at a local endpoint with ``OPENAI_BASE_URL``) or ``StubLLMClient`` for dry runs,
+which should run with ``use_cache=False`` so stub answers never reach the cache.
+
+Cases whose request fails are counted and left unanalysed; run again with
+``restart=True`` to rescan from the first case and retry them.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import openai
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal
+from models.ai_batch_job import AIBatchJob
+from models.settings import Settings
+from services.llm_cache_service import acached_llm_call
+from services.on_demand_ai_analysis import (
+    ai_analyzer, UPDATE_ANALYSIS_SQL, ANALYSIS_CACHE_TEMPLATE, ANALYSIS_PROMPT_VERSION,
+    analysis_update_params, extract_analysis_json
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_NAME = "case_analysis_backfill"
+
+SELECT_UNANALYSED_SQL = text("""
+    SELECT id, title, decision, judgement, conclusion, case_summary,
+           area_of_law, protagonist, antagonist
+    FROM reported_cases
+    WHERE id > :last_id
+      AND (ai_case_outcome IS NULL OR ai_case_outcome = '')
+    ORDER BY id
+    LIMIT :limit
+""")
+
+
+class RateLimiter:
+    """Spaces request starts at least ``60 / requests_per_minute`` seconds apart"""
+
+    def __init__(self, requests_per_minute: Optional[int]):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class StubLLMClient:
+    """
+    Minimal stand-in for ``AsyncOpenAI``: answers every request with a fixed analysis
+    after ``latency`` seconds and reports token usage from the prompt length.
+    """
+
+    def __init__(self, analysis: Optional[Dict[str, str]] = None, latency: float = 0.0):
+        self.analysis = analysis or {
+            "case_outcome": "UNRESOLVED",
+            "court_orders": "Stub analysis",
+            "financial_impact": "UNRESOLVED - Stub analysis",
+            "detailed_outcome": "Stub analysis",
+        }
+        self.latency = latency
+        self.calls = 0
+        self.chat = self
+        self.completions = self
+
+    async def create(self, model: str, messages: List[Dict[str, str]], **kwargs):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        content = json.dumps(self.analysis)
+        prompt_tokens = sum(len(message["content"]) for message in messages) // 4
+        return _StubResponse(content, prompt_tokens, len(content) // 4)
+
+
+class _StubResponse:
+    def __init__(self, content: str, prompt_tokens: int, completion_tokens: int):
+        message = type("Message", (), {"content": content})()
+        self.choices = [type("Choice", (), {"message": message})()]
+        self.usage = type("Usage", (), {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        })()
+
+
+def create_async_client(db: Session):
+    """AsyncOpenAI with the API key from the settings table or OPENAI_API_KEY"""
+    setting = db.query(Settings).filter(Settings.key == "openai_api_key").first()
+    api_key = setting.value if setting and setting.value else os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OpenAI API key not found in database or environment variables")
+    return openai.AsyncOpenAI(api_key=api_key, base_url=settings.openai_base_url)
+
+
+class BatchCaseAnalysisRunner:
+    """Backfills AI case analyses in checkpointed batches"""
+
+    def __init__(self, client=None, session_factory: Callable[[], Session] = SessionLocal,
+                 model: str = "gpt-3.5-turbo", job_name: str = DEFAULT_JOB_NAME,
+                 batch_size: Optional[int] = None, concurrency: Optional[int] = None,
+                 requests_per_minute: Optional[int] = None, use_cache: bool = True):
+        self.client = client
+        self.use_cache = use_cache
+        self.session_factory = session_factory
+        self.model = model
+        self.job_name = job_name
+        self.batch_size = batch_size or settings.ai_batch_size
+        self.concurrency = concurrency or settings.ai_batch_concurrency
+        self.rate_limiter = RateLimiter(
+            requests_per_minute if requests_per_minute is not None else settings.ai_batch_requests_per_minute
+        )
+        # Prompt building and response parsing are shared with the on-demand analysis
+        self.analyzer = ai_analyzer
+        self.stats = {"processed": 0, "failed": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        self._started = None
+
+    # ------------------------------------------------------------------
+    # Checkpoint and database access (run in worker threads)
+    # ------------------------------------------------------------------
+
+    def _load_checkpoint(self, restart: bool) -> int:
+        db = self.session_factory()
+        try:
+            job = db.query(AIBatchJob).filter(AIBatchJob.job_name == self.job_name).first()
+            if job is None:
+                job = AIBatchJob(job_name=self.job_name, last_case_id=0, processed=0, failed=0,
+                                 prompt_tokens=0, completion_tokens=0)
+                db.add(job)
+            elif restart:
+                job.last_case_id = 0
+            job.status = "running"
+            job.finished_at = None
+            db.commit()
+            return job.last_case_id
+        finally:
+            db.close()
+
+    def _fetch_batch(self, last_id: int) -> List[Dict[str, Any]]:
+        db = self.session_factory()
+        try:
+            rows = db.execute(SELECT_UNANALYSED_SQL, {"last_id": last_id, "limit": self.batch_size})
+            return [dict(row._mapping) for row in rows]
+        finally:
+            db.close()
+
+    def _write_batch(self, last_id: int, results: List[Dict[str, Any]], failed: int,
+                     usage: Dict[str, int], last_error: Optional[str]) -> None:
+        """Store the analyses and advance the checkpoint in one transaction"""
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            if results:
+                db.execute(UPDATE_ANALYSIS_SQL, [
+                    analysis_update_params(result["case_id"], result["analysis"], now) for result in results
+                ])
+            job = db.query(AIBatchJob).filter(AIBatchJob.job_name == self.job_name).with_for_update().one()
+            job.last_case_id = last_id
+            job.processed = (job.processed or 0) + len(results)
+            job.failed = (job.failed or 0) + failed
+            job.prompt_tokens = (job.prompt_tokens or 0) + usage["prompt_tokens"]
+            job.completion_tokens = (job.completion_tokens or 0) + usage["completion_tokens"]
+            if last_error:
+                job.last_error = last_error[:2000]
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _finish(self, status: str, error: Optional[str] = None) -> None:
+        db = self.session_factory()
+        try:
+            job = db.query(AIBatchJob).filter(AIBatchJob.job_name == self.job_name).first()
+            if job is not None:
+                job.status = status
+                job.finished_at = datetime.now(timezone.utc)
+                if error:
+                    job.last_error = error[:2000]
+                db.commit()
+        finally:
+            db.close()
+
+    # ------------------------------------------------------------------
+    # Model calls
+    # ------------------------------------------------------------------
+
+    async def _analyze(self, case: Dict[str, Any], semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        case_content = self.analyzer.prepare_case_content(case)
+        if not case_content.strip():
+            return {"case_id": case["id"], "analysis": self.analyzer.get_default_analysis(), "usage": None}
+
+        usage = []
+
+        async def complete():
+            async with semaphore:
+                await self.rate_limiter.wait()
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=self.analyzer.build_analysis_messages(case_content),
+                    max_tokens=2000,
+                    temperature=0.2
+                )
+            usage.append(response.usage)
+            # Raises on an unparseable response, which keeps it out of the cache
+            return extract_analysis_json(response.choices[0].message.content), response.usage
+
+        try:
+            if self.use_cache:
+                analysis, _ = await acached_llm_call(ANALYSIS_CACHE_TEMPLATE, ANALYSIS_PROMPT_VERSION, self.model,
+                                                     case_content, complete)
+            else:
+                analysis, _ = await complete()
+        except Exception as e:
+            logger.warning(f"Analysis of case {case['id']} failed: {e}")
+            if usage:
+                # The model answered but not with JSON: store the default analysis as before
+                return {"case_id": case["id"], "analysis": self.analyzer.get_default_analysis(), "usage": usage[0]}
+            return {"case_id": case["id"], "error": str(e)}
+
+        # Cache hits cost no tokens
+        return {"case_id": case["id"], "analysis": analysis, "usage": usage[0] if usage else None}
+
+    # ------------------------------------------------------------------
+    # Run
+    # ------------------------------------------------------------------
+
+    def throughput(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        minutes = elapsed / 60 if elapsed else 0.0
+        tokens = self.stats["prompt_tokens"] + self.stats["completion_tokens"]
+        return dict(
+            self.stats,
+            job_name=self.job_name,
+            elapsed_seconds=round(elapsed, 1),
+            cases_per_minute=round(self.stats["processed"] / minutes, 1) if minutes else 0.0,
+            tokens_per_minute=round(tokens / minutes, 1) if minutes else 0.0,
+        )
+
+    async def run(self, limit: Optional[int] = None, restart: bool = False) -> Dict[str, Any]:
+        """Analyse up to ``limit`` unanalysed cases (all by default) and return throughput stats"""
+        if self.client is None:
+            db = self.session_factory()
+            try:
+                self.client = create_async_client(db)
+            finally:
+                db.close()
+
+        self._started = time.monotonic()
+        last_id = await asyncio.to_thread(self._load_checkpoint, restart)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        logger.info(f"Batch analysis '{self.job_name}' starting after case {last_id}")
+
+        try:
+            while limit is None or self.stats["processed"] + self.stats["failed"] < limit:
+                batch = await asyncio.to_thread(self._fetch_batch, last_id)
+                if limit is not None:
+                    batch = batch[:limit - self.stats["processed"] - self.stats["failed"]]
+                if not batch:
+                    break
+
+                outcomes = await asyncio.gather(*(self._analyze(case, semaphore) for case in batch))
+                results = [outcome for outcome in outcomes if "analysis" in outcome]
+                errors = [outcome["error"] for outcome in outcomes if "error" in outcome]
+                usage = {"prompt_tokens": 0, "completion_tokens": 0}
+                for result in results:
+                    if result["usage"]:
+                        usage["prompt_tokens"] += getattr(result["usage"], "prompt_tokens", 0) or 0
+                        usage["completion_tokens"] += getattr(result["usage"], "completion_tokens", 0) or 0
+
+                last_id = batch[-1]["id"]
+                await asyncio.to_thread(self._write_batch, last_id, results, len(errors), usage,
+                                        errors[-1] if errors else None)
+
+                self.stats["processed"] += len(results)
+                self.stats["failed"] += len(errors)
+                self.stats["prompt_tokens"] += usage["prompt_tokens"]
+                self.stats["completion_tokens"] += usage["completion_tokens"]
+                progress = self.throughput()
+                logger.info(
+                    f"Batch analysis '{self.job_name}' through case {last_id}: "
+                    f"{progress['processed']} analysed, {progress['failed']} failed, "
+                    f"{progress['cases_per_minute']} cases/min, {progress['tokens_per_minute']} tokens/min"
+                )
+        except Exception as e:
+            await asyncio.to_thread(self._finish, "failed", str(e))
+            raise
+
+        await asyncio.to_thread(self._finish, "completed")
+        return self.throughput()
+
+
+def get_batch_job_status(db: Session, job_name: str = DEFAULT_JOB_NAME) -> Optional[Dict[str, Any]]:
+    job = db.query(AIBatchJob).filter(AIBatchJob.job_name == job_name).first()
+    if job is None:
+        return None
+    return {
+        "job_name": job.job_name,
+        "status": job.status,
+        "last_case_id": job.last_case_id,
+        "processed": job.processed,
+        "failed": job.failed,
+        "prompt_tokens": job.prompt_tokens,
+        "completion_tokens": job.completion_tokens,
+        "last_error": job.last_error,
+        "started_at": job.started_at,
+        "updated_at": job.updated_at,
+        "finished_at": job.finished_at,
+    }
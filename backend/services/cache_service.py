@@ -0,0 +1,342 @@
+"""
+Pluggable response cache for dashboard and statistics endpoints.
+
+Backends:
+
+* ``InMemoryCache`` - per-process LRU with per-entry TTL (default).
+* ``RedisCache`` - shared across workers; enabled with ``CACHE_BACKEND=redis`` and
+  ``REDIS_URL``. Any object with redis-py's ``get/set/delete/scan_iter`` methods can
+  be passed as ``client`` (e.g. ``fakeredis.FakeRedis()`` in tests).
+
+Usage::
+
+    @router.get("/cases/stats")
+    @cached(CASE_STATS)
+    async def get_case_stats(db: Session = Depends(get_db)): ...
+
+    @router.post("/cases")
+    @invalidates(CASE_STATS, DASHBOARD_STATS)
+    async def create_case(...): ...
+
+Keys are ``<namespace>:<args>``; ``db``, ``current_user`` and ``self`` are never
+part of the key. With the in-memory backend invalidation only reaches the
+worker that handled the write, so TTLs bound staleness across workers.
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Namespaces shared by the cached readers and the write routes that invalidate them
+DASHBOARD_STATS = "admin_dashboard_stats"
+CASE_STATS = "case_stats"
+PEOPLE_STATS = "people_stats"
+COMPANIES_STATS = "companies_stats"
+GAZETTE_STATS = "gazette_statistics"
+CASE_CONTEXT = "case_context"
+LLM_RESPONSES = "llm_responses"
+
+# Arguments that identify the caller or connection rather than the result
+EXCLUDED_KEY_ARGS = {"self", "db", "current_user", "request", "background_tasks"}
+
+_MISSING = object()
+
+
+class CacheMetrics:
+    """Hit/miss counters per namespace"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def record(self, namespace: str, event: str) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(
+                namespace, {"hits": 0, "misses": 0, "sets": 0, "invalidations": 0}
+            )
+            counters[event] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for namespace, counters in self._counters.items():
+                lookups = counters["hits"] + counters["misses"]
+                result[namespace] = dict(counters, hit_rate=round(counters["hits"] / lookups, 4) if lookups else 0.0)
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+class CacheBackend:
+    """Interface every backend implements"""
+
+    name = "base"
+
+    def get(self, key: str) -> Any:
+        """Return the cached value or ``_MISSING``"""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix: str) -> int:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class InMemoryCache(CacheBackend):
+    """Thread-safe LRU cache with per-entry expiry"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete_prefix(self, prefix: str) -> int:
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> Optional[int]:
+        return len(self._entries)
+
+
+class RedisCache(CacheBackend):
+    """Redis-backed cache; values are pickled, keys share a common prefix"""
+
+    name = "redis"
+
+    def __init__(self, client=None, url: Optional[str] = None, key_prefix: str = "juridence:cache:"):
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise RuntimeError("redis package is not installed")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.key_prefix = key_prefix
+
+    def get(self, key: str) -> Any:
+        raw = self.client.get(self.key_prefix + key)
+        if raw is None:
+            return _MISSING
+        return pickle.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        self.client.set(self.key_prefix + key, pickle.dumps(value), ex=ttl)
+
+    def delete_prefix(self, prefix: str) -> int:
+        keys = list(self.client.scan_iter(match=f"{self.key_prefix}{prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        self.delete_prefix("")
+
+
+metrics = CacheMetrics()
+_backend: Optional[CacheBackend] = None
+_backend_lock = threading.Lock()
+
+
+def _create_backend() -> CacheBackend:
+    if settings.cache_backend == "redis" and settings.redis_url:
+        try:
+            backend = RedisCache(url=settings.redis_url)
+            backend.client.ping()
+            return backend
+        except Exception as e:
+            logger.warning(f"Redis cache unavailable ({e}); falling back to in-process cache")
+    return InMemoryCache(max_entries=settings.cache_max_entries)
+
+
+def get_cache() -> CacheBackend:
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _create_backend()
+    return _backend
+
+
+def set_cache(backend: Optional[CacheBackend]) -> None:
+    """Swap the process-wide backend (``None`` re-creates it from settings on next use)"""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+def make_key(namespace: str, func: Callable, args: tuple, kwargs: dict) -> str:
+    bound = inspect.signature(func).bind_partial(*args, **kwargs)
+    parts = [
+        f"{name}={value!r}"
+        for name, value in sorted(bound.arguments.items())
+        if name not in EXCLUDED_KEY_ARGS
+    ]
+    if not parts:
+        return f"{namespace}:"
+    digest = hashlib.sha1("&".join(parts).encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+def _lookup(namespace: str, key: str) -> Any:
+    if not settings.cache_enabled:
+        return _MISSING
+    try:
+        value = get_cache().get(key)
+    except Exception as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        return _MISSING
+    metrics.record(namespace, "hits" if value is not _MISSING else "misses")
+    return value
+
+
+def _store(namespace: str, key: str, value: Any, ttl: int) -> None:
+    if not settings.cache_enabled:
+        return
+    try:
+        get_cache().set(key, value, ttl)
+        metrics.record(namespace, "sets")
+    except Exception as e:
+        logger.warning(f"Cache write failed for {key}: {e}")
+
+
+def get_cached(namespace: str, key: str) -> Any:
+    """Value stored under ``<namespace>:<key>`` or None"""
+    value = _lookup(namespace, f"{namespace}:{key}")
+    return None if value is _MISSING else value
+
+
+def set_cached(namespace: str, key: str, value: Any, ttl: Optional[int] = None) -> None:
+    _store(namespace, f"{namespace}:{key}", value, ttl or settings.cache_default_ttl)
+
+
+def delete_cached_prefix(namespace: str, key_prefix: str) -> None:
+    """Drop the entries of ``namespace`` whose key starts with ``key_prefix``"""
+    try:
+        get_cache().delete_prefix(f"{namespace}:{key_prefix}")
+        metrics.record(namespace, "invalidations")
+    except Exception as e:
+        logger.warning(f"Cache invalidation failed for {namespace}:{key_prefix}: {e}")
+
+
+def cached(namespace: str, ttl: Optional[int] = None):
+    """Cache the return value of a sync or async function under ``namespace``"""
+    def decorator(func: Callable):
+        expiry = ttl or settings.cache_default_ttl
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key = make_key(namespace, func, args, kwargs)
+                value = _lookup(namespace, key)
+                if value is not _MISSING:
+                    return value
+                value = await func(*args, **kwargs)
+                _store(namespace, key, value, expiry)
+                return value
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(namespace, func, args, kwargs)
+            value = _lookup(namespace, key)
+            if value is not _MISSING:
+                return value
+            value = func(*args, **kwargs)
+            _store(namespace, key, value, expiry)
+            return value
+        return wrapper
+
+    return decorator
+
+
+def invalidate(*namespaces: str) -> None:
+    """Drop every cached entry in the given namespaces"""
+    for namespace in namespaces:
+        try:
+            get_cache().delete_prefix(f"{namespace}:")
+            metrics.record(namespace, "invalidations")
+        except Exception as e:
+            logger.warning(f"Cache invalidation failed for {namespace}: {e}")
+
+
+def invalidates(*namespaces: str):
+    """Invalidate ``namespaces`` after the decorated write handler returns successfully"""
+    def decorator(func: Callable):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                result = await func(*args, **kwargs)
+                invalidate(*namespaces)
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            invalidate(*namespaces)
+            return result
+        return wrapper
+
+    return decorator
+
+
+def cache_stats() -> Dict[str, Any]:
+    backend = get_cache()
+    return {
+        "backend": backend.name,
+        "enabled": settings.cache_enabled,
+        "entries": backend.size(),
+        "namespaces": metrics.snapshot(),
+    }
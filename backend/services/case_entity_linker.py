@@ -0,0 +1,488 @@
+"""
+Precomputed links between reported cases and the people, banks, companies and insurers
+they name.
+
+Person, bank, company and insurance analytics used to find an entity's cases with
+``ilike '%name%'`` over title, parties and decision text, one full scan of
+``reported_cases`` per entity. ``CaseEntityLinker`` instead loads the names of all
+entities into a ``NameTrie``, a token trie acting as a word-level multi-pattern
+automaton, and streams ``reported_cases`` once in keyset batches. For every case field
+it reports each entity whose name occurs there as a whole-word token sequence, and
+writes the matches to ``case_entity_links`` with the field and a confidence:
+
+* the field weight in ``FIELD_CONFIDENCE`` (parties highest, decision text lowest),
+* times ``ALIAS_CONFIDENCE`` for short, former and previous names and for company names
+  with their legal suffix dropped ("Ghana Commercial Bank Limited" -> "Ghana Commercial
+  Bank").
+
+Names are matched case-insensitively on whole tokens, so "Ama Owusu" no longer matches
+"Amankwah Owusu-Ansah". Person names need at least two tokens (salutations dropped);
+single-token organisation names (acronyms, short names) only match in the title and
+party fields.
+
+Analytics read links with ``get_linked_cases``, which never writes. ``case_entity_link_state``
+records which entities have been linked; an entity created after the last full run is
+handed to ``link_queue`` on first lookup, whose daemon thread links the entities queued
+since its last pass with its own session, one case scan per batch. Matching a case needs
+the names of all entities, which is too heavy for the web process, so the case routes
+only record new and edited cases with ``queue_case_links`` and
+``scripts/link_case_entities.py --queued`` re-links them on a schedule. Backlogs are
+linked by ``--unlinked`` or ``--case-id``, or by the next full run.
+"""
+
+import logging
+import queue
+import re
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import delete, exists, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, undefer_group
+
+from config import settings
+from database import SessionLocal
+from models.banks import Banks
+from models.case_entity_link import CaseEntityLink, CaseEntityLinkPending, CaseEntityLinkState
+from models.companies import Companies
+from models.insurance import Insurance
+from models.people import People
+from models.reported_cases import ReportedCases, BODY_COLUMN_GROUP
+from services.person_name_resolver import SALUTATIONS
+
+logger = logging.getLogger(__name__)
+
+PERSON = "person"
+BANK = "bank"
+COMPANY = "company"
+INSURANCE = "insurance"
+ENTITY_TYPES = (PERSON, BANK, COMPANY, INSURANCE)
+
+# Case fields searched per entity type (the fields the per-entity scans covered)
+ENTITY_FIELDS = {
+    PERSON: ("protagonist", "antagonist", "title", "lawyers", "presiding_judge", "decision"),
+    BANK: ("protagonist", "antagonist", "title"),
+    COMPANY: ("protagonist", "antagonist", "title"),
+    INSURANCE: ("title",),
+}
+FIELD_CONFIDENCE = {
+    "protagonist": 1.0,
+    "antagonist": 1.0,
+    "title": 0.9,
+    "lawyers": 0.7,
+    "presiding_judge": 0.7,
+    "decision": 0.5,
+}
+EXTRACTED_FIELD = "extracted"  # links recorded by case processing for the people it extracted
+ALIAS_CONFIDENCE = 0.9
+SINGLE_TOKEN_FIELDS = {"protagonist", "antagonist", "title"}
+MIN_SINGLE_TOKEN_LENGTH = 3
+CORPORATE_SUFFIXES = {"ltd", "limited", "plc", "inc", "llc", "co", "company", "gh"}
+
+_TOKEN = re.compile(r"\w+")
+
+MODELS = {BANK: Banks, COMPANY: Companies, INSURANCE: Insurance}
+
+
+def name_tokens(text: Optional[str]) -> List[str]:
+    return _TOKEN.findall((text or "").lower())
+
+
+def _name_list(value: Any) -> List[str]:
+    if isinstance(value, list):
+        return [str(name) for name in value if name]
+    if isinstance(value, str):
+        return [name.strip() for name in value.split(",") if name.strip()]
+    return []
+
+
+def entity_patterns(entity_type: str, names: Iterable[Tuple[str, float]]) -> Dict[Tuple[str, ...], Tuple[str, float]]:
+    """Token patterns of an entity's names -> (name, weight); the best weight wins per pattern"""
+    patterns: Dict[Tuple[str, ...], Tuple[str, float]] = {}
+
+    def add(tokens: List[str], name: str, weight: float) -> None:
+        key = tuple(tokens)
+        if key and (key not in patterns or patterns[key][1] < weight):
+            patterns[key] = (name, weight)
+
+    for name, weight in names:
+        tokens = name_tokens(name)
+        if entity_type == PERSON:
+            while len(tokens) > 1 and tokens[0] in SALUTATIONS:
+                tokens.pop(0)
+            if len(tokens) >= 2:
+                add(tokens, name, weight)
+            continue
+        if len(tokens) == 1 and len(tokens[0]) < MIN_SINGLE_TOKEN_LENGTH:
+            continue
+        add(tokens, name, weight)
+        stripped = list(tokens)
+        while len(stripped) > 1 and stripped[-1] in CORPORATE_SUFFIXES:
+            stripped.pop()
+        if len(stripped) < len(tokens) and (len(stripped) > 1 or len(stripped[0]) >= MIN_SINGLE_TOKEN_LENGTH):
+            add(stripped, name, weight * ALIAS_CONFIDENCE)
+    return patterns
+
+
+class NameTrie:
+    """Token trie over entity names; ``find`` reports every name occurring in a token sequence"""
+
+    _END = ""  # tokens are never empty, so this key cannot clash with a child
+
+    def __init__(self):
+        self.root: Dict[str, Any] = {}
+        self.patterns = 0
+
+    def add(self, tokens: Sequence[str], payload: Tuple) -> None:
+        node = self.root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(self._END, []).append(payload)
+        self.patterns += 1
+
+    def find(self, tokens: Sequence[str]) -> Iterator[Tuple[int, Tuple]]:
+        """(pattern length in tokens, payload) of every match, at every start position"""
+        root = self.root
+        count = len(tokens)
+        for start in range(count):
+            node = root.get(tokens[start])
+            end = start + 1
+            while node is not None:
+                payloads = node.get(self._END)
+                if payloads:
+                    length = end - start
+                    for payload in payloads:
+                        yield length, payload
+                if end >= count:
+                    break
+                node = node.get(tokens[end])
+                end += 1
+
+
+class CaseEntityLinker:
+    """Matches the names of the loaded entities against reported cases and stores the links"""
+
+    def __init__(self, db: Session, entity_types: Sequence[str] = ENTITY_TYPES,
+                 batch_size: Optional[int] = None):
+        self.db = db
+        self.entity_types = tuple(entity_types)
+        self.batch_size = batch_size or settings.case_link_batch_size
+        self.trie = NameTrie()
+        self.entity_ids: Dict[str, List[int]] = {entity_type: [] for entity_type in self.entity_types}
+        self.fields = [field for field in FIELD_CONFIDENCE
+                       if any(field in ENTITY_FIELDS[entity_type] for entity_type in self.entity_types)]
+
+    # -- automaton ------------------------------------------------------
+
+    def _entity_names(self, entity_type: str, ids: Optional[List[int]]) -> Iterator[Tuple[int, List[Tuple[str, float]]]]:
+        if entity_type == PERSON:
+            statement = select(People.id, People.full_name, People.first_name, People.last_name)
+            if ids is not None:
+                statement = statement.where(People.id.in_(ids))
+            for person_id, full_name, first_name, last_name in self.db.execute(
+                statement.execution_options(yield_per=self.batch_size)
+            ):
+                yield person_id, [(full_name, 1.0), (f"{first_name or ''} {last_name or ''}", 1.0)]
+            return
+
+        model = MODELS[entity_type]
+        statement = select(model.id, model.name, model.short_name, model.former_name, model.previous_names)
+        if ids is not None:
+            statement = statement.where(model.id.in_(ids))
+        for entity_id, name, short_name, former_name, previous_names in self.db.execute(
+            statement.execution_options(yield_per=self.batch_size)
+        ):
+            aliases = [short_name, former_name] + _name_list(previous_names)
+            yield entity_id, [(name, 1.0)] + [(alias, ALIAS_CONFIDENCE) for alias in aliases if alias]
+
+    def load(self, ids: Optional[Dict[str, List[int]]] = None) -> int:
+        """Add the names of all entities (or of ``ids`` per type) to the automaton"""
+        for entity_type in self.entity_types:
+            type_ids = ids.get(entity_type) if ids is not None else None
+            if ids is not None and not type_ids:
+                continue
+            for entity_id, names in self._entity_names(entity_type, type_ids):
+                self.entity_ids[entity_type].append(entity_id)
+                for tokens, (name, weight) in entity_patterns(entity_type, names).items():
+                    self.trie.add(tokens, (entity_type, entity_id, name, weight))
+        logger.info(
+            f"Case linker loaded {self.trie.patterns} name patterns for "
+            + ", ".join(f"{len(entity_ids)} {entity_type}" for entity_type, entity_ids in self.entity_ids.items())
+        )
+        return self.trie.patterns
+
+    # -- matching -------------------------------------------------------
+
+    def match_case(self, row: Any) -> List[Dict[str, Any]]:
+        """Link rows for one case row (id plus the searched fields)"""
+        best: Dict[Tuple[str, int, str], Tuple[float, str]] = {}
+        for field in self.fields:
+            tokens = name_tokens(getattr(row, field))
+            if not tokens:
+                continue
+            for length, (entity_type, entity_id, name, weight) in self.trie.find(tokens):
+                if field not in ENTITY_FIELDS[entity_type]:
+                    continue
+                if length == 1 and field not in SINGLE_TOKEN_FIELDS:
+                    continue
+                confidence = FIELD_CONFIDENCE[field] * weight
+                key = (entity_type, entity_id, field)
+                if key not in best or best[key][0] < confidence:
+                    best[key] = (confidence, name)
+        return [
+            {
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "case_id": row.id,
+                "match_field": field,
+                "matched_name": name[:500],
+                "confidence": round(confidence, 3),
+            }
+            for (entity_type, entity_id, field), (confidence, name) in best.items()
+        ]
+
+    def _case_batches(self, case_ids: Optional[List[int]] = None) -> Iterator[List[Any]]:
+        """Cases in keyset batches of ``batch_size``, only the columns the loaded types search"""
+        columns = [ReportedCases.id] + [getattr(ReportedCases, field) for field in self.fields]
+        last_id = 0
+        while True:
+            statement = select(*columns).where(ReportedCases.id > last_id)
+            if case_ids is not None:
+                statement = statement.where(ReportedCases.id.in_(case_ids))
+            rows = self.db.execute(statement.order_by(ReportedCases.id).limit(self.batch_size)).all()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1].id
+
+    def _insert_links(self, links: List[Dict[str, Any]]) -> None:
+        if links:
+            self.db.execute(insert(CaseEntityLink), links)
+
+    def _mark_linked(self) -> None:
+        now = datetime.now(timezone.utc)
+        for entity_type, entity_ids in self.entity_ids.items():
+            for start in range(0, len(entity_ids), self.batch_size):
+                statement = pg_insert(CaseEntityLinkState).values([
+                    {"entity_type": entity_type, "entity_id": entity_id, "linked_at": now}
+                    for entity_id in entity_ids[start:start + self.batch_size]
+                ])
+                self.db.execute(statement.on_conflict_do_update(
+                    index_elements=[CaseEntityLinkState.entity_type, CaseEntityLinkState.entity_id],
+                    set_={"linked_at": statement.excluded.linked_at}
+                ))
+
+    # -- runs -----------------------------------------------------------
+
+    def link_cases(self, case_ids: Optional[List[int]] = None) -> Dict[str, int]:
+        """
+        Re-link all cases (or ``case_ids``) against every loaded entity. Each batch
+        replaces the batch's links of the loaded entity types and is committed on its
+        own, so readers never see a case without links mid-run. A full run then marks
+        every loaded entity as linked. Call ``load()`` first, without ``ids``.
+        """
+        counts = {"cases": 0, "links": 0}
+        for rows in self._case_batches(case_ids):
+            links = [link for row in rows for link in self.match_case(row)]
+            self.db.execute(delete(CaseEntityLink).where(
+                CaseEntityLink.entity_type.in_(self.entity_types),
+                CaseEntityLink.match_field != EXTRACTED_FIELD,
+                CaseEntityLink.case_id.in_([row.id for row in rows])
+            ))
+            self._insert_links(links)
+            self.db.commit()
+            counts["cases"] += len(rows)
+            counts["links"] += len(links)
+            logger.info(f"Case linker: {counts['cases']} cases, {counts['links']} links")
+        if case_ids is None:
+            self._mark_linked()
+            self.db.commit()
+        return counts
+
+    def link_entities(self) -> Dict[str, int]:
+        """
+        Re-link the loaded entities (``load(ids=...)``) against all cases in one scan,
+        replacing their links, and mark them linked. Commits once at the end.
+        """
+        counts = {"cases": 0, "links": 0}
+        for entity_type, entity_ids in self.entity_ids.items():
+            if entity_ids:
+                self.db.execute(delete(CaseEntityLink).where(
+                    CaseEntityLink.entity_type == entity_type,
+                    CaseEntityLink.match_field != EXTRACTED_FIELD,
+                    CaseEntityLink.entity_id.in_(entity_ids)
+                ))
+        if self.trie.patterns:
+            for rows in self._case_batches():
+                links = [link for row in rows for link in self.match_case(row)]
+                self._insert_links(links)
+                counts["cases"] += len(rows)
+                counts["links"] += len(links)
+        self._mark_linked()
+        self.db.commit()
+        return counts
+
+
+def unlinked_ids(db: Session, entity_type: str, entity_ids: Optional[List[int]] = None) -> List[int]:
+    """The entities (of ``entity_ids``, else all of the type) that have never been linked"""
+    model = People if entity_type == PERSON else MODELS[entity_type]
+    statement = select(model.id).where(~exists().where(
+        CaseEntityLinkState.entity_type == entity_type,
+        CaseEntityLinkState.entity_id == model.id
+    ))
+    if entity_ids is not None:
+        statement = statement.where(model.id.in_(entity_ids))
+    return list(db.execute(statement.order_by(model.id)).scalars())
+
+
+def link_entity_batches(db: Session, entity_type: str, entity_ids: List[int],
+                        batch_size: Optional[int] = None) -> Dict[str, int]:
+    """Link ``entity_ids`` with one case scan per ``batch_size`` entities, committing each batch"""
+    batch_size = batch_size or settings.case_link_batch_size
+    counts = {"entities": 0, "links": 0}
+    for start in range(0, len(entity_ids), batch_size):
+        batch = entity_ids[start:start + batch_size]
+        linker = CaseEntityLinker(db, [entity_type], batch_size=batch_size)
+        linker.load({entity_type: batch})
+        counts["links"] += linker.link_entities()["links"]
+        counts["entities"] += len(batch)
+    return counts
+
+
+def queue_case_links(db: Session, case_ids: Iterable[int]) -> None:
+    """Record cases whose text changed for the next ``link_queued_cases``; the caller commits"""
+    rows = [{"case_id": case_id} for case_id in case_ids]
+    if not rows:
+        return
+    statement = pg_insert(CaseEntityLinkPending).values(rows)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[CaseEntityLinkPending.case_id],
+        set_={"queued_at": statement.excluded.queued_at}
+    ))
+
+
+def link_queued_cases(db: Session, batch_size: Optional[int] = None) -> Dict[str, int]:
+    """
+    Re-link the cases recorded by ``queue_case_links`` against all entities, loading the
+    names once. A case queued again while the run is going keeps its pending row.
+    """
+    started = db.execute(select(func.now())).scalar()
+    case_ids = list(db.execute(
+        select(CaseEntityLinkPending.case_id).order_by(CaseEntityLinkPending.case_id)
+    ).scalars())
+    if not case_ids:
+        return {"cases": 0, "links": 0}
+    linker = CaseEntityLinker(db, batch_size=batch_size)
+    linker.load()
+    counts = linker.link_cases(case_ids)
+    db.execute(delete(CaseEntityLinkPending).where(
+        CaseEntityLinkPending.case_id.in_(case_ids),
+        CaseEntityLinkPending.queued_at <= started
+    ))
+    db.commit()
+    return counts
+
+
+class CaseLinkQueue:
+    """Background thread linking entities that were never linked, off the request path"""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Tuple[str, List[int]]]" = queue.Queue()
+        self._queued: Set[Tuple[str, int]] = set()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def enqueue_entities(self, entity_type: str, entity_ids: Iterable[int]) -> int:
+        """Queue entities for linking; ids already waiting are skipped"""
+        with self._lock:
+            entity_ids = [entity_id for entity_id in entity_ids if (entity_type, entity_id) not in self._queued]
+            if not entity_ids:
+                return 0
+            self._queued.update((entity_type, entity_id) for entity_id in entity_ids)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="case-entity-linker", daemon=True)
+                self._thread.start()
+        self._queue.put((entity_type, entity_ids))
+        return len(entity_ids)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def join(self) -> None:
+        """Block until every queued batch has been linked"""
+        self._queue.join()
+
+    def _drain(self) -> List[Tuple[str, List[int]]]:
+        items = [self._queue.get()]
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                return items
+
+    def _run(self) -> None:
+        while True:
+            items = self._drain()
+            entity_ids: Dict[str, Set[int]] = {}
+            for entity_type, ids in items:
+                entity_ids.setdefault(entity_type, set()).update(ids)
+            db = SessionLocal()
+            try:
+                for entity_type, ids in entity_ids.items():
+                    missing = unlinked_ids(db, entity_type, sorted(ids))
+                    if not missing:
+                        continue
+                    counts = link_entity_batches(db, entity_type, missing)
+                    logger.info(f"Linked {counts['entities']} new {entity_type} entities: {counts['links']} links")
+                    if entity_type == PERSON:
+                        # Analytics generated before the person was linked saw no cases
+                        from services.person_analytics_queue import analytics_queue
+                        analytics_queue.enqueue(missing)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Case entity linking batch failed: {e}")
+            finally:
+                db.close()
+                with self._lock:
+                    for entity_type, ids in entity_ids.items():
+                        self._queued.difference_update((entity_type, entity_id) for entity_id in ids)
+                for _ in items:
+                    self._queue.task_done()
+
+
+link_queue = CaseLinkQueue()
+
+
+def get_linked_cases(db: Session, entity_type: str, entity_id: int, min_confidence: Optional[float] = None,
+                     with_body: bool = True) -> List[ReportedCases]:
+    """
+    Cases linked to an entity with at least ``min_confidence`` (default
+    CASE_LINK_MIN_CONFIDENCE). Read-only: an entity that was never linked is queued on
+    ``link_queue`` and has only its recorded links until the queue reaches it.
+    """
+    if unlinked_ids(db, entity_type, [entity_id]):
+        link_queue.enqueue_entities(entity_type, [entity_id])
+    if min_confidence is None:
+        min_confidence = settings.case_link_min_confidence
+    case_ids = select(CaseEntityLink.case_id).where(
+        CaseEntityLink.entity_type == entity_type,
+        CaseEntityLink.entity_id == entity_id,
+        CaseEntityLink.confidence >= min_confidence
+    )
+    query = db.query(ReportedCases)
+    if with_body:
+        query = query.options(undefer_group(BODY_COLUMN_GROUP))
+    return query.filter(ReportedCases.id.in_(case_ids)).order_by(ReportedCases.id).all()
+
+
+def record_link(db: Session, entity_type: str, entity_id: int, case_id: int, matched_name: Optional[str] = None,
+                match_field: str = EXTRACTED_FIELD, confidence: float = 1.0) -> None:
+    """Record a known link (e.g. a party extracted from the case); the caller commits"""
+    db.execute(pg_insert(CaseEntityLink).values(
+        entity_type=entity_type, entity_id=entity_id, case_id=case_id, match_field=match_field,
+        matched_name=(matched_name or "")[:500] or None, confidence=confidence
+    ).on_conflict_do_nothing(
+        index_elements=[CaseEntityLink.entity_type, CaseEntityLink.entity_id,
+                        CaseEntityLink.case_id, CaseEntityLink.match_field]
+    ))
@@ -4,7 +4,8 @@ from models.people import People
 from models.banks import Banks
 from models.insurance import Insurance
 from models.companies import Companies
-from models.case_metadata import CaseMetadata, CaseSearchIndex
+from models.case_metadata import CaseMetadata
+from services.case_search_index_service import CaseSearchIndexService
 from services.ai_service import AIService
 from typing import Dict, Any, List
 import json
@@ -104,32 +105,9 @@ class CaseMetadataService:
                 case_metadata.updated_at = datetime.now()
             
             # Create or update search index
-            search_index = db.query(CaseSearchIndex).filter(CaseSearchIndex.case_id == case_id).first()
-            
-            if not search_index:
-                # Create searchable text
-                searchable_text = f"{case_data.get('title', '')} {case_data.get('case_summary', '')} {case_data.get('protagonist', '')} {case_data.get('antagonist', '')} {case_data.get('lawyers', '')} {case_data.get('presiding_judge', '')}"
-                
-                search_index = CaseSearchIndex(
-                    case_id=case_id,
-                    searchable_text=searchable_text,
-                    person_names=entities.get('people', []),
-                    organization_names=entities.get('companies', []) + entities.get('banks', []) + entities.get('insurance', []),
-                    keywords=keywords.split(', ') if keywords else [],
-                    word_count=len(searchable_text.split()),
-                    last_indexed=datetime.now()
-                )
-                db.add(search_index)
-            else:
-                # Update existing search index
-                searchable_text = f"{case_data.get('title', '')} {case_data.get('case_summary', '')} {case_data.get('protagonist', '')} {case_data.get('antagonist', '')} {case_data.get('lawyers', '')} {case_data.get('presiding_judge', '')}"
-                
-                search_index.searchable_text = searchable_text
-                search_index.person_names = entities.get('people', [])
-                search_index.organization_names = entities.get('companies', []) + entities.get('banks', []) + entities.get('insurance', [])
-                search_index.keywords = keywords.split(', ') if keywords else []
-                search_index.word_count = len(searchable_text.split())
-                search_index.last_indexed = datetime.now()
+            CaseSearchIndexService(db).upsert(
+                case, entities=entities, keywords=keywords.split(', ') if keywords else []
+            )
             
             # Commit all changes
             db.commit()
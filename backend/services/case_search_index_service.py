@@ -0,0 +1,238 @@
+"""
+Case search document maintenance and matching.
+
+Each reported case has one ``case_search_index`` row holding a weighted search
+document:
+
+    A  title
+    B  parties (protagonist, antagonist, related people)
+    C  judges and lawyers
+    D  headnotes, case summary, keywords
+
+On PostgreSQL the weights live in the ``search_vector`` tsvector column (GIN
+indexed); ``searchable_text`` keeps the lowercased plain text for other dialects.
+On PostgreSQL the document is owned by the triggers and ``case_search_index_refresh``
+in migrations/add_case_search_vector.sql: ``upsert`` only stores the pipeline's
+extracted names and keywords and asks the database to recompute the document. Other
+dialects have no triggers, so ``upsert`` builds the document in Python. ``backfill``
+rebuilds the whole table in batches. Cases without a row (inserted before the
+backfill, or around the triggers) are still found through ``unindexed_match_filter``.
+"""
+
+import logging
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, case as sql_case, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, selectinload, undefer_group
+
+from models.reported_cases import ReportedCases, BODY_COLUMN_GROUP, AI_ANALYSIS_COLUMN_GROUP
+from models.case_metadata import CaseMetadata, CaseSearchIndex
+
+logger = logging.getLogger(__name__)
+
+TEXT_SEARCH_CONFIG = "simple"
+HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def _join(values: Iterable[Any]) -> str:
+    parts = []
+    for value in values:
+        if not value:
+            continue
+        if isinstance(value, (list, tuple)):
+            parts.extend(str(item) for item in value if item)
+        else:
+            parts.append(str(value))
+    return HTML_TAG_PATTERN.sub(" ", " ".join(parts))
+
+
+def build_weighted_fields(case: ReportedCases, metadata: Optional[CaseMetadata] = None,
+                          person_names: Optional[List[str]] = None) -> Dict[str, str]:
+    """Split a case into the A-D weighted text fields of its search document"""
+    return {
+        "A": _join([case.title]),
+        "B": _join([
+            case.protagonist, case.antagonist,
+            metadata.related_people if metadata else None,
+            person_names,
+        ]),
+        "C": _join([
+            case.presiding_judge, case.judgement_by, case.opinion_by, case.lawyers,
+            metadata.judges if metadata else None,
+            metadata.lawyers if metadata else None,
+        ]),
+        "D": _join([case.headnotes, case.case_summary, case.keywords_phrases]),
+    }
+
+
+def build_prefix_tsquery(query: str) -> Optional[str]:
+    """Turn free text into a prefix-matching tsquery string ("mens:* & ato:*")"""
+    tokens = TOKEN_PATTERN.findall(query.lower())
+    if not tokens:
+        return None
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+class CaseSearchIndexService:
+    """Maintains and queries case_search_index"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.is_postgres = db.get_bind().dialect.name == "postgresql"
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+    def tsquery(self, query: str):
+        tsquery_text = build_prefix_tsquery(query)
+        if tsquery_text is None:
+            return None
+        return func.to_tsquery(TEXT_SEARCH_CONFIG, tsquery_text)
+
+    def match_filter(self, query: str):
+        """Condition on CaseSearchIndex selecting cases whose document matches ``query``"""
+        if self.is_postgres:
+            tsquery = self.tsquery(query)
+            if tsquery is None:
+                return literal(False)
+            return CaseSearchIndex.search_vector.op("@@")(tsquery)
+        return CaseSearchIndex.searchable_text.like(f"%{query.lower().strip()}%")
+
+    def unindexed_match_filter(self, query: str):
+        """
+        Condition for an outer join on CaseSearchIndex: cases with no search document
+        yet, matched by LIKE over the title and parties
+        """
+        pattern = f"%{query.strip()}%"
+        return and_(
+            CaseSearchIndex.id.is_(None),
+            or_(
+                ReportedCases.title.ilike(pattern),
+                ReportedCases.protagonist.ilike(pattern),
+                ReportedCases.antagonist.ilike(pattern),
+            ),
+        )
+
+    def rank_expression(self, query: str):
+        """
+        Relevance score evaluated in SQL: ``ts_rank_cd`` over the weighted vector
+        (title A > parties B > judges/lawyers C > body D) plus a bonus for an exact
+        title match. Other dialects get a CASE sum over the short columns.
+        """
+        term = " ".join(query.lower().split())
+        title = func.lower(ReportedCases.title)
+        exact_title = sql_case((title == term, 1.0), else_=0.0)
+        if self.is_postgres:
+            tsquery = self.tsquery(query)
+            if tsquery is None:
+                return literal(0.0)
+            return func.coalesce(func.ts_rank_cd(CaseSearchIndex.search_vector, tsquery), 0.0) + exact_title
+
+        pattern = f"%{term}%"
+        weighted = [
+            (title, 1.0),
+            (func.lower(ReportedCases.protagonist), 0.4),
+            (func.lower(ReportedCases.antagonist), 0.4),
+            (func.lower(ReportedCases.presiding_judge), 0.2),
+            (func.lower(ReportedCases.lawyers), 0.2),
+            (CaseSearchIndex.searchable_text, 0.1),
+        ]
+        score = exact_title
+        for column, weight in weighted:
+            score = score + sql_case((column.like(pattern), weight), else_=0.0)
+        return score
+
+    def load_cases(self, case_ids: List[int], include_bodies: bool = False) -> List[ReportedCases]:
+        """Hydrate ranked case ids in order; the deferred body groups load only when requested"""
+        if not case_ids:
+            return []
+        options = [selectinload(ReportedCases.case_metadata)]
+        if include_bodies:
+            options.extend([undefer_group(BODY_COLUMN_GROUP), undefer_group(AI_ANALYSIS_COLUMN_GROUP)])
+        cases = self.db.query(ReportedCases).options(*options).filter(ReportedCases.id.in_(case_ids)).all()
+        by_id = {case.id: case for case in cases}
+        return [by_id[case_id] for case_id in case_ids if case_id in by_id]
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def upsert(self, case: ReportedCases, entities: Optional[Dict[str, List[str]]] = None,
+               keywords: Optional[List[str]] = None) -> None:
+        """Create or refresh the search document for ``case`` (caller commits)"""
+        if keywords is None:
+            keywords = case.keywords_phrases.split(', ') if case.keywords_phrases else []
+        if self.is_postgres:
+            self._upsert_postgres(case, entities, keywords)
+            return
+
+        metadata = self.db.query(CaseMetadata).filter(CaseMetadata.case_id == case.id).first()
+        search_index = self.db.query(CaseSearchIndex).filter(CaseSearchIndex.case_id == case.id).first()
+        if not search_index:
+            search_index = CaseSearchIndex(case_id=case.id, searchable_text="")
+            self.db.add(search_index)
+
+        if entities is not None:
+            search_index.person_names = entities.get('people', [])
+            search_index.organization_names = (
+                entities.get('companies', []) + entities.get('banks', []) + entities.get('insurance', [])
+            )
+        search_index.keywords = keywords
+
+        fields = build_weighted_fields(case, metadata, search_index.person_names)
+        searchable_text = " ".join(" ".join(fields.values()).lower().split())
+        search_index.searchable_text = searchable_text
+        search_index.word_count = len(searchable_text.split())
+        search_index.last_indexed = datetime.now()
+
+    def _upsert_postgres(self, case: ReportedCases, entities: Optional[Dict[str, List[str]]],
+                         keywords: List[str]) -> None:
+        """
+        Store the columns only the pipeline knows, then let case_search_index_refresh
+        rebuild the document from the flushed case and metadata rows. INSERT ... ON
+        CONFLICT keeps concurrent writers (and the triggers) from racing on the row.
+        """
+        self.db.flush()
+        values = {"keywords": keywords}
+        if entities is not None:
+            values["person_names"] = entities.get('people', [])
+            values["organization_names"] = (
+                entities.get('companies', []) + entities.get('banks', []) + entities.get('insurance', [])
+            )
+        statement = pg_insert(CaseSearchIndex).values(case_id=case.id, searchable_text="", **values)
+        self.db.execute(statement.on_conflict_do_update(index_elements=[CaseSearchIndex.case_id], set_=values))
+        self.db.execute(select(func.case_search_index_refresh(case.id)))
+
+    def refresh_case(self, case_id: int) -> bool:
+        case = self.db.query(ReportedCases).filter(ReportedCases.id == case_id).first()
+        if not case:
+            return False
+        self.upsert(case)
+        return True
+
+    def backfill(self, batch_size: int = 500, only_missing: bool = False) -> int:
+        """Rebuild search documents for every case, committing once per batch"""
+        last_id = 0
+        total = 0
+        while True:
+            cases_query = self.db.query(ReportedCases).options(
+                undefer_group(BODY_COLUMN_GROUP)
+            ).filter(ReportedCases.id > last_id)
+            if only_missing:
+                cases_query = cases_query.outerjoin(
+                    CaseSearchIndex, CaseSearchIndex.case_id == ReportedCases.id
+                ).filter(CaseSearchIndex.id.is_(None))
+            batch = cases_query.order_by(ReportedCases.id).limit(batch_size).all()
+            if not batch:
+                break
+            for case in batch:
+                self.upsert(case)
+            self.db.commit()
+            last_id = batch[-1].id
+            total += len(batch)
+            self.db.expunge_all()
+            logger.info(f"Case search index backfilled through case {last_id} ({total} cases)")
+        return total
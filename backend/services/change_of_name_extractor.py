@@ -15,17 +15,11 @@ import sys
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-try:
-    import pdfplumber
-    import PyPDF2
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
-    print("Warning: PDF processing libraries not installed.")
-
 from database import get_db
+from services.pdf_text_extraction_service import get_pdf_text
 from models.gazette import Gazette, GazetteType, GazetteStatus, GazettePriority
-from models.people import People
+from services.person_name_resolver import PersonNameResolver, ResolvedPerson
+from services.gazette_duplicate_index import GazetteDuplicateIndex, name_row_key, source_row_key
 
 logger = logging.getLogger(__name__)
 
@@ -36,43 +30,12 @@ class ChangeOfNameExtractor:
     def __init__(self):
         self.db = next(get_db())
         self.processed_name_sets: Set[str] = set()  # Track processed name_set_ids
+        self.duplicates = GazetteDuplicateIndex(self.db)  # stored rows, prefetched per document
+        self._name_resolver: Optional[PersonNameResolver] = None
         
     def extract_text_from_pdf(self, file_path: str) -> Dict[str, any]:
-        """Extract text from PDF with page numbers"""
-        result = {
-            'text': '',
-            'pages': {},  # page_num: text
-            'total_pages': 0
-        }
-        
-        if not PDF_AVAILABLE:
-            logger.error("PDF libraries not available")
-            return result
-            
-        try:
-            with pdfplumber.open(file_path) as pdf:
-                result['total_pages'] = len(pdf.pages)
-                for page_num, page in enumerate(pdf.pages, 1):
-                    page_text = page.extract_text() or ""
-                    result['pages'][str(page_num)] = page_text
-                    result['text'] += page_text + "\n"
-                    
-                if len(result['text'].strip()) > 100:
-                    return result
-                    
-            # Fallback to PyPDF2
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                result['total_pages'] = len(pdf_reader.pages)
-                for page_num, page in enumerate(pdf_reader.pages, 1):
-                    page_text = page.extract_text() or ""
-                    result['pages'][str(page_num)] = page_text
-                    result['text'] += page_text + "\n"
-                    
-        except Exception as e:
-            logger.error(f"Error extracting text from {file_path}: {str(e)}")
-            
-        return result
+        """Extract text from PDF with page numbers (shared, page-parallel extraction)"""
+        return get_pdf_text(file_path).as_extractor_result(str_keys=True)
     
     def extract_gazette_metadata(self, filename: str) -> Dict[str, Optional[str]]:
         """Extract gazette number, date, and other metadata from filename"""
@@ -462,95 +425,61 @@ class ChangeOfNameExtractor:
         hash_input = f"{source}:{item_number}:{document_filename}:{page_number}:{new_name}"
         return hashlib.md5(hash_input.encode()).hexdigest()
     
-    def find_or_create_person(self, full_name: str, gender: Optional[str] = None) -> Optional[People]:
-        """Find existing person or create new one"""
+    @property
+    def name_resolver(self) -> PersonNameResolver:
+        """Name index of this run, loaded on first use"""
+        if self._name_resolver is None:
+            self._name_resolver = PersonNameResolver(self.db)
+        return self._name_resolver
+    
+    def find_or_create_person(self, full_name: str, gender: Optional[str] = None) -> Optional[ResolvedPerson]:
+        """Find existing person or create new one (in-memory name index)"""
         try:
-            # Try exact match first
-            person = self.db.query(People).filter(
-                People.full_name.ilike(full_name)
-            ).first()
-            
-            if not person:
-                # Try searching by first and last name separately
-                name_parts = full_name.split()
-                if len(name_parts) >= 2:
-                    first_name = name_parts[0]
-                    last_name = ' '.join(name_parts[1:])
-                    
-                    person = self.db.query(People).filter(
-                        People.first_name.ilike(first_name),
-                        People.last_name.ilike(last_name)
-                    ).first()
-            
-            if not person:
-                # Create new person
+            person = self.name_resolver.resolve(full_name, gender=gender)
+            if person and person.created:
                 logger.info(f"Creating new person: {full_name}")
-                name_parts = full_name.split()
-                first_name = name_parts[0] if name_parts else full_name
-                last_name = ' '.join(name_parts[1:]) if len(name_parts) > 1 else ''
-                
-                person = People(
-                    full_name=full_name,
-                    first_name=first_name,
-                    last_name=last_name,
-                    gender=gender,
-                    created_by=None
-                )
-                
-                self.db.add(person)
-                self.db.commit()
-                self.db.refresh(person)
-            else:
-                # Update gender if provided and not set
-                if gender and not person.gender:
-                    person.gender = gender
-                    self.db.commit()
-                    self.db.refresh(person)
-            
             return person
         except Exception as e:
             logger.error(f"Error finding/creating person {full_name}: {e}")
             self.db.rollback()
-            # Try to find existing person again after rollback
-            try:
-                person = self.db.query(People).filter(
-                    People.full_name.ilike(full_name)
-                ).first()
-                if person:
-                    return person
-            except:
-                pass
             return None
     
-    def check_duplicate_name_set(self, name_set_id: str) -> bool:
-        """Check if this name_set_id already exists"""
-        if name_set_id in self.processed_name_sets:
-            return True
-        
-        existing = self.db.query(Gazette).filter(
-            Gazette.name_set_id == name_set_id
-        ).first()
-        
-        if existing:
-            self.processed_name_sets.add(name_set_id)
-            return True
-        
-        return False
+    def finish_run(self):
+        """Write batched person updates (gender fill-ins) collected during the run"""
+        if self._name_resolver is None:
+            return
+        try:
+            self._name_resolver.flush_updates()
+            self.db.commit()
+        except Exception as e:
+            logger.error(f"Error writing person updates: {e}")
+            self.db.rollback()
+    
+    def entry_key(self, entry_data: Dict) -> str:
+        """Duplicate key of a master/variant row: its name set and name, else its source fields"""
+        if entry_data.get('name_set_id'):
+            return name_row_key(entry_data['name_set_id'], entry_data.get('name_role'), entry_data.get('name_value'))
+        return source_row_key(
+            entry_data.get('source') or '',
+            entry_data.get('item_number') or '',
+            entry_data.get('document_filename') or '',
+            entry_data.get('gazette_page') or entry_data.get('page_number') or 0,
+            entry_data.get('current_name') or entry_data.get('new_name') or '',
+            entry_data.get('name_role') or '',
+            entry_data.get('name_value') or ''
+        )
+    
+    def check_duplicate_name_set(self, name_set_id: str, name_role: Optional[str] = None,
+                                 name_value: Optional[str] = None, document_filename: str = '') -> bool:
+        """Check if this row of the name set already exists (stored rows prefetched per document)"""
+        return self.duplicates.has_key(document_filename, name_row_key(name_set_id, name_role, name_value))
     
     def check_duplicate_fallback(self, source: str, item_number: str, document_filename: str, 
                                    page_number: int, current_name: str, name_role: str, name_value: str) -> bool:
         """Fallback duplicate check if name_set_id is not available"""
-        existing = self.db.query(Gazette).filter(
-            Gazette.source == source,
-            Gazette.item_number == item_number,
-            Gazette.document_filename == document_filename,
-            Gazette.gazette_page == page_number,
-            Gazette.current_name == current_name,
-            Gazette.name_role == name_role,
-            Gazette.name_value == name_value
-        ).first()
-        
-        return existing is not None
+        return self.duplicates.has_key(document_filename, source_row_key(
+            source, item_number, document_filename, page_number, current_name, name_role, name_value
+        ))
     
     def save_gazette_entry(self, entry_data: Dict, name_set_id: Optional[str] = None) -> Optional[Gazette]:
         """Save a single gazette entry (master or variant)"""
@@ -558,8 +487,13 @@ class ChangeOfNameExtractor:
             # Check for duplicate using name_set_id if available
             name_set_id_check = entry_data.get('name_set_id')
             if name_set_id_check:
-                if self.check_duplicate_name_set(name_set_id_check):
-                    logger.info(f"Skipping duplicate name_set_id: {name_set_id_check}")
+                if self.check_duplicate_name_set(
+                    name_set_id_check,
+                    entry_data.get('name_role'),
+                    entry_data.get('name_value'),
+                    entry_data.get('document_filename') or ''
+                ):
+                    logger.info(f"Skipping duplicate name_set_id: {name_set_id_check} ({entry_data.get('name_role')})")
                     return None
             else:
                 # Fallback duplicate check
@@ -605,8 +539,10 @@ class ChangeOfNameExtractor:
                 entry_data['gazette_metadata'] = None
             
             # Create gazette entry
-            gazette = Gazette(**entry_data)
-            self.db.add(gazette)
+            gazette = self.duplicates.insert(entry_data, self.entry_key(entry_data))
+            if not gazette:
+                logger.info(f"Skipping duplicate entry: {entry_data.get('item_number')} ({entry_data.get('name_role')})")
+                return None
             self.db.commit()
             self.db.refresh(gazette)
             
@@ -747,6 +683,9 @@ class ChangeOfNameExtractor:
                 if other_gazette:
                     saved_entries.append(other_gazette)
         
+        if not saved_entries:
+            # Every row was a duplicate: a person created for this entry is not kept
+            self.name_resolver.discard_staged()
         return saved_entries
     
     def process_change_of_name_section(self, text: str, page_num: int, gazette_metadata: Dict,
@@ -834,6 +773,8 @@ class ChangeOfNameExtractor:
                 logger.error(f"Error processing entry {item_no_str} on page {page_num}: {e}")
                 continue
         
+        # Person updates are written per section, not only in close()
+        self.finish_run()
         return saved_entries
     
     def _parse_date(self, date_str: str) -> Optional[datetime]:
@@ -862,5 +803,8 @@ class ChangeOfNameExtractor:
     def close(self):
         """Close database connection"""
         if hasattr(self, 'db'):
+            self.finish_run()
+            if self._name_resolver is not None:
+                self._name_resolver.close()
             self.db.close()
 
@@ -9,7 +9,8 @@ from models.company_analytics import CompanyAnalytics
 from models.company_case_statistics import CompanyCaseStatistics
 from models.companies import Companies
 from models.reported_cases import ReportedCases
-from sqlalchemy import or_, and_, func
+from services.case_entity_linker import COMPANY, get_linked_cases
+from sqlalchemy import and_
 from typing import List, Dict, Any, Optional
 import logging
 
@@ -116,31 +117,9 @@ class CompanyAnalyticsService:
             return None
     
     def _get_company_cases(self, company: Companies) -> List[ReportedCases]:
-        """Get cases related to a specific company."""
+        """Get cases naming a specific company (precomputed case_entity_links)."""
         try:
-            # Search for cases where the company name appears in title, protagonist, or antagonist
-            company_name = company.name.lower()
-            short_name = company.short_name.lower() if company.short_name else ""
-            
-            # Create search terms
-            search_terms = [company_name]
-            if short_name and short_name != company_name:
-                search_terms.append(short_name)
-            
-            # Build search conditions
-            conditions = []
-            for term in search_terms:
-                conditions.extend([
-                    func.lower(ReportedCases.title).like(f"%{term}%"),
-                    func.lower(ReportedCases.protagonist).like(f"%{term}%"),
-                    func.lower(ReportedCases.antagonist).like(f"%{term}%")
-                ])
-            
-            cases = self.db.query(ReportedCases).filter(
-                or_(*conditions)
-            ).all()
-            
-            return cases
+            return get_linked_cases(self.db, COMPANY, company.id, with_body=False)
             
         except Exception as e:
             logger.error(f"Error getting cases for company {company.name}: {e}")
@@ -3,18 +3,20 @@ import openai
 import re
 from typing import Dict, List, Any, Optional, Tuple
 from decimal import Decimal
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 from datetime import datetime
 from models.people import People
 from models.banks import Banks
 from models.insurance import Insurance
 from models.companies import Companies
-from models.reported_cases import ReportedCases
+from models.reported_cases import ReportedCases, BODY_COLUMN_GROUP
 from models.person_analytics import PersonAnalytics
 from models.bank_analytics import BankAnalytics
 from models.insurance_analytics import InsuranceAnalytics
 from models.company_analytics import CompanyAnalytics
-from models.case_metadata import CaseMetadata, CaseSearchIndex
+from models.case_metadata import CaseMetadata
+from services.case_entity_linker import PERSON, get_linked_cases, record_link
+from services.case_search_index_service import CaseSearchIndexService
 from services.person_analytics_service import PersonAnalyticsService
 from services.bank_analytics_service import BankAnalyticsService
 from services.ai_service import AIService
@@ -232,13 +234,9 @@ class EnhancedCaseProcessingService:
                 self.db.add(person)
                 self.db.flush()
             
-            # Get all cases for this person
-            person_cases = self.db.query(ReportedCases).filter(
-                ReportedCases.protagonist.ilike(f"%{str(person.full_name)}%")
-                | ReportedCases.antagonist.ilike(f"%{str(person.full_name)}%")
-                | ReportedCases.lawyers.ilike(f"%{str(person.full_name)}%")
-                | ReportedCases.presiding_judge.ilike(f"%{str(person.full_name)}%")
-            ).all()
+            # Get all cases for this person (this case is linked even before the next linker run)
+            record_link(self.db, PERSON, person.id, case_id, matched_name=name.strip())
+            person_cases = get_linked_cases(self.db, PERSON, person.id)
             
             # Calculate risk assessment
             risk_score, risk_level, risk_factors = self.person_analytics.calculate_risk_score(person_cases)
@@ -316,7 +314,7 @@ class EnhancedCaseProcessingService:
                 self.db.flush()
             
             # Get all cases for this bank
-            bank_cases = self.db.query(ReportedCases).filter(
+            bank_cases = self.db.query(ReportedCases).options(undefer_group(BODY_COLUMN_GROUP)).filter(
                 ReportedCases.title.ilike(f"%{str(bank.name)}%")
                 | ReportedCases.case_summary.ilike(f"%{str(bank.name)}%")
                 | ReportedCases.commentary.ilike(f"%{str(bank.name)}%")
@@ -399,7 +397,7 @@ class EnhancedCaseProcessingService:
                 self.db.flush()
             
             # Get all cases for this insurance company
-            insurance_cases = self.db.query(ReportedCases).filter(
+            insurance_cases = self.db.query(ReportedCases).options(undefer_group(BODY_COLUMN_GROUP)).filter(
                 ReportedCases.title.ilike(f"%{str(insurance.name)}%")
                 | ReportedCases.case_summary.ilike(f"%{str(insurance.name)}%")
                 | ReportedCases.commentary.ilike(f"%{str(insurance.name)}%")
@@ -482,7 +480,7 @@ class EnhancedCaseProcessingService:
                 self.db.flush()
             
             # Get all cases for this company
-            company_cases = self.db.query(ReportedCases).filter(
+            company_cases = self.db.query(ReportedCases).options(undefer_group(BODY_COLUMN_GROUP)).filter(
                 ReportedCases.title.ilike(f"%{str(company.name)}%")
                 | ReportedCases.case_summary.ilike(f"%{str(company.name)}%")
                 | ReportedCases.commentary.ilike(f"%{str(company.name)}%")
@@ -601,28 +599,7 @@ class EnhancedCaseProcessingService:
 
     def _create_search_index(self, case_id: int, case: ReportedCases, entities: Dict[str, List[str]]) -> None:
         """Create or update search index"""
-        search_index = self.db.query(CaseSearchIndex).filter(CaseSearchIndex.case_id == case_id).first()
-        
-        searchable_text = f"{case.title or ''} {case.case_summary or ''} {case.protagonist or ''} {case.antagonist or ''} {case.lawyers or ''} {case.presiding_judge or ''}"
-        
-        if not search_index:
-            search_index = CaseSearchIndex(
-                case_id=case_id,
-                searchable_text=searchable_text,
-                person_names=entities.get('people', []),
-                organization_names=entities.get('companies', []) + entities.get('banks', []) + entities.get('insurance', []),
-                keywords=case.keywords_phrases.split(', ') if case.keywords_phrases else [],
-                word_count=len(searchable_text.split()),
-                last_indexed=datetime.now()
-            )
-            self.db.add(search_index)
-        else:
-            search_index.searchable_text = searchable_text
-            search_index.person_names = entities.get('people', [])
-            search_index.organization_names = entities.get('companies', []) + entities.get('banks', []) + entities.get('insurance', [])
-            search_index.keywords = case.keywords_phrases.split(', ') if case.keywords_phrases else []
-            search_index.word_count = len(searchable_text.split())
-            search_index.last_indexed = datetime.now()
+        CaseSearchIndexService(self.db).upsert(case, entities=entities)
 
     def _calculate_basic_analytics(self, cases: List[ReportedCases]) -> Dict[str, Any]:
         """Calculate basic analytics for cases"""
@@ -21,27 +21,18 @@ from collections import defaultdict
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-try:
-    import pdfplumber
-    import PyPDF2
-    from pdf2image import convert_from_path
-    import pytesseract
-    from PIL import Image
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
-    print("Warning: PDF processing libraries not installed.")
-
 from database import get_db
+from services.pdf_text_extraction_service import get_pdf_text
 from models.gazette import Gazette, GazetteType, GazetteStatus, GazettePriority
-from models.people import People
+from services.person_name_resolver import PersonNameResolver, ResolvedPerson
+from services.gazette_duplicate_index import GazetteDuplicateIndex, item_key
 
 try:
-    from services.auto_analytics_generator import AutoAnalyticsGenerator
+    from services.person_analytics_queue import analytics_queue
     ANALYTICS_AVAILABLE = True
 except ImportError:
     ANALYTICS_AVAILABLE = False
-    AutoAnalyticsGenerator = None
+    analytics_queue = None
 
 logger = logging.getLogger(__name__)
 
@@ -52,44 +43,12 @@ class EnhancedGazetteExtractor:
     def __init__(self):
         self.db = next(get_db())
         self.processed_item_numbers: Set[Tuple[str, str, str]] = set()  # (gazette_number, item_no, type)
+        self.duplicates = GazetteDuplicateIndex(self.db)  # stored notices, prefetched per gazette number
+        self._name_resolver: Optional[PersonNameResolver] = None
         
     def extract_text_from_pdf(self, file_path: str) -> Dict[str, any]:
-        """Extract text from PDF with page numbers"""
-        result = {
-            'text': '',
-            'pages': {},  # page_num: text
-            'total_pages': 0
-        }
-        
-        if not PDF_AVAILABLE:
-            logger.error("PDF libraries not available")
-            return result
-            
-        try:
-            # Try pdfplumber first (better for structured text and page extraction)
-            with pdfplumber.open(file_path) as pdf:
-                result['total_pages'] = len(pdf.pages)
-                for page_num, page in enumerate(pdf.pages, 1):
-                    page_text = page.extract_text() or ""
-                    result['pages'][page_num] = page_text
-                    result['text'] += page_text + "\n"
-                
-                if len(result['text'].strip()) > 100:
-                    return result
-                    
-            # Fallback to PyPDF2
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                result['total_pages'] = len(pdf_reader.pages)
-                for page_num, page in enumerate(pdf_reader.pages, 1):
-                    page_text = page.extract_text() or ""
-                    result['pages'][page_num] = page_text
-                    result['text'] += page_text + "\n"
-                    
-        except Exception as e:
-            logger.error(f"Error extracting text from {file_path}: {str(e)}")
-            
-        return result
+        """Extract text from PDF with page numbers (shared, page-parallel extraction)"""
+        return get_pdf_text(file_path).as_extractor_result(str_keys=False)
     
     def extract_gazette_metadata(self, filename: str) -> Dict[str, Optional[str]]:
         """Extract gazette number, date, and other metadata from filename"""
@@ -317,84 +276,44 @@ class EnhancedGazetteExtractor:
         if key in self.processed_item_numbers:
             return True
         
-        # Also check database
-        existing = self.db.query(Gazette).filter(
-            Gazette.gazette_number == gazette_number,
-            Gazette.item_number == item_number,
-            Gazette.gazette_type == gazette_type_enum
-        ).first()
-        
-        return existing is not None
+        # Stored notices of this gazette, prefetched once
+        return self.duplicates.has_item(gazette_number, item_number, gazette_type_enum)
     
-    def find_or_create_person(self, full_name: str, gender: Optional[str] = None, **kwargs) -> People:
-        """Find existing person or create new one, handling name variations"""
-        # Try exact match first
-        person = self.db.query(People).filter(
-            People.full_name.ilike(full_name)
-        ).first()
-        
-        if not person:
-            # Try searching by first and last name separately
-            name_parts = full_name.split()
-            if len(name_parts) >= 2:
-                first_name = name_parts[0]
-                last_name = ' '.join(name_parts[1:])
-                
-                person = self.db.query(People).filter(
-                    People.first_name.ilike(first_name),
-                    People.last_name.ilike(last_name)
-                ).first()
-        
-        if not person:
-            # Create new person
+    @property
+    def name_resolver(self) -> PersonNameResolver:
+        """Name index of this run, loaded on first use"""
+        if self._name_resolver is None:
+            self._name_resolver = PersonNameResolver(self.db)
+        return self._name_resolver
+    
+    def find_or_create_person(self, full_name: str, gender: Optional[str] = None, **kwargs) -> Optional[ResolvedPerson]:
+        """Find existing person or create new one, handling name variations (in-memory name index)"""
+        # A differing spelling of a matched person is recorded as a previous name
+        record_alias = bool(kwargs.pop('previous_names', True))
+        person = self.name_resolver.resolve(full_name, gender=gender, record_alias=record_alias, **kwargs)
+        if person and person.created:
             logger.info(f"Creating new person: {full_name}")
-            name_parts = full_name.split()
-            first_name = name_parts[0] if name_parts else full_name
-            last_name = ' '.join(name_parts[1:]) if len(name_parts) > 1 else ''
-            
-            person = People(
-                full_name=full_name,
-                first_name=first_name,
-                last_name=last_name,
-                gender=gender,
-                created_by=None
-            )
-            
-            # Add additional fields from kwargs
-            for key, value in kwargs.items():
-                if hasattr(person, key) and value:
-                    setattr(person, key, value)
-            
-            self.db.add(person)
-            self.db.commit()
-            self.db.refresh(person)
-            
-            # Generate analytics for new person
-            if ANALYTICS_AVAILABLE and AutoAnalyticsGenerator:
-                try:
-                    generator = AutoAnalyticsGenerator(self.db)
-                    generator.generate_analytics_for_person(person.id)
-                    logger.info(f"Analytics generated for new person {person.id}")
-                except Exception as analytics_error:
-                    logger.warning(f"Failed to generate analytics for person {person.id}: {analytics_error}")
-        else:
-            # Update gender if provided and not set
-            if gender and not person.gender:
-                person.gender = gender
-                self.db.commit()
-                self.db.refresh(person)
-            
-            # Update previous names if this is an alias
-            if 'previous_names' not in kwargs or kwargs.get('previous_names'):
-                if not person.previous_names:
-                    person.previous_names = []
-                if full_name not in person.previous_names and full_name != person.full_name:
-                    person.previous_names.append(full_name)
-                    self.db.commit()
-                    self.db.refresh(person)
-        
         return person
     
+    def finish_run(self):
+        """
+        Write batched person updates and generate analytics for the people created since
+        the last call. This extractor runs from scripts, so it waits for the analytics
+        worker instead of leaving the batch on a daemon thread the process exit would kill.
+        """
+        if self._name_resolver is None:
+            return
+        try:
+            self._name_resolver.flush_updates()
+            self.db.commit()
+        except Exception as e:
+            logger.error(f"Error writing person updates: {e}")
+            self.db.rollback()
+        created = self._name_resolver.take_created_ids()
+        if created and ANALYTICS_AVAILABLE:
+            analytics_queue.enqueue(created)
+            analytics_queue.join()
+    
     def create_name_datasets(self, name_data: Dict, gazette_metadata: Dict, item_number: str, 
                             page_number: int, text: str) -> List[Dict]:
         """Create separate datasets for each name (New, Old, each Alias)"""
@@ -457,7 +376,7 @@ class EnhancedGazetteExtractor:
         
         return datasets
     
-    def save_gazette_entry(self, dataset: Dict, person: People) -> Optional[Gazette]:
+    def save_gazette_entry(self, dataset: Dict, person: ResolvedPerson) -> Optional[Gazette]:
         """Save gazette entry to database"""
         try:
             # Check for duplicate
@@ -539,8 +458,12 @@ class EnhancedGazetteExtractor:
                 entry_data['profession'] = dataset.get('profession') if dataset.get('profession') and dataset.get('profession') != 'N/A' else None
                 entry_data['effective_date_of_change'] = dataset.get('effective_date')
             
-            gazette = Gazette(**entry_data)
-            self.db.add(gazette)
+            gazette = self.duplicates.insert(
+                entry_data, item_key(entry_data['gazette_number'], entry_data['item_number'], gazette_type)
+            )
+            if not gazette:
+                logger.info(f"Skipping duplicate: Item {dataset.get('item_number')} in Gazette {dataset.get('gazette_number')}")
+                return None
             self.db.commit()
             self.db.refresh(gazette)
             
@@ -688,7 +611,12 @@ class EnhancedGazetteExtractor:
                 gazette = self.save_gazette_entry(dataset, person)
                 if gazette:
                     saved_entries.append(gazette)
+                else:
+                    # A person created for a notice that was not saved is not kept
+                    self.name_resolver.discard_staged()
         
+        # Person updates and analytics are written per section, not only in close()
+        self.finish_run()
         return saved_entries
     
     def process_change_of_dob_section(self, text: str, page_num: int, gazette_metadata: Dict) -> List[Gazette]:
@@ -776,14 +704,20 @@ class EnhancedGazetteExtractor:
                 'created_by': None
             }
             
-            gazette = Gazette(**entry_data)
-            self.db.add(gazette)
+            gazette = self.duplicates.insert(
+                entry_data, item_key(entry_data['gazette_number'], item_number, entry_data['gazette_type'])
+            )
+            if not gazette:
+                self.name_resolver.discard_staged()
+                continue
             self.db.commit()
             self.db.refresh(gazette)
             
             saved_entries.append(gazette)
             logger.info(f"Saved DOB change: {name} (Item {item_number})")
         
+        # Person updates and analytics are written per section, not only in close()
+        self.finish_run()
         return saved_entries
     
     def process_change_of_pob_section(self, text: str, page_num: int, gazette_metadata: Dict) -> List[Gazette]:
@@ -872,14 +806,20 @@ class EnhancedGazetteExtractor:
                 'created_by': None
             }
             
-            gazette = Gazette(**entry_data)
-            self.db.add(gazette)
+            gazette = self.duplicates.insert(
+                entry_data, item_key(entry_data['gazette_number'], item_number, entry_data['gazette_type'])
+            )
+            if not gazette:
+                self.name_resolver.discard_staged()
+                continue
             self.db.commit()
             self.db.refresh(gazette)
             
             saved_entries.append(gazette)
             logger.info(f"Saved POB change: {name} (Item {item_number})")
         
+        # Person updates and analytics are written per section, not only in close()
+        self.finish_run()
         return saved_entries
     
     def verify_item_sequence(self, item_numbers: List[str], gazette_number: str) -> List[Tuple[str, str]]:
@@ -907,5 +847,8 @@ class EnhancedGazetteExtractor:
     def close(self):
         """Close database connection"""
         if hasattr(self, 'db'):
+            self.finish_run()
+            if self._name_resolver is not None:
+                self._name_resolver.close()
             self.db.close()
 
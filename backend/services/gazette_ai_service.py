@@ -12,6 +12,9 @@ from models.marriage_officer import MarriageOfficer
 from datetime import datetime
 import json
 import re
+from services.prompt_budget import PromptBuilder
+
+GAZETTE_CHAT_COMPLETION_TOKENS = 1000
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -813,28 +816,19 @@ If no results are found, suggest alternative search strategies:
             else:
                 context = "\n\nNo gazette entries found matching the search criteria."
             
-            # Build messages for OpenAI
-            messages = [
-                {"role": "system", "content": system_prompt}
-            ]
-            
-            # Add chat history if provided
-            if chat_history:
-                for msg in chat_history[-10:]:  # Limit to last 10 messages
-                    messages.append({
-                        "role": "user" if msg["role"] == "user" else "assistant",
-                        "content": msg["content"]
-                    })
-            
-            # Add current user message with context
-            user_prompt = f"{user_message}{context}"
-            messages.append({"role": "user", "content": user_prompt})
+            # Build messages for OpenAI: history and search results share the token budget,
+            # the search results go after the current user message
+            builder = PromptBuilder(self.model, completion_tokens=GAZETTE_CHAT_COMPLETION_TOKENS)
+            prompt = builder.build(
+                lambda fields, message: (system_prompt, f"{message}{fields['search_results'] or ''}"),
+                {"search_results": context}, user_message, chat_history
+            )
             
             # Generate response
             response = self.openai_client.chat.completions.create(
                 model=self.model,
-                messages=messages,
-                max_tokens=1000,
+                messages=prompt.messages,
+                max_tokens=GAZETTE_CHAT_COMPLETION_TOKENS,
                 temperature=0.7,
                 stream=False
             )
@@ -849,6 +843,7 @@ If no results are found, suggest alternative search strategies:
                 "search_results": search_results,
                 "search_params": search_params,
                 "tokens_used": tokens_used,
+                "prompt_tokens": prompt.token_counts,
                 "response_time_ms": response_time_ms
             }
             
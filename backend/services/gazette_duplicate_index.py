@@ -0,0 +1,117 @@
+"""
+Duplicate detection for gazette notices extracted from PDFs.
+
+The PDF extractors used to ask the database, once per extracted item, whether a notice
+with the same ``(gazette_number, item_number, gazette_type)`` or ``name_set_id`` already
+existed. ``GazetteDuplicateIndex`` instead loads the keys of every stored notice of a
+gazette number or source document with one query, the first time that gazette or
+document is checked, and answers the per-item checks from a set. Notices saved during
+the run are added to the same set.
+
+New notices carry their key in ``gazette_entries.import_key``, whose partial unique
+index (migrations/create_gazette_import_jobs.sql) is shared with the Excel import, and
+are written with ``INSERT ... ON CONFLICT DO NOTHING``. The statement names no conflict
+target, so the name-set and fallback unique indexes of change of name rows
+(migrations/create_gazette_entries_table.sql) apply as well: a notice stored by a
+concurrent run after the prefetch is skipped by the database instead of duplicated.
+Keys are namespaced by kind so they never collide with the Excel import's content
+hashes. Notices stored before keys existed have no ``import_key``; the prefetch derives
+their keys from the key columns, so they are still recognised.
+"""
+
+import hashlib
+import logging
+from typing import Any, Dict, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from models.gazette import Gazette, GazetteType
+
+logger = logging.getLogger(__name__)
+
+ITEM_KEY = "item"  # gazette_number, item_number, gazette_type (EnhancedGazetteExtractor)
+NAME_ROW_KEY = "name-row"  # name_set_id, name_role, name_value (ChangeOfNameExtractor)
+SOURCE_ROW_KEY = "source-row"  # rows without name_set_id (ChangeOfNameExtractor fallback)
+
+
+def _entry_key(kind: str, *parts: Any) -> str:
+    material = "\x1f".join([kind] + ["" if part is None else str(part) for part in parts])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _type_value(gazette_type: Any) -> str:
+    return gazette_type.value if isinstance(gazette_type, GazetteType) else str(gazette_type or "")
+
+
+def item_key(gazette_number: Optional[str], item_number: Optional[str], gazette_type: Any) -> str:
+    return _entry_key(ITEM_KEY, gazette_number or "", item_number or "", _type_value(gazette_type))
+
+
+def name_row_key(name_set_id: str, name_role: Optional[str], name_value: Optional[str]) -> str:
+    return _entry_key(NAME_ROW_KEY, name_set_id, name_role or "", name_value or "")
+
+
+def source_row_key(source: Optional[str], item_number: Optional[str], document_filename: Optional[str],
+                   page_number: Optional[int], current_name: Optional[str], name_role: Optional[str],
+                   name_value: Optional[str]) -> str:
+    return _entry_key(SOURCE_ROW_KEY, source or "", item_number or "", document_filename or "",
+                      page_number or 0, current_name or "", name_role or "", name_value or "")
+
+
+class GazetteDuplicateIndex:
+    """Existing notice keys per gazette number / source document, loaded on first check"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._keys: Set[str] = set()
+        self._loaded: Set[Tuple[str, str]] = set()
+
+    def _load(self, column, value: str) -> None:
+        scope = (column.key, value)
+        if scope in self._loaded:
+            return
+        rows = self.db.execute(
+            select(
+                Gazette.import_key, Gazette.gazette_number, Gazette.item_number, Gazette.gazette_type,
+                Gazette.name_set_id, Gazette.name_role, Gazette.name_value, Gazette.source,
+                Gazette.document_filename, Gazette.gazette_page, Gazette.current_name
+            ).where(column == value)
+        )
+        count = 0
+        for row in rows:
+            if row.import_key:
+                self._keys.add(row.import_key)
+            self._keys.add(item_key(row.gazette_number, row.item_number, row.gazette_type))
+            if row.name_set_id:
+                self._keys.add(name_row_key(row.name_set_id, row.name_role, row.name_value))
+            self._keys.add(source_row_key(row.source, row.item_number, row.document_filename,
+                                          row.gazette_page, row.current_name, row.name_role, row.name_value))
+            count += 1
+        self._loaded.add(scope)
+        logger.info(f"Duplicate index loaded {count} existing notices for {column.key} {value!r}")
+
+    def has_item(self, gazette_number: Optional[str], item_number: Optional[str], gazette_type: Any) -> bool:
+        self._load(Gazette.gazette_number, gazette_number or "")
+        return item_key(gazette_number, item_number, gazette_type) in self._keys
+
+    def has_key(self, document_filename: Optional[str], key: str) -> bool:
+        """Name-row / source-row keys are scoped by the notice's source document"""
+        self._load(Gazette.document_filename, document_filename or "")
+        return key in self._keys
+
+    def insert(self, values: Dict[str, Any], key: str) -> Optional[Gazette]:
+        """
+        Insert a notice under ``key`` unless it violates any unique index of
+        ``gazette_entries`` (ON CONFLICT DO NOTHING). Returns the new notice, or None when
+        it was a duplicate. The caller commits.
+
+        The session is flushed first: the notice's person may only be staged
+        (``PersonNameResolver``) and this Core statement does not autoflush.
+        """
+        self.db.flush()
+        statement = pg_insert(Gazette).values(**values, import_key=key).on_conflict_do_nothing().returning(Gazette)
+        gazette = self.db.scalars(statement).first()
+        self._keys.add(key)
+        return gazette
@@ -0,0 +1,536 @@
+"""
+Bulk import of gazette notices from Excel workbooks (POST /api/gazette/import-excel).
+
+``normalize_frame`` maps a workbook to one canonical frame per notice type with
+column-wise pandas operations (text cleanup, date parsing over unique values, page
+numbers). ``GazetteImportEngine`` then writes it in chunks of
+``GAZETTE_IMPORT_CHUNK_SIZE`` rows:
+
+* existing notices are recognised by ``import_key``, a hash of the notice's content,
+  which is prefetched once for the whole workbook. Inserts use
+  ``ON CONFLICT (import_key) DO NOTHING`` so a concurrent import of the same file cannot
+  create duplicates either;
+* people are matched case-insensitively on ``full_name``, prefetched once for every name
+  in the workbook; names not found are inserted with one multi-row INSERT per chunk;
+* the people columns a notice carries (previous names, date/place of birth, ...) are
+  written with one executemany UPDATE per chunk;
+* the chunk and the job's progress counters are committed together. A chunk that fails
+  is retried row by row so one bad row only skips itself.
+
+Analytics for newly created people are not generated inside the import; their ids go to
+``analytics_queue`` (services/person_analytics_queue.py), which works through them after
+the response.
+"""
+
+import hashlib
+import logging
+import re
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal
+from models.gazette import Gazette, GazetteType, GazetteStatus, GazettePriority
+from models.gazette_import_job import GazetteImportJob
+from models.people import People
+from services.person_analytics_queue import analytics_queue
+
+logger = logging.getLogger(__name__)
+
+DATE_FORMATS = [
+    "%d %B, %Y",  # 23rd February, 2017
+    "%d %B %Y",   # 18 November 2019
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+    "%m/%d/%Y"
+]
+_ORDINAL_SUFFIX = re.compile(r"(\d)(st|nd|rd|th)\b", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+LOOKUP_BATCH = 1000
+MAX_JOB_ERRORS = 50
+
+SUPPORTED_TYPES = (
+    GazetteType.CHANGE_OF_NAME,
+    GazetteType.CHANGE_OF_DATE_OF_BIRTH,
+    GazetteType.CHANGE_OF_PLACE_OF_BIRTH,
+    GazetteType.APPOINTMENT_OF_MARRIAGE_OFFICERS,
+)
+
+# People columns a notice may set; a NULL in the batch keeps the current value
+PERSON_SYNC_COLUMNS = (
+    "previous_names", "effective_date_of_change", "date_of_birth", "place_of_birth",
+    "job_title", "employer", "address", "gazette_source", "gazette_reference",
+)
+PERSON_EXTRA_COLUMNS = ("occupation", "organization", "address")
+
+
+def parse_gazette_date(value: Any) -> Optional[datetime]:
+    """Parse the date formats found in the gazette workbooks"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)) or value == "":
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, datetime):
+        return value
+
+    clean_date = _ORDINAL_SUFFIX.sub(r"\1", str(value)).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(clean_date, fmt)
+        except ValueError:
+            continue
+
+    logger.warning(f"Could not parse date: {value}")
+    return None
+
+
+def normalize_name_key(name: Optional[str]) -> str:
+    return _WHITESPACE.sub(" ", name or "").strip().lower()
+
+
+# ----------------------------------------------------------------------
+# Column-wise normalization
+# ----------------------------------------------------------------------
+
+def _text(df: pd.DataFrame, column: Optional[str]) -> pd.Series:
+    if not column or column not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    series = df[column]
+    if pd.api.types.is_float_dtype(series):
+        # Whole numbers (gazette numbers, item numbers) read as floats: 94.0 -> "94"
+        whole = series.dropna()
+        if (whole == whole.round()).all():
+            series = series.astype("Int64")
+    return series.astype(object).where(series.notna(), "").astype(str).str.strip()
+
+
+def _dates(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df.columns:
+        return pd.Series(None, index=df.index, dtype=object)
+    series = df[column]
+    # Each distinct value is parsed once; workbooks repeat the same few dates
+    parsed = {value: parse_gazette_date(value) for value in series.dropna().unique()}
+    return pd.Series([None if pd.isna(value) else parsed[value] for value in series], index=df.index, dtype=object)
+
+
+def _pages(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df.columns:
+        return pd.Series(None, index=df.index, dtype=object)
+    pages = pd.to_numeric(df[column], errors="coerce")
+    return pd.Series([None if pd.isna(page) else int(page) for page in pages], index=df.index, dtype=object)
+
+
+def _find_column(df: pd.DataFrame, *fragments: str) -> Optional[str]:
+    """Last column whose lowercased name contains every fragment"""
+    found = None
+    for column in df.columns:
+        name = str(column).lower().strip()
+        if all(fragment in name for fragment in fragments):
+            found = column
+    return found
+
+
+def _import_key(*parts: Any) -> str:
+    material = "\x1f".join(normalize_name_key(str(part)) if part is not None else "" for part in parts)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def normalize_frame(df: pd.DataFrame, gazette_type: GazetteType) -> pd.DataFrame:
+    """
+    Canonical columns: primary_name, import_key, gazette column values (``g_*``) and
+    person columns (``p_*``) for the notice type. Rows without a name get an empty
+    ``primary_name`` and are skipped by the engine.
+    """
+    out = pd.DataFrame(index=df.index)
+    gazette_date = _dates(df, "Gazette Date")
+    out["g_gazette_date"] = gazette_date
+    out["g_gazette_number"] = _text(df, "Gazette Number")
+    out["g_page_number"] = _pages(df, "Page Number")
+    # Rows without an item number are numbered by their position in the workbook
+    item_numbers = _text(df, _find_column(df, "item", "no"))
+    row_numbers = pd.Series((df.index + 1).astype(str), index=df.index)
+    out["g_item_number"] = item_numbers.where(item_numbers != "", "XL-" + row_numbers)
+
+    if gazette_type == GazetteType.CHANGE_OF_NAME:
+        old_name = _text(df, _find_column(df, "old", "name"))
+        new_name = _text(df, _find_column(df, "new", "name"))
+        aliases = _text(df, _find_column(df, "alias"))
+        effective = _dates(df, "Effective Date")
+        primary = new_name.where(new_name != "", old_name)
+        alias_lists = aliases.map(lambda value: [alias.strip() for alias in value.split(",") if alias.strip()])
+        alias_lists = pd.Series(
+            [names + [old] if old and old != new else names
+             for names, old, new in zip(alias_lists, old_name, new_name)],
+            index=df.index, dtype=object
+        )
+        out["primary_name"] = primary
+        out["g_title"] = "Change of Name - " + primary
+        out["g_content"] = "Name change from " + old_name + " to " + new_name
+        out["g_old_name"] = old_name
+        out["g_new_name"] = new_name
+        out["g_alias_names"] = alias_lists
+        out["g_effective_date"] = effective
+        out["g_source"] = _text(df, "Source")
+        out["p_previous_names"] = alias_lists.map(lambda names: names or None)
+        out["p_effective_date_of_change"] = effective
+        key_parts = [old_name, new_name]
+
+    elif gazette_type == GazetteType.CHANGE_OF_DATE_OF_BIRTH:
+        name = _text(df, "Name")
+        old_dob = _dates(df, "Old Date of Birth")
+        new_dob = _dates(df, "New Date of Birth")
+        effective = _dates(df, "Effective Date")
+        out["primary_name"] = name
+        out["g_title"] = "Change of Date of Birth - " + name
+        out["g_content"] = [f"Date of birth change from {old} to {new}" for old, new in zip(old_dob, new_dob)]
+        out["g_old_date_of_birth"] = old_dob
+        out["g_new_date_of_birth"] = new_dob
+        out["g_effective_date"] = effective
+        out["g_source"] = _text(df, "Source")
+        out["p_date_of_birth"] = new_dob
+        out["p_effective_date_of_change"] = effective
+        key_parts = [name, old_dob, new_dob]
+
+    elif gazette_type == GazetteType.CHANGE_OF_PLACE_OF_BIRTH:
+        name = _text(df, "Name")
+        old_pob = _text(df, "Old Place of Birth")
+        new_pob = _text(df, "New Place of Birth")
+        effective = _dates(df, "Effective Date")
+        out["primary_name"] = name
+        out["g_title"] = "Change of Place of Birth - " + name
+        out["g_content"] = "Place of birth change from " + old_pob + " to " + new_pob
+        out["g_old_place_of_birth"] = old_pob
+        out["g_new_place_of_birth"] = new_pob
+        out["g_effective_date"] = effective
+        out["g_source"] = _text(df, "Source")
+        out["p_place_of_birth"] = new_pob
+        out["p_effective_date_of_change"] = effective
+        key_parts = [name, old_pob, new_pob]
+
+    elif gazette_type == GazetteType.APPOINTMENT_OF_MARRIAGE_OFFICERS:
+        officer = _text(df, "Name of the Appointed Marriage Officer")
+        church = _text(df, "Church of the Marriage Officer")
+        location = _text(df, "Location of the Church")
+        authority = _text(df, "Appointing Authority")
+        effective = _dates(df, "Appointment Date")
+        out["primary_name"] = officer
+        out["g_title"] = "Appointment of Marriage Officer - " + officer
+        out["g_content"] = (
+            "Appointment of Marriage Officer - " + officer + "\n\nOfficer Details:\n- Name: " + officer
+            + "\n- Church: " + church + "\n- Location: " + location + "\n- Appointing Authority: " + authority
+        )
+        out["g_officer_name"] = officer
+        out["g_officer_title"] = "Marriage Officer"
+        out["g_appointment_authority"] = authority
+        out["g_jurisdiction_area"] = location
+        out["g_effective_date"] = effective
+        out["g_source"] = _text(df, "Source (Gazette No., Date, Page)")
+        out["p_job_title"] = "Marriage Officer"
+        out["p_employer"] = authority
+        out["p_address"] = location
+        # Only applied to people the import creates, as find_or_create_person did
+        out["new_occupation"] = "Marriage Officer"
+        out["new_organization"] = church
+        out["new_address"] = location
+        key_parts = [officer, church, location]
+
+    else:
+        raise ValueError(f"Unsupported gazette type: {gazette_type.value}")
+
+    out["p_gazette_source"] = out["g_source"]
+    out["p_gazette_reference"] = out["g_gazette_number"]
+    out["import_key"] = [
+        _import_key(gazette_type.value, number, date, *parts)
+        for number, date, *parts in zip(out["g_gazette_number"], gazette_date, *key_parts)
+    ]
+    return out
+
+
+# ----------------------------------------------------------------------
+# Import engine
+# ----------------------------------------------------------------------
+
+def _batches(values: List[Any], size: int = LOOKUP_BATCH):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _blank_to_none(value: Any) -> Any:
+    return None if value == "" or (isinstance(value, list) and not value) else value
+
+
+class GazetteImportEngine:
+    """Writes a normalized workbook frame in committed chunks and tracks progress on the job"""
+
+    def __init__(self, db: Session, job: GazetteImportJob, gazette_type: GazetteType,
+                 chunk_size: Optional[int] = None, generate_analytics: Optional[bool] = None):
+        self.db = db
+        self.job = job
+        self.gazette_type = gazette_type
+        self.chunk_size = chunk_size or settings.gazette_import_chunk_size
+        self.generate_analytics = (
+            settings.gazette_import_generate_analytics if generate_analytics is None else generate_analytics
+        )
+        self.person_ids: Dict[str, int] = {}
+        self.existing_keys: set = set()
+        self.errors: List[str] = []
+        self.counts = {
+            "processed_rows": 0, "imported": 0, "duplicates": 0, "skipped": 0,
+            "people_created": 0, "people_updated": 0, "analytics_queued": 0,
+        }
+
+    # -- prefetch -------------------------------------------------------
+
+    def prefetch(self, frame: pd.DataFrame) -> None:
+        """Existing people for every name and existing notices for every key, in batched IN queries"""
+        names = sorted({normalize_name_key(name) for name in frame["primary_name"] if name})
+        for batch in _batches(names):
+            rows = self.db.execute(
+                select(People.id, func.lower(People.full_name))
+                .where(func.lower(People.full_name).in_(batch))
+                .order_by(People.id)
+            )
+            for person_id, name in rows:
+                self.person_ids.setdefault(normalize_name_key(name), person_id)
+
+        keys = list(dict.fromkeys(frame["import_key"]))
+        for batch in _batches(keys):
+            self.existing_keys.update(
+                self.db.execute(select(Gazette.import_key).where(Gazette.import_key.in_(batch))).scalars()
+            )
+
+    # -- chunk writing --------------------------------------------------
+
+    def _new_person_row(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        full_name = record["primary_name"]
+        parts = full_name.split(" ")
+        row = {
+            "full_name": full_name,
+            "first_name": parts[0],
+            "last_name": " ".join(parts[1:]),
+            "created_by": None,
+        }
+        for column in PERSON_EXTRA_COLUMNS:
+            row[column] = _blank_to_none(record.get(f"new_{column}"))
+        return row
+
+    def _gazette_row(self, record: Dict[str, Any], person_id: int) -> Dict[str, Any]:
+        row = {
+            column[2:]: _blank_to_none(value) if column != "g_gazette_number" else value
+            for column, value in record.items() if column.startswith("g_")
+        }
+        effective = row.get("effective_date")
+        row.update(
+            import_key=record["import_key"],
+            gazette_type=self.gazette_type,
+            status=GazetteStatus.PUBLISHED,
+            priority=GazettePriority.MEDIUM,
+            publication_date=row.get("gazette_date") or effective or datetime.now(),
+            effective_date_of_change=effective,
+            source=record.get("g_source") or "",
+            document_filename=self.job.filename or "excel-import",
+            source_item_number=row["item_number"],
+            jurisdiction="Ghana",
+            person_id=person_id,
+            is_public=True,
+            created_by=None,
+        )
+        return row
+
+    def _write_chunk(self, records: List[Dict[str, Any]]) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Insert one chunk; returns (new name -> person id, counters). The caller commits."""
+        counts = {"imported": 0, "duplicates": 0, "skipped": 0, "people_created": 0, "people_updated": 0}
+        new_people: Dict[str, Dict[str, Any]] = {}
+        pending: List[Dict[str, Any]] = []
+        seen = set()
+        for record in records:
+            name_key = normalize_name_key(record["primary_name"])
+            if not name_key:
+                counts["skipped"] += 1
+                continue
+            if record["import_key"] in self.existing_keys or record["import_key"] in seen:
+                counts["duplicates"] += 1
+                continue
+            seen.add(record["import_key"])
+            if name_key not in self.person_ids and name_key not in new_people:
+                new_people[name_key] = self._new_person_row(record)
+            pending.append(record)
+
+        created: Dict[str, int] = {}
+        if new_people:
+            rows = self.db.execute(
+                pg_insert(People).values(list(new_people.values())).returning(People.id, People.full_name)
+            )
+            for person_id, full_name in rows:
+                created.setdefault(normalize_name_key(full_name), person_id)
+            counts["people_created"] = len(created)
+
+        def person_id_for(record):
+            name_key = normalize_name_key(record["primary_name"])
+            return self.person_ids.get(name_key) or created[name_key]
+
+        inserted_keys = set()
+        if pending:
+            statement = pg_insert(Gazette).values(
+                [self._gazette_row(record, person_id_for(record)) for record in pending]
+            ).on_conflict_do_nothing(
+                index_elements=[Gazette.import_key], index_where=Gazette.import_key.isnot(None)
+            ).returning(Gazette.import_key)
+            inserted_keys = set(self.db.execute(statement).scalars())
+        counts["imported"] = len(inserted_keys)
+        counts["duplicates"] += len(pending) - len(inserted_keys)
+
+        # Later rows of the same person win, as when rows were synced one after another
+        person_updates: Dict[int, Dict[str, Any]] = {}
+        for record in pending:
+            if record["import_key"] not in inserted_keys:
+                continue
+            values = person_updates.setdefault(person_id_for(record), {})
+            for column in PERSON_SYNC_COLUMNS:
+                value = _blank_to_none(record.get(f"p_{column}"))
+                if value is not None:
+                    values[column] = value
+        person_updates = {person_id: values for person_id, values in person_updates.items() if values}
+        if person_updates:
+            table = People.__table__
+            statement = update(table).where(table.c.id == bindparam("b_person_id")).values({
+                column: func.coalesce(bindparam(f"b_{column}", type_=table.c[column].type), table.c[column])
+                for column in PERSON_SYNC_COLUMNS
+            })
+            self.db.execute(statement, [
+                dict({f"b_{column}": values.get(column) for column in PERSON_SYNC_COLUMNS}, b_person_id=person_id)
+                for person_id, values in person_updates.items()
+            ])
+            counts["people_updated"] = len(person_updates)
+
+        self.existing_keys.update(inserted_keys)
+        return created, counts
+
+    def _save_progress(self, status: Optional[str] = None, counts: Optional[Dict[str, int]] = None) -> None:
+        for name, value in (counts or self.counts).items():
+            setattr(self.job, name, value)
+        self.job.errors = self.errors[:MAX_JOB_ERRORS] or None
+        if status:
+            self.job.status = status
+            if status in ("completed", "failed"):
+                self.job.finished_at = datetime.now(timezone.utc)
+
+    def _commit_chunk(self, created: Dict[str, int], counts: Dict[str, int], rows: int) -> None:
+        """Commit the chunk with the job counters it produces, then queue analytics"""
+        merged = dict(self.counts)
+        for name, value in counts.items():
+            merged[name] += value
+        merged["processed_rows"] += rows
+        if self.generate_analytics:
+            merged["analytics_queued"] += len(created)
+        self._save_progress(counts=merged)
+        self.db.commit()
+
+        self.counts = merged
+        self.person_ids.update(created)
+        if self.generate_analytics and created:
+            analytics_queue.enqueue(created.values(), self.job.id)
+
+    def _process_chunk(self, records: List[Dict[str, Any]], first_row: int) -> None:
+        try:
+            created, counts = self._write_chunk(records)
+            self._commit_chunk(created, counts, len(records))
+            return
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"Import chunk at row {first_row} failed, retrying row by row: {e}")
+
+        for offset, record in enumerate(records):
+            try:
+                created, counts = self._write_chunk([record])
+                self._commit_chunk(created, counts, 1)
+            except Exception as e:
+                self.db.rollback()
+                self.counts["skipped"] += 1
+                self.counts["processed_rows"] += 1
+                self.errors.append(f"Row {first_row + offset}: {str(e)}")
+                logger.error(f"Error importing row {first_row + offset}: {e}")
+        self._save_progress()
+        self.db.commit()
+
+    def run(self, frame: pd.DataFrame) -> Dict[str, Any]:
+        self.job.status = "running"
+        self.job.total_rows = len(frame)
+        self.db.commit()
+        try:
+            self.prefetch(frame)
+            records = frame.to_dict("records")
+            for start in range(0, len(records), self.chunk_size):
+                self._process_chunk(records[start:start + self.chunk_size], start + 1)
+            self._save_progress("completed")
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            self.errors.append(str(e))
+            self._save_progress("failed")
+            self.db.commit()
+            raise
+        return job_to_dict(self.job)
+
+
+def create_import_job(db: Session, gazette_type: GazetteType, filename: Optional[str],
+                      total_rows: int = 0) -> GazetteImportJob:
+    job = GazetteImportJob(
+        id=str(uuid.uuid4()), filename=filename, gazette_type=gazette_type.value,
+        status="queued", total_rows=total_rows,
+    )
+    db.add(job)
+    db.commit()
+    return job
+
+
+def import_gazette_frame(db: Session, job: GazetteImportJob, df: pd.DataFrame,
+                         gazette_type: GazetteType) -> Dict[str, Any]:
+    """Normalize and import a workbook frame under ``job``"""
+    frame = normalize_frame(df, gazette_type)
+    return GazetteImportEngine(db, job, gazette_type).run(frame)
+
+
+def run_import_job(job_id: str, df: pd.DataFrame, gazette_type: GazetteType) -> None:
+    """Background entry point: imports with its own session"""
+    db = SessionLocal()
+    try:
+        job = db.query(GazetteImportJob).filter(GazetteImportJob.id == job_id).first()
+        if job is None:
+            logger.error(f"Gazette import job {job_id} not found")
+            return
+        import_gazette_frame(db, job, df, gazette_type)
+    except Exception as e:
+        logger.error(f"Gazette import job {job_id} failed: {e}", exc_info=True)
+    finally:
+        db.close()
+
+
+def job_to_dict(job: GazetteImportJob) -> Dict[str, Any]:
+    return {
+        "job_id": job.id,
+        "filename": job.filename,
+        "gazette_type": job.gazette_type,
+        "status": job.status,
+        "total_rows": job.total_rows,
+        "processed_rows": job.processed_rows,
+        "imported": job.imported,
+        "duplicates": job.duplicates,
+        "skipped": job.skipped,
+        "people_created": job.people_created,
+        "people_updated": job.people_updated,
+        "analytics_queued": job.analytics_queued,
+        "analytics_done": job.analytics_done,
+        "errors": job.errors or [],
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "finished_at": job.finished_at,
+    }
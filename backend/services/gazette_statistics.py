@@ -11,6 +11,8 @@ from sqlalchemy import func, extract
 from database import get_db
 from models.gazette import Gazette, GazetteType
 from models.people import People
+from services.cache_service import cached, GAZETTE_STATS
+from services.stats_rollup_service import StatsRollupService
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,27 +24,26 @@ class GazetteStatistics:
     def __init__(self, db: Session):
         self.db = db
     
+    def _rollups(self) -> StatsRollupService:
+        return StatsRollupService(self.db)
+    
     def get_overall_statistics(self) -> Dict:
         """Get overall gazette processing statistics"""
         try:
+            rollups = self._rollups()
+            
             # Total gazettes processed (unique gazette numbers)
-            total_gazettes = self.db.query(func.count(func.distinct(Gazette.gazette_number))).scalar() or 0
+            total_gazettes = rollups.count("gazettes.distinct_numbers")
             
             # Total names retrieved (unique people from gazettes)
-            total_names = self.db.query(func.count(func.distinct(Gazette.person_id))).filter(
-                Gazette.person_id.isnot(None)
-            ).scalar() or 0
+            total_names = rollups.count("gazettes.distinct_people")
             
             # Total entries extracted
-            total_entries = self.db.query(func.count(Gazette.id)).scalar() or 0
+            total_entries = rollups.count("gazettes.total")
             
             # Breakdown by type
-            by_type = {}
-            for gtype in GazetteType:
-                count = self.db.query(func.count(Gazette.id)).filter(
-                    Gazette.gazette_type == gtype
-                ).scalar() or 0
-                by_type[gtype.value] = count
+            type_counts = rollups.counts("gazettes.type")
+            by_type = {gtype.value: type_counts.get(gtype.value, 0) for gtype in GazetteType}
             
             return {
                 'total_gazettes_processed': total_gazettes,
@@ -64,23 +65,17 @@ class GazetteStatistics:
     def get_statistics_by_year(self) -> Dict:
         """Get statistics grouped by year"""
         try:
-            # Get all gazettes with dates
-            gazettes = self.db.query(
-                extract('year', Gazette.gazette_date).label('year'),
-                func.count(func.distinct(Gazette.gazette_number)).label('gazette_count'),
-                func.count(func.distinct(Gazette.person_id)).label('name_count'),
-                func.count(Gazette.id).label('entry_count')
-            ).filter(
-                Gazette.gazette_date.isnot(None)
-            ).group_by('year').order_by('year').all()
+            rollups = self._rollups()
+            gazette_counts = rollups.counts("gazettes.year_numbers")
+            name_counts = rollups.counts("gazettes.year_people")
+            entry_counts = rollups.counts("gazettes.year")
             
             year_stats = {}
-            for row in gazettes:
-                year = int(row.year) if row.year else 0
-                year_stats[str(year)] = {
-                    'gazettes_processed': row.gazette_count or 0,
-                    'names_retrieved': row.name_count or 0,
-                    'entries_extracted': row.entry_count or 0
+            for year in sorted(entry_counts, key=int):
+                year_stats[year] = {
+                    'gazettes_processed': gazette_counts.get(year, 0),
+                    'names_retrieved': name_counts.get(year, 0),
+                    'entries_extracted': entry_counts[year]
                 }
             
             return year_stats
@@ -88,6 +83,15 @@ class GazetteStatistics:
             logger.error(f"Error getting statistics by year: {e}")
             return {}
     
+    def get_statistics_by_jurisdiction(self) -> Dict:
+        """Get entry counts grouped by jurisdiction, largest first"""
+        try:
+            jurisdiction_counts = self._rollups().counts("gazettes.jurisdiction")
+            return dict(sorted(jurisdiction_counts.items(), key=lambda item: item[1], reverse=True))
+        except Exception as e:
+            logger.error(f"Error getting statistics by jurisdiction: {e}")
+            return {}
+    
     def get_gazette_list(self, year: Optional[int] = None, limit: int = 100) -> List[Dict]:
         """Get list of processed gazettes"""
         try:
@@ -185,11 +189,13 @@ class GazetteStatistics:
             logger.error(f"Error getting name linking statistics: {e}")
             return {'total_linked_names': 0, 'linked_names': []}
     
+    @cached(GAZETTE_STATS)
     def get_complete_statistics(self) -> Dict:
         """Get complete statistics for dashboard"""
         return {
             'overall': self.get_overall_statistics(),
             'by_year': self.get_statistics_by_year(),
+            'by_jurisdiction': self.get_statistics_by_jurisdiction(),
             'name_linking': self.get_name_linking_statistics(),
             'generated_at': datetime.now().isoformat()
         }
@@ -0,0 +1,91 @@
+"""
+Keyword dictionaries of the analytics services, compiled for one pass per case text.
+
+The person, bank, insurance and auto analytics services score cases against keyword
+dictionaries (risk categories, subject categories, legal issues, financial terms,
+outcome indicators). They used to test every keyword with ``keyword.lower() in
+case_text.lower()``, lowercasing the whole case text again for every keyword, and each
+scoring method re-read every case.
+
+A ``KeywordMatcher`` is built once per service from all of its dictionaries ("groups").
+Keywords are lowercased and deduplicated across groups and categories ("fraud" is a
+risk keyword, a subject keyword and a legal issue, but is searched for once).
+``scan(text)`` lowercases the text once, tests each distinct keyword once and returns
+``KeywordHits``. The scoring methods then read per-category hits, counts and term lists
+from the hits instead of searching the text again; services keep one ``KeywordHits``
+per case, so a case is scanned once however many scores use it.
+
+Matching keeps the services' substring semantics: a keyword matches anywhere in the
+text, so "land" still matches "landlord". Plain substring tests run in C. A single
+alternation regex or a pure-Python automaton over the same keywords measured several
+times slower on judgment-sized texts (see scripts/benchmark_keyword_matcher.py).
+"""
+
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Sequence, Tuple, Union
+
+GroupSpec = Union[Mapping[str, Sequence[str]], Sequence[str]]
+
+FLAT = ""  # category of groups given as a plain keyword list
+
+
+class KeywordMatcher:
+    """Named keyword groups ({category: [keywords]} or a flat list) compiled for scanning"""
+
+    def __init__(self, groups: Mapping[str, GroupSpec]):
+        self.groups: Dict[str, List[Tuple[str, List[Tuple[str, str]]]]] = {}
+        distinct: Dict[str, None] = {}
+        for group, spec in groups.items():
+            categories = spec.items() if isinstance(spec, Mapping) else [(FLAT, spec)]
+            compiled = []
+            for category, keywords in categories:
+                pairs = [(keyword, keyword.lower()) for keyword in keywords]
+                compiled.append((category, pairs))
+                for _, lowered in pairs:
+                    distinct[lowered] = None
+            self.groups[group] = compiled
+        self.keywords: Tuple[str, ...] = tuple(distinct)
+        self.keyword_set: FrozenSet[str] = frozenset(distinct)
+
+    def scan(self, text: str) -> "KeywordHits":
+        lowered = (text or "").lower()
+        return KeywordHits(self, frozenset(keyword for keyword in self.keywords if keyword in lowered))
+
+
+class KeywordHits:
+    """Compiled keywords found in one text (or the union of several)"""
+
+    __slots__ = ("matcher", "found")
+
+    def __init__(self, matcher: KeywordMatcher, found: FrozenSet[str]):
+        self.matcher = matcher
+        self.found = found
+
+    def __contains__(self, keyword: str) -> bool:
+        lowered = keyword.lower()
+        if lowered not in self.matcher.keyword_set:
+            raise KeyError(f"Keyword {keyword!r} is not in any compiled group")
+        return lowered in self.found
+
+    def any(self, group: str) -> bool:
+        return any(lowered in self.found for _, pairs in self.matcher.groups[group] for _, lowered in pairs)
+
+    def categories(self, group: str) -> Dict[str, List[str]]:
+        """Category -> keywords found (dictionary order), for categories with at least one"""
+        result = {}
+        for category, pairs in self.matcher.groups[group]:
+            keywords = [keyword for keyword, lowered in pairs if lowered in self.found]
+            if keywords:
+                result[category] = keywords
+        return result
+
+    def counts(self, group: str) -> Dict[str, int]:
+        return {category: len(keywords) for category, keywords in self.categories(group).items()}
+
+    def terms(self, group: str) -> List[str]:
+        """Keywords of a flat group found, in dictionary order"""
+        return self.categories(group).get(FLAT, [])
+
+    @classmethod
+    def union(cls, matcher: KeywordMatcher, hits: Iterable["KeywordHits"]) -> "KeywordHits":
+        found = frozenset().union(*(item.found for item in hits))
+        return cls(matcher, found)
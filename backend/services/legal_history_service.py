@@ -1,10 +1,10 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 from sqlalchemy import and_, or_, func, desc, asc
 from typing import List, Dict, Optional, Tuple
 import re
 from datetime import datetime
 
-from models.reported_cases import ReportedCases
+from models.reported_cases import ReportedCases, BODY_COLUMN_GROUP
 from models.legal_history import LegalHistory, CaseMention, LegalSearchIndex
 from models.people import People
 from models.banks import Banks
@@ -112,7 +112,7 @@ class LegalHistoryService:
         for term in search_terms:
             conditions.append(ReportedCases.title.ilike(f"%{term}%"))
         
-        return self.db.query(ReportedCases).filter(or_(*conditions)).all()
+        return self.db.query(ReportedCases).options(undefer_group(BODY_COLUMN_GROUP)).filter(or_(*conditions)).all()
 
     def _search_in_parties(self, search_terms: List[str]) -> List[ReportedCases]:
         """Search for entity mentions in antagonist/protagonist fields"""
@@ -123,7 +123,7 @@ class LegalHistoryService:
                 ReportedCases.protagonist.ilike(f"%{term}%")
             ])
         
-        return self.db.query(ReportedCases).filter(or_(*conditions)).all()
+        return self.db.query(ReportedCases).options(undefer_group(BODY_COLUMN_GROUP)).filter(or_(*conditions)).all()
 
     def _search_in_content(self, search_terms: List[str]) -> List[ReportedCases]:
         """Search for entity mentions in case content"""
@@ -136,7 +136,7 @@ class LegalHistoryService:
                 ReportedCases.keywords_phrases.ilike(f"%{term}%")
             ])
         
-        return self.db.query(ReportedCases).filter(or_(*conditions)).all()
+        return self.db.query(ReportedCases).options(undefer_group(BODY_COLUMN_GROUP)).filter(or_(*conditions)).all()
 
     def _combine_search_results(self, *result_sets) -> List[ReportedCases]:
         """Combine and deduplicate search results"""
@@ -0,0 +1,309 @@
+"""
+Persistent cache of LLM results for AI case summaries and analyses.
+
+Entries are keyed by ``sha256(model, template, template version, normalized input)``.
+The normalized input is the text the prompt is built from, with whitespace collapsed,
+so the same case content maps to the same key no matter which request produced it.
+Bump a template's version whenever its prompt or output parsing changes.
+
+Two tiers:
+
+* the shared response cache (``services/cache_service.py``, ``LLM_RESPONSES``
+  namespace) answers repeat calls in-process or from Redis;
+* the ``llm_response_cache`` table keeps results across restarts and deploys.
+
+Rows expire after ``LLM_CACHE_TTL``. Every ``LLM_CACHE_EVICT_EVERY`` stores, expired rows
+and rows beyond ``LLM_CACHE_MAX_ENTRIES`` are deleted, least recently used first.
+
+Usage::
+
+    result, hit = cached_llm_call(
+        "ai_service.case_summary", "v1", model, context,
+        lambda: (call_model(...), usage),
+        bypass=not use_cache,
+    )
+
+``acached_llm_call`` is the same for an async ``compute`` (AsyncOpenAI); its cache reads
+and writes run in worker threads.
+
+``bypass=True`` skips the lookup but still stores the fresh result, so a bypass works
+as a refresh; ``LLM_CACHE_ENABLED=false`` turns both off. Only successful results should be
+returned from ``compute``; raise to keep a failure out of the cache.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import update
+
+from config import settings
+from database import SessionLocal
+from models.llm_response_cache import LLMResponseCache
+from services.cache_service import get_cached, set_cached, delete_cached_prefix, LLM_RESPONSES
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class LLMCacheMetrics:
+    """Counters exposed on /api/admin/llm-cache/stats"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.stores = 0
+        self.evicted = 0
+        self.errors = 0
+        self.tokens_saved = 0
+        self.by_template: Dict[str, Dict[str, int]] = {}
+
+    def record(self, template: Optional[str] = None, **increments: int) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+            if template:
+                counters = self.by_template.setdefault(template, {"hits": 0, "misses": 0, "tokens_saved": 0})
+                for name in ("hits", "misses", "tokens_saved"):
+                    counters[name] += increments.get(name, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "bypasses": self.bypasses,
+                "stores": self.stores,
+                "evicted": self.evicted,
+                "errors": self.errors,
+                "tokens_saved": self.tokens_saved,
+                "templates": {name: dict(counters) for name, counters in self.by_template.items()},
+            }
+
+
+metrics = LLMCacheMetrics()
+
+
+def normalize_prompt_input(text: Any) -> str:
+    """Collapse whitespace so formatting-only differences share a key"""
+    if text is None:
+        return ""
+    if not isinstance(text, str):
+        text = json.dumps(text, sort_keys=True, default=str)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def llm_cache_key(model: str, template: str, template_version: str, input_text: Any) -> str:
+    material = "\x1f".join([model or "", template, template_version, normalize_prompt_input(input_text)])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _usage_tokens(usage: Any) -> Tuple[int, int]:
+    """(prompt, completion) tokens from an OpenAI usage object or dict"""
+    if not usage:
+        return 0, 0
+    if isinstance(usage, dict):
+        return usage.get("prompt_tokens") or 0, usage.get("completion_tokens") or 0
+    return getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0
+
+
+def get_llm_response(key: str, template: str) -> Optional[Dict[str, Any]]:
+    """Cached ``{"response", "prompt_tokens", "completion_tokens"}`` for ``key`` or None"""
+    entry = get_cached(LLM_RESPONSES, key)
+    if entry is not None:
+        return entry
+
+    db = SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+        row = db.query(LLMResponseCache).filter(
+            LLMResponseCache.cache_key == key,
+            LLMResponseCache.expires_at > now
+        ).first()
+        if row is None:
+            return None
+        entry = {
+            "response": row.response,
+            "prompt_tokens": row.prompt_tokens or 0,
+            "completion_tokens": row.completion_tokens or 0,
+        }
+        db.execute(
+            update(LLMResponseCache)
+            .where(LLMResponseCache.cache_key == key)
+            .values(hit_count=LLMResponseCache.hit_count + 1, last_hit_at=now)
+        )
+        db.commit()
+        expires_at = row.expires_at if row.expires_at.tzinfo else row.expires_at.replace(tzinfo=timezone.utc)
+        remaining = int((expires_at - now).total_seconds())
+        set_cached(LLM_RESPONSES, key, entry, ttl=max(1, min(remaining, settings.llm_cache_ttl)))
+        return entry
+    except Exception as e:
+        db.rollback()
+        metrics.record(errors=1)
+        logger.warning(f"LLM cache read failed for {template}: {e}")
+        return None
+    finally:
+        db.close()
+
+
+def store_llm_response(key: str, template: str, template_version: str, model: str,
+                       response: Any, usage: Any = None) -> None:
+    prompt_tokens, completion_tokens = _usage_tokens(usage)
+    entry = {"response": response, "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens}
+    set_cached(LLM_RESPONSES, key, entry, ttl=settings.llm_cache_ttl)
+
+    db = SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+        db.merge(LLMResponseCache(
+            cache_key=key,
+            template=template,
+            template_version=template_version,
+            model=model or "",
+            response=response,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            hit_count=0,
+            created_at=now,
+            last_hit_at=now,
+            expires_at=now + timedelta(seconds=settings.llm_cache_ttl),
+        ))
+        db.commit()
+        metrics.record(stores=1)
+    except Exception as e:
+        db.rollback()
+        metrics.record(errors=1)
+        logger.warning(f"LLM cache write failed for {template}: {e}")
+        return
+    finally:
+        db.close()
+
+    if settings.llm_cache_evict_every and metrics.stores % settings.llm_cache_evict_every == 0:
+        evict_llm_responses()
+
+
+def cached_llm_call(template: str, template_version: str, model: str, input_text: Any,
+                    compute: Callable[[], Tuple[Any, Any]], bypass: bool = False) -> Tuple[Any, bool]:
+    """
+    Return ``(result, cache_hit)``. On a miss ``compute()`` is called and must return
+    ``(result, usage)``; the result has to be JSON-serializable.
+    """
+    if not settings.llm_cache_enabled:
+        return compute()[0], False
+
+    key = llm_cache_key(model, template, template_version, input_text)
+    if bypass:
+        metrics.record(bypasses=1)
+    else:
+        entry = get_llm_response(key, template)
+        if entry is not None:
+            metrics.record(template, hits=1,
+                           tokens_saved=entry["prompt_tokens"] + entry["completion_tokens"])
+            return entry["response"], True
+        metrics.record(template, misses=1)
+
+    result, usage = compute()
+    store_llm_response(key, template, template_version, model, result, usage)
+    return result, False
+
+
+async def acached_llm_call(template: str, template_version: str, model: str, input_text: Any,
+                           compute: Callable[[], Awaitable[Tuple[Any, Any]]],
+                           bypass: bool = False) -> Tuple[Any, bool]:
+    """``cached_llm_call`` for an async ``compute``"""
+    if not settings.llm_cache_enabled:
+        return (await compute())[0], False
+
+    key = llm_cache_key(model, template, template_version, input_text)
+    if bypass:
+        metrics.record(bypasses=1)
+    else:
+        entry = await asyncio.to_thread(get_llm_response, key, template)
+        if entry is not None:
+            metrics.record(template, hits=1,
+                           tokens_saved=entry["prompt_tokens"] + entry["completion_tokens"])
+            return entry["response"], True
+        metrics.record(template, misses=1)
+
+    result, usage = await compute()
+    await asyncio.to_thread(store_llm_response, key, template, template_version, model, result, usage)
+    return result, False
+
+
+def evict_llm_responses(db=None) -> int:
+    """Delete expired rows, then the least recently used rows beyond ``llm_cache_max_entries``"""
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+        removed = db.query(LLMResponseCache).filter(
+            LLMResponseCache.expires_at <= now
+        ).delete(synchronize_session=False)
+
+        keep = settings.llm_cache_max_entries
+        if keep:
+            cutoff = db.query(LLMResponseCache.last_hit_at).order_by(
+                LLMResponseCache.last_hit_at.desc().nullslast()
+            ).offset(keep).limit(1).scalar()
+            if cutoff is not None:
+                removed += db.query(LLMResponseCache).filter(
+                    (LLMResponseCache.last_hit_at <= cutoff) | (LLMResponseCache.last_hit_at.is_(None))
+                ).delete(synchronize_session=False)
+        db.commit()
+        metrics.record(evicted=removed)
+        return removed
+    except Exception as e:
+        db.rollback()
+        metrics.record(errors=1)
+        logger.warning(f"LLM cache eviction failed: {e}")
+        return 0
+    finally:
+        if own_session:
+            db.close()
+
+
+def clear_llm_cache(template: Optional[str] = None, db=None) -> int:
+    """
+    Drop every stored result (or only those of ``template``); the in-process/Redis
+    tier is keyed by hash only and is cleared entirely.
+    """
+    delete_cached_prefix(LLM_RESPONSES, "")
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        query = db.query(LLMResponseCache)
+        if template:
+            query = query.filter(LLMResponseCache.template == template)
+        removed = query.delete(synchronize_session=False)
+        db.commit()
+        return removed
+    finally:
+        if own_session:
+            db.close()
+
+
+def llm_cache_stats(db=None) -> Dict[str, Any]:
+    stats = metrics.snapshot()
+    stats["enabled"] = settings.llm_cache_enabled
+    stats["ttl"] = settings.llm_cache_ttl
+    stats["max_entries"] = settings.llm_cache_max_entries
+    if db is not None:
+        try:
+            stats["entries"] = db.query(LLMResponseCache).count()
+        except Exception as e:
+            logger.warning(f"LLM cache size query failed: {e}")
+            stats["entries"] = None
+    return stats
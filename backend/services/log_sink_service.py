@@ -0,0 +1,396 @@
+"""
+Pluggable sinks for the rows LoggingService writes to the *_logs tables.
+
+* ``direct`` (default) - the caller's session adds and commits each row, as before.
+* ``batched`` - rows are buffered in memory and a background thread inserts them
+  with one executemany INSERT per log table every ``log_flush_interval`` seconds
+  (or as soon as ``log_batch_size`` rows are waiting).
+* ``jsonl`` - rows are appended to local segment files under ``log_segment_dir``
+  (one JSON object per line); closed segments are bulk loaded into the database
+  every ``log_segment_load_interval`` seconds and deleted once loaded. Rows survive
+  a process crash and the request path only ever touches the local disk.
+
+``LogSampler`` drops a configurable share of routine access/activity rows before they
+reach any sink; errors, audit and security rows are always kept.
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from config import settings
+from database import SessionLocal
+from models.logs import AccessLog, ActivityLog, AuditLog, ErrorLog, SecurityLog, LogLevel, ActivityType
+
+logger = logging.getLogger(__name__)
+
+LOG_MODELS = {
+    "access": AccessLog,
+    "activity": ActivityLog,
+    "audit": AuditLog,
+    "error": ErrorLog,
+    "security": SecurityLog,
+}
+ENUM_FIELDS = {"severity": LogLevel, "activity_type": ActivityType}
+STALE_SEGMENT_SECONDS = 3600
+
+
+class LogSampler:
+    """Keeps a random share of routine rows; anything that looks like a problem is always kept"""
+
+    def __init__(self, access_rate: float = 1.0, activity_rate: float = 1.0):
+        self.rates = {"access": access_rate, "activity": activity_rate}
+        self.sampled_out: Dict[str, int] = defaultdict(int)
+
+    def keep(self, table: str, values: Dict[str, Any]) -> bool:
+        rate = self.rates.get(table, 1.0)
+        if rate >= 1.0:
+            return True
+        if table == "access" and (values.get("status_code") or 0) >= 400:
+            return True
+        if table == "activity" and values.get("severity") not in (None, LogLevel.DEBUG, LogLevel.INFO):
+            return True
+        if random.random() < rate:
+            return True
+        self.sampled_out[table] += 1
+        return False
+
+
+class LogSink:
+    """Interface every sink implements"""
+
+    name = "base"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {"emitted": 0, "written": 0, "dropped": 0, "failed": 0}
+
+    def _count(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] += value
+
+    def emit(self, table: str, values: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.counters, sink=self.name)
+
+
+def insert_log_rows(rows_by_table: Dict[str, List[Dict[str, Any]]]) -> Dict[str, int]:
+    """
+    Grouped executemany INSERT per log table. When a batch is rejected the table's rows
+    are retried one by one so a single bad row only loses itself.
+    Returns {"written": n, "failed": n}.
+    """
+    result = {"written": 0, "failed": 0}
+    db = SessionLocal()
+    try:
+        for table, rows in rows_by_table.items():
+            if not rows:
+                continue
+            model = LOG_MODELS[table]
+            try:
+                db.execute(insert(model), rows)
+                db.commit()
+                result["written"] += len(rows)
+                continue
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"Bulk insert of {len(rows)} {table} log rows failed ({e}); retrying row by row")
+            for row in rows:
+                try:
+                    db.execute(insert(model), [row])
+                    db.commit()
+                    result["written"] += 1
+                except Exception as e:
+                    db.rollback()
+                    result["failed"] += 1
+                    logger.error(f"Dropping {table} log row: {e}")
+    finally:
+        db.close()
+    return result
+
+
+class _PeriodicWorker:
+    """Daemon thread calling ``task`` every ``interval`` seconds or when woken"""
+
+    def __init__(self, name: str, interval: float, task):
+        self.interval = interval
+        self.task = task
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=max(self.interval * 2, 5))
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.task()
+            except Exception as e:
+                logger.error(f"Log sink background task failed: {e}")
+
+
+class BatchedDatabaseSink(LogSink):
+    """Buffers rows in memory and inserts them per table in the background"""
+
+    name = "batched"
+
+    def __init__(self, batch_size: int = 200, flush_interval: float = 2.0, max_buffer: int = 20000):
+        super().__init__()
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+        self._buffer: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._buffered = 0
+        self._flush_lock = threading.Lock()
+        self._worker = _PeriodicWorker("log-sink-batched", flush_interval, self.flush)
+
+    def emit(self, table: str, values: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._buffered >= self.max_buffer:
+                self.counters["dropped"] += 1
+                return
+            self._buffer[table].append(values)
+            self._buffered += 1
+            self.counters["emitted"] += 1
+            full = self._buffered >= self.batch_size
+        if full:
+            self._worker.wake()
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            with self._lock:
+                pending, self._buffer = self._buffer, defaultdict(list)
+                self._buffered = 0
+            if not any(pending.values()):
+                return
+            result = insert_log_rows(pending)
+            self._count("written", result["written"])
+            self._count("failed", result["failed"])
+
+    def close(self) -> None:
+        self._worker.stop()
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        with self._lock:
+            stats["buffered"] = self._buffered
+        return stats
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _decode_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    for field, enum_type in ENUM_FIELDS.items():
+        if isinstance(row.get(field), str):
+            row[field] = enum_type[row[field]]
+    if isinstance(row.get("created_at"), str):
+        row["created_at"] = datetime.fromisoformat(row["created_at"])
+    return row
+
+
+class JsonlFileSink(LogSink):
+    """
+    Appends rows to ``<segment_dir>/<pid>-<n>.jsonl.open``; a segment is closed (renamed
+    to ``.jsonl``) when it grows past ``max_segment_bytes`` or at each load cycle, and
+    closed segments are bulk loaded and removed.
+    """
+
+    name = "jsonl"
+
+    def __init__(self, segment_dir: str, max_segment_bytes: int = 16 * 1024 * 1024,
+                 load_interval: float = 30.0, batch_size: int = 1000):
+        super().__init__()
+        self.segment_dir = segment_dir
+        self.max_segment_bytes = max_segment_bytes
+        self.batch_size = batch_size
+        os.makedirs(segment_dir, exist_ok=True)
+        self._prefix = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._sequence = 0
+        self._file = None
+        self._file_path: Optional[str] = None
+        self._load_lock = threading.Lock()
+        self._worker = _PeriodicWorker("log-sink-jsonl", load_interval, self.flush)
+
+    def _open_segment(self) -> None:
+        self._sequence += 1
+        self._file_path = os.path.join(self.segment_dir, f"{self._prefix}-{self._sequence:06d}.jsonl.open")
+        self._file = open(self._file_path, "a", encoding="utf-8")
+
+    def _close_segment(self) -> None:
+        """Caller holds self._lock"""
+        if self._file is None:
+            return
+        self._file.close()
+        os.replace(self._file_path, self._file_path[:-len(".open")])
+        self._file = None
+        self._file_path = None
+
+    def emit(self, table: str, values: Dict[str, Any]) -> None:
+        line = json.dumps({"table": table, "values": {k: _encode(v) for k, v in values.items()}}, default=str)
+        with self._lock:
+            try:
+                if self._file is None:
+                    self._open_segment()
+                self._file.write(line + "\n")
+                self._file.flush()
+                self.counters["emitted"] += 1
+                if self._file.tell() >= self.max_segment_bytes:
+                    self._close_segment()
+            except OSError as e:
+                self.counters["dropped"] += 1
+                logger.error(f"Could not append to log segment: {e}")
+
+    def flush(self) -> None:
+        """Close the current segment and bulk load every closed segment"""
+        with self._lock:
+            self._close_segment()
+        self.load_segments()
+
+    def load_segments(self) -> int:
+        with self._load_lock:
+            loaded = 0
+            for filename in sorted(os.listdir(self.segment_dir)):
+                path = os.path.join(self.segment_dir, filename)
+                if filename.endswith(".jsonl.open") and not filename.startswith(self._prefix):
+                    # Left behind by a worker that died before closing it
+                    try:
+                        if time.time() - os.path.getmtime(path) > STALE_SEGMENT_SECONDS:
+                            os.replace(path, path[:-len(".open")])
+                            path = path[:-len(".open")]
+                            filename = os.path.basename(path)
+                    except OSError:
+                        continue
+                if not filename.endswith(".jsonl"):
+                    continue
+                # Claim the segment so workers sharing the directory never load it twice
+                claimed = f"{path}.loading-{self._prefix}"
+                try:
+                    os.replace(path, claimed)
+                except OSError:
+                    continue
+                loaded += self._load_segment(claimed)
+            return loaded
+
+    def _load_segment(self, path: str) -> int:
+        rows_by_table: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    rows_by_table[record["table"]].append(_decode_row(record["values"]))
+                except (ValueError, KeyError) as e:
+                    self._count("failed")
+                    logger.error(f"Skipping malformed line in {path}: {e}")
+
+        total = 0
+        for table, rows in rows_by_table.items():
+            for start in range(0, len(rows), self.batch_size):
+                result = insert_log_rows({table: rows[start:start + self.batch_size]})
+                self._count("written", result["written"])
+                self._count("failed", result["failed"])
+                total += result["written"]
+        os.remove(path)
+        return total
+
+    def close(self) -> None:
+        self._worker.stop()
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["pending_segments"] = len([f for f in os.listdir(self.segment_dir) if ".jsonl" in f])
+        return stats
+
+
+_sink: Optional[LogSink] = None
+_sink_lock = threading.Lock()
+sampler = LogSampler(
+    access_rate=settings.log_access_sample_rate,
+    activity_rate=settings.log_activity_sample_rate,
+)
+
+
+def _create_sink() -> Optional[LogSink]:
+    if settings.log_sink == "batched":
+        return BatchedDatabaseSink(
+            batch_size=settings.log_batch_size,
+            flush_interval=settings.log_flush_interval,
+            max_buffer=settings.log_buffer_max,
+        )
+    if settings.log_sink == "jsonl":
+        return JsonlFileSink(
+            segment_dir=settings.log_segment_dir,
+            max_segment_bytes=settings.log_segment_max_bytes,
+            load_interval=settings.log_segment_load_interval,
+        )
+    return None
+
+
+def get_log_sink() -> Optional[LogSink]:
+    """The process-wide sink, or None for direct writes through the caller's session"""
+    global _sink
+    if _sink is None and settings.log_sink != "direct":
+        with _sink_lock:
+            if _sink is None:
+                _sink = _create_sink()
+    return _sink
+
+
+def set_log_sink(sink: Optional[LogSink]) -> None:
+    global _sink
+    with _sink_lock:
+        _sink = sink
+
+
+def close_log_sink() -> None:
+    """Flush and stop the background sink (application shutdown)"""
+    global _sink
+    with _sink_lock:
+        sink, _sink = _sink, None
+    if sink is not None:
+        sink.close()
+
+
+def log_sink_stats() -> Dict[str, Any]:
+    sink = get_log_sink()
+    stats = sink.stats() if sink else {"sink": "direct"}
+    stats["sample_rates"] = dict(sampler.rates)
+    stats["sampled_out"] = dict(sampler.sampled_out)
+    return stats
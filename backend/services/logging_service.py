@@ -5,12 +5,13 @@ Comprehensive logging service for tracking user activities, access logs, and sys
 import json
 import traceback
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, and_, or_
 from models.logs import AccessLog, ActivityLog, AuditLog, ErrorLog, SecurityLog, LogLevel, ActivityType
 from models.user import User
+from services.log_sink_service import LOG_MODELS, get_log_sink, sampler
 import requests
 import ipaddress
 
@@ -18,6 +19,18 @@ class LoggingService:
     def __init__(self, db: Session):
         self.db = db
     
+    def _write(self, table: str, values: Dict[str, Any]):
+        """Hand a log row to the configured sink, or add and commit it on this session"""
+        if not sampler.keep(table, values):
+            return
+        sink = get_log_sink()
+        if sink is not None:
+            values.setdefault("created_at", datetime.now(timezone.utc))
+            sink.emit(table, values)
+            return
+        self.db.add(LOG_MODELS[table](**values))
+        self.db.commit()
+    
     def get_client_info(self, request) -> Dict[str, Any]:
         """Extract client information from request"""
         try:
@@ -100,28 +113,27 @@ class LoggingService:
         try:
             client_info = self.get_client_info(request)
             
-            access_log = AccessLog(
-                user_id=user_id,
-                session_id=session_id,
-                ip_address=client_info["ip_address"],
-                user_agent=client_info["user_agent"],
-                method=request.method,
-                url=str(request.url),
-                endpoint=request.url.path,
-                status_code=response.status_code,
-                response_time=response_time,
-                request_size=len(str(request.body)) if hasattr(request, 'body') else None,
-                response_size=len(response.body) if hasattr(response, 'body') else None,
-                referer=request.headers.get("referer"),
-                country=client_info["country"],
-                city=client_info["city"],
-                device_type=client_info["device_type"],
-                browser=client_info["browser"],
-                os=client_info["os"]
-            )
+            values = {
+                "user_id": user_id,
+                "session_id": session_id,
+                "ip_address": client_info["ip_address"],
+                "user_agent": client_info["user_agent"],
+                "method": request.method,
+                "url": str(request.url),
+                "endpoint": request.url.path,
+                "status_code": response.status_code,
+                "response_time": response_time,
+                "request_size": len(str(request.body)) if hasattr(request, 'body') else None,
+                "response_size": len(response.body) if hasattr(response, 'body') else None,
+                "referer": request.headers.get("referer"),
+                "country": client_info["country"],
+                "city": client_info["city"],
+                "device_type": client_info["device_type"],
+                "browser": client_info["browser"],
+                "os": client_info["os"],
+            }
             
-            self.db.add(access_log)
-            self.db.commit()
+            self._write("access", values)
         except Exception as e:
             print(f"Error logging access: {e}")
             self.db.rollback()
@@ -135,24 +147,23 @@ class LoggingService:
                     severity: LogLevel = LogLevel.INFO):
         """Log user activity"""
         try:
-            activity_log = ActivityLog(
-                user_id=user_id,
-                session_id=session_id,
-                activity_type=activity_type,
-                action=action,
-                description=description,
-                resource_type=resource_type,
-                resource_id=resource_id,
-                old_values=old_values,
-                new_values=new_values,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                log_metadata=metadata,
-                severity=severity
-            )
+            values = {
+                "user_id": user_id,
+                "session_id": session_id,
+                "activity_type": activity_type,
+                "action": action,
+                "description": description,
+                "resource_type": resource_type,
+                "resource_id": resource_id,
+                "old_values": old_values,
+                "new_values": new_values,
+                "ip_address": ip_address,
+                "user_agent": user_agent,
+                "log_metadata": metadata,
+                "severity": severity,
+            }
             
-            self.db.add(activity_log)
-            self.db.commit()
+            self._write("activity", values)
         except Exception as e:
             print(f"Error logging activity: {e}")
             self.db.rollback()
@@ -164,21 +175,20 @@ class LoggingService:
                  user_agent: Optional[str] = None):
         """Log audit trail for data changes"""
         try:
-            audit_log = AuditLog(
-                user_id=user_id,
-                session_id=session_id,
-                table_name=table_name,
-                record_id=record_id,
-                action=action,
-                field_name=field_name,
-                old_value=old_value,
-                new_value=new_value,
-                ip_address=ip_address,
-                user_agent=user_agent
-            )
+            values = {
+                "user_id": user_id,
+                "session_id": session_id,
+                "table_name": table_name,
+                "record_id": record_id,
+                "action": action,
+                "field_name": field_name,
+                "old_value": old_value,
+                "new_value": new_value,
+                "ip_address": ip_address,
+                "user_agent": user_agent,
+            }
             
-            self.db.add(audit_log)
-            self.db.commit()
+            self._write("audit", values)
         except Exception as e:
             print(f"Error logging audit: {e}")
             self.db.rollback()
@@ -191,23 +201,22 @@ class LoggingService:
                  severity: LogLevel = LogLevel.ERROR):
         """Log system errors"""
         try:
-            error_log = ErrorLog(
-                user_id=user_id,
-                session_id=session_id,
-                error_type=error_type,
-                error_message=error_message,
-                stack_trace=stack_trace,
-                url=url,
-                method=method,
-                status_code=status_code,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                log_metadata=metadata,
-                severity=severity
-            )
+            values = {
+                "user_id": user_id,
+                "session_id": session_id,
+                "error_type": error_type,
+                "error_message": error_message,
+                "stack_trace": stack_trace,
+                "url": url,
+                "method": method,
+                "status_code": status_code,
+                "ip_address": ip_address,
+                "user_agent": user_agent,
+                "log_metadata": metadata,
+                "severity": severity,
+            }
             
-            self.db.add(error_log)
-            self.db.commit()
+            self._write("error", values)
         except Exception as e:
             print(f"Error logging error: {e}")
             self.db.rollback()
@@ -219,22 +228,21 @@ class LoggingService:
                     blocked: bool = False, session_id: Optional[str] = None):
         """Log security events"""
         try:
-            security_log = SecurityLog(
-                user_id=user_id,
-                session_id=session_id,
-                event_type=event_type,
-                description=description,
-                severity=severity,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                country=country,
-                city=city,
-                log_metadata=metadata,
-                blocked=blocked
-            )
+            values = {
+                "user_id": user_id,
+                "session_id": session_id,
+                "event_type": event_type,
+                "description": description,
+                "severity": severity,
+                "ip_address": ip_address,
+                "user_agent": user_agent,
+                "country": country,
+                "city": city,
+                "log_metadata": metadata,
+                "blocked": blocked,
+            }
             
-            self.db.add(security_log)
-            self.db.commit()
+            self._write("security", values)
         except Exception as e:
             print(f"Error logging security event: {e}")
             self.db.rollback()
@@ -16,9 +16,57 @@ import json
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 from config import settings
+from services.llm_cache_service import cached_llm_call
 
 logger = logging.getLogger(__name__)
 
+# Bump when the analysis prompt or parsing changes so cached analyses are not reused
+# (v2: the cache stores the parsed analysis instead of the raw response)
+ANALYSIS_CACHE_TEMPLATE = "on_demand.case_analysis"
+ANALYSIS_PROMPT_VERSION = "v2"
+ANALYSIS_SYSTEM_PROMPT = (
+    "You are a legal AI assistant specializing in case analysis for banking and financial institutions. "
+    "Analyze legal cases and provide structured insights for credit assessment and risk evaluation. "
+    "Be conservative and accurate in your assessments."
+)
+ANALYSIS_VERSION = "2.0"  # stored in reported_cases.ai_summary_version
+
+UPDATE_ANALYSIS_SQL = text("""
+    UPDATE reported_cases 
+    SET ai_case_outcome = :case_outcome,
+        ai_court_orders = :court_orders,
+        ai_financial_impact = :financial_impact,
+        ai_detailed_outcome = :detailed_outcome,
+        ai_summary_generated_at = :generated_at,
+        ai_summary_version = :version
+    WHERE id = :case_id
+""")
+
+
+def extract_analysis_json(ai_response):
+    """Parse the JSON object of a model response; raises ValueError when there is none"""
+    response_text = (ai_response or "").strip()
+    if response_text.startswith('{') and response_text.endswith('}'):
+        return json.loads(response_text)
+    start_idx = response_text.find('{')
+    end_idx = response_text.rfind('}') + 1
+    if start_idx != -1 and end_idx > start_idx:
+        return json.loads(response_text[start_idx:end_idx])
+    raise ValueError("No valid JSON found in response")
+
+
+def analysis_update_params(case_id, analysis, generated_at=None):
+    """Bind parameters of UPDATE_ANALYSIS_SQL for one analysed case"""
+    return {
+        "case_id": case_id,
+        "case_outcome": analysis.get('case_outcome', 'UNRESOLVED'),
+        "court_orders": analysis.get('court_orders', ''),
+        "financial_impact": analysis.get('financial_impact', 'UNRESOLVED'),
+        "detailed_outcome": analysis.get('detailed_outcome', ''),
+        "generated_at": generated_at or datetime.utcnow(),
+        "version": ANALYSIS_VERSION
+    }
+
 class OnDemandAIAnalysis:
     def __init__(self):
         self.engine = create_engine(settings.database_url)
@@ -117,19 +165,13 @@ class OnDemandAIAnalysis:
         
         return "\n\n".join(content_parts)
     
-    def analyze_case(self, case):
-        """Analyze a single case with AI"""
-        try:
-            case_content = self.prepare_case_content(case)
-            
-            if not case_content.strip():
-                return self.get_default_analysis()
-            
-            # Truncate content to fit within token limits
-            if len(case_content) > 6000:
-                case_content = case_content[:6000] + "..."
-            
-            prompt = f"""
+    def build_analysis_messages(self, case_content):
+        """Chat messages asking the model for the structured analysis of ``case_content``"""
+        # Truncate content to fit within token limits
+        if len(case_content) > 6000:
+            case_content = case_content[:6000] + "..."
+        
+        prompt = f"""
 Analyze the following legal case and provide structured insights for banking and financial assessment purposes:
 
 CASE CONTENT:
@@ -156,25 +198,35 @@ Guidelines:
 
 Respond only with valid JSON, no additional text.
 """
+        
+        return [
+            {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def analyze_case(self, case, use_cache=True):
+        """Analyze a single case with AI (cached by model and case content)"""
+        try:
+            case_content = self.prepare_case_content(case)
             
-            response = self.openai_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a legal AI assistant specializing in case analysis for banking and financial institutions. Analyze legal cases and provide structured insights for credit assessment and risk evaluation. Be conservative and accurate in your assessments."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=2000,
-                temperature=0.2
-            )
+            if not case_content.strip():
+                return self.get_default_analysis()
             
-            ai_response = response.choices[0].message.content
-            return self.parse_ai_response(ai_response)
+            messages = self.build_analysis_messages(case_content)
+            
+            def complete():
+                response = self.openai_client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=2000,
+                    temperature=0.2
+                )
+                # Raises on an unparseable response, which keeps it out of the cache
+                return extract_analysis_json(response.choices[0].message.content), response.usage
+            
+            analysis, _ = cached_llm_call(ANALYSIS_CACHE_TEMPLATE, ANALYSIS_PROMPT_VERSION, self.model,
+                                          case_content, complete, bypass=not use_cache)
+            return analysis
             
         except Exception as e:
             logger.error(f"Error analyzing case {case['id']}: {e}")
@@ -183,19 +235,7 @@ Respond only with valid JSON, no additional text.
     def parse_ai_response(self, ai_response):
         """Parse AI response and extract structured data"""
         try:
-            response_text = ai_response.strip()
-            
-            if response_text.startswith('{') and response_text.endswith('}'):
-                return json.loads(response_text)
-            else:
-                start_idx = response_text.find('{')
-                end_idx = response_text.rfind('}') + 1
-                if start_idx != -1 and end_idx > start_idx:
-                    json_str = response_text[start_idx:end_idx]
-                    return json.loads(json_str)
-                else:
-                    raise ValueError("No valid JSON found in response")
-                    
+            return extract_analysis_json(ai_response)
         except Exception as e:
             logger.error(f"Error parsing AI response: {e}")
             return self.get_default_analysis()
@@ -213,43 +253,27 @@ Respond only with valid JSON, no additional text.
         """Update case with AI analysis"""
         try:
             with self.engine.connect() as conn:
-                conn.execute(text("""
-                    UPDATE reported_cases 
-                    SET ai_case_outcome = :case_outcome,
-                        ai_court_orders = :court_orders,
-                        ai_financial_impact = :financial_impact,
-                        ai_detailed_outcome = :detailed_outcome,
-                        ai_summary_generated_at = :generated_at,
-                        ai_summary_version = :version
-                    WHERE id = :case_id
-                """), {
-                    "case_id": case_id,
-                    "case_outcome": analysis.get('case_outcome', 'UNRESOLVED'),
-                    "court_orders": analysis.get('court_orders', ''),
-                    "financial_impact": analysis.get('financial_impact', 'UNRESOLVED'),
-                    "detailed_outcome": analysis.get('detailed_outcome', ''),
-                    "generated_at": datetime.utcnow(),
-                    "version": "2.0"
-                })
+                conn.execute(UPDATE_ANALYSIS_SQL, analysis_update_params(case_id, analysis))
                 conn.commit()
                 return True
         except Exception as e:
             logger.error(f"Error updating case {case_id}: {e}")
             return False
     
-    def analyze_case_on_demand(self, case_id):
-        """Analyze a case only if it hasn't been analyzed before"""
+    def analyze_case_on_demand(self, case_id, use_cache=True):
+        """Analyze a case only if it hasn't been analyzed before (``use_cache=False`` re-analyzes it)"""
         try:
-            # Check if case is already analyzed
-            is_analyzed, generated_at = self.is_case_analyzed(case_id)
-            
-            if is_analyzed:
-                logger.info(f"Case {case_id} already analyzed at {generated_at}")
-                return {
-                    "status": "already_analyzed",
-                    "message": f"Case {case_id} was already analyzed on {generated_at}",
-                    "generated_at": generated_at
-                }
+            # Check if case is already analyzed; a refresh re-runs the analysis regardless
+            if use_cache:
+                is_analyzed, generated_at = self.is_case_analyzed(case_id)
+                
+                if is_analyzed:
+                    logger.info(f"Case {case_id} already analyzed at {generated_at}")
+                    return {
+                        "status": "already_analyzed",
+                        "message": f"Case {case_id} was already analyzed on {generated_at}",
+                        "generated_at": generated_at
+                    }
             
             # Setup OpenAI if not already done
             if not self.openai_client:
@@ -278,7 +302,7 @@ Respond only with valid JSON, no additional text.
             logger.info(f"Analyzing case {case_id} on demand: {case['title'][:50]}...")
             
             # Perform AI analysis
-            analysis = self.analyze_case(case)
+            analysis = self.analyze_case(case, use_cache=use_cache)
             
             # Update database
             if self.update_case_with_analysis(case_id, analysis):
@@ -305,6 +329,6 @@ Respond only with valid JSON, no additional text.
 # Global instance
 ai_analyzer = OnDemandAIAnalysis()
 
-def analyze_case_if_needed(case_id):
+def analyze_case_if_needed(case_id, use_cache=True):
     """Public function to analyze a case if it hasn't been analyzed before"""
-    return ai_analyzer.analyze_case_on_demand(case_id)
+    return ai_analyzer.analyze_case_on_demand(case_id, use_cache=use_cache)
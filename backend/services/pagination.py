@@ -0,0 +1,221 @@
+"""
+Shared pagination helpers for list and search endpoints.
+
+Supports two access patterns over the same ordered query:
+
+* keyset ("cursor") pagination - the response carries an opaque ``next_cursor``
+  encoding the sort key of the last row; the next request filters on
+  ``(sort_key, id) > cursor`` instead of using OFFSET, so deep pages cost the
+  same as the first one.
+* classic page/offset pagination - kept for existing clients; used when no
+  cursor is supplied.
+
+Totals can be computed exactly (``count_mode="exact"``) or read from the
+PostgreSQL planner's row estimate (``count_mode="estimated"``), which avoids a
+full scan of large tables such as reported_cases and gazette_entries. Cursor
+pages are not counted exactly again: they echo the total the client got with
+the first page (``total``), else use the estimate.
+"""
+
+import base64
+import enum
+import json
+import logging
+import math
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_, true
+from sqlalchemy.orm import Query
+
+logger = logging.getLogger(__name__)
+
+COUNT_MODES = ("exact", "estimated")
+
+# Below this estimate the planner figure is too coarse to be useful; count exactly instead
+EXACT_COUNT_THRESHOLD = 10000
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        value = value.value
+    if isinstance(value, datetime):
+        return {"t": "dt", "v": value.isoformat()}
+    if isinstance(value, date):
+        return {"t": "d", "v": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"t": "dec", "v": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        kind, raw = value.get("t"), value.get("v")
+        if kind == "dt":
+            return datetime.fromisoformat(raw)
+        if kind == "d":
+            return date.fromisoformat(raw)
+        if kind == "dec":
+            return Decimal(raw)
+        raise InvalidCursorError("Unknown cursor value type")
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode sort-key values into an opaque URL-safe token"""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, expected_length: int) -> List[Any]:
+    """Decode a token produced by ``encode_cursor``"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except Exception as e:
+        raise InvalidCursorError(f"Malformed cursor: {e}")
+    if not isinstance(values, list) or len(values) != expected_length:
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+    return [_decode_value(v) for v in values]
+
+
+def _is_nullable(column) -> bool:
+    expression = getattr(column, "expression", column)
+    return getattr(expression, "nullable", True) and not getattr(expression, "primary_key", False)
+
+
+def _after_condition(column, direction: str, value):
+    """Rows strictly after ``value`` in (direction, NULLS LAST) order"""
+    if value is None:
+        return None  # Nothing sorts after NULL when nulls come last
+    after = column < value if direction == "desc" else column > value
+    return or_(after, column.is_(None)) if _is_nullable(column) else after
+
+
+def _equal_condition(column, value):
+    return column.is_(None) if value is None else column == value
+
+
+def keyset_filter(sort_keys: Sequence[Tuple[Any, str]], values: Sequence[Any]):
+    """Build the lexicographic "row comes after cursor" predicate for mixed sort directions"""
+    clauses = []
+    for i, (column, direction) in enumerate(sort_keys):
+        after = _after_condition(column, direction, values[i])
+        if after is None:
+            continue
+        prefix = [_equal_condition(sort_keys[j][0], values[j]) for j in range(i)]
+        clauses.append(and_(*prefix, after) if prefix else after)
+    return or_(*clauses) if clauses else ~true()
+
+
+def apply_sort(query: Query, sort_keys: Sequence[Tuple[Any, str]]) -> Query:
+    order = [
+        (column.desc() if direction == "desc" else column.asc()).nullslast()
+        for column, direction in sort_keys
+    ]
+    return query.order_by(*order)
+
+
+def estimate_count(query: Query) -> Optional[int]:
+    """Row estimate from the PostgreSQL planner, or None when unavailable"""
+    session = query.session
+    bind = session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+    try:
+        compiled = query.order_by(None).statement.compile(dialect=bind.dialect)
+        result = session.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar()
+        plan = result if isinstance(result, list) else json.loads(result)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.warning(f"Falling back to exact count, planner estimate failed: {e}")
+        return None
+
+
+def count_query(query: Query, count_mode: str = "exact") -> int:
+    if count_mode == "estimated":
+        estimate = estimate_count(query)
+        if estimate is not None and estimate >= EXACT_COUNT_THRESHOLD:
+            return estimate
+    return query.order_by(None).count()
+
+
+class PageResult:
+    """One page of rows plus the metadata list endpoints report"""
+
+    def __init__(self, items: list, total: int, page: int, limit: int, next_cursor: Optional[str], has_prev: bool):
+        self.items = items
+        self.total = total
+        self.page = page
+        self.limit = limit
+        self.next_cursor = next_cursor
+        self.has_next = next_cursor is not None
+        self.has_prev = has_prev
+
+    @property
+    def total_pages(self) -> int:
+        return math.ceil(self.total / self.limit) if self.limit else 0
+
+
+def paginate(
+    query: Query,
+    sort_keys: Sequence[Tuple[Any, str]],
+    page: int = 1,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",
+    total: Optional[int] = None,
+) -> PageResult:
+    """
+    Order ``query`` by ``sort_keys`` (``[(column, "asc"|"desc"), ...]``, which must end
+    with a unique column such as the primary key) and fetch one page.
+
+    With ``cursor`` the page starts after the encoded row and ``page`` is only echoed
+    back; without it ``page`` selects an OFFSET for backwards compatibility.
+
+    ``total`` is the total the client received with the first page. Cursor pages
+    echo it, or fall back to the planner estimate, so a deep cursor page costs no
+    more than the first one; without a cursor ``total`` is ignored and counted.
+    """
+    if count_mode not in COUNT_MODES:
+        raise ValueError(f"count_mode must be one of {COUNT_MODES}")
+
+    if not cursor or total is None:
+        total = count_query(query, "estimated" if cursor else count_mode)
+
+    page_query = apply_sort(query, sort_keys)
+    if cursor:
+        values = decode_cursor(cursor, len(sort_keys))
+        page_query = page_query.filter(keyset_filter(sort_keys, values))
+        has_prev = True
+    else:
+        page_query = page_query.offset((page - 1) * limit)
+        has_prev = page > 1
+
+    rows = page_query.limit(limit + 1).all()
+    items = rows[:limit]
+
+    next_cursor = None
+    if len(rows) > limit and items:
+        last = items[-1]
+        next_cursor = encode_cursor([_sort_value(last, column) for column, _ in sort_keys])
+
+    return PageResult(items, total, page, limit, next_cursor, has_prev)
+
+
+def _sort_value(row, column):
+    """Read a sort column's value back from an ORM entity, a column row or a multi-entity row"""
+    if hasattr(row, "_mapping"):
+        if column.key in row._mapping:
+            return row._mapping[column.key]
+        owner = getattr(column, "class_", None)
+        entity = next((item for item in row if owner is not None and isinstance(item, owner)), None)
+        return getattr(entity, column.key) if entity is not None else None
+    return getattr(row, column.key)
@@ -0,0 +1,215 @@
+"""
+Content-addressed on-disk cache of PDF extraction results.
+
+Entries are keyed by the SHA-256 of the PDF bytes, an extraction kind ("text" for
+services/pdf_text_extraction_service.py, "cause_list_ocr" for the Supreme Court cause
+list import, ...) and that extractor's version. A renamed or re-uploaded copy of a
+gazette therefore hits the cache, and an edited one misses it. Bump the extractor
+version whenever its output changes; entries of older versions are then never read
+again and age out.
+
+Payloads (per-page text, word boxes, OCR tokens) are stored as msgpack when it is
+installed, JSON otherwise, zlib-compressed, one file per entry under
+``PDF_CACHE_DIR/<sha[:2]>/``. Reads refresh an entry's mtime. When the directory grows
+past ``PDF_CACHE_MAX_BYTES`` the least recently used entries are removed.
+
+``scripts/pdf_extraction_cache.py`` warms, inspects and trims the cache.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+from typing import Any, Callable, Dict, List, Optional
+
+from config import settings
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# First byte of an entry file: how the compressed payload is encoded
+FORMAT_MSGPACK = b"M"
+FORMAT_JSON = b"J"
+ENTRY_SUFFIX = ".bin"
+HASH_CHUNK_BYTES = 1024 * 1024
+
+_evict_lock = threading.Lock()
+
+
+def file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_dir() -> str:
+    return os.path.abspath(settings.pdf_cache_dir)
+
+
+def entry_path(sha256: str, kind: str, version: str) -> str:
+    return os.path.join(cache_dir(), sha256[:2], f"{sha256}-{kind}-v{version}{ENTRY_SUFFIX}")
+
+
+def _encode(payload: Any) -> bytes:
+    if MSGPACK_AVAILABLE:
+        return FORMAT_MSGPACK + zlib.compress(msgpack.packb(payload, use_bin_type=True))
+    return FORMAT_JSON + zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def _decode(data: bytes) -> Any:
+    marker, body = data[:1], zlib.decompress(data[1:])
+    if marker == FORMAT_MSGPACK:
+        # int page keys survive the round trip with strict_map_key off
+        return msgpack.unpackb(body, raw=False, strict_map_key=False)
+    return json.loads(body.decode("utf-8"))
+
+
+def load_entry(sha256: str, kind: str, version: str) -> Optional[Any]:
+    """Cached payload or None; an unreadable entry is deleted and counts as a miss"""
+    if not settings.pdf_cache_enabled:
+        return None
+    path = entry_path(sha256, kind, version)
+    try:
+        with open(path, "rb") as handle:
+            payload = _decode(handle.read())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Discarding unreadable PDF cache entry {path}: {e}")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return payload
+
+
+def store_entry(sha256: str, kind: str, version: str, payload: Any) -> None:
+    if not settings.pdf_cache_enabled:
+        return
+    path = entry_path(sha256, kind, version)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so concurrent readers never see a partial entry
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as handle:
+            handle.write(_encode(payload))
+        os.replace(temp_path, path)
+    except Exception as e:
+        logger.warning(f"PDF cache write failed for {path}: {e}")
+        return
+    evict_entries()
+
+
+def cached_extraction(file_path: str, kind: str, version: str, extract: Callable[[], Any],
+                      refresh: bool = False) -> Any:
+    """
+    ``extract()`` result for ``file_path``, read from the cache when an entry for the
+    same bytes, kind and version exists. ``refresh=True`` re-extracts and overwrites.
+    """
+    if not settings.pdf_cache_enabled:
+        return extract()
+    sha256 = file_sha256(file_path)
+    if not refresh:
+        payload = load_entry(sha256, kind, version)
+        if payload is not None:
+            return payload
+    payload = extract()
+    store_entry(sha256, kind, version, payload)
+    return payload
+
+
+def list_entries() -> List[Dict[str, Any]]:
+    """Every entry with its key parts, size and last use, most recently used first"""
+    entries = []
+    root = cache_dir()
+    if not os.path.isdir(root):
+        return entries
+    for prefix in os.listdir(root):
+        directory = os.path.join(root, prefix)
+        if not os.path.isdir(directory):
+            continue
+        for name in os.listdir(directory):
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            sha256, _, rest = name[:-len(ENTRY_SUFFIX)].partition("-")
+            kind, _, version = rest.rpartition("-v")
+            entries.append({
+                "path": path,
+                "sha256": sha256,
+                "kind": kind,
+                "version": version,
+                "bytes": stat.st_size,
+                "last_used": stat.st_mtime,
+            })
+    entries.sort(key=lambda entry: entry["last_used"], reverse=True)
+    return entries
+
+
+def evict_entries(max_bytes: Optional[int] = None) -> int:
+    """Remove least recently used entries until the cache fits ``max_bytes``; returns the count"""
+    limit = settings.pdf_cache_max_bytes if max_bytes is None else max_bytes
+    if not limit or limit < 0:
+        return 0
+    with _evict_lock:
+        entries = list_entries()
+        total = sum(entry["bytes"] for entry in entries)
+        removed = 0
+        while entries and total > limit:
+            entry = entries.pop()
+            try:
+                os.remove(entry["path"])
+            except OSError:
+                continue
+            total -= entry["bytes"]
+            removed += 1
+        return removed
+
+
+def clear_entries(kind: Optional[str] = None) -> int:
+    removed = 0
+    for entry in list_entries():
+        if kind and entry["kind"] != kind:
+            continue
+        try:
+            os.remove(entry["path"])
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def cache_stats() -> Dict[str, Any]:
+    entries = list_entries()
+    kinds: Dict[str, Dict[str, int]] = {}
+    for entry in entries:
+        counters = kinds.setdefault(f"{entry['kind']} v{entry['version']}", {"entries": 0, "bytes": 0})
+        counters["entries"] += 1
+        counters["bytes"] += entry["bytes"]
+    return {
+        "enabled": settings.pdf_cache_enabled,
+        "directory": cache_dir(),
+        "format": "msgpack+zlib" if MSGPACK_AVAILABLE else "json+zlib",
+        "entries": len(entries),
+        "bytes": sum(entry["bytes"] for entry in entries),
+        "max_bytes": settings.pdf_cache_max_bytes,
+        "kinds": kinds,
+    }
@@ -15,22 +15,11 @@ import sys
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# PDF processing libraries
-try:
-    import PyPDF2
-    import pdfplumber
-    from pdf2image import convert_from_path
-    import pytesseract
-    from PIL import Image
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
-    print("Warning: PDF processing libraries not installed. Install with: pip install PyPDF2 pdfplumber pdf2image pytesseract pillow")
-
 from database import get_db
 from models.gazette import Gazette, GazetteType, GazetteStatus, GazettePriority
-from models.people import People
-from services.auto_analytics_generator import AutoAnalyticsGenerator
+from services.pdf_text_extraction_service import PDFExtractionError, get_pdf_text
+from services.person_analytics_queue import analytics_queue
+from services.person_name_resolver import PersonNameResolver, ResolvedPerson
 
 logger = logging.getLogger(__name__)
 
@@ -39,72 +28,20 @@ class PDFGazetteAnalyzer:
     
     def __init__(self):
         self.db = next(get_db())
+        self._name_resolver: Optional[PersonNameResolver] = None
         
     def extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF using multiple methods for better accuracy"""
-        try:
-            # Method 1: Try pdfplumber first (better for structured text)
-            text = self._extract_with_pdfplumber(file_path)
-            if text and len(text.strip()) > 100:
-                return text
-                
-            # Method 2: Fallback to PyPDF2
-            text = self._extract_with_pypdf2(file_path)
-            if text and len(text.strip()) > 100:
-                return text
-                
-            # Method 3: OCR as last resort
-            text = self._extract_with_ocr(file_path)
-            return text
-            
-        except Exception as e:
-            logger.error(f"Error extracting text from {file_path}: {str(e)}")
-            raise
-    
-    def _extract_with_pdfplumber(self, file_path: str) -> str:
-        """Extract text using pdfplumber"""
-        try:
-            import pdfplumber
-            text = ""
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            return text.strip()
-        except Exception as e:
-            logger.warning(f"pdfplumber extraction failed: {e}")
-            return ""
-    
-    def _extract_with_pypdf2(self, file_path: str) -> str:
-        """Extract text using PyPDF2"""
-        try:
-            text = ""
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            return text.strip()
-        except Exception as e:
-            logger.warning(f"PyPDF2 extraction failed: {e}")
-            return ""
-    
-    def _extract_with_ocr(self, file_path: str) -> str:
-        """Extract text using OCR (for scanned PDFs)"""
-        try:
-            # Convert PDF to images
-            images = convert_from_path(file_path, dpi=300)
-            text = ""
-            
-            for image in images:
-                # Use OCR to extract text from image
-                page_text = pytesseract.image_to_string(image, config='--psm 6')
-                text += page_text + "\n"
-            
-            return text.strip()
-        except Exception as e:
-            logger.warning(f"OCR extraction failed: {e}")
-            return ""
+        """
+        Extract text from PDF page by page (pdfplumber, then PyPDF2, then OCR for
+        scanned pages), in parallel for large gazettes. Raises PDFExtractionError when
+        the PDF cannot be read.
+        """
+        document = get_pdf_text(file_path)
+        if not document.complete:
+            raise PDFExtractionError(document.error or f"No pages could be extracted from {file_path}")
+        return "\n".join(
+            document.pages[number] for number in sorted(document.pages) if document.pages[number].strip()
+        ).strip()
     
     def analyze_gazette_pdf(self, file_path: str) -> List[Dict]:
         """Analyze PDF and extract gazette entries"""
@@ -126,6 +63,9 @@ class PDFGazetteAnalyzer:
             logger.info(f"Extracted {len(gazette_entries)} gazette entries from {file_path}")
             return gazette_entries
             
+        except PDFExtractionError:
+            # Reported by process_pdf_file as an error, not as "no entries found"
+            raise
         except Exception as e:
             logger.error(f"Error analyzing PDF {file_path}: {e}")
             return []
@@ -430,41 +370,32 @@ class PDFGazetteAnalyzer:
         
         return None
     
-    def find_or_create_person(self, name: str, **kwargs) -> People:
-        """Find existing person or create new one"""
-        person = self.db.query(People).filter(People.full_name.ilike(name)).first()
-        
-        if not person:
+    @property
+    def name_resolver(self) -> PersonNameResolver:
+        """Name index of this analyzer's runs, loaded on first use"""
+        if self._name_resolver is None:
+            self._name_resolver = PersonNameResolver(self.db)
+        return self._name_resolver
+    
+    def find_or_create_person(self, name: str, **kwargs) -> Optional[ResolvedPerson]:
+        """Find existing person or create new one (in-memory name index)"""
+        person = self.name_resolver.resolve(name, **kwargs)
+        if person and person.created:
             logger.info(f"Creating new person: {name}")
-            first_name = name.split(' ')[0] if name else None
-            last_name = ' '.join(name.split(' ')[1:]) if name and len(name.split(' ')) > 1 else None
-            
-            person = People(
-                full_name=name,
-                first_name=first_name,
-                last_name=last_name,
-                created_by=None
-            )
-            
-            # Add additional fields from kwargs
-            for key, value in kwargs.items():
-                if hasattr(person, key) and value:
-                    setattr(person, key, value)
-            
-            self.db.add(person)
-            self.db.commit()
-            self.db.refresh(person)
-            
-            # Generate analytics for new person
-            try:
-                generator = AutoAnalyticsGenerator(self.db)
-                generator.generate_analytics_for_person(person.id)
-                logger.info(f"Analytics generated for new person {person.id}")
-            except Exception as analytics_error:
-                logger.warning(f"Failed to generate analytics for new person {person.id}: {analytics_error}")
-        
         return person
     
+    def finish_run(self):
+        """Write batched person updates and queue analytics for the people created since the last call"""
+        if self._name_resolver is None:
+            return
+        try:
+            self._name_resolver.flush_updates()
+            self.db.commit()
+        except Exception as e:
+            logger.error(f"Error writing person updates: {e}")
+            self.db.rollback()
+        analytics_queue.enqueue(self._name_resolver.take_created_ids())
+    
     def save_gazette_entry(self, entry_data: Dict) -> Optional[Gazette]:
         """Save gazette entry to database"""
         try:
@@ -539,6 +470,7 @@ class PDFGazetteAnalyzer:
                 gazette = self.save_gazette_entry(entry)
                 if gazette:
                     saved_count += 1
+            self.finish_run()
             
             return {
                 'file_path': file_path,
@@ -561,6 +493,8 @@ class PDFGazetteAnalyzer:
     def close(self):
         """Close database connection"""
         if hasattr(self, 'db'):
+            if self._name_resolver is not None:
+                self._name_resolver.close()
             self.db.close()
 
 # Example usage
@@ -0,0 +1,265 @@
+"""
+Shared, page-level PDF text extraction for the gazette extractors.
+
+``extract_pdf_text`` returns a ``PDFText`` (page number -> text). For each page it
+tries pdfplumber first. If the page yields almost nothing it falls back to PyPDF2
+for that page, then to OCR when the page is an image (a scanned page). The
+fallback is decided per page, not per document, so one scanned page no longer
+sends the whole gazette through a second parser.
+
+Documents with at least ``PDF_PARALLEL_MIN_PAGES`` pages are split into page ranges
+extracted in a process pool (``PDF_EXTRACTION_WORKERS`` processes); smaller ones are
+read in-process. Workers are spawned rather than forked so they never inherit
+locks held by the server's threads.
+
+``get_pdf_text`` memoizes the last few documents by path, size and mtime, so
+several extractors run over the same gazette parse it once. Below that sits the
+on-disk cache (services/pdf_extraction_cache.py), keyed by the PDF's SHA-256 and
+``EXTRACTOR_VERSION``: re-importing an unchanged gazette skips pdfplumber and OCR
+entirely. Bump ``EXTRACTOR_VERSION`` whenever extraction output changes.
+"""
+
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from config import settings
+from services.pdf_extraction_cache import file_sha256, load_entry, store_entry
+
+try:
+    import pdfplumber
+    import PyPDF2
+    PDF_AVAILABLE = True
+except ImportError:
+    PDF_AVAILABLE = False
+
+try:
+    from pdf2image import convert_from_path
+    import pytesseract
+    OCR_AVAILABLE = True
+except ImportError:
+    OCR_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# A page yielding fewer characters than this is retried with the next method
+PAGE_MIN_CHARS = 20
+OCR_DPI = 300
+MEMO_SIZE = 4
+CACHE_KIND = "text"
+EXTRACTOR_VERSION = "1"
+
+
+class PDFExtractionError(Exception):
+    """A PDF could not be opened or its pages could not be extracted"""
+
+
+@dataclass
+class PDFText:
+    """Text of a PDF indexed by 1-based page number"""
+    file_path: str
+    total_pages: int = 0
+    pages: Dict[int, str] = field(default_factory=dict)
+    methods: Dict[int, str] = field(default_factory=dict)  # page -> pdfplumber | pypdf2 | ocr | none
+    # page -> [text, x0, top, x1, bottom] per word; only pages read by pdfplumber have boxes
+    words: Dict[int, List[list]] = field(default_factory=dict)
+    error: Optional[str] = None  # why extraction failed, when it did
+
+    @property
+    def complete(self) -> bool:
+        """Every page came back (a page may still be empty, e.g. a blank scan without OCR)"""
+        return self.error is None and self.total_pages > 0 and len(self.pages) == self.total_pages
+
+    @property
+    def text(self) -> str:
+        return "".join(self.pages.get(number, "") + "\n" for number in range(1, self.total_pages + 1))
+
+    def as_extractor_result(self, str_keys: bool = False) -> Dict[str, any]:
+        """The ``{'text', 'pages', 'total_pages'}`` dict the gazette extractors work on"""
+        return {
+            "text": self.text,
+            "pages": {str(number) if str_keys else number: text for number, text in sorted(self.pages.items())},
+            "total_pages": self.total_pages,
+        }
+
+    def to_payload(self) -> Dict[str, any]:
+        return {
+            "total_pages": self.total_pages,
+            "pages": [
+                [number, self.pages[number], self.methods.get(number, "none"), self.words.get(number, [])]
+                for number in sorted(self.pages)
+            ],
+        }
+
+    @classmethod
+    def from_payload(cls, file_path: str, payload: Dict[str, any]) -> "PDFText":
+        result = cls(file_path=file_path, total_pages=payload["total_pages"])
+        for number, text, method, words in payload["pages"]:
+            result.pages[number] = text
+            result.methods[number] = method
+            if words:
+                result.words[number] = words
+        return result
+
+
+def _page_words(page) -> List[list]:
+    return [
+        [word["text"], round(word["x0"], 1), round(word["top"], 1), round(word["x1"], 1), round(word["bottom"], 1)]
+        for word in page.extract_words()
+    ]
+
+
+def _ocr_page(file_path: str, page_number: int) -> str:
+    images = convert_from_path(file_path, dpi=OCR_DPI, first_page=page_number, last_page=page_number)
+    return "\n".join(pytesseract.image_to_string(image, config="--psm 6") for image in images)
+
+
+def _extract_range(file_path: str, first_page: int, last_page: int, ocr: bool) -> List[Tuple[int, str, str, List[list]]]:
+    """Extract pages ``first_page..last_page`` (1-based, inclusive); runs in a worker process"""
+    results = []
+    reader = None
+    with pdfplumber.open(file_path) as pdf:
+        for number in range(first_page, last_page + 1):
+            page = pdf.pages[number - 1]
+            method = "pdfplumber"
+            words: List[list] = []
+            try:
+                text = page.extract_text() or ""
+                if text.strip():
+                    words = _page_words(page)
+            except Exception as e:
+                logger.warning(f"pdfplumber failed on page {number} of {file_path}: {e}")
+                text = ""
+
+            if len(text.strip()) < PAGE_MIN_CHARS:
+                try:
+                    if reader is None:
+                        reader = PyPDF2.PdfReader(file_path)
+                    fallback = reader.pages[number - 1].extract_text() or ""
+                    if len(fallback.strip()) > len(text.strip()):
+                        text, method = fallback, "pypdf2"
+                except Exception as e:
+                    logger.warning(f"PyPDF2 failed on page {number} of {file_path}: {e}")
+
+            if len(text.strip()) < PAGE_MIN_CHARS and ocr and OCR_AVAILABLE and page.images:
+                try:
+                    scanned = _ocr_page(file_path, number)
+                    if len(scanned.strip()) > len(text.strip()):
+                        text, method = scanned, "ocr"
+                except Exception as e:
+                    logger.warning(f"OCR failed on page {number} of {file_path}: {e}")
+
+            if method != "pdfplumber":
+                words = []
+            results.append((number, text, method if text.strip() else "none", words))
+    return results
+
+
+def _page_count(file_path: str) -> int:
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def _page_ranges(total_pages: int, workers: int) -> List[Tuple[int, int]]:
+    """Contiguous ranges, about two per worker so a slow (OCR) range does not stall the pool"""
+    size = max(1, math.ceil(total_pages / (workers * 2)))
+    return [(start, min(start + size - 1, total_pages)) for start in range(1, total_pages + 1, size)]
+
+
+def extract_pdf_text(file_path: str, workers: Optional[int] = None, ocr: bool = True) -> PDFText:
+    """
+    Extract every page of ``file_path``; pages that fail come back empty. When the
+    document cannot be opened or extracted at all, ``error`` is set and the result is
+    not ``complete``.
+    """
+    result = PDFText(file_path=file_path)
+    if not PDF_AVAILABLE:
+        logger.error("PDF libraries not available")
+        result.error = "PDF libraries not available"
+        return result
+
+    try:
+        result.total_pages = _page_count(file_path)
+    except Exception as e:
+        logger.error(f"Error opening {file_path}: {str(e)}")
+        result.error = f"Error opening PDF: {e}"
+        return result
+
+    workers = workers or settings.pdf_extraction_workers or os.cpu_count() or 1
+    ranges = _page_ranges(result.total_pages, workers)
+    try:
+        if workers > 1 and result.total_pages >= settings.pdf_parallel_min_pages:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=min(workers, len(ranges)), mp_context=context) as pool:
+                futures = [pool.submit(_extract_range, file_path, first, last, ocr) for first, last in ranges]
+                chunks = [future.result() for future in futures]
+        else:
+            chunks = [_extract_range(file_path, 1, result.total_pages, ocr)] if result.total_pages else []
+    except Exception as e:
+        logger.error(f"Error extracting text from {file_path}: {str(e)}")
+        result.error = f"Error extracting text: {e}"
+        return result
+
+    for chunk in chunks:
+        for number, text, method, words in chunk:
+            result.pages[number] = text
+            result.methods[number] = method
+            if words:
+                result.words[number] = words
+    return result
+
+
+_memo: "OrderedDict[Tuple[str, int, float, bool], PDFText]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def get_pdf_text(file_path: str, ocr: bool = True, refresh: bool = False) -> PDFText:
+    """
+    ``extract_pdf_text`` memoized on (path, size, mtime) for the last few documents and
+    cached on disk by content; ``refresh=True`` re-extracts and overwrites both
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError as e:
+        logger.error(f"Error extracting text from {file_path}: {str(e)}")
+        return PDFText(file_path=file_path, error=f"Error reading PDF: {e}")
+    key = (os.path.realpath(file_path), stat.st_size, stat.st_mtime, ocr)
+    with _memo_lock:
+        if key in _memo and not refresh:
+            _memo.move_to_end(key)
+            return _memo[key]
+
+    kind = CACHE_KIND if ocr else f"{CACHE_KIND}-no-ocr"
+    sha256 = None
+    result = None
+    if settings.pdf_cache_enabled:
+        try:
+            sha256 = file_sha256(file_path)
+            payload = None if refresh else load_entry(sha256, kind, EXTRACTOR_VERSION)
+            if payload is not None:
+                result = PDFText.from_payload(file_path, payload)
+                if not result.complete:
+                    # Written by an earlier version that cached failed extractions
+                    logger.info(f"Ignoring incomplete cached extraction of {file_path}")
+                    result = None
+        except Exception as e:
+            logger.warning(f"PDF cache lookup failed for {file_path}: {e}")
+
+    if result is None:
+        result = extract_pdf_text(file_path, ocr=ocr)
+        # Failed or partial extractions are neither cached nor memoized, so the next call retries them
+        if sha256 and result.complete:
+            store_entry(sha256, kind, EXTRACTOR_VERSION, result.to_payload())
+
+    if result.complete:
+        with _memo_lock:
+            _memo[key] = result
+            while len(_memo) > MEMO_SIZE:
+                _memo.popitem(last=False)
+    return result
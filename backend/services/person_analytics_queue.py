@@ -0,0 +1,82 @@
+"""
+Deferred analytics for people created by bulk imports and gazette extraction runs.
+
+``analytics_queue.enqueue(person_ids, job_id)`` hands the ids to a daemon thread that
+runs ``AutoAnalyticsGenerator`` for each with its own session, so importers never
+generate analytics inline. When a ``gazette_import_jobs`` id is given, the job's
+``analytics_done`` counter is advanced after each batch. Command-line runs call
+``analytics_queue.join()`` before exiting so the daemon thread is not killed mid-batch.
+"""
+
+import logging
+import queue
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import update
+
+from database import SessionLocal
+from models.gazette_import_job import GazetteImportJob
+
+logger = logging.getLogger(__name__)
+
+
+class PersonAnalyticsQueue:
+    """Background thread generating analytics for newly created people"""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Tuple[Optional[str], List[int]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def enqueue(self, person_ids: Iterable[int], job_id: Optional[str] = None) -> int:
+        person_ids = list(person_ids)
+        if not person_ids:
+            return 0
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="person-analytics", daemon=True)
+                self._thread.start()
+        self._queue.put((job_id, person_ids))
+        return len(person_ids)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def join(self) -> None:
+        """Block until every queued batch has been processed (CLI runs exit right after)"""
+        self._queue.join()
+
+    def _run(self) -> None:
+        # Imported lazily: the generator pulls in the analytics models and services
+        from services.auto_analytics_generator import AutoAnalyticsGenerator
+
+        while True:
+            job_id, person_ids = self._queue.get()
+            db = SessionLocal()
+            done = 0
+            try:
+                generator = AutoAnalyticsGenerator(db)
+                for person_id in person_ids:
+                    try:
+                        generator.generate_analytics_for_person(person_id)
+                    except Exception as e:
+                        db.rollback()
+                        logger.warning(f"Failed to generate analytics for new person {person_id}: {e}")
+                    done += 1
+                if job_id:
+                    db.execute(
+                        update(GazetteImportJob)
+                        .where(GazetteImportJob.id == job_id)
+                        .values(analytics_done=GazetteImportJob.analytics_done + done)
+                    )
+                    db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Person analytics batch failed: {e}")
+            finally:
+                db.close()
+                self._queue.task_done()
+
+
+analytics_queue = PersonAnalyticsQueue()
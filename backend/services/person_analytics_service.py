@@ -1,12 +1,13 @@
 import os
 import openai
 import re
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 from decimal import Decimal
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 from models.people import People
-from models.reported_cases import ReportedCases
+from models.reported_cases import ReportedCases, BODY_COLUMN_GROUP
 from models.person_analytics import PersonAnalytics
+from services.keyword_matcher import KeywordHits, KeywordMatcher
 import json
 
 class PersonAnalyticsService:
@@ -38,6 +39,32 @@ class PersonAnalyticsService:
             'Constitutional': ['constitution', 'human rights', 'fundamental rights', 'election'],
             'Administrative': ['administrative', 'public body', 'government', 'permit', 'license']
         }
+        
+        self.legal_issue_keywords = [
+            'constitutional', 'human rights', 'due process', 'equal protection',
+            'contract breach', 'negligence', 'fraud', 'misrepresentation',
+            'employment law', 'discrimination', 'harassment', 'wrongful termination',
+            'property rights', 'intellectual property', 'patent', 'copyright',
+            'criminal law', 'evidence', 'procedure', 'jurisdiction'
+        ]
+        
+        self.financial_term_keywords = [
+            'interest rate', 'compound interest', 'penalty', 'fine',
+            'damages', 'compensation', 'restitution', 'remedy',
+            'injunction', 'specific performance', 'liquidated damages',
+            'breach of contract', 'unjust enrichment', 'quantum meruit'
+        ]
+        
+        # All dictionaries compiled once; each case text is scanned once (services/keyword_matcher.py)
+        self.keyword_matcher = KeywordMatcher({
+            'risk': {category: data['keywords'] for category, data in self.risk_keywords.items()},
+            'subject': self.subject_categories,
+            'legal_issues': self.legal_issue_keywords,
+            'financial_terms': self.financial_term_keywords,
+            'complexity': ['appeal', 'supreme court', 'multiple', 'several'],
+            'favorable': ['dismissed', 'acquitted', 'favorable', 'won', 'successful'],
+        })
+        self._case_hits_cache: Dict[int, KeywordHits] = {}
 
     def calculate_risk_score(self, cases: List[ReportedCases]) -> Tuple[int, str, List[str]]:
         """Calculate risk score based on case analysis"""
@@ -48,19 +75,16 @@ class PersonAnalyticsService:
         risk_factors = []
         
         for case in cases:
-            case_text = self._get_case_text(case)
             case_score = 0
             case_risk_factors = []
             
             # Analyze case text for risk indicators
-            for category, data in self.risk_keywords.items():
-                weight = data['weight']
-                keywords = data['keywords']
+            for category, keywords in self._case_hits(case).categories('risk').items():
+                weight = self.risk_keywords[category]['weight']
                 
                 for keyword in keywords:
-                    if keyword.lower() in case_text.lower():
-                        case_score += weight
-                        case_risk_factors.append(f"{category}: {keyword}")
+                    case_score += weight
+                    case_risk_factors.append(f"{category}: {keyword}")
             
             # Additional factors
             if case.area_of_law and 'criminal' in case.area_of_law.lower():
@@ -123,21 +147,18 @@ class PersonAnalyticsService:
         if not cases:
             return "N/A", [], [], []
         
-        all_text = " ".join([self._get_case_text(case) for case in cases])
+        # Keywords found in any of the cases
+        all_hits = KeywordHits.union(self.keyword_matcher, (self._case_hits(case) for case in cases))
         
         # Analyze subject matter categories
-        category_scores = {}
-        for category, keywords in self.subject_categories.items():
-            score = sum(1 for keyword in keywords if keyword.lower() in all_text.lower())
-            if score > 0:
-                category_scores[category] = score
+        category_scores = all_hits.counts('subject')
         
         primary_subject = max(category_scores.items(), key=lambda x: x[1])[0] if category_scores else "Other"
         subject_categories = list(category_scores.keys())
         
         # Extract legal issues and financial terms
-        legal_issues = self._extract_legal_issues(all_text)
-        financial_terms = self._extract_financial_terms(all_text)
+        legal_issues = self._extract_legal_issues(all_hits)
+        financial_terms = self._extract_financial_terms(all_hits)
         
         return primary_subject, subject_categories, legal_issues, financial_terms
 
@@ -149,15 +170,16 @@ class PersonAnalyticsService:
         complexity_factors = 0
         for case in cases:
             case_text = self._get_case_text(case)
+            hits = self._case_hits(case)
             
             # Complexity indicators
             if len(case_text) > 5000:
                 complexity_factors += 2
-            if 'appeal' in case_text.lower():
+            if 'appeal' in hits:
                 complexity_factors += 3
-            if 'supreme court' in case_text.lower():
+            if 'supreme court' in hits:
                 complexity_factors += 2
-            if 'multiple' in case_text.lower() or 'several' in case_text.lower():
+            if 'multiple' in hits or 'several' in hits:
                 complexity_factors += 1
             if case.area_of_law and 'constitutional' in case.area_of_law.lower():
                 complexity_factors += 2
@@ -175,8 +197,7 @@ class PersonAnalyticsService:
         
         favorable_outcomes = 0
         for case in resolved_cases:
-            case_text = self._get_case_text(case)
-            if any(word in case_text.lower() for word in ['dismissed', 'acquitted', 'favorable', 'won', 'successful']):
+            if self._case_hits(case).any('favorable'):
                 favorable_outcomes += 1
         
         success_rate = (favorable_outcomes / len(resolved_cases)) * 100
@@ -202,6 +223,13 @@ class PersonAnalyticsService:
         
         return " ".join(text_parts)
 
+    def _case_hits(self, case: ReportedCases) -> KeywordHits:
+        """Keyword hits of a case, scanned once per service instance"""
+        hits = self._case_hits_cache.get(case.id)
+        if hits is None:
+            hits = self._case_hits_cache[case.id] = self.keyword_matcher.scan(self._get_case_text(case))
+        return hits
+
     def _extract_monetary_amounts(self, text: str) -> List[Decimal]:
         """Extract monetary amounts from text"""
         amounts = []
@@ -227,38 +255,15 @@ class PersonAnalyticsService:
         
         return amounts
 
-    def _extract_legal_issues(self, text: str) -> List[str]:
-        """Extract legal issues from text"""
-        legal_issues = []
-        issue_keywords = [
-            'constitutional', 'human rights', 'due process', 'equal protection',
-            'contract breach', 'negligence', 'fraud', 'misrepresentation',
-            'employment law', 'discrimination', 'harassment', 'wrongful termination',
-            'property rights', 'intellectual property', 'patent', 'copyright',
-            'criminal law', 'evidence', 'procedure', 'jurisdiction'
-        ]
-        
-        for keyword in issue_keywords:
-            if keyword.lower() in text.lower():
-                legal_issues.append(keyword.title())
-        
-        return list(set(legal_issues))
+    def _extract_legal_issues(self, text: Union[str, KeywordHits]) -> List[str]:
+        """Extract legal issues from text (or from keyword hits already scanned)"""
+        hits = text if isinstance(text, KeywordHits) else self.keyword_matcher.scan(text)
+        return list(set(keyword.title() for keyword in hits.terms('legal_issues')))
 
-    def _extract_financial_terms(self, text: str) -> List[str]:
-        """Extract financial terms from text"""
-        financial_terms = []
-        term_keywords = [
-            'interest rate', 'compound interest', 'penalty', 'fine',
-            'damages', 'compensation', 'restitution', 'remedy',
-            'injunction', 'specific performance', 'liquidated damages',
-            'breach of contract', 'unjust enrichment', 'quantum meruit'
-        ]
-        
-        for keyword in term_keywords:
-            if keyword.lower() in text.lower():
-                financial_terms.append(keyword.title())
-        
-        return list(set(financial_terms))
+    def _extract_financial_terms(self, text: Union[str, KeywordHits]) -> List[str]:
+        """Extract financial terms from text (or from keyword hits already scanned)"""
+        hits = text if isinstance(text, KeywordHits) else self.keyword_matcher.scan(text)
+        return list(set(keyword.title() for keyword in hits.terms('financial_terms')))
 
     async def generate_analytics_for_person(self, person_id: int) -> Optional[PersonAnalytics]:
         """Generate comprehensive analytics for a person"""
@@ -279,7 +284,7 @@ class PersonAnalyticsService:
             return None
         
         # Get related cases
-        cases = self.db.query(ReportedCases).filter(
+        cases = self.db.query(ReportedCases).options(undefer_group(BODY_COLUMN_GROUP)).filter(
             ReportedCases.title.contains(person.full_name)
         ).all()
         
@@ -0,0 +1,243 @@
+"""
+In-memory name -> person index for gazette extraction runs.
+
+The gazette extractors used to look every extracted name up with one or two ``ilike``
+queries against ``people`` and commit each new person on its own. A
+``PersonNameResolver`` instead loads ``id``, ``full_name``, ``first_name`` and
+``last_name`` of all people once, streamed, into a hash index. Two keys are kept per
+person: the normalized full name and the normalized first + last name. Both are
+lowercased, stripped of punctuation and leading salutations (Mr., Dr., Alhaji, ...)
+and token-sorted, so "MENSAH, Kwame" and "Mr. Kwame Mensah" share a key.
+
+Names that are not found become new ``People`` rows. Their ids are reserved from the
+``people`` id sequence in blocks, so callers get ``person.id`` immediately. The rows
+are only added to the session and reach the database in one batched INSERT with the
+caller's next flush. Gender fill-ins and ``previous_names`` appends for existing people
+are collected and written by ``flush_updates`` in one executemany UPDATE.
+
+If the caller's transaction rolls back, persons staged since the last commit are
+dropped from the index, because their reserved ids were never written.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import bindparam, event, select, text, update
+from sqlalchemy.orm import Session
+
+from models.people import People
+
+logger = logging.getLogger(__name__)
+
+SALUTATIONS = {"mr", "mrs", "miss", "ms", "dr", "rev", "prof", "hon", "chief", "alhaji", "alhaja"}
+_TOKEN_SPLIT = re.compile(r"[^\w']+")
+
+LOAD_BATCH = 10000
+ID_BLOCK = 100
+
+
+def normalize_person_name(name: Optional[str]) -> str:
+    """Lowercased, salutation-stripped, token-sorted key of a name"""
+    tokens = [token.strip("'") for token in _TOKEN_SPLIT.split((name or "").lower())]
+    tokens = [token for token in tokens if token]
+    while len(tokens) > 1 and tokens[0] in SALUTATIONS:
+        tokens.pop(0)
+    return " ".join(sorted(tokens))
+
+
+@dataclass
+class ResolvedPerson:
+    id: int
+    full_name: str
+    created: bool = False
+
+
+class PersonNameResolver:
+    """Resolves names to people for one extraction run over a session"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._index: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}  # person id -> stored full_name
+        self._loaded = False
+        self._reserved: List[int] = []
+        self._new: Dict[int, People] = {}  # staged since the last commit, by reserved id
+        self._uncommitted: Dict[int, List[str]] = {}  # same people -> the index keys they added
+        self._pending: Dict[int, Dict[str, Any]] = {}  # existing person id -> gender / names to append
+        self.created_ids: List[int] = []
+        event.listen(db, "after_commit", self._after_commit)
+        event.listen(db, "after_rollback", self._after_rollback)
+
+    # -- index ----------------------------------------------------------
+
+    def load(self) -> None:
+        rows = self.db.execute(
+            select(People.id, People.full_name, People.first_name, People.last_name)
+            .order_by(People.id)
+            .execution_options(yield_per=LOAD_BATCH)
+        )
+        for person_id, full_name, first_name, last_name in rows:
+            self._add_to_index(person_id, full_name, first_name, last_name)
+        self._loaded = True
+        logger.info(f"Name resolver indexed {len(self._names)} people under {len(self._index)} keys")
+
+    def _add_to_index(self, person_id: int, full_name: str, first_name: Optional[str],
+                      last_name: Optional[str]) -> List[str]:
+        self._names[person_id] = full_name
+        keys = [normalize_person_name(full_name), normalize_person_name(f"{first_name or ''} {last_name or ''}")]
+        added = []
+        for key in keys:
+            # The oldest person wins a shared key, like the first row of the old lookups
+            if key and key not in self._index:
+                self._index[key] = person_id
+                added.append(key)
+        return added
+
+    def lookup(self, name: str) -> Optional[int]:
+        if not self._loaded:
+            self.load()
+        return self._index.get(normalize_person_name(name))
+
+    # -- staging --------------------------------------------------------
+
+    def _next_id(self) -> int:
+        if not self._reserved:
+            self._reserved = list(self.db.execute(
+                text("SELECT nextval(pg_get_serial_sequence('people', 'id')) FROM generate_series(1, :n)"),
+                {"n": ID_BLOCK}
+            ).scalars())
+        return self._reserved.pop(0)
+
+    def resolve(self, full_name: str, gender: Optional[str] = None, record_alias: bool = False,
+                **fields: Any) -> Optional[ResolvedPerson]:
+        """
+        Person id for ``full_name``, staging a new person when none matches. ``fields``
+        (occupation, address, ...) are only set on new people. With ``record_alias``
+        a name that differs from the matched person's stored ``full_name`` is appended
+        to their ``previous_names``.
+        """
+        if not full_name or not normalize_person_name(full_name):
+            return None
+        person_id = self.lookup(full_name)
+
+        if person_id is None:
+            name_parts = full_name.split()
+            person = People(
+                id=self._next_id(),
+                full_name=full_name,
+                first_name=name_parts[0] if name_parts else full_name,
+                last_name=' '.join(name_parts[1:]) if len(name_parts) > 1 else '',
+                gender=gender,
+                created_by=None
+            )
+            for key, value in fields.items():
+                if hasattr(person, key) and value:
+                    setattr(person, key, value)
+            self.db.add(person)
+            self._new[person.id] = person
+            self._uncommitted[person.id] = self._add_to_index(
+                person.id, full_name, person.first_name, person.last_name
+            )
+            self.created_ids.append(person.id)
+            return ResolvedPerson(person.id, full_name, created=True)
+
+        stored_name = self._names.get(person_id, full_name)
+        if person_id in self._new:
+            person = self._new[person_id]
+            if gender and not person.gender:
+                person.gender = gender
+            if record_alias and full_name != stored_name and full_name not in (person.previous_names or []):
+                person.previous_names = (person.previous_names or []) + [full_name]
+        else:
+            pending = self._pending.setdefault(person_id, {"gender": None, "names": []})
+            if gender and not pending["gender"]:
+                pending["gender"] = gender
+            if record_alias and full_name != stored_name and full_name not in pending["names"]:
+                pending["names"].append(full_name)
+        return ResolvedPerson(person_id, stored_name)
+
+    # -- batched writes -------------------------------------------------
+
+    def flush_updates(self) -> int:
+        """
+        Write collected gender fill-ins and ``previous_names`` appends of existing people
+        (one SELECT and one executemany UPDATE); the caller commits. Returns rows updated.
+        """
+        pending = {person_id: values for person_id, values in self._pending.items()
+                   if values["gender"] or values["names"]}
+        self._pending = {}
+        if not pending:
+            return 0
+
+        current = {
+            person_id: (previous_names, gender)
+            for person_id, previous_names, gender in self.db.execute(
+                select(People.id, People.previous_names, People.gender).where(People.id.in_(list(pending)))
+            )
+        }
+        params = []
+        for person_id, values in pending.items():
+            if person_id not in current:
+                continue
+            previous_names, gender = current[person_id]
+            names = list(previous_names or [])
+            names.extend(name for name in values["names"] if name not in names)
+            params.append({
+                "b_id": person_id,
+                "b_previous_names": names or previous_names,
+                "b_gender": gender or values["gender"],
+            })
+        if params:
+            table = People.__table__
+            self.db.execute(
+                update(table).where(table.c.id == bindparam("b_id")).values(
+                    previous_names=bindparam("b_previous_names", type_=table.c.previous_names.type),
+                    gender=bindparam("b_gender"),
+                ),
+                params
+            )
+        return len(params)
+
+    def discard_staged(self) -> int:
+        """
+        Drop the people staged since the last commit when the notice they were resolved
+        for was not saved (a duplicate), so no orphan person is committed. This rolls back
+        the caller's transaction, so call it between the extractors' per-notice commits.
+        Returns how many people were dropped.
+        """
+        dropped = len(self._uncommitted)
+        if dropped:
+            self.db.rollback()
+        return dropped
+
+    def take_created_ids(self) -> List[int]:
+        """Ids of people created and committed since the last call (for deferred analytics)"""
+        created = [person_id for person_id in self.created_ids if person_id not in self._uncommitted]
+        self.created_ids = [person_id for person_id in self.created_ids if person_id in self._uncommitted]
+        return created
+
+    # -- transaction tracking -------------------------------------------
+
+    def _after_commit(self, session) -> None:
+        # Committed people are ordinary existing people from here on
+        self._new = {}
+        self._uncommitted = {}
+
+    def _after_rollback(self, session) -> None:
+        if not self._uncommitted:
+            return
+        for person_id, keys in self._uncommitted.items():
+            for key in keys:
+                if self._index.get(key) == person_id:
+                    del self._index[key]
+            self._names.pop(person_id, None)
+        dropped: Set[int] = set(self._uncommitted)
+        self.created_ids = [person_id for person_id in self.created_ids if person_id not in dropped]
+        self._new = {}
+        self._uncommitted = {}
+
+    def close(self) -> None:
+        event.remove(self.db, "after_commit", self._after_commit)
+        event.remove(self.db, "after_rollback", self._after_rollback)
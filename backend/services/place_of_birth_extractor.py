@@ -22,6 +22,7 @@ except ImportError:
     print("Warning: PDF processing libraries not installed.")
 
 from database import get_db
+from services.pdf_text_extraction_service import get_pdf_text
 from models.gazette import Gazette, GazetteType, GazetteStatus, GazettePriority
 from models.people import People
 from sqlalchemy.exc import IntegrityError
@@ -36,41 +37,8 @@ class PlaceOfBirthExtractor:
         self.db = next(get_db())
         
     def extract_text_from_pdf(self, file_path: str) -> Dict[str, any]:
-        """Extract text from PDF with page numbers"""
-        result = {
-            'text': '',
-            'pages': {},
-            'total_pages': 0
-        }
-        
-        if not PDF_AVAILABLE:
-            logger.error("PDF libraries not available")
-            return result
-            
-        try:
-            with pdfplumber.open(file_path) as pdf:
-                result['total_pages'] = len(pdf.pages)
-                for page_num, page in enumerate(pdf.pages, 1):
-                    page_text = page.extract_text() or ""
-                    result['pages'][str(page_num)] = page_text
-                    result['text'] += page_text + "\n"
-                    
-                if len(result['text'].strip()) > 100:
-                    return result
-                    
-            # Fallback to PyPDF2
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                result['total_pages'] = len(pdf_reader.pages)
-                for page_num, page in enumerate(pdf_reader.pages, 1):
-                    page_text = page.extract_text() or ""
-                    result['pages'][str(page_num)] = page_text
-                    result['text'] += page_text + "\n"
-                    
-        except Exception as e:
-            logger.error(f"Error extracting text from {file_path}: {str(e)}")
-            
-        return result
+        """Extract text from PDF with page numbers (shared, page-parallel extraction)"""
+        return get_pdf_text(file_path).as_extractor_result(str_keys=True)
     
     def extract_gazette_metadata(self, filename: str) -> Dict[str, Optional[str]]:
         """Extract gazette number, date, and other metadata from filename"""
@@ -0,0 +1,247 @@
+"""
+Token-budget-aware prompt assembly for the AI chat services.
+
+``PromptBuilder.build`` fits a chat prompt into
+``min(model context window - completion tokens, AI_PROMPT_MAX_TOKENS)``:
+
+* the fixed part (instructions and the new user message) is always sent;
+* chat history may use up to ``AI_PROMPT_HISTORY_SHARE`` of what is left, newest turns
+  first, or more when the context fields need less. Turns that do not fit are compacted
+  into one "earlier conversation" note instead of being dropped silently;
+* the remaining budget is split across the context fields (case summary, decision,
+  search results, ...). Short fields are kept whole and long ones are cut to an equal
+  share of what remains.
+
+Tokens are counted with tiktoken when it is installed and estimated at about four
+characters per token otherwise. ``PromptBuild.token_counts`` reports the figures
+per part so callers can log and return them.
+"""
+
+import json
+import math
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from config import settings
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Per-message framing overhead of the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = "... [Content truncated]"
+
+# Context windows of the models the admin settings allow; anything else gets the default
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-4": 8192,
+    "gpt-4-turbo": 128000,
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Share of the history budget the compacted note of older turns may take
+HISTORY_SUMMARY_SHARE = 0.2
+HISTORY_SUMMARY_SNIPPET_TOKENS = 40
+
+Renderer = Callable[[Dict[str, str], str], Tuple[str, str]]
+
+
+@lru_cache(maxsize=16)
+def _encoding(model: str):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: Any, model: str = "gpt-3.5-turbo") -> int:
+    """Tokens of ``text``; other values (JSON list columns...) are counted as their JSON"""
+    if not text:
+        return 0
+    if not isinstance(text, str):
+        text = json.dumps(text, default=str)
+    if TIKTOKEN_AVAILABLE:
+        return len(_encoding(model).encode(text))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: Optional[str], max_tokens: int, model: str = "gpt-3.5-turbo") -> Optional[str]:
+    """Cut ``text`` to at most ``max_tokens`` tokens (marker included)"""
+    if text and not isinstance(text, str):
+        raise TypeError(f"truncate_to_tokens expects a string, got {type(text).__name__}; "
+                        f"use truncate_items_to_tokens for lists")
+    if not text or count_tokens(text, model) <= max_tokens:
+        return text
+    keep = max_tokens - count_tokens(TRUNCATION_MARKER, model)
+    if keep <= 0:
+        return ""
+    if TIKTOKEN_AVAILABLE:
+        encoding = _encoding(model)
+        return encoding.decode(encoding.encode(text)[:keep]) + TRUNCATION_MARKER
+    return text[:keep * CHARS_PER_TOKEN] + TRUNCATION_MARKER
+
+
+def truncate_items_to_tokens(items: Optional[Sequence[Any]], max_tokens: int,
+                             model: str = "gpt-3.5-turbo") -> Optional[List[Any]]:
+    """Keep the leading items of a list whose tokens together fit in ``max_tokens``"""
+    if not items:
+        return items
+    kept = []
+    used = 0
+    for item in items:
+        used += count_tokens(item, model)
+        if used > max_tokens:
+            break
+        kept.append(item)
+    return kept
+
+
+def context_window(model: str) -> int:
+    for name in sorted(MODEL_CONTEXT_WINDOWS, key=len, reverse=True):
+        if model and model.startswith(name):
+            return MODEL_CONTEXT_WINDOWS[name]
+    return DEFAULT_CONTEXT_WINDOW
+
+
+@dataclass
+class PromptBuild:
+    messages: List[Dict[str, str]]
+    token_counts: Dict[str, int] = field(default_factory=dict)
+    history_included: int = 0
+    history_compacted: int = 0
+    truncated_fields: List[str] = field(default_factory=list)
+
+
+class PromptBuilder:
+    """Assembles system prompt, history and user message within a token budget"""
+
+    def __init__(self, model: str, completion_tokens: int = 800, max_prompt_tokens: Optional[int] = None,
+                 history_share: Optional[float] = None):
+        self.model = model
+        self.completion_tokens = completion_tokens
+        limit = max_prompt_tokens or settings.ai_prompt_max_tokens
+        self.budget = max(0, min(context_window(model) - completion_tokens, limit))
+        self.history_share = settings.ai_prompt_history_share if history_share is None else history_share
+
+    def count(self, text: Optional[str]) -> int:
+        return count_tokens(text, self.model)
+
+    def count_message(self, message: Dict[str, str]) -> int:
+        return self.count(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+    def fit_fields(self, fields: Dict[str, Optional[str]], budget: int) -> Tuple[Dict[str, Optional[str]], List[str]]:
+        """
+        Share ``budget`` across ``fields``: each field gets its full size or an equal share
+        of what is left, smallest first. Returns ``fields`` itself when everything fits.
+        """
+        sizes = {name: self.count(value) for name, value in fields.items()}
+        if sum(sizes.values()) <= budget:
+            return fields, []
+        fitted = dict(fields)
+        truncated = []
+        remaining = max(0, budget)
+        ordered = sorted(sizes, key=sizes.get)
+        for position, name in enumerate(ordered):
+            share = remaining // (len(ordered) - position)
+            if sizes[name] <= share:
+                remaining -= sizes[name]
+                continue
+            fitted[name] = truncate_to_tokens(fields[name], share, self.model) if share else None
+            truncated.append(name)
+            remaining -= self.count(fitted[name])
+        return fitted, truncated
+
+    def _compact(self, messages: List[Dict[str, str]], budget: int) -> Optional[Dict[str, str]]:
+        """One note quoting the start of each older turn, newest kept when space runs out"""
+        if budget <= MESSAGE_OVERHEAD_TOKENS:
+            return None
+        header = "Summary of the earlier conversation (oldest first):"
+        used = self.count(header) + MESSAGE_OVERHEAD_TOKENS
+        lines: List[str] = []
+        for message in reversed(messages):
+            speaker = "User" if message["role"] == "user" else "Assistant"
+            line = f"- {speaker}: {truncate_to_tokens(' '.join(message['content'].split()), HISTORY_SUMMARY_SNIPPET_TOKENS, self.model)}"
+            cost = self.count(line) + 1
+            if used + cost > budget:
+                break
+            lines.append(line)
+            used += cost
+        if not lines:
+            return None
+        return {"role": "system", "content": "\n".join([header] + list(reversed(lines)))}
+
+    def fit_history(self, history: Optional[List[Dict]], budget: int) -> Tuple[List[Dict[str, str]], int, int]:
+        """
+        Newest turns verbatim within ``budget``; older turns compacted into a note.
+        Returns ``(messages, turns included verbatim, turns compacted)``.
+        """
+        turns = [
+            {"role": "user" if message["role"] == "user" else "assistant", "content": message["content"]}
+            for message in (history or []) if message.get("content")
+        ]
+        total = sum(self.count_message(turn) for turn in turns)
+        if total <= budget:
+            return turns, len(turns), 0
+
+        summary_budget = int(budget * HISTORY_SUMMARY_SHARE)
+        recent_budget = budget - summary_budget
+        kept: List[Dict[str, str]] = []
+        used = 0
+        for turn in reversed(turns):
+            cost = self.count_message(turn)
+            if used + cost > recent_budget:
+                break
+            kept.append(turn)
+            used += cost
+        kept.reverse()
+        older = turns[:len(turns) - len(kept)]
+        note = self._compact(older, summary_budget + (recent_budget - used))
+        return ([note] if note else []) + kept, len(kept), len(older)
+
+    def build(self, render: Renderer, fields: Dict[str, Optional[str]], user_message: str,
+              history: Optional[List[Dict]] = None) -> PromptBuild:
+        """
+        ``render(fields, user_message)`` returns ``(system prompt, user content)`` for the
+        given (possibly cut) context fields.
+        """
+        empty_system, empty_user = render({name: None for name in fields}, user_message)
+        fixed = self.count(empty_system) + self.count(empty_user) + 2 * MESSAGE_OVERHEAD_TOKENS
+        available = max(0, self.budget - fixed)
+
+        field_need = sum(self.count(value) for value in fields.values())
+        history_cap = max(int(available * self.history_share), available - field_need)
+        history_messages, included, compacted = self.fit_history(history, history_cap)
+        history_tokens = sum(self.count_message(message) for message in history_messages)
+
+        fitted, truncated = self.fit_fields(fields, available - history_tokens)
+        system_prompt, user_content = render(fitted, user_message)
+        messages = [{"role": "system", "content": system_prompt}] + history_messages + [
+            {"role": "user", "content": user_content}
+        ]
+
+        system_tokens = self.count_message(messages[0])
+        user_tokens = self.count_message(messages[-1])
+        field_tokens = sum(self.count(value) for value in fitted.values())
+        return PromptBuild(
+            messages=messages,
+            token_counts={
+                "budget": self.budget,
+                "fixed": fixed,
+                "context_fields": field_tokens,
+                "history": history_tokens,
+                "system": system_tokens,
+                "user": user_tokens,
+                "total": system_tokens + history_tokens + user_tokens,
+                "completion_reserved": self.completion_tokens,
+            },
+            history_included=included,
+            history_compacted=compacted,
+            truncated_fields=truncated,
+        )
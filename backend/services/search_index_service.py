@@ -0,0 +1,257 @@
+"""
+Search index service backing /api/search/unified.
+
+Every searchable entity (people, banks, insurance, companies) has one row in
+``search_documents`` holding its display title and a lowercased concatenation of
+its searchable fields. On PostgreSQL the documents are maintained by triggers and
+matched through pg_trgm GIN indexes, so ``LIKE '%term%'`` no longer scans the
+entity tables; ranking and LIMIT/OFFSET are evaluated in SQL. On other dialects
+(SQLite in local setups) the same table is queried with a portable score
+expression. There ``sync_entity`` / ``remove_entity`` run from an ``after_flush``
+listener on every ORM write to the four entity models, so create/update/delete
+routes keep the documents current; bulk SQL writes need ``rebuild``.
+"""
+
+import json
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple, Any
+
+from sqlalchemy import and_, case, delete, desc, event, exists, func, insert, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from models.people import People
+from models.banks import Banks
+from models.insurance import Insurance
+from models.companies import Companies
+from models.search_document import SearchDocument
+
+logger = logging.getLogger(__name__)
+
+# entity_type -> (model, title column, searchable columns, searchable flag column, boost column)
+SEARCH_ENTITIES: Dict[str, Tuple[Any, str, List[str], str, Optional[str]]] = {
+    "people": (
+        People,
+        "full_name",
+        ["full_name", "first_name", "last_name", "id_number", "phone_number",
+         "email", "address", "city", "region", "previous_names"],
+        "is_verified",
+        "case_count",
+    ),
+    "banks": (
+        Banks,
+        "name",
+        ["name", "short_name", "bank_code", "city", "region", "description"],
+        "is_active",
+        None,
+    ),
+    "insurance": (
+        Insurance,
+        "name",
+        ["name", "short_name", "license_number", "city", "region", "description"],
+        "is_active",
+        None,
+    ),
+    "companies": (
+        Companies,
+        "name",
+        ["name", "short_name", "registration_number", "city", "region", "industry", "description"],
+        "is_active",
+        None,
+    ),
+}
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace so queries match the stored documents"""
+    return " ".join(query.lower().split())
+
+
+def build_document_text(values: Sequence[Any]) -> str:
+    """Join searchable field values into the lowercased document text"""
+    parts = []
+    for value in values:
+        if value is None or value == "":
+            continue
+        if isinstance(value, (list, dict)):
+            value = json.dumps(value)
+        parts.append(str(value))
+    return normalize_query(" ".join(parts))
+
+
+class SearchIndexService:
+    """Ranked retrieval over the search_documents table"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.is_postgres = db.get_bind().dialect.name == "postgresql"
+
+    # ------------------------------------------------------------------
+    # Retrieval
+    # ------------------------------------------------------------------
+    def _match_filter(self, term: Optional[str], entity_types: Sequence[str]):
+        conditions = [
+            SearchDocument.entity_type.in_(list(entity_types)),
+            SearchDocument.is_searchable == True,
+        ]
+        if term:
+            # Served by the gin_trgm_ops index on PostgreSQL
+            conditions.append(SearchDocument.document.like(f"%{term}%"))
+        return and_(*conditions)
+
+    def score_expression(self, term: Optional[str]):
+        """Relevance score: exact title > title prefix > title contains > other fields"""
+        if not term:
+            return literal(0.0)
+        title = func.lower(SearchDocument.title)
+        positional = case(
+            (title == term, 3.0),
+            (title.like(f"{term}%"), 2.0),
+            (title.like(f"%{term}%"), 1.0),
+            else_=0.0,
+        )
+        if self.is_postgres:
+            return positional + func.similarity(title, term)
+        return positional
+
+    def search(
+        self,
+        query: Optional[str],
+        entity_types: Sequence[str],
+        limit: int,
+        offset: int = 0,
+    ) -> List[Tuple[str, int, float]]:
+        """Return ``(entity_type, entity_id, score)`` tuples for the requested window"""
+        term = normalize_query(query) if query else None
+        score = self.score_expression(term).label("score")
+        rows = (
+            self.db.query(SearchDocument.entity_type, SearchDocument.entity_id, score)
+            .filter(self._match_filter(term, entity_types))
+            .order_by(desc("score"), desc(SearchDocument.boost), SearchDocument.entity_type, SearchDocument.entity_id)
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+        return [(row.entity_type, row.entity_id, float(row.score or 0)) for row in rows]
+
+    def count(self, query: Optional[str], entity_types: Sequence[str]) -> int:
+        return sum(self.count_by_type(query, entity_types).values())
+
+    def count_by_type(self, query: Optional[str], entity_types: Sequence[str]) -> Dict[str, int]:
+        """Per-type match counts from a single GROUP BY over the index"""
+        term = normalize_query(query) if query else None
+        rows = (
+            self.db.query(SearchDocument.entity_type, func.count(SearchDocument.id))
+            .filter(self._match_filter(term, entity_types))
+            .group_by(SearchDocument.entity_type)
+            .all()
+        )
+        counts = {entity_type: 0 for entity_type in entity_types}
+        counts.update({entity_type: count for entity_type, count in rows})
+        return counts
+
+    # ------------------------------------------------------------------
+    # Maintenance (PostgreSQL uses triggers; these keep other dialects current
+    # and backfill after bulk loads)
+    # ------------------------------------------------------------------
+    def _document_values(self, entity_type: str, obj) -> Dict[str, Any]:
+        model, title_col, fields, flag_col, boost_col = SEARCH_ENTITIES[entity_type]
+        return {
+            "title": (getattr(obj, title_col) or "")[:500],
+            "document": build_document_text([getattr(obj, field) for field in fields]),
+            "is_searchable": bool(getattr(obj, flag_col)),
+            "boost": float(getattr(obj, boost_col) or 0) if boost_col else 0.0,
+        }
+
+    def sync_entity(self, entity_type: str, obj) -> None:
+        """
+        Create or refresh the search document for a single entity (caller commits).
+        Core statements only, so it is safe inside flush events.
+        """
+        self.remove_entity(entity_type, obj.id)
+        self.db.execute(insert(SearchDocument).values(
+            entity_type=entity_type, entity_id=obj.id, **self._document_values(entity_type, obj)
+        ))
+
+    def remove_entity(self, entity_type: str, entity_id: int) -> None:
+        self.db.execute(delete(SearchDocument).where(
+            SearchDocument.entity_type == entity_type,
+            SearchDocument.entity_id == entity_id,
+        ))
+
+    def _upsert_documents(self, rows: List[Dict[str, Any]]) -> None:
+        """INSERT ... ON CONFLICT (entity_type, entity_id) DO UPDATE, so documents written by
+        triggers or the flush listener meanwhile are refreshed instead of violating the key"""
+        statement = (pg_insert if self.is_postgres else sqlite_insert)(SearchDocument).values(rows)
+        self.db.execute(statement.on_conflict_do_update(
+            index_elements=[SearchDocument.entity_type, SearchDocument.entity_id],
+            set_={
+                "title": statement.excluded.title,
+                "document": statement.excluded.document,
+                "is_searchable": statement.excluded.is_searchable,
+                "boost": statement.excluded.boost,
+                "updated_at": func.now(),
+            }
+        ))
+
+    def rebuild(self, entity_types: Optional[Sequence[str]] = None, batch_size: int = 1000) -> Dict[str, int]:
+        """
+        Rebuild documents from the entity tables in place, committing once per batch.
+        Each batch is upserted, so search keeps serving the existing documents during
+        the run; documents of entities that no longer exist are deleted at the end.
+        """
+        indexed = {}
+        for entity_type in entity_types or SEARCH_ENTITIES.keys():
+            model = SEARCH_ENTITIES[entity_type][0]
+            last_id = 0
+            total = 0
+            while True:
+                batch = (
+                    self.db.query(model)
+                    .filter(model.id > last_id)
+                    .order_by(model.id)
+                    .limit(batch_size)
+                    .all()
+                )
+                if not batch:
+                    break
+                self._upsert_documents([
+                    {"entity_type": entity_type, "entity_id": obj.id, **self._document_values(entity_type, obj)}
+                    for obj in batch
+                ])
+                self.db.commit()
+                last_id = batch[-1].id
+                total += len(batch)
+                self.db.expunge_all()
+
+            removed = self.db.execute(delete(SearchDocument).where(
+                SearchDocument.entity_type == entity_type,
+                ~exists().where(model.id == SearchDocument.entity_id)
+            )).rowcount
+            self.db.commit()
+            indexed[entity_type] = total
+            logger.info(f"Search index rebuilt for {entity_type}: {total} documents, {removed} stale removed")
+        return indexed
+
+SEARCH_ENTITY_TYPES = {spec[0]: entity_type for entity_type, spec in SEARCH_ENTITIES.items()}
+
+
+def _sync_search_documents(session: Session, flush_context) -> None:
+    """Mirror ORM writes to indexed entities into search_documents (PostgreSQL uses triggers)"""
+    changed = [obj for obj in list(session.new) + list(session.dirty) if type(obj) in SEARCH_ENTITY_TYPES]
+    deleted = [obj for obj in session.deleted if type(obj) in SEARCH_ENTITY_TYPES]
+    if not changed and not deleted:
+        return
+    service = SearchIndexService(session)
+    if service.is_postgres:
+        return
+    for obj in changed:
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        service.sync_entity(SEARCH_ENTITY_TYPES[type(obj)], obj)
+    for obj in deleted:
+        service.remove_entity(SEARCH_ENTITY_TYPES[type(obj)], obj.id)
+
+
+event.listen(Session, "after_flush", _sync_search_documents)
@@ -9,7 +9,8 @@ from models.banks import Banks
 from models.insurance import Insurance
 from models.companies import Companies
 from models.reported_cases import ReportedCases
-from models.case_metadata import CaseMetadata, CaseSearchIndex
+from models.case_metadata import CaseMetadata
+from services.case_search_index_service import CaseSearchIndexService
 from services.ai_service import AIService
 import json
 
@@ -376,25 +377,4 @@ class SimpleCaseProcessingService:
 
     def _create_search_index(self, case_id: int, case: ReportedCases, entities: Dict[str, List[str]]) -> None:
         """Create or update search index"""
-        search_index = self.db.query(CaseSearchIndex).filter(CaseSearchIndex.case_id == case_id).first()
-        
-        searchable_text = f"{case.title or ''} {case.case_summary or ''} {case.protagonist or ''} {case.antagonist or ''} {case.lawyers or ''} {case.presiding_judge or ''}"
-        
-        if not search_index:
-            search_index = CaseSearchIndex(
-                case_id=case_id,
-                searchable_text=searchable_text,
-                person_names=entities.get('people', []),
-                organization_names=entities.get('companies', []) + entities.get('banks', []) + entities.get('insurance', []),
-                keywords=case.keywords_phrases.split(', ') if case.keywords_phrases else [],
-                word_count=len(searchable_text.split()),
-                last_indexed=datetime.now()
-            )
-            self.db.add(search_index)
-        else:
-            search_index.searchable_text = searchable_text
-            search_index.person_names = entities.get('people', [])
-            search_index.organization_names = entities.get('companies', []) + entities.get('banks', []) + entities.get('insurance', [])
-            search_index.keywords = case.keywords_phrases.split(', ') if case.keywords_phrases else []
-            search_index.word_count = len(searchable_text.split())
-            search_index.last_indexed = datetime.now()
+        CaseSearchIndexService(self.db).upsert(case, entities=entities)
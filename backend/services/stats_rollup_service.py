@@ -0,0 +1,431 @@
+"""
+Pre-aggregated statistics for the admin, people and gazette dashboards.
+
+Every source row (a case, a person, a gazette entry) is mapped to one bucket per
+dimension, e.g. ``{"cases.total": "all", "cases.court_type": "SC", "cases.region": "Ashanti"}``.
+``stats_rollups`` holds the row count of each (dimension, bucket) and
+``stats_rollup_members`` remembers which buckets each row was counted in.
+
+``refresh`` is incremental: it only reads rows whose ``COALESCE(updated_at, created_at)``
+is past the source's watermark (minus ``WATERMARK_OVERLAP`` to cover transactions that
+committed late), diffs their buckets against the stored membership and applies +1/-1
+deltas. Rows missing from the source table are counted out. Re-reading a row is a
+no-op, so the overlap is safe. ``refresh(full=True)`` rebuilds a source from scratch.
+
+Dimensions mapped in ``DISTINCT_DIMENSIONS`` feed a parent count of how many of their
+buckets are non-empty (distinct gazette numbers per year, distinct people overall...).
+
+Rollups are built off the request path: by the lifespan refresh loop, whose first
+pass runs at startup, or by scripts/refresh_stats_rollups.py. Until a source has been
+built, ``count`` / ``counts`` answer from live aggregate queries (``LIVE_DIMENSIONS``).
+
+Each refresh runs in a single transaction holding the source's ``stats_rollup_state``
+row lock, so concurrent workers skip rather than double count. Writes that bypass
+``updated_at`` (raw bulk SQL) are picked up by the next full refresh
+(scripts/refresh_stats_rollups.py --full).
+"""
+
+import asyncio
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import extract, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.gazette import Gazette
+from models.people import People
+from models.reported_cases import ReportedCases
+from models.stats_rollup import StatsRollup, StatsRollupMember, StatsRollupState
+
+logger = logging.getLogger(__name__)
+
+CASES = "cases"
+PEOPLE = "people"
+GAZETTES = "gazettes"
+
+ALL = "all"
+WATERMARK_OVERLAP = timedelta(minutes=5)
+MAX_BUCKET_LENGTH = 255
+QUERY_CHUNK_SIZE = 500
+
+# dimension -> parent dimension counting its non-empty buckets.
+# "<parent bucket>|<value>" buckets roll up into <parent bucket>, the rest into "all".
+DISTINCT_DIMENSIONS = {
+    "gazettes.number": "gazettes.distinct_numbers",
+    "gazettes.person": "gazettes.distinct_people",
+    "gazettes.year_number": "gazettes.year_numbers",
+    "gazettes.year_person": "gazettes.year_people",
+}
+
+
+def _bucket(value: Any) -> str:
+    if hasattr(value, "value"):  # Enum members
+        value = value.value
+    return str(value)[:MAX_BUCKET_LENGTH]
+
+
+def case_buckets(row) -> Dict[str, str]:
+    buckets = {"cases.total": ALL}
+    if row.court_type:
+        buckets["cases.court_type"] = _bucket(row.court_type)
+    if row.status is not None:
+        buckets["cases.status"] = _bucket(row.status)
+    if row.region:
+        buckets["cases.region"] = _bucket(row.region)
+    if row.year:
+        buckets["cases.year"] = _bucket(row.year)
+    return buckets
+
+
+def person_buckets(row) -> Dict[str, str]:
+    buckets = {"people.total": ALL}
+    if row.status != "active":
+        return buckets
+    buckets["people.active"] = ALL
+    buckets["people.region"] = _bucket(row.region or "Unknown")
+    if row.is_verified:
+        buckets["people.verified"] = ALL
+    if row.risk_level:
+        buckets["people.risk_level"] = _bucket(row.risk_level)
+    if row.case_count and row.case_count > 0:
+        buckets["people.with_cases"] = ALL
+    if row.occupation is not None:
+        buckets["people.occupation"] = _bucket(row.occupation)
+    return buckets
+
+
+def gazette_buckets(row) -> Dict[str, str]:
+    number = _bucket(row.gazette_number) if row.gazette_number is not None else None
+    buckets = {"gazettes.total": ALL}
+    if number is not None:
+        buckets["gazettes.number"] = number
+    if row.person_id is not None:
+        buckets["gazettes.person"] = str(row.person_id)
+    if row.gazette_type is not None:
+        buckets["gazettes.type"] = _bucket(row.gazette_type)
+    if row.jurisdiction:
+        buckets["gazettes.jurisdiction"] = _bucket(row.jurisdiction)
+    if row.gazette_date is not None:
+        year = str(row.gazette_date.year)
+        buckets["gazettes.year"] = year
+        if number is not None:
+            buckets["gazettes.year_number"] = _bucket(f"{year}|{number}")
+        if row.person_id is not None:
+            buckets["gazettes.year_person"] = f"{year}|{row.person_id}"
+    return buckets
+
+
+class RollupSource:
+    """A source table, the columns its buckets depend on and the bucket mapping"""
+
+    def __init__(self, name: str, model, columns: Sequence, bucket_fn: Callable[[Any], Dict[str, str]]):
+        self.name = name
+        self.model = model
+        self.columns = columns
+        self.bucket_fn = bucket_fn
+
+    @property
+    def changed_at(self):
+        return func.coalesce(self.model.updated_at, self.model.created_at)
+
+
+SOURCES: Dict[str, RollupSource] = {
+    CASES: RollupSource(CASES, ReportedCases, [
+        ReportedCases.court_type, ReportedCases.status, ReportedCases.region, ReportedCases.year,
+    ], case_buckets),
+    PEOPLE: RollupSource(PEOPLE, People, [
+        People.status, People.region, People.occupation, People.is_verified,
+        People.risk_level, People.case_count,
+    ], person_buckets),
+    GAZETTES: RollupSource(GAZETTES, Gazette, [
+        Gazette.gazette_number, Gazette.gazette_date, Gazette.person_id,
+        Gazette.gazette_type, Gazette.jurisdiction,
+    ], gazette_buckets),
+}
+
+
+def _not_blank(column):
+    return [column.isnot(None), column != ""]
+
+
+def _year_bucket(value: Any) -> str:
+    return str(int(value))
+
+
+_GAZETTE_YEAR = extract("year", Gazette.gazette_date)
+_ACTIVE_PERSON = People.status == "active"
+
+# dimension -> (group by expression or None for the "all" bucket, counted expression,
+#               filters, bucket of a group value); mirrors the *_buckets functions above
+LIVE_DIMENSIONS: Dict[str, tuple] = {
+    "cases.total": (None, func.count(ReportedCases.id), [], _bucket),
+    "cases.court_type": (ReportedCases.court_type, func.count(ReportedCases.id),
+                         _not_blank(ReportedCases.court_type), _bucket),
+    "cases.status": (ReportedCases.status, func.count(ReportedCases.id), [ReportedCases.status.isnot(None)], _bucket),
+    "cases.region": (ReportedCases.region, func.count(ReportedCases.id), _not_blank(ReportedCases.region), _bucket),
+    "cases.year": (ReportedCases.year, func.count(ReportedCases.id), _not_blank(ReportedCases.year), _bucket),
+    "people.total": (None, func.count(People.id), [], _bucket),
+    "people.active": (None, func.count(People.id), [_ACTIVE_PERSON], _bucket),
+    "people.verified": (None, func.count(People.id), [_ACTIVE_PERSON, People.is_verified == True], _bucket),
+    "people.with_cases": (None, func.count(People.id), [_ACTIVE_PERSON, People.case_count > 0], _bucket),
+    "people.risk_level": (People.risk_level, func.count(People.id),
+                          [_ACTIVE_PERSON] + _not_blank(People.risk_level), _bucket),
+    "people.occupation": (People.occupation, func.count(People.id),
+                          [_ACTIVE_PERSON, People.occupation.isnot(None)], _bucket),
+    "people.region": (func.coalesce(func.nullif(People.region, ""), "Unknown"), func.count(People.id),
+                      [_ACTIVE_PERSON], _bucket),
+    "gazettes.total": (None, func.count(Gazette.id), [], _bucket),
+    "gazettes.distinct_numbers": (None, func.count(func.distinct(Gazette.gazette_number)), [], _bucket),
+    "gazettes.distinct_people": (None, func.count(func.distinct(Gazette.person_id)), [], _bucket),
+    "gazettes.type": (Gazette.gazette_type, func.count(Gazette.id), [Gazette.gazette_type.isnot(None)], _bucket),
+    "gazettes.jurisdiction": (Gazette.jurisdiction, func.count(Gazette.id), _not_blank(Gazette.jurisdiction), _bucket),
+    "gazettes.year": (_GAZETTE_YEAR, func.count(Gazette.id), [Gazette.gazette_date.isnot(None)], _year_bucket),
+    "gazettes.year_numbers": (_GAZETTE_YEAR, func.count(func.distinct(Gazette.gazette_number)),
+                              [Gazette.gazette_date.isnot(None)], _year_bucket),
+    "gazettes.year_people": (_GAZETTE_YEAR, func.count(func.distinct(Gazette.person_id)),
+                             [Gazette.gazette_date.isnot(None)], _year_bucket),
+}
+
+
+def _chunks(values: List, size: int = QUERY_CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class StatsRollupService:
+    """Reads and incrementally refreshes the stats_rollups aggregates"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._built: Dict[str, bool] = {}
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def is_built(self, source: str) -> bool:
+        if source not in self._built:
+            refreshed_at = self.db.query(StatsRollupState.last_refreshed_at).filter(
+                StatsRollupState.source == source
+            ).scalar()
+            self._built[source] = refreshed_at is not None
+            if refreshed_at is None:
+                logger.info(f"Stats rollup for {source} has not been built yet; serving live counts")
+        return self._built[source]
+
+    def counts(self, dimension: str) -> Dict[str, int]:
+        if not self.is_built(dimension.split(".", 1)[0]):
+            return self._live_counts(dimension)
+        rows = self.db.query(StatsRollup.bucket, StatsRollup.row_count).filter(
+            StatsRollup.dimension == dimension
+        ).all()
+        return {bucket: row_count for bucket, row_count in rows}
+
+    def count(self, dimension: str, bucket: str = ALL) -> int:
+        if not self.is_built(dimension.split(".", 1)[0]):
+            return self._live_counts(dimension).get(bucket, 0)
+        value = self.db.query(StatsRollup.row_count).filter(
+            StatsRollup.dimension == dimension, StatsRollup.bucket == bucket
+        ).scalar()
+        return value or 0
+
+    def _live_counts(self, dimension: str) -> Dict[str, int]:
+        group, counted, filters, bucket_of = LIVE_DIMENSIONS[dimension]
+        if group is None:
+            return {ALL: self.db.query(counted).filter(*filters).scalar() or 0}
+        rows = self.db.query(group, counted).filter(*filters).group_by(group).all()
+        return {bucket_of(value): row_count for value, row_count in rows if row_count}
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+    def _lock_state(self, source: str) -> Optional[StatsRollupState]:
+        """Lock the source's state row; None when another worker is refreshing it"""
+        state = self.db.query(StatsRollupState).filter(
+            StatsRollupState.source == source
+        ).with_for_update(skip_locked=True).first()
+        if state is not None:
+            return state
+        if self.db.query(StatsRollupState.source).filter(StatsRollupState.source == source).first():
+            return None
+        state = StatsRollupState(source=source, rows_processed=0)
+        self.db.add(state)
+        try:
+            self.db.flush()
+        except IntegrityError:
+            self.db.rollback()
+            return None
+        return state
+
+    def refresh(self, source: str, full: bool = False, batch_size: int = 1000) -> int:
+        """Bring ``source``'s rollups up to date; returns the number of rows re-read"""
+        spec = SOURCES[source]
+        started_at = datetime.now(timezone.utc)
+        state = self._lock_state(source)
+        if state is None:
+            logger.info(f"Stats rollup for {source} is being refreshed by another worker; skipping")
+            return 0
+
+        try:
+            since = None
+            if full:
+                self._clear(spec)
+            elif state.watermark is not None:
+                since = state.watermark - WATERMARK_OVERLAP
+
+            processed = 0
+            last_id = 0
+            while True:
+                rows_query = self.db.query(spec.model.id, *spec.columns).filter(spec.model.id > last_id)
+                if since is not None:
+                    rows_query = rows_query.filter(spec.changed_at >= since)
+                rows = rows_query.order_by(spec.model.id).limit(batch_size).all()
+                if not rows:
+                    break
+                self._apply(self._diff_rows(spec, rows))
+                # Flushed but not committed: readers keep seeing the previous totals until the end
+                self.db.flush()
+                self._expunge_rollup_objects()
+                processed += len(rows)
+                last_id = rows[-1].id
+
+            removed = self._remove_deleted(spec)
+
+            state.watermark = started_at
+            state.last_refreshed_at = datetime.now(timezone.utc)
+            if full:
+                state.last_full_refresh_at = state.last_refreshed_at
+            state.rows_processed = processed
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        logger.info(f"Stats rollup for {source} refreshed: {processed} rows re-read, {removed} removed"
+                    f"{' (full rebuild)' if full else ''}")
+        return processed
+
+    def refresh_all(self, full: bool = False) -> Dict[str, int]:
+        results = {}
+        for source in SOURCES:
+            try:
+                results[source] = self.refresh(source, full=full)
+            except Exception as e:
+                logger.error(f"Error refreshing stats rollup for {source}: {e}")
+                results[source] = -1
+        return results
+
+    def _clear(self, spec: RollupSource) -> None:
+        # Every dimension of a source, distinct parents included, is prefixed with its name
+        self.db.query(StatsRollup).filter(
+            StatsRollup.dimension.like(f"{spec.name}.%")
+        ).delete(synchronize_session=False)
+        self.db.query(StatsRollupMember).filter(
+            StatsRollupMember.source == spec.name
+        ).delete(synchronize_session=False)
+
+    def _expunge_rollup_objects(self) -> None:
+        # Keeps the identity map small during a full rebuild without detaching the caller's objects
+        for instance in list(self.db):
+            if isinstance(instance, (StatsRollup, StatsRollupMember)):
+                self.db.expunge(instance)
+
+    def _diff_rows(self, spec: RollupSource, rows) -> Counter:
+        row_ids = [row.id for row in rows]
+        members = {
+            member.row_id: member
+            for member in self.db.query(StatsRollupMember).filter(
+                StatsRollupMember.source == spec.name, StatsRollupMember.row_id.in_(row_ids)
+            )
+        }
+        deltas = Counter()
+        for row in rows:
+            new_buckets = spec.bucket_fn(row)
+            member = members.get(row.id)
+            old_buckets = member.buckets if member else {}
+            if old_buckets == new_buckets:
+                continue
+            for dimension, bucket in old_buckets.items():
+                deltas[(dimension, bucket)] -= 1
+            for dimension, bucket in new_buckets.items():
+                deltas[(dimension, bucket)] += 1
+            if member:
+                member.buckets = new_buckets
+            else:
+                self.db.add(StatsRollupMember(source=spec.name, row_id=row.id, buckets=new_buckets))
+        return deltas
+
+    def _remove_deleted(self, spec: RollupSource) -> int:
+        orphans = self.db.query(StatsRollupMember).outerjoin(
+            spec.model, spec.model.id == StatsRollupMember.row_id
+        ).filter(
+            StatsRollupMember.source == spec.name, spec.model.id.is_(None)
+        ).all()
+        if not orphans:
+            return 0
+        deltas = Counter()
+        for member in orphans:
+            for dimension, bucket in member.buckets.items():
+                deltas[(dimension, bucket)] -= 1
+            self.db.delete(member)
+        self._apply(deltas)
+        self.db.flush()
+        return len(orphans)
+
+    def _apply(self, deltas: Counter) -> None:
+        """Add ``deltas`` to stats_rollups, dropping empty buckets and updating distinct parents"""
+        by_dimension = defaultdict(list)
+        for (dimension, bucket), delta in deltas.items():
+            if delta:
+                by_dimension[dimension].append(bucket)
+
+        parent_deltas = Counter()
+        for dimension, buckets in by_dimension.items():
+            existing = {}
+            for chunk in _chunks(buckets):
+                for rollup in self.db.query(StatsRollup).filter(
+                    StatsRollup.dimension == dimension, StatsRollup.bucket.in_(chunk)
+                ):
+                    existing[rollup.bucket] = rollup
+
+            parent = DISTINCT_DIMENSIONS.get(dimension)
+            for bucket in buckets:
+                rollup = existing.get(bucket)
+                old_count = rollup.row_count if rollup else 0
+                new_count = old_count + deltas[(dimension, bucket)]
+                if rollup is not None and new_count <= 0:
+                    self.db.delete(rollup)
+                elif rollup is not None:
+                    rollup.row_count = new_count
+                elif new_count > 0:
+                    self.db.add(StatsRollup(dimension=dimension, bucket=bucket, row_count=new_count))
+
+                if parent and (old_count > 0) != (new_count > 0):
+                    parent_bucket = bucket.split("|", 1)[0] if "|" in bucket else ALL
+                    parent_deltas[(parent, parent_bucket)] += 1 if new_count > 0 else -1
+
+        if parent_deltas:
+            self._apply(parent_deltas)
+
+
+def refresh_stats_rollups(full: bool = False) -> Dict[str, int]:
+    """Refresh every source in its own session (used by the background loop and the CLI)"""
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return StatsRollupService(db).refresh_all(full=full)
+    finally:
+        db.close()
+
+
+async def run_periodic_refresh(interval_seconds: int) -> None:
+    """Background loop started from the application lifespan"""
+    while True:
+        try:
+            await asyncio.to_thread(refresh_stats_rollups)
+        except Exception as e:
+            logger.error(f"Periodic stats rollup refresh failed: {e}")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,192 @@
+"""
+Background ingestion of usage_tracking rows.
+
+``UsageTrackingMiddleware`` hands each tracked request to ``usage_pipeline.submit``,
+which only appends to a bounded in-memory queue. A single worker task drains the
+queue and bulk-inserts the rows (one executemany INSERT per batch) from a worker
+thread, so requests never wait on the database:
+
+* a batch is written when it reaches ``usage_batch_size`` events or
+  ``usage_flush_interval`` seconds after its first event, whichever comes first;
+* when the queue is full new events are dropped and counted (back-pressure never
+  reaches the request path);
+* ``stop`` (called from the application lifespan) drains the queue before exit.
+
+Events are only buffered in memory, so a hard crash loses at most one queue's worth
+of usage records.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from config import settings
+from database import SessionLocal
+from models.usage_tracking import UsageTracking
+from services.usage_tracking_service import UsageTrackingService
+
+logger = logging.getLogger(__name__)
+
+
+class UsageIngestionMetrics:
+    """Counters exposed on /api/admin/usage-tracking/stats"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_flush_at: Optional[datetime] = None
+        self.last_flush_ms: Optional[int] = None
+
+    def record(self, **increments: int) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def record_flush(self, written: int, elapsed_ms: int) -> None:
+        with self._lock:
+            self.written += written
+            self.batches += 1
+            self.last_flush_at = datetime.now(timezone.utc)
+            self.last_flush_ms = elapsed_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enqueued": self.enqueued,
+                "dropped": self.dropped,
+                "written": self.written,
+                "failed": self.failed,
+                "batches": self.batches,
+                "last_flush_at": self.last_flush_at.isoformat() if self.last_flush_at else None,
+                "last_flush_ms": self.last_flush_ms,
+            }
+
+
+class UsageIngestionPipeline:
+    """Bounded queue + batching writer for usage events"""
+
+    def __init__(self, max_queue_size: int = 10000, batch_size: int = 500, flush_interval: float = 2.0):
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.metrics = UsageIngestionMetrics()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._stopping = False
+        self._worker = asyncio.create_task(self._run())
+        logger.info(f"Usage ingestion started (batch size {self.batch_size}, flush every {self.flush_interval}s)")
+
+    async def stop(self) -> None:
+        """Write everything still queued, then stop the worker"""
+        if not self.running:
+            return
+        self._stopping = True
+        await self._worker
+        self._worker = None
+        logger.info(f"Usage ingestion stopped: {self.metrics.snapshot()}")
+
+    def submit(self, **event: Any) -> bool:
+        """
+        Queue one usage event (``UsageTrackingService.build_usage_values`` fields).
+        Never blocks; returns False when the event was dropped.
+        """
+        if self._queue is None or self._stopping:
+            self.metrics.record(dropped=1)
+            return False
+        event.setdefault("created_at", datetime.now(timezone.utc))
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.metrics.record(dropped=1)
+            return False
+        self.metrics.record(enqueued=1)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            self.metrics.snapshot(),
+            running=self.running,
+            queue_depth=self._queue.qsize() if self._queue is not None else 0,
+            max_queue_size=self.max_queue_size,
+        )
+
+    async def _next_batch(self) -> List[Dict[str, Any]]:
+        """Wait for the first event, then collect until the batch is full or the interval ends"""
+        batch = []
+        try:
+            batch.append(await asyncio.wait_for(self._queue.get(), timeout=self.flush_interval))
+        except asyncio.TimeoutError:
+            return batch
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and not self._stopping:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            batch = await self._next_batch()
+            if batch:
+                await asyncio.to_thread(self._write_batch, batch)
+        # Shutdown: flush whatever is left
+        while True:
+            batch = self._drain()
+            if not batch:
+                break
+            await asyncio.to_thread(self._write_batch, batch)
+
+    def _write_batch(self, events: List[Dict[str, Any]]) -> None:
+        started = time.monotonic()
+        db = SessionLocal()
+        try:
+            service = UsageTrackingService(db)
+            rows = [service.build_usage_values(**event) for event in events]
+            db.execute(insert(UsageTracking), rows)
+            db.commit()
+            self.metrics.record_flush(len(rows), int((time.monotonic() - started) * 1000))
+        except Exception as e:
+            db.rollback()
+            self.metrics.record(failed=len(events))
+            logger.error(f"Error writing {len(events)} usage records: {e}")
+        finally:
+            db.close()
+
+
+usage_pipeline = UsageIngestionPipeline(
+    max_queue_size=settings.usage_queue_max_size,
+    batch_size=settings.usage_batch_size,
+    flush_interval=settings.usage_flush_interval,
+)
@@ -36,73 +36,85 @@ class UsageTrackingService:
             }
         }
     
-    def track_usage(self, 
-                   user_id: Optional[int] = None,
-                   session_id: Optional[str] = None,
-                   endpoint: str = "",
-                   method: str = "GET",
-                   resource_type: str = "api_call",
-                   tokens_used: Optional[int] = None,
-                   api_calls: int = 1,
-                   response_time_ms: Optional[int] = None,
-                   data_processed: Optional[int] = None,
-                   query: Optional[str] = None,
-                   filters_applied: Optional[Dict] = None,
-                   results_count: Optional[int] = None,
-                   ai_model: Optional[str] = None,
-                   prompt_tokens: Optional[int] = None,
-                   completion_tokens: Optional[int] = None,
-                   ip_address: Optional[str] = None,
-                   user_agent: Optional[str] = None,
-                   referer: Optional[str] = None) -> UsageTracking:
-        """Track a single usage event"""
+    def build_usage_values(self,
+                           user_id: Optional[int] = None,
+                           session_id: Optional[str] = None,
+                           endpoint: str = "",
+                           method: str = "GET",
+                           resource_type: str = "api_call",
+                           tokens_used: Optional[int] = None,
+                           api_calls: int = 1,
+                           response_time_ms: Optional[int] = None,
+                           data_processed: Optional[int] = None,
+                           query: Optional[str] = None,
+                           filters_applied: Optional[Dict] = None,
+                           results_count: Optional[int] = None,
+                           ai_model: Optional[str] = None,
+                           prompt_tokens: Optional[int] = None,
+                           completion_tokens: Optional[int] = None,
+                           ip_address: Optional[str] = None,
+                           user_agent: Optional[str] = None,
+                           referer: Optional[str] = None,
+                           created_at: Optional[datetime] = None) -> Dict[str, Any]:
+        """Column values of a usage_tracking row, costs included (no database access)"""
+        
+        # Calculate estimated cost
+        estimated_cost = self._calculate_cost(
+            resource_type=resource_type,
+            tokens_used=tokens_used,
+            api_calls=api_calls,
+            results_count=results_count,
+            ai_model=ai_model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens
+        )
+        
+        # Get cost rates
+        cost_per_token, cost_per_api_call = self._get_cost_rates(resource_type, ai_model)
+        
+        values = {
+            "user_id": user_id,
+            "session_id": session_id,
+            "endpoint": endpoint,
+            "method": method,
+            "resource_type": resource_type,
+            "tokens_used": tokens_used or 0,
+            "api_calls": api_calls,
+            "response_time_ms": response_time_ms,
+            "data_processed": data_processed,
+            "estimated_cost": estimated_cost,
+            "cost_per_token": cost_per_token,
+            "cost_per_api_call": cost_per_api_call,
+            "query": query,
+            "filters_applied": filters_applied,
+            "results_count": results_count,
+            "ai_model": ai_model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "referer": referer,
+        }
+        if created_at is not None:
+            # Queued events keep the time of the request rather than the time of the insert
+            values["created_at"] = created_at
+        return values
+    
+    def track_usage(self, **kwargs) -> UsageTracking:
+        """Track a single usage event (see build_usage_values for the accepted fields)"""
         
         try:
-            # Calculate estimated cost
-            estimated_cost = self._calculate_cost(
-                resource_type=resource_type,
-                tokens_used=tokens_used,
-                api_calls=api_calls,
-                results_count=results_count,
-                ai_model=ai_model,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens
-            )
-            
-            # Get cost rates
-            cost_per_token, cost_per_api_call = self._get_cost_rates(resource_type, ai_model)
+            values = self.build_usage_values(**kwargs)
             
             # Create usage record
-            usage_record = UsageTracking(
-                user_id=user_id,
-                session_id=session_id,
-                endpoint=endpoint,
-                method=method,
-                resource_type=resource_type,
-                tokens_used=tokens_used or 0,
-                api_calls=api_calls,
-                response_time_ms=response_time_ms,
-                data_processed=data_processed,
-                estimated_cost=estimated_cost,
-                cost_per_token=cost_per_token,
-                cost_per_api_call=cost_per_api_call,
-                query=query,
-                filters_applied=filters_applied,
-                results_count=results_count,
-                ai_model=ai_model,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                referer=referer
-            )
+            usage_record = UsageTracking(**values)
             
             self.db.add(usage_record)
             self.db.commit()
             self.db.refresh(usage_record)
             
             # Update user's real-time usage stats
-            self._update_user_usage_stats(user_id, resource_type, estimated_cost)
+            self._update_user_usage_stats(values["user_id"], values["resource_type"], values["estimated_cost"])
             
             return usage_record
             